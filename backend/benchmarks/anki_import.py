@@ -0,0 +1,74 @@
+"""Time and peak Python memory to import a 50k-note Anki deck through the
+background import worker.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.anki_import
+"""
+
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from benchmarks.utils import create_benchmark_user, login
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards.models import Card, Collection
+from src.main import app
+from tests.utils.anki import make_apkg
+
+NOTES = 50_000
+
+
+def notes():
+    for i in range(NOTES):
+        yield [f"<b>Word {i}</b>", f"Meaning of word {i}<br>Example sentence {i}"]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        package = make_apkg(Path(directory) / "deck.apkg", notes(), "Vocabulary")
+        content = package.read_bytes()
+    print(f"deck: {NOTES} notes, {len(content) / 1024 / 1024:.1f}MiB")
+
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        collection_id = None
+        try:
+            with TestClient(app) as client:
+                headers = login(client, user.email, password)
+                url = f"{settings.API_V1_STR}/collections/anki-imports"
+
+                tracemalloc.start()
+                start = time.perf_counter()
+                rsp = client.post(url, content=content, headers=headers)
+                rsp.raise_for_status()
+                job = rsp.json()
+                while job["status"] in ("pending", "running"):
+                    time.sleep(0.05)
+                    job = client.get(f"{url}/{job['id']}", headers=headers).json()
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                collection_id = job["collection_id"]
+                print(
+                    f"{job['status']}: {job['imported']} cards in {elapsed:.2f}s "
+                    f"({job['imported'] / elapsed:.0f} cards/s), "
+                    f"peak Python allocations {peak / 1024 / 1024:.1f}MiB"
+                )
+        finally:
+            if collection_id:
+                session.exec(delete(Card).where(Card.collection_id == collection_id))
+                session.exec(delete(Collection).where(Collection.id == collection_id))
+            session.delete(user)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Time to find near-duplicate cards in a large collection with the LSH
+bucket index, against comparing every pair of signatures, and the cost of
+skipping near-duplicates on import.
+
+One card in ten is a copy of an earlier card with different case,
+punctuation or one word changed.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.card_duplicates
+"""
+
+import csv
+import io
+import random
+import string
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from benchmarks.card_import import cleanup
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards import dedup
+from src.flashcards.models import Card
+from src.flashcards.services import fingerprint_cards
+from src.main import app
+
+CARDS = 50_000
+VOCABULARY = 5_000
+ITERATIONS = 5
+# All-pairs comparison is timed on a sample and extrapolated
+PAIRWISE_SAMPLE = 2_000
+
+
+def cards_csv(cards: int) -> bytes:
+    rng = random.Random(0)
+    vocabulary = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(VOCABULARY)
+    ]
+
+    def sentence(words: int) -> str:
+        return " ".join(rng.choices(vocabulary, k=words))
+
+    rows: list[tuple[str, str]] = []
+    for _ in range(cards):
+        if rows and rng.random() < 0.1:
+            front, back = rng.choice(rows)
+            words = back.split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            rows.append((front.upper() + "?", " ".join(words)))
+        else:
+            rows.append((sentence(6), sentence(16)))
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["front", "back"])
+    writer.writerows(rows)
+    return out.getvalue().encode()
+
+
+def main() -> None:
+    content = cards_csv(CARDS)
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        collection_ids = []
+
+        with TestClient(app) as client:
+            headers = login(client, user.email, password)
+            try:
+                for skip_duplicates in (False, True):
+                    rsp = client.post(
+                        f"{settings.API_V1_STR}/collections/",
+                        json={"name": f"Bench skip={skip_duplicates}"},
+                        headers=headers,
+                    )
+                    rsp.raise_for_status()
+                    collection_id = rsp.json()["id"]
+                    collection_ids.append(collection_id)
+                    start = time.perf_counter()
+                    rsp = client.post(
+                        f"{settings.API_V1_STR}/collections/{collection_id}"
+                        "/cards/import",
+                        params={"skip_duplicates": skip_duplicates},
+                        content=content,
+                        headers=headers,
+                    )
+                    rsp.raise_for_status()
+                    elapsed = time.perf_counter() - start
+                    print(
+                        f"import, skip_duplicates={skip_duplicates!s:<5} "
+                        f"{elapsed:7.2f}s {rsp.text.splitlines()[-1]}"
+                    )
+
+                collection_id = collection_ids[0]
+
+                def duplicates() -> None:
+                    rsp = client.get(
+                        f"{settings.API_V1_STR}/collections/{collection_id}/duplicates",
+                        headers=headers,
+                    )
+                    rsp.raise_for_status()
+
+                report(f"duplicates of {CARDS} cards", measure(duplicates, ITERATIONS))
+
+                session.exec(
+                    update(Card)
+                    .where(Card.collection_id == collection_id)
+                    .values(minhash=None, lsh_buckets=None)
+                )
+                start = time.perf_counter()
+                fingerprint_cards(session, collection_id)
+                session.commit()
+                elapsed = time.perf_counter() - start
+                print(f"fingerprint {CARDS} cards in {elapsed:7.2f}s")
+
+                minhashes = session.exec(
+                    select(Card.minhash).where(Card.collection_id == collection_id)
+                ).all()
+                signatures = dedup.from_bytes(minhashes[:PAIRWISE_SAMPLE])
+                start = time.perf_counter()
+                for i in range(len(signatures)):
+                    scores = dedup.similarity(signatures[i + 1 :], signatures[i])
+                    np.flatnonzero(scores >= dedup.DUPLICATE_THRESHOLD)
+                elapsed = (time.perf_counter() - start) * (CARDS / PAIRWISE_SAMPLE) ** 2
+                print(f"all pairs of {CARDS} cards in {elapsed:7.2f}s (estimated)")
+            finally:
+                session.rollback()
+                for collection_id in collection_ids:
+                    cleanup(session, collection_id)
+
+        session.delete(user)
+        session.commit()
+
+
+if __name__ == "__main__":
+    main()
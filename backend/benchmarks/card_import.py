@@ -0,0 +1,98 @@
+"""Time to add a large vocabulary list to a collection with an ongoing
+practice session, one card per request and with a bulk CSV import.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.card_import
+"""
+
+import csv
+import io
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from benchmarks.utils import create_benchmark_user, login
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards.models import Collection
+from src.main import app
+
+CARDS = 20_000
+# Single-card requests are timed on a sample and extrapolated
+SINGLE_REQUESTS = 500
+
+
+def vocabulary_csv(cards: int) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["front", "back"])
+    for i in range(cards):
+        writer.writerow([f"Word {i}", f"Meaning of word {i}, with a comma"])
+    return out.getvalue().encode()
+
+
+def cleanup(session: Session, collection_id) -> None:
+    session.exec(delete(Collection).where(Collection.id == collection_id))
+    session.commit()
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        content = vocabulary_csv(CARDS)
+
+        with TestClient(app) as client:
+            headers = login(client, user.email, password)
+            for label in ("single", "import"):
+                rsp = client.post(
+                    f"{settings.API_V1_STR}/collections/",
+                    json={"name": f"Bench {label}"},
+                    headers=headers,
+                )
+                rsp.raise_for_status()
+                collection_id = rsp.json()["id"]
+                base = f"{settings.API_V1_STR}/collections/{collection_id}/cards"
+                try:
+                    client.post(
+                        f"{base}/", json={"front": "a", "back": "b"}, headers=headers
+                    ).raise_for_status()
+                    client.post(
+                        f"{settings.API_V1_STR}/practice-sessions",
+                        json={"collection_id": collection_id},
+                        headers=headers,
+                    ).raise_for_status()
+
+                    start = time.perf_counter()
+                    if label == "single":
+                        for i in range(SINGLE_REQUESTS):
+                            client.post(
+                                f"{base}/",
+                                json={"front": f"Word {i}", "back": f"Meaning {i}"},
+                                headers=headers,
+                            ).raise_for_status()
+                        elapsed = (
+                            (time.perf_counter() - start) * CARDS / SINGLE_REQUESTS
+                        )
+                    else:
+                        rsp = client.post(
+                            f"{base}/import", content=content, headers=headers
+                        )
+                        rsp.raise_for_status()
+                        elapsed = time.perf_counter() - start
+                        print(rsp.text.splitlines()[-1])
+                    print(
+                        f"{label:<8} {CARDS} cards in {elapsed:7.2f}s "
+                        f"({CARDS / elapsed:8.0f} cards/s)"
+                    )
+                finally:
+                    cleanup(session, collection_id)
+
+        session.delete(user)
+        session.commit()
+
+
+if __name__ == "__main__":
+    main()
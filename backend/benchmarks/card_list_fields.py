@@ -0,0 +1,98 @@
+"""Size and latency of card and practice card lists of a large collection,
+with full cards and narrowed to ids and previews with `fields`.
+
+Cards hold a few paragraphs of rich text HTML on each side, as written by
+the card editor.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.card_list_fields
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from benchmarks.card_import import cleanup
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.core.config import settings
+from src.core.db import engine
+from src.main import app
+
+CARDS = 20_000
+PAGE = 1_000
+ITERATIONS = 20
+
+# About 1,000 characters of HTML a side
+PARAGRAPH = (
+    "'<p>Card ' || g.i || ' <strong>explains</strong> a term of the "
+    "collection with an example sentence, a note on usage and a "
+    "&quot;mnemonic&quot; to remember it by.</p>'"
+)
+SEED = f"""
+INSERT INTO card (id, front, back, collection_id, created_at, updated_at)
+SELECT gen_random_uuid(), repeat({PARAGRAPH}, 7), repeat({PARAGRAPH}, 7),
+       :collection_id, now(), now()
+FROM generate_series(1, :cards) AS g(i)
+"""
+
+VARIANTS = {"full cards": {}, "id and preview": {"fields": ["id", "preview"]}}
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+
+        with TestClient(app) as client:
+            headers = login(client, user.email, password)
+            rsp = client.post(
+                f"{settings.API_V1_STR}/collections/",
+                json={"name": "Bench fields"},
+                headers=headers,
+            )
+            rsp.raise_for_status()
+            collection_id = rsp.json()["id"]
+            try:
+                session.exec(
+                    text(SEED), params={"collection_id": collection_id, "cards": CARDS}
+                )
+                session.commit()
+                session.exec(text("ANALYZE card"))
+                session.commit()
+                rsp = client.post(
+                    f"{settings.API_V1_STR}/practice-sessions",
+                    json={"collection_id": collection_id},
+                    headers=headers,
+                )
+                rsp.raise_for_status()
+                practice_session_id = rsp.json()["id"]
+
+                urls = {
+                    "cards": f"{settings.API_V1_STR}/collections/{collection_id}"
+                    "/cards/",
+                    "practice cards": f"{settings.API_V1_STR}/practice-sessions/"
+                    f"{practice_session_id}/cards",
+                }
+                for name, url in urls.items():
+                    for variant, params in VARIANTS.items():
+                        params = {**params, "limit": PAGE}
+
+                        def page(url=url, params=params) -> int:
+                            rsp = client.get(url, params=params, headers=headers)
+                            rsp.raise_for_status()
+                            return len(rsp.content)
+
+                        size = page()
+                        label = f"{name}, {variant}"
+                        report(label, measure(page, ITERATIONS))
+                        print(f"{'':<32} {size / 1024:8.1f} KiB per {PAGE} cards")
+            finally:
+                session.rollback()
+                cleanup(session, collection_id)
+
+        session.delete(user)
+        session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Latency of full-text card search over 1M cards, against a regular
+expression scan of the same cards.
+
+Cards are filled with words drawn from a skewed vocabulary, so some words
+match a large share of the cards and others only a few.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.card_search
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from benchmarks.card_import import cleanup
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.core.config import settings
+from src.core.db import engine
+from src.main import app
+
+CARDS = 1_000_000
+COLLECTIONS = 10
+VOCABULARY = 20_000
+ITERATIONS = 20
+SCAN_ITERATIONS = 3
+
+# A string of `words` words, drawn with low numbers far more often, for each
+# row of the series `g`
+WORDS = """(
+    SELECT string_agg('w' || floor({vocabulary} * power(random(), 3))::int, ' ')
+    FROM generate_series(1, {words}) AS w WHERE g.i > 0
+)"""
+
+SEED = f"""
+INSERT INTO card (id, front, back, collection_id, created_at, updated_at)
+SELECT gen_random_uuid(), {WORDS.format(vocabulary=VOCABULARY, words=2)},
+       {WORDS.format(vocabulary=VOCABULARY, words=8)},
+       (CAST(:collection_ids AS uuid[]))[1 + g.i % :collections], now(), now()
+FROM generate_series(1, :cards) AS g(i)
+"""
+
+SCAN = """
+SELECT card.id FROM card JOIN collection ON collection.id = card.collection_id
+WHERE collection.user_id = :user_id
+  AND (card.front ~* :pattern OR card.back ~* :pattern)
+LIMIT 20
+"""
+
+QUERIES = {
+    "common word": "w0",
+    "mid-frequency word": "w800",
+    "rare word": "w19000",
+    "two words": "w3 w40",
+}
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+
+        with TestClient(app) as client:
+            headers = login(client, user.email, password)
+            collection_ids = []
+            for i in range(COLLECTIONS):
+                rsp = client.post(
+                    f"{settings.API_V1_STR}/collections/",
+                    json={"name": f"Bench {i}"},
+                    headers=headers,
+                )
+                rsp.raise_for_status()
+                collection_ids.append(rsp.json()["id"])
+            try:
+                session.exec(
+                    text(SEED),
+                    params={
+                        "collection_ids": collection_ids,
+                        "collections": COLLECTIONS,
+                        "cards": CARDS,
+                    },
+                )
+                session.commit()
+                session.exec(text("ANALYZE card"))
+                session.commit()
+
+                for label, query in QUERIES.items():
+                    for scope in (None, collection_ids[0]):
+                        params = {"q": query, "count": "none"}
+                        if scope:
+                            params["collection_id"] = scope
+
+                        def search(params=params) -> None:
+                            client.get(
+                                f"{settings.API_V1_STR}/search",
+                                params=params,
+                                headers=headers,
+                            ).raise_for_status()
+
+                        name = f"{label}{' in collection' if scope else ''}"
+                        report(name, measure(search, ITERATIONS))
+
+                def scan() -> None:
+                    session.exec(
+                        text(SCAN),
+                        params={"user_id": user.id, "pattern": r"\mw19000\M"},
+                    ).all()
+
+                report("regex scan, rare word", measure(scan, SCAN_ITERATIONS))
+            finally:
+                session.rollback()
+                for collection_id in collection_ids:
+                    cleanup(session, collection_id)
+
+        session.delete(user)
+        session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Time to copy a large collection, by reading its cards and re-posting
+them from the client and with the server-side clone.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.collection_clone
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from benchmarks.card_import import cleanup, vocabulary_csv
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.core.config import settings
+from src.core.db import engine
+from src.main import app
+
+CARDS = 10_000
+# Client-side copies are timed on a sample and extrapolated
+CLIENT_CARDS = 500
+ITERATIONS = 20
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        collection_ids = []
+
+        with TestClient(app) as client:
+            headers = login(client, user.email, password)
+
+            def create(name: str) -> str:
+                rsp = client.post(
+                    f"{settings.API_V1_STR}/collections/",
+                    json={"name": name},
+                    headers=headers,
+                )
+                rsp.raise_for_status()
+                collection_ids.append(rsp.json()["id"])
+                return rsp.json()["id"]
+
+            try:
+                source_id = create("Bench source")
+                client.post(
+                    f"{settings.API_V1_STR}/collections/{source_id}/cards/import",
+                    content=vocabulary_csv(CARDS),
+                    headers=headers,
+                ).raise_for_status()
+
+                copy_id = create("Bench client copy")
+                start = time.perf_counter()
+                rsp = client.get(
+                    f"{settings.API_V1_STR}/collections/{source_id}/cards/",
+                    params={"limit": CLIENT_CARDS},
+                    headers=headers,
+                )
+                for card in rsp.json()["data"]:
+                    client.post(
+                        f"{settings.API_V1_STR}/collections/{copy_id}/cards/",
+                        json={"front": card["front"], "back": card["back"]},
+                        headers=headers,
+                    ).raise_for_status()
+                elapsed = (time.perf_counter() - start) * CARDS / CLIENT_CARDS
+                print(f"client copy of {CARDS} cards in {elapsed:7.2f}s (estimated)")
+
+                def clone() -> None:
+                    rsp = client.post(
+                        f"{settings.API_V1_STR}/collections/{source_id}/clone",
+                        headers=headers,
+                    )
+                    rsp.raise_for_status()
+                    collection_ids.append(rsp.json()["id"])
+
+                report(f"clone of {CARDS} cards", measure(clone, ITERATIONS))
+            finally:
+                for collection_id in collection_ids:
+                    cleanup(session, collection_id)
+
+        session.delete(user)
+        session.commit()
+
+
+if __name__ == "__main__":
+    main()
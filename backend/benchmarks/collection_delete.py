@@ -0,0 +1,138 @@
+"""Time and peak memory to delete a large collection whose cards are all in
+practice sessions, with the database cascading the delete and with the ORM
+loading and deleting every row.
+
+Loading the relationships before deleting makes the ORM delete the loaded
+rows itself, which is how collections were deleted before the foreign keys
+cascaded.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.collection_delete
+"""
+
+import time
+import tracemalloc
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+from benchmarks.utils import create_benchmark_user, login
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards.models import Card, Collection, PracticeSession
+from src.main import app
+from src.users.models import User
+
+CARDS = 50_000
+SESSIONS = 4
+
+SEED_CARDS = """
+INSERT INTO card (id, front, back, collection_id, created_at, updated_at)
+SELECT gen_random_uuid(), 'Word ' || g.i, 'Meaning of word ' || g.i,
+       :collection_id, now(), now()
+FROM generate_series(1, :cards) AS g(i)
+"""
+
+SEED_SESSIONS = """
+WITH practice_session AS (
+    INSERT INTO practicesession (id, collection_id, user_id, is_completed,
+        total_cards, cards_practiced, correct_answers, created_at, updated_at)
+    SELECT gen_random_uuid(), :collection_id, :user_id, g.i > 1, :cards,
+           0, 0, now(), now()
+    FROM generate_series(1, :sessions) AS g(i)
+    RETURNING id
+)
+INSERT INTO practicecard (id, session_id, card_id, is_practiced, created_at,
+    updated_at)
+SELECT gen_random_uuid(), practice_session.id, card.id, false, now(), now()
+FROM practice_session CROSS JOIN card
+WHERE card.collection_id = :collection_id
+"""
+
+
+def seed(client: TestClient, headers: dict[str, str], session: Session, user_id):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Bench delete"},
+        headers=headers,
+    )
+    rsp.raise_for_status()
+    collection_id = rsp.json()["id"]
+    params = {
+        "collection_id": collection_id,
+        "user_id": user_id,
+        "cards": CARDS,
+        "sessions": SESSIONS,
+    }
+    session.exec(text(SEED_CARDS), params=params)
+    session.exec(text(SEED_SESSIONS), params=params)
+    session.commit()
+    return collection_id
+
+
+def timed(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {elapsed:7.2f}s peak={peak / 2**20:8.1f}MiB")
+
+
+def main() -> None:
+    rows = CARDS * (SESSIONS + 1) + SESSIONS
+    print(f"collection of {CARDS} cards, {SESSIONS} sessions, {rows} rows")
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        user_id = user.id
+
+        with TestClient(app) as client:
+            headers = login(client, user.email, password)
+            try:
+                collection_id = seed(client, headers, session, user_id)
+
+                def cascade_in_database() -> None:
+                    client.delete(
+                        f"{settings.API_V1_STR}/collections/{collection_id}",
+                        headers=headers,
+                    ).raise_for_status()
+
+                timed("database cascade (API)", cascade_in_database)
+
+                collection_id = seed(client, headers, session, user_id)
+
+                def cascade_in_orm() -> None:
+                    collection = session.exec(
+                        select(Collection)
+                        .where(Collection.id == collection_id)
+                        .options(
+                            selectinload(Collection.cards).selectinload(
+                                Card.practice_cards
+                            ),
+                            selectinload(Collection.practice_sessions).selectinload(
+                                PracticeSession.practice_cards
+                            ),
+                        )
+                    ).one()
+                    session.delete(collection)
+                    session.commit()
+
+                timed("ORM cascade", cascade_in_orm)
+            finally:
+                session.rollback()
+                session.exec(
+                    text("DELETE FROM collection WHERE user_id = :user_id"),
+                    params={"user_id": user_id},
+                )
+                session.commit()
+
+        session.delete(session.get(User, user_id))
+        session.commit()
+
+
+if __name__ == "__main__":
+    main()
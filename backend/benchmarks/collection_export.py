@@ -0,0 +1,132 @@
+"""Time and transfer size to get every card of a large collection out, by
+paging the card list with offsets and by streaming an export in each
+format, and the peak Python memory of producing each export.
+
+The test client buffers whole responses, so export memory is measured on
+the response generator alone, without tracing during the timed requests.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.collection_export
+"""
+
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable, Iterator
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, text
+from sqlmodel import Session
+
+from benchmarks.utils import create_benchmark_user, login
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards.exports import export_collection, gzip_chunks
+from src.flashcards.models import Card, Collection
+from src.flashcards.services import get_cards
+from src.main import app
+
+CARDS = 200_000
+PAGE_SIZE = 1000
+
+
+def seed(session: Session, user_id: uuid.UUID) -> uuid.UUID:
+    collection = Collection(name="Bench", user_id=user_id)
+    session.add(collection)
+    session.commit()
+    session.exec(
+        text(
+            """
+            INSERT INTO card (id, front, back, collection_id, created_at, updated_at)
+            SELECT gen_random_uuid(), 'Front ' || i, 'Back of card ' || i || ', with
+            a second line', :collection_id, now() - i * interval '1 second',
+                   now() - i * interval '1 second'
+            FROM generate_series(1, :cards) AS i
+            """
+        ),
+        params={"collection_id": collection.id, "cards": CARDS},
+    )
+    session.commit()
+    session.exec(text("ANALYZE card"))
+    return collection.id
+
+
+def run(label: str, fn: Callable[[], int], chunks: Callable[[], Iterator]) -> None:
+    start = time.perf_counter()
+    transferred = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for _ in chunks():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<16} {elapsed:6.2f}s transferred={transferred / 1024 / 1024:6.1f}MiB "
+        f"peak={peak / 1024 / 1024:6.1f}MiB"
+    )
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        collection_id = seed(session, user.id)
+        base = f"{settings.API_V1_STR}/collections/{collection_id}"
+
+        try:
+            with TestClient(app) as client:
+                headers = login(client, user.email, password)
+
+                def offset_pages() -> int:
+                    transferred = 0
+                    for skip in range(0, CARDS, PAGE_SIZE):
+                        rsp = client.get(
+                            f"{base}/cards/",
+                            params={"skip": skip, "limit": PAGE_SIZE},
+                            headers={**headers, "Accept-Encoding": "identity"},
+                        )
+                        rsp.raise_for_status()
+                        transferred += len(rsp.content)
+                    return transferred
+
+                def pages() -> Iterator:
+                    for skip in range(0, CARDS, PAGE_SIZE):
+                        yield get_cards(session, collection_id, skip, PAGE_SIZE)
+                        session.expunge_all()
+
+                run("offset pages", offset_pages, pages)
+
+                for label, format, encoding in (
+                    ("export ndjson", "ndjson", "identity"),
+                    ("export csv", "csv", "identity"),
+                    ("export csv gzip", "csv", "gzip"),
+                ):
+
+                    def export(format: str = format, encoding: str = encoding) -> int:
+                        transferred = 0
+                        with client.stream(
+                            "GET",
+                            f"{base}/export",
+                            params={"format": format},
+                            headers={**headers, "Accept-Encoding": encoding},
+                        ) as rsp:
+                            rsp.raise_for_status()
+                            for chunk in rsp.iter_raw():
+                                transferred += len(chunk)
+                        return transferred
+
+                    def chunks(format: str = format, encoding: str = encoding):
+                        chunks = export_collection(engine, collection_id, format)
+                        return gzip_chunks(chunks) if encoding == "gzip" else chunks
+
+                    run(label, export, chunks)
+        finally:
+            session.exec(delete(Card).where(Card.collection_id == collection_id))
+            session.exec(delete(Collection).where(Collection.id == collection_id))
+            session.delete(user)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Payload size, query count and latency of the collection endpoints for a
+user with many large collections.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.collection_list
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards.models import Card, Collection
+from src.main import app
+from tests.utils.utils import count_queries
+
+COLLECTIONS = 200
+CARDS_PER_COLLECTION = 1_000
+ITERATIONS = 20
+
+
+def seed(session: Session, user_id: uuid.UUID) -> list[uuid.UUID]:
+    now = datetime.now(timezone.utc)
+    collection_ids = [uuid.uuid4() for _ in range(COLLECTIONS)]
+    session.exec(
+        insert(Collection),
+        params=[
+            {
+                "id": collection_id,
+                "name": f"Bench {i}",
+                "user_id": user_id,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i, collection_id in enumerate(collection_ids)
+        ],
+    )
+    for collection_id in collection_ids:
+        session.exec(
+            insert(Card),
+            params=[
+                {
+                    "id": uuid.uuid4(),
+                    "front": f"Front {i} " + "x" * 40,
+                    "back": f"Back {i} " + "y" * 200,
+                    "collection_id": collection_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(CARDS_PER_COLLECTION)
+            ],
+        )
+    session.commit()
+    return collection_ids
+
+
+def cleanup(session: Session, user_id: uuid.UUID) -> None:
+    user_collections = select(Collection.id).where(Collection.user_id == user_id)
+    session.exec(delete(Card).where(Card.collection_id.in_(user_collections)))
+    session.exec(delete(Collection).where(Collection.user_id == user_id))
+    session.commit()
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        collection_ids = seed(session, user.id)
+
+        try:
+            with TestClient(app) as client:
+                headers = login(client, user.email, password)
+                for label, url in (
+                    ("GET /collections/", f"{settings.API_V1_STR}/collections/"),
+                    (
+                        "GET /collections/{id}",
+                        f"{settings.API_V1_STR}/collections/{collection_ids[0]}",
+                    ),
+                ):
+
+                    def request(url: str = url) -> None:
+                        client.get(url, headers=headers).raise_for_status()
+
+                    request()
+                    with count_queries(engine) as statements:
+                        rsp = client.get(url, headers=headers)
+                    report(label, measure(request, ITERATIONS))
+                    print(
+                        f"{'':<32} payload={len(rsp.content) / 1024:.1f}KiB "
+                        f"queries/request={len(statements)}"
+                    )
+        finally:
+            cleanup(session, user.id)
+            session.delete(user)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
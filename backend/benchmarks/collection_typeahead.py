@@ -0,0 +1,97 @@
+"""Latency of collection name typeahead for a user with many collections,
+among many collections of other users, with and without the prefix cache.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.collection_typeahead
+"""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards.cache import typeahead_cache
+from src.main import app
+
+USER_COLLECTIONS = 2_000
+OTHER_COLLECTIONS = 200_000
+ITERATIONS = 200
+TYPED = "spanish verbs 1"
+
+# Names such as "Spanish vocabulary 17" or "Travel German 3"
+SEED = """
+INSERT INTO collection (id, name, user_id, created_at, updated_at, version)
+SELECT gen_random_uuid(),
+       (ARRAY['Spanish', 'German', 'Travel', 'Kanji', 'Biology', 'History'])
+           [1 + g.i % 6] || ' ' ||
+       (ARRAY['vocabulary', 'verbs', 'phrases', 'basics', 'exam'])[1 + g.i % 5]
+           || ' ' || g.i,
+       :user_id, now(), now(), 1
+FROM generate_series(1, :collections) AS g(i)
+"""
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        other, _ = create_benchmark_user(session)
+        try:
+            for user_id, collections in [
+                (user.id, USER_COLLECTIONS),
+                (other.id, OTHER_COLLECTIONS),
+            ]:
+                session.exec(
+                    text(SEED), params={"user_id": user_id, "collections": collections}
+                )
+            session.commit()
+            session.exec(text("ANALYZE collection"))
+            session.commit()
+
+            with TestClient(app) as client:
+                headers = login(client, user.email, password)
+                url = f"{settings.API_V1_STR}/collections/typeahead"
+
+                def baseline() -> None:
+                    client.get(
+                        f"{settings.API_V1_STR}/users/me", headers=headers
+                    ).raise_for_status()
+
+                report("request overhead (users/me)", measure(baseline, ITERATIONS))
+
+                for term in ("s", "span", "verbs 1"):
+
+                    def lookup(term=term) -> None:
+                        typeahead_cache.clear()
+                        client.get(
+                            url, params={"q": term}, headers=headers
+                        ).raise_for_status()
+
+                    report(f"uncached '{term}'", measure(lookup, ITERATIONS))
+
+                def type_name() -> None:
+                    typeahead_cache.clear()
+                    for end in range(1, len(TYPED) + 1):
+                        client.get(
+                            url, params={"q": TYPED[:end]}, headers=headers
+                        ).raise_for_status()
+
+                timings = measure(type_name, ITERATIONS)
+                report(
+                    f"typing '{TYPED}', per letter",
+                    [timing / len(TYPED) for timing in timings],
+                )
+                print(
+                    f"cache hits={typeahead_cache.hits} misses={typeahead_cache.misses}"
+                )
+        finally:
+            session.rollback()
+            session.delete(user)
+            session.delete(other)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Latency of deep pages of a large collection's card list, with OFFSET
+pagination and with cursors, and of the first page with each count mode.
+Endpoint latency includes the total count, so the page query is also timed
+on its own.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.keyset_pagination
+"""
+
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, text
+from sqlmodel import Session, select
+
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.core.config import settings
+from src.core.db import engine
+from src.core.pagination import Cursor, after_cursor, keyset_order
+from src.flashcards.models import Card, Collection
+from src.main import app
+
+CARDS = 1_000_000
+PAGE_SIZE = 100
+DEPTHS = (0, 10_000, 100_000, 500_000, CARDS - PAGE_SIZE)
+ITERATIONS = 10
+
+
+def seed(session: Session, user_id: uuid.UUID) -> uuid.UUID:
+    collection = Collection(name="Bench", user_id=user_id)
+    session.add(collection)
+    session.commit()
+    session.exec(
+        text(
+            """
+            INSERT INTO card (id, front, back, collection_id, created_at, updated_at)
+            SELECT gen_random_uuid(), 'Front ' || i, 'Back ' || i, :collection_id,
+                   now() - i * interval '1 second', now() - i * interval '1 second'
+            FROM generate_series(1, :cards) AS i
+            """
+        ),
+        params={"collection_id": collection.id, "cards": CARDS},
+    )
+    session.commit()
+    session.exec(text("ANALYZE card"))
+    return collection.id
+
+
+def cursor_at(session: Session, collection_id: uuid.UUID, depth: int) -> str | None:
+    """The cursor a client would hold after paging down to `depth`."""
+    if depth == 0:
+        return None
+    statement = (
+        select(Card.updated_at, Card.id)
+        .where(Card.collection_id == collection_id)
+        .order_by(Card.updated_at.desc(), Card.id.desc())
+        .offset(depth - 1)
+        .limit(1)
+    )
+    return Cursor(*session.exec(statement).one()).encode()
+
+
+def page_statement(collection_id: uuid.UUID, depth: int, cursor: str | None):
+    statement = (
+        select(Card)
+        .where(Card.collection_id == collection_id)
+        .order_by(*keyset_order(Card.updated_at, Card.id))
+        .limit(PAGE_SIZE)
+    )
+    if cursor is None:
+        return statement.offset(depth)
+    return statement.where(
+        after_cursor(Card.updated_at, Card.id, Cursor.decode(cursor))
+    )
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        collection_id = seed(session, user.id)
+        url = f"{settings.API_V1_STR}/collections/{collection_id}/cards/"
+
+        try:
+            with TestClient(app) as client:
+                headers = login(client, user.email, password)
+                for depth in DEPTHS:
+                    cursor = cursor_at(session, collection_id, depth)
+                    for label, params in (
+                        (f"offset depth={depth}", {"skip": depth}),
+                        (f"cursor depth={depth}", {"cursor": cursor} if cursor else {}),
+                    ):
+                        params = {"limit": PAGE_SIZE, **params}
+
+                        def request(params: dict = params) -> None:
+                            client.get(
+                                url, params=params, headers=headers
+                            ).raise_for_status()
+
+                        request()
+                        report(label, measure(request, ITERATIONS))
+
+                    for label, statement in (
+                        (
+                            f"  query offset depth={depth}",
+                            page_statement(collection_id, depth, None),
+                        ),
+                        (
+                            f"  query cursor depth={depth}",
+                            page_statement(collection_id, depth, cursor),
+                        ),
+                    ):
+
+                        def query(statement=statement) -> None:
+                            session.exec(statement).all()
+                            session.expunge_all()
+
+                        query()
+                        report(label, measure(query, ITERATIONS))
+
+                for count in ("exact", "estimate", "none"):
+
+                    def first_page(count: str = count) -> None:
+                        client.get(
+                            url,
+                            params={"limit": PAGE_SIZE, "count": count},
+                            headers=headers,
+                        ).raise_for_status()
+
+                    first_page()
+                    report(f"count={count}", measure(first_page, ITERATIONS))
+        finally:
+            session.exec(delete(Card).where(Card.collection_id == collection_id))
+            session.exec(delete(Collection).where(Collection.id == collection_id))
+            session.delete(user)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
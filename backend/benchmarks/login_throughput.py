@@ -0,0 +1,64 @@
+"""Concurrent login throughput with bcrypt on threads vs. worker processes.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.login_throughput
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+from sqlmodel import Session
+
+from benchmarks.utils import create_benchmark_user
+from src.auth.hashing import password_hasher
+from src.core.config import settings
+from src.core.db import engine
+from src.main import app
+
+CONCURRENCY = 16
+LOGINS = 64
+
+
+async def run_logins(email: str, password: str) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+
+        async def login() -> None:
+            async with semaphore:
+                rsp = await client.post(
+                    f"{settings.API_V1_STR}/tokens",
+                    data={"username": email, "password": password},
+                )
+                rsp.raise_for_status()
+
+        await login()
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(LOGINS)))
+        return LOGINS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        try:
+            modes = (("thread pool", 0), ("process pool", os.cpu_count() or 2))
+            for label, workers in modes:
+                password_hasher.shutdown()
+                password_hasher.workers = workers
+                password_hasher.max_pending = LOGINS
+                rate = asyncio.run(run_logins(user.email, password))
+                print(f"{label:<16} workers={workers:<3} {rate:7.1f} logins/s")
+        finally:
+            password_hasher.shutdown()
+            session.delete(user)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Latency of GET /collections/ with and without the principal cache.
+
+Run from the backend directory against a migrated database:
+
+    python -m benchmarks.principal_cache
+"""
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from benchmarks.utils import create_benchmark_user, login, measure, report
+from src.auth.cache import principal_cache
+from src.core.config import settings
+from src.core.db import engine
+from src.flashcards.services import create_collection
+from src.main import app
+from tests.utils.utils import count_queries
+
+ITERATIONS = 500
+
+
+def main() -> None:
+    with Session(engine) as session:
+        user, password = create_benchmark_user(session)
+        for i in range(10):
+            create_collection(session=session, user_id=user.id, name=f"Bench {i}")
+
+        try:
+            with TestClient(app) as client:
+                headers = login(client, user.email, password)
+                url = f"{settings.API_V1_STR}/collections/"
+
+                def request() -> None:
+                    client.get(url, headers=headers).raise_for_status()
+
+                ttl = principal_cache.ttl
+                for label, cache_ttl in (("cache disabled", 0), ("cache enabled", ttl)):
+                    principal_cache.clear()
+                    principal_cache.ttl = cache_ttl
+                    measure(request, 20)
+                    with count_queries(engine) as statements:
+                        request()
+                    report(label, measure(request, ITERATIONS))
+                    print(f"{'':<32} queries/request={len(statements)}")
+                principal_cache.ttl = ttl
+                print(f"hits={principal_cache.hits} misses={principal_cache.misses}")
+        finally:
+            session.delete(user)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import statistics
+import time
+from collections.abc import Callable
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.core.config import settings
+from src.users.models import User
+from src.users.schemas import UserCreate
+from src.users.services import create_user
+from tests.utils.utils import random_email, random_lower_string
+
+
+def create_benchmark_user(session: Session) -> tuple[User, str]:
+    password = random_lower_string()
+    user = create_user(
+        session=session,
+        user_create=UserCreate(email=random_email(), password=password),
+    )
+    return user, password
+
+
+def login(client: TestClient, email: str, password: str) -> dict[str, str]:
+    rsp = client.post(
+        f"{settings.API_V1_STR}/tokens",
+        data={"username": email, "password": password},
+    )
+    rsp.raise_for_status()
+    return {"Authorization": f"Bearer {rsp.json()['access_token']}"}
+
+
+def measure(fn: Callable[[], object], iterations: int) -> list[float]:
+    """Run `fn` `iterations` times and return per-call latencies in ms."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{label:<32} n={len(timings):<6} "
+        f"mean={statistics.mean(timings):7.2f}ms "
+        f"p50={statistics.median(timings):7.2f}ms "
+        f"p95={p95:7.2f}ms"
+    )
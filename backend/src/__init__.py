@@ -1,6 +1,7 @@
 import traceback
 
 try:
+    from .core.rate_limit import RateLimitBucket  # noqa
     from .users.models import User  # noqa
     from .flashcards.models import Collection, Card, PracticeSession, PracticeCard  # noqa
 except Exception:
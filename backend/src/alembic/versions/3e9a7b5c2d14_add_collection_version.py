@@ -0,0 +1,27 @@
+"""Add collection version counter
+
+Revision ID: 3e9a7b5c2d14
+Revises: 8c4d1f2a6b90
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e9a7b5c2d14'
+down_revision = '8c4d1f2a6b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'collection',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+    )
+
+
+def downgrade():
+    op.drop_column('collection', 'version')
@@ -0,0 +1,35 @@
+"""Make AI usage quota unique per user
+
+Revision ID: 5b2f7e9c1a3d
+Revises: d1ea38d75310
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2f7e9c1a3d'
+down_revision = 'd1ea38d75310'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the most used row when concurrent first requests created several
+    op.execute(
+        """
+        DELETE FROM aiusagequota a
+        USING aiusagequota b
+        WHERE a.user_id = b.user_id
+          AND (a.usage_count, a.id) < (b.usage_count, b.id)
+        """
+    )
+    op.drop_index('ix_aiusagequota_user_id', table_name='aiusagequota')
+    op.create_index(op.f('ix_aiusagequota_user_id'), 'aiusagequota', ['user_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_aiusagequota_user_id'), table_name='aiusagequota')
+    op.create_index('ix_aiusagequota_user_id', 'aiusagequota', ['user_id'], unique=False)
@@ -0,0 +1,45 @@
+"""Add a full-text search vector to cards
+
+Revision ID: 6d2c8e4f1a7b
+Revises: 3e9a7b5c2d14
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2c8e4f1a7b'
+down_revision = '3e9a7b5c2d14'
+branch_labels = None
+depends_on = None
+
+# Cards are in any language, so the `simple` configuration only lowercases
+# words. Its parser skips HTML tags and entities, leaving the plain text of
+# the Markdown/HTML card content. Fronts rank above backs.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', front), 'A') || "
+    "setweight(to_tsvector('simple', back), 'B')"
+)
+
+
+def upgrade():
+    op.add_column(
+        'card',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_card_search_vector', 'card', ['search_vector'], postgresql_using='gin'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_card_search_vector', table_name='card')
+    op.drop_column('card', 'search_vector')
@@ -0,0 +1,43 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: 8c4d1f2a6b90
+Revises: 5b2f7e9c1a3d
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4d1f2a6b90'
+down_revision = '5b2f7e9c1a3d'
+branch_labels = None
+depends_on = None
+
+# (table, old single column index, new composite index columns)
+INDEXES = [
+    ('collection', 'user_id', ['user_id', 'updated_at', 'id']),
+    ('card', 'collection_id', ['collection_id', 'updated_at', 'id']),
+    ('practicesession', 'user_id', ['user_id', 'created_at', 'id']),
+    ('practicecard', 'session_id', ['session_id', 'created_at', 'id']),
+    ('practicecard', None, ['session_id', 'updated_at', 'id']),
+]
+
+
+def upgrade():
+    for table, _, columns in INDEXES:
+        op.create_index(f"ix_{table}_{'_'.join(columns)}", table, columns)
+    # The composite indexes lead with the same column, so they also serve
+    # the foreign key lookups the single column indexes were used for
+    for table, column, _ in INDEXES:
+        if column:
+            op.drop_index(f'ix_{table}_{column}', table_name=table)
+
+
+def downgrade():
+    for table, column, _ in INDEXES:
+        if column:
+            op.create_index(f'ix_{table}_{column}', table, [column])
+    for table, _, columns in INDEXES:
+        op.drop_index(f"ix_{table}_{'_'.join(columns)}", table_name=table)
@@ -0,0 +1,32 @@
+"""Trigram index for collection name lookups
+
+Revision ID: 9a1f3c5e7b2d
+Revises: 6d2c8e4f1a7b
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9a1f3c5e7b2d'
+down_revision = '6d2c8e4f1a7b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # pg_trgm ships with the PostgreSQL contrib modules, which the server
+    # must have installed
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_collection_name_trgm',
+        'collection',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade():
+    op.drop_index('ix_collection_name_trgm', table_name='collection')
@@ -0,0 +1,45 @@
+"""Keep the status of Anki deck imports in the database
+
+Revision ID: a7d3e5f1c9b2
+Revises: f5b8d2c6e9a3
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e5f1c9b2'
+down_revision = 'f5b8d2c6e9a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ankideckimport',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+        sa.Column('collection_id', sa.Uuid(), nullable=True),
+        sa.Column('imported', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('errors', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('detail', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['collection_id'], ['collection.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_ankideckimport_user_id'), 'ankideckimport', ['user_id'])
+    op.create_index(op.f('ix_ankideckimport_created_at'), 'ankideckimport', ['created_at'])
+
+
+def downgrade():
+    op.drop_index(op.f('ix_ankideckimport_created_at'), table_name='ankideckimport')
+    op.drop_index(op.f('ix_ankideckimport_user_id'), table_name='ankideckimport')
+    op.drop_table('ankideckimport')
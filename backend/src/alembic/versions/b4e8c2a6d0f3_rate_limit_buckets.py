@@ -0,0 +1,35 @@
+"""Add a table for rate limit buckets shared by all workers
+
+Revision ID: b4e8c2a6d0f3
+Revises: a7d3e5f1c9b2
+Create Date: 2026-10-17 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e8c2a6d0f3'
+down_revision = 'a7d3e5f1c9b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ratelimitbucket',
+        sa.Column('key', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('tokens', sa.Float(), nullable=False),
+        sa.Column('retry_after', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index(op.f('ix_ratelimitbucket_expires_at'), 'ratelimitbucket', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index(op.f('ix_ratelimitbucket_expires_at'), table_name='ratelimitbucket')
+    op.drop_table('ratelimitbucket')
@@ -0,0 +1,37 @@
+"""Add MinHash signatures and LSH buckets to cards
+
+Revision ID: b7e2d4a9c3f1
+Revises: 9a1f3c5e7b2d
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d4a9c3f1'
+down_revision = '9a1f3c5e7b2d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Both are computed by the application. Existing cards are left without
+    # them and fingerprinted when their collection is first checked for
+    # duplicates.
+    op.add_column('card', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.add_column(
+        'card',
+        sa.Column('lsh_buckets', postgresql.ARRAY(sa.BigInteger()), nullable=True),
+    )
+    op.create_index(
+        'ix_card_lsh_buckets', 'card', ['lsh_buckets'], postgresql_using='gin'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_card_lsh_buckets', table_name='card')
+    op.drop_column('card', 'lsh_buckets')
+    op.drop_column('card', 'minhash')
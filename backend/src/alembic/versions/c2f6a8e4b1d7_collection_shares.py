@@ -0,0 +1,38 @@
+"""Offer copies of collections to other users until they accept
+
+Revision ID: c2f6a8e4b1d7
+Revises: b4e8c2a6d0f3
+Create Date: 2026-10-17 23:50:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f6a8e4b1d7'
+down_revision = 'b4e8c2a6d0f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'collectionshare',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('collection_id', sa.Uuid(), nullable=False),
+        sa.Column('recipient_id', sa.Uuid(), nullable=False),
+        sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['collection_id'], ['collection.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['recipient_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('collection_id', 'recipient_id'),
+    )
+    op.create_index(op.f('ix_collectionshare_recipient_id'), 'collectionshare', ['recipient_id'])
+
+
+def downgrade():
+    op.drop_index(op.f('ix_collectionshare_recipient_id'), table_name='collectionshare')
+    op.drop_table('collectionshare')
@@ -0,0 +1,43 @@
+"""Cascade deletes of collections, cards and practice sessions in the database
+
+Revision ID: e3c9a1d5f7b4
+Revises: b7e2d4a9c3f1
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3c9a1d5f7b4'
+down_revision = 'b7e2d4a9c3f1'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table) of the foreign keys whose rows are deleted
+# with the row they refer to
+FOREIGN_KEYS = [
+    ('card', 'collection_id', 'collection'),
+    ('practicesession', 'collection_id', 'collection'),
+    ('practicecard', 'session_id', 'practicesession'),
+    ('practicecard', 'card_id', 'card'),
+]
+
+
+def _replace_foreign_keys(ondelete):
+    for table, column, referred in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(
+            name, table, referred, [column], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade():
+    # The referring columns are all indexed, as the leading column of an
+    # index at least, so each cascade is an index lookup
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade():
+    _replace_foreign_keys(None)
@@ -0,0 +1,51 @@
+"""Add a plain text preview of the card front
+
+Revision ID: f5b8d2c6e9a3
+Revises: e3c9a1d5f7b4
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b8d2c6e9a3'
+down_revision = 'e3c9a1d5f7b4'
+branch_labels = None
+depends_on = None
+
+# Card content is HTML from the rich text editor. Block ends and line breaks
+# become spaces, other tags are dropped, the entities the editor writes are
+# decoded and runs of whitespace collapsed, then the first 120 characters
+# are kept, without trailing space.
+PREVIEW = r"""rtrim(left(btrim(regexp_replace(
+    replace(replace(replace(replace(replace(replace(
+        regexp_replace(
+            regexp_replace(
+                front,
+                '<(br|/(p|h[1-6]|li|div|blockquote|pre|td|th))\M[^>]*>',
+                ' ', 'gi'
+            ),
+            '<[^>]*>', '', 'g'
+        ),
+        '&nbsp;', ' '), '&lt;', '<'), '&gt;', '>'), '&quot;', '"'),
+        '&#39;', ''''), '&amp;', '&'),
+    '\s+', ' ', 'g'
+)), 120))"""
+
+
+def upgrade():
+    op.add_column(
+        'card',
+        sa.Column(
+            'preview',
+            sa.String(),
+            sa.Computed(PREVIEW, persisted=True),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column('card', 'preview')
@@ -5,23 +5,33 @@ import jwt
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 
-from core.config import ALGORITHM
+from src.auth.cache import principal_cache
+from src.auth.hashing import password_hasher
 from src.auth.schemas import Token
-from src.auth.services import SessionDep, send_reset_email
+from src.auth.services import (
+    ALGORITHM,
+    SessionDep,
+    send_reset_email,
+)
 from src.core.config import settings
+from src.users.services import get_user_by_email, set_password_by_email
 
 from . import services
+from .exceptions import PasswordHasherBusyError
 
 router = APIRouter()
 
 
-@router.post("/tokens")
-def login_access_token(
+@router.post("/tokens", dependencies=[Depends(services.limit_login_attempts)])
+async def login_access_token(
     session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Token:
-    user = services.authenticate(
-        session=session, email=form_data.username, password=form_data.password
-    )
+    try:
+        user = await services.authenticate(
+            session=session, email=form_data.username, password=form_data.password
+        )
+    except PasswordHasherBusyError:
+        raise HTTPException(status_code=503, detail="Server busy, try again later")
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not user.is_active:
@@ -34,9 +44,11 @@ def login_access_token(
     )
 
 
-@router.post("/password-reset")
-def password_reset_request(email: str, session: SessionDep):
-    user = services.get_user_by_email(session=session, email=email)
+@router.post(
+    "/password-reset", dependencies=[Depends(services.limit_password_reset_requests)]
+)
+async def password_reset_request(email: str, session: SessionDep):
+    user = await get_user_by_email(session=session, email=email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     # Envoyez un email avec un token de réinitialisation
@@ -46,7 +58,7 @@ def password_reset_request(email: str, session: SessionDep):
 
 
 @router.post("/password-reset/confirm")
-def reset_password_confirm(token: str, new_password: str, session: SessionDep):
+async def reset_password_confirm(token: str, new_password: str, session: SessionDep):
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get("sub")
@@ -55,12 +67,14 @@ def reset_password_confirm(token: str, new_password: str, session: SessionDep):
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=400, detail="Token expired")
 
-    user = services.get_user_by_email(session=session, email=email)
-    if not user:
+    try:
+        hashed_password = await password_hasher.hash(new_password)
+    except PasswordHasherBusyError:
+        raise HTTPException(status_code=503, detail="Server busy, try again later")
+    user_id = await set_password_by_email(
+        session=session, email=email, hashed_password=hashed_password
+    )
+    if not user_id:
         raise HTTPException(status_code=404, detail="User not found")
-
-    hashed_password = services.get_password_hash(new_password)
-    user.hashed_password = hashed_password
-    session.add(user)
-    session.commit()
+    principal_cache.invalidate_user(user_id)
     return {"message": "Password reset successful"}
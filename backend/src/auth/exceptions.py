@@ -0,0 +1,10 @@
+class AuthException(Exception):
+    """Base exception for auth module"""
+
+    pass
+
+
+class PasswordHasherBusyError(AuthException):
+    """Raised when too many password hashing jobs are already pending"""
+
+    pass
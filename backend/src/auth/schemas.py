@@ -1,3 +1,5 @@
+import uuid
+
 from sqlmodel import SQLModel
 
 
@@ -8,3 +10,11 @@ class Token(SQLModel):
 
 class TokenPayload(SQLModel):
     sub: str | None = None
+
+
+class Principal(SQLModel):
+    """Authenticated caller, without the user's relationships."""
+
+    id: uuid.UUID
+    is_active: bool
+    is_superuser: bool
@@ -1,63 +1,178 @@
-import smtplib
+import math
+import uuid
+from collections.abc import AsyncGenerator
 from datetime import datetime, timedelta, timezone
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Annotated, Any
 
 import jwt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
-from passlib.context import CryptContext
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.auth.schemas import TokenPayload
+from src.auth.cache import principal_cache
+from src.auth.hashing import get_crypt_context, password_hasher
+from src.auth.schemas import Principal, TokenPayload
 from src.core.config import settings
-from src.core.db import get_db
+from src.core.db import async_engine, engine, get_db, replica_router
+from src.core.email import email_queue
+from src.core.rate_limit import (
+    DatabaseRateLimitBackend,
+    InMemoryRateLimitBackend,
+    RateLimitBackend,
+    TokenBucketLimiter,
+)
 from src.users.models import User
 
 ALGORITHM = "HS256"
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/tokens")
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = get_crypt_context(settings.PASSWORD_HASH_ROUNDS)
 
-SessionDep = Annotated[Session, Depends(get_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
-
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+rate_limit_backend: RateLimitBackend
+if settings.RATE_LIMIT_BACKEND == "database":
+    rate_limit_backend = DatabaseRateLimitBackend(engine)
+else:
+    rate_limit_backend = InMemoryRateLimitBackend(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+login_ip_limiter = TokenBucketLimiter(
+    "login-ip", settings.LOGIN_IP_RATE_LIMIT, rate_limit_backend
+)
+login_account_limiter = TokenBucketLimiter(
+    "login-account", settings.LOGIN_ACCOUNT_RATE_LIMIT, rate_limit_backend
+)
+password_reset_ip_limiter = TokenBucketLimiter(
+    "password-reset-ip", settings.PASSWORD_RESET_IP_RATE_LIMIT, rate_limit_backend
+)
+password_reset_account_limiter = TokenBucketLimiter(
+    "password-reset-account",
+    settings.PASSWORD_RESET_ACCOUNT_RATE_LIMIT,
+    rate_limit_backend,
+)
+
+
+def _enforce_rate_limits(
+    request: Request,
+    account: str,
+    ip_limiter: TokenBucketLimiter,
+    account_limiter: TokenBucketLimiter,
+) -> None:
+    # Behind a proxy listed in FORWARDED_ALLOW_IPS this is the client address
+    # from X-Forwarded-For, see `ProxyHeadersMiddleware` in `src.main`
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = ip_limiter.hit(client_ip) or account_limiter.hit(account.lower())
+    if retry_after:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def limit_login_attempts(
+    request: Request, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
+) -> None:
+    _enforce_rate_limits(
+        request, form_data.username, login_ip_limiter, login_account_limiter
+    )
+
+
+def limit_password_reset_requests(request: Request, email: str) -> None:
+    _enforce_rate_limits(
+        request, email, password_reset_ip_limiter, password_reset_account_limiter
+    )
+
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_current_user(request: Request, token: TokenDep) -> Principal:
+    principal = principal_cache.get(token)
+    if principal is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+            token_data = TokenPayload(**payload)
+            user_id = uuid.UUID(token_data.sub)
+        except (InvalidTokenError, ValidationError, TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        statement = select(User.id, User.is_active, User.is_superuser).where(
+            User.id == user_id
+        )
+        # A short-lived session, so the connection is released before the
+        # endpoint runs instead of being held for the whole request
+        async with AsyncSession(async_engine) as session:
+            row = (await session.exec(statement)).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = Principal(
+            id=row.id, is_active=row.is_active, is_superuser=row.is_superuser
         )
-    user = session.get(User, token_data.sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if not user.is_active:
+        principal_cache.put(token, principal, expires_at=payload.get("exp"))
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return user
+    if request.method not in SAFE_METHODS:
+        # Recorded again once the response is sent, see `record_writes`
+        replica_router.record_write(principal.id)
+        request.state.writer_id = principal.id
+    return principal
 
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+
+
+async def get_read_db(current_user: CurrentUser) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints, on a replica when one is configured."""
+    engine = replica_router.engine_for_read(current_user.id)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+
+async def get_current_active_superuser(current_user: CurrentUser) -> Principal:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=403, detail="The user doesn't have enough privileges"
+        )
+    return current_user
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def authenticate(*, session: Session, email: str, password: str) -> User | None:
+async def authenticate(
+    *, session: AsyncSession, email: str, password: str
+) -> User | None:
+    """The user with this email and password, if any. The password is
+    verified on the hashing pool.
+
+    Hashes made with a different cost factor are replaced on success.
+    """
     from src.users.services import get_user_by_email
 
-    db_user = get_user_by_email(session=session, email=email)
+    db_user = await get_user_by_email(session=session, email=email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = await password_hasher.verify_and_update(
+        password, db_user.hashed_password
+    )
+    if not verified:
         return None
+    if new_hash:
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        await session.commit()
     return db_user
 
 
@@ -74,7 +189,10 @@ def get_password_hash(password: str) -> str:
 
 def send_reset_email(email: str, reset_token: str) -> None:
     """
-    Send a password reset email to the specified email address.
+    Queue a password reset email to the specified email address.
+
+    The message is sent by the background email worker, so this returns
+    without waiting for the mail server.
 
     Args:
         email (str): The recipient's email address.
@@ -105,13 +223,4 @@ def send_reset_email(email: str, reset_token: str) -> None:
     message["Subject"] = subject
     message.attach(MIMEText(body, "plain"))
 
-    # Send the email
-    try:
-        with smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-            server.sendmail(settings.EMAIL_SENDER, email, message.as_string())
-        print(f"Password reset email sent to {email}")
-    except Exception as e:
-        print(f"Failed to send email to {email}: {e}")
-        raise
+    email_queue.enqueue(message)
@@ -30,6 +30,27 @@ class Settings(BaseSettings):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Set either value to 0 to disable the token-to-principal cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+    PASSWORD_HASH_ROUNDS: int = 12
+    # Set to 0 to hash passwords on the thread pool instead of worker processes
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # Attempts per minute; set to 0 to disable a limit
+    LOGIN_IP_RATE_LIMIT: int = 30
+    LOGIN_ACCOUNT_RATE_LIMIT: int = 10
+    PASSWORD_RESET_IP_RATE_LIMIT: int = 10
+    PASSWORD_RESET_ACCOUNT_RATE_LIMIT: int = 3
+    # "memory" keeps the buckets per worker process, bounded by
+    # RATE_LIMIT_MAX_KEYS; "database" shares them between all workers
+    RATE_LIMIT_BACKEND: Literal["memory", "database"] = "memory"
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    # Addresses of the proxies or load balancers in front of the app, comma
+    # separated ("*" trusts any). Requests from them are attributed to the
+    # client in their X-Forwarded-For header, e.g. for rate limits.
+    FORWARDED_ALLOW_IPS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
     DOMAIN: str = "localhost"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
 
@@ -46,6 +67,33 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str = ""
 
+    # Connections the async engine serving requests keeps open per worker
+    # process, and extra ones allowed under load
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # The same for the separate pool of the sync engine, only used by the
+    # database rate limit backend and the startup scripts. A worker opens at
+    # most the sum of both pools' size and overflow to the primary.
+    DB_SYNC_POOL_SIZE: int = 2
+    DB_SYNC_MAX_OVERFLOW: int = 3
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT: float = 30
+    # Seconds after which a connection is replaced; -1 keeps it forever
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Requests holding connections longer than this in total are logged
+    DB_SLOW_HOLD_MS: float = 500
+    # Optional read replicas (postgresql+psycopg://...) for read-only
+    # endpoints, comma separated; reads use the primary when empty
+    DB_REPLICA_URIS: Annotated[
+        list[PostgresDsn] | str, BeforeValidator(parse_cors)
+    ] = []
+    # Seconds a user's reads stay on the primary after a request of theirs
+    # that may write has finished. Tracked per worker process, see
+    # `ReplicaRouter`
+    DB_READ_YOUR_WRITES_SECONDS: float = 5
+    DB_READ_YOUR_WRITES_MAX_USERS: int = 100_000
+
     @computed_field  # type: ignore[misc]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -58,6 +106,18 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    FRONTEND_BASE_URL: str = "http://localhost:5173"
+
+    SMTP_SERVER: str | None = None
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: str | None = None
+    SMTP_PASSWORD: str | None = None
+    SMTP_USE_TLS: bool = True
+    SMTP_IDLE_TIMEOUT_SECONDS: int = 60
+    EMAIL_SENDER: str = "noreply@example.com"
+    EMAIL_QUEUE_BATCH_SIZE: int = 50
+    EMAIL_QUEUE_MAX_SIZE: int = 1000
+
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_PASSWORD: str
     USERS_OPEN_REGISTRATION: bool = False
@@ -67,6 +127,28 @@ class Settings(BaseSettings):
     AI_MAX_USAGE_QUOTA: int = 30
     AI_QUOTA_TIME_RANGE_DAYS: int = 1
 
+    # Rows sent to the database per COPY during a bulk card import, and the
+    # number of invalid rows reported individually before only counting them
+    CARD_IMPORT_CHUNK_SIZE: int = 1000
+    CARD_IMPORT_MAX_REPORTED_ERRORS: int = 100
+    # Bytes of an import's valid rows kept in memory while the upload is
+    # read; larger imports spill to a temporary file
+    CARD_IMPORT_SPOOL_MAX_MEMORY: int = 8 * 1024 * 1024
+    # Rows fetched per round trip from the server-side cursor of an export
+    CARD_EXPORT_CHUNK_SIZE: int = 1000
+    # Largest .apkg upload and largest collection database inside it
+    ANKI_IMPORT_MAX_BYTES: int = 200 * 1024 * 1024
+    ANKI_IMPORT_MAX_COLLECTION_BYTES: int = 1024 * 1024 * 1024
+    # Decks waiting for the import worker of each process, and imports
+    # whose status is kept for polling, across all processes
+    ANKI_IMPORT_MAX_PENDING: int = 10
+    ANKI_IMPORT_MAX_JOBS: int = 1000
+    # Set either value to 0 to disable the collection name typeahead cache,
+    # which holds up to MAX_SIZE names. Other worker processes only see
+    # changes to a user's collections once their entries expire.
+    TYPEAHEAD_CACHE_TTL_SECONDS: int = 60
+    TYPEAHEAD_CACHE_MAX_SIZE: int = 100_000
+
     COLLECTION_GENERATION_PROMPT: str | None = None
     CARD_GENERATION_PROMPT: str | None = None
 
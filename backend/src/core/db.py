@@ -1,6 +1,23 @@
-from collections.abc import Generator
+import itertools
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-from sqlmodel import Session, create_engine, select
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+    QueuePool,
+)
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.core.config import settings
 from src.users.models import User
@@ -8,11 +25,221 @@ from src.users.schemas import (
     UserCreate,
 )
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+class PoolStats(SQLModel):
+    engine: str
+    pid: int
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float | None
+    max_wait_ms: float | None
+    avg_hold_ms: float | None
+    max_hold_ms: float | None
+
+
+# Seconds each connection was held during the current request, see
+# `track_connection_hold`
+_connection_holds: ContextVar[list[float] | None] = ContextVar(
+    "connection_holds", default=None
+)
+
+
+@contextmanager
+def track_connection_hold() -> Generator[list[float], None, None]:
+    """Collect how long each connection checked out inside the block was held.
+
+    SQLAlchemy runs the async driver in greenlets that share the caller's
+    context, and context is copied into threadpool workers, so connections
+    used by async endpoints and by sync dependencies are both included.
+    """
+    holds: list[float] = []
+    token = _connection_holds.set(holds)
+    try:
+        yield holds
+    finally:
+        _connection_holds.reset(token)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait times, timeouts and how long
+    connections are held before being returned.
+
+    Counters are per process, so each worker reports its own pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._checkins = 0
+        self._total_hold = 0.0
+        self._max_hold = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        checked_out_at = time.perf_counter()
+        connection.info["checked_out_at"] = checked_out_at
+        wait = checked_out_at - start
+        with self._stats_lock:
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        checked_out_at = record.info.pop("checked_out_at", None)
+        super()._do_return_conn(record)
+        if checked_out_at is None:
+            return
+        hold = time.perf_counter() - checked_out_at
+        with self._stats_lock:
+            self._checkins += 1
+            self._total_hold += hold
+            self._max_hold = max(self._max_hold, hold)
+        holds = _connection_holds.get()
+        if holds is not None:
+            holds.append(hold)
+
+    def stats(self, engine: str = "default") -> PoolStats:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            checkins = self._checkins
+            avg_wait = self._total_wait / checkouts if checkouts else None
+            avg_hold = self._total_hold / checkins if checkins else None
+            return PoolStats(
+                engine=engine,
+                pid=os.getpid(),
+                size=self.size(),
+                max_overflow=self._max_overflow,
+                checked_out=self.checkedout(),
+                checked_in=self.checkedin(),
+                overflow=max(self.overflow(), 0),
+                checkouts=checkouts,
+                timeouts=self._timeouts,
+                avg_wait_ms=avg_wait * 1000 if avg_wait is not None else None,
+                max_wait_ms=self._max_wait * 1000 if checkouts else None,
+                avg_hold_ms=avg_hold * 1000 if avg_hold is not None else None,
+                max_hold_ms=self._max_hold * 1000 if checkins else None,
+            )
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+pool_options = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+# The sync engine only serves the rate limit backend and the startup scripts,
+# so it has its own, smaller budget rather than a second copy of the async one
+sync_pool_options = {
+    **pool_options,
+    "pool_size": settings.DB_SYNC_POOL_SIZE,
+    "max_overflow": settings.DB_SYNC_MAX_OVERFLOW,
+}
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **sync_pool_options,
+)
+# Requests run on the event loop with this engine
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncQueuePool,
+    **pool_options,
+)
+replica_engines = [
+    create_async_engine(str(uri), poolclass=InstrumentedAsyncQueuePool, **pool_options)
+    for uri in settings.DB_REPLICA_URIS
+]
+
+
+class ReplicaRouter:
+    """Chooses the engine for read-only sessions.
+
+    Reads are spread round-robin over the replicas, except for users who
+    wrote within the last `read_your_writes_window` seconds: they read from
+    the primary so replication lag never hides their own changes. A write
+    is recorded when a request that may write starts and again when its
+    response has been sent, so the window covers slow writes too.
+
+    Recent writers are tracked in a bounded LRU map in process memory, so
+    each worker only knows of the writes it served. With several workers,
+    a read landing on another worker than the write may be sent to a
+    replica; deployments that need read-your-writes across workers should
+    route each user to one worker.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        read_your_writes_window: float,
+        max_users: int = 100_000,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.read_your_writes_window = read_your_writes_window
+        self.max_users = max_users
+        self._next_replica = itertools.cycle(range(len(replicas)))
+        self._last_writes: OrderedDict[uuid.UUID, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record_write(self, user_id: uuid.UUID) -> None:
+        if not self.replicas:
+            return
+        with self._lock:
+            self._last_writes.pop(user_id, None)
+            self._last_writes[user_id] = time.monotonic()
+            while len(self._last_writes) > self.max_users:
+                self._last_writes.popitem(last=False)
+
+    def engine_for_read(self, user_id: uuid.UUID | None = None) -> AsyncEngine:
+        if not self.replicas:
+            return self.primary
+        with self._lock:
+            if user_id is not None:
+                last_write = self._last_writes.get(user_id)
+                if last_write is not None:
+                    if time.monotonic() - last_write < self.read_your_writes_window:
+                        return self.primary
+                    del self._last_writes[user_id]
+            return self.replicas[next(self._next_replica)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._last_writes.clear()
+
+
+replica_router = ReplicaRouter(
+    primary=async_engine,
+    replicas=replica_engines,
+    read_your_writes_window=settings.DB_READ_YOUR_WRITES_SECONDS,
+    max_users=settings.DB_READ_YOUR_WRITES_MAX_USERS,
+)
 
 
 def init_db(session: Session) -> None:
-    from src.users.services import create_user
+    from src.auth.services import get_password_hash
 
     user = session.exec(
         select(User).where(User.email == settings.FIRST_SUPERUSER)
@@ -23,10 +250,18 @@ def init_db(session: Session) -> None:
             password=settings.FIRST_SUPERUSER_PASSWORD,
             is_superuser=True,
         )
-
-        user = create_user(session=session, user_create=user_in)
+        user = User.model_validate(
+            user_in,
+            update={"hashed_password": get_password_hash(user_in.password)},
+        )
+        session.add(user)
+        session.commit()
 
 
-def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    # A connection is only checked out when the first statement runs and goes
+    # back to the pool on commit. Objects are not expired on commit, so
+    # serializing the response does not load them again, which an async
+    # session could not do outside of an await.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
@@ -0,0 +1,184 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from email.message import Message
+
+from sqlmodel import SQLModel
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmailQueueStats(SQLModel):
+    queue_depth: int
+    sent: int
+    failed: int
+    dropped: int
+    last_send_latency_ms: float | None
+    avg_send_latency_ms: float | None
+
+
+class EmailQueue:
+    """Outbound mail queue drained by a single background thread.
+
+    The worker keeps one authenticated SMTP connection open while there is
+    mail to send, sends queued messages in batches and closes the
+    connection after `idle_timeout` seconds without work.
+    """
+
+    def __init__(
+        self,
+        host: str | None,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        use_tls: bool = True,
+        batch_size: int = 50,
+        max_size: int = 1000,
+        idle_timeout: float = 60,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.last_send_latency: float | None = None
+        self._total_send_latency = 0.0
+        self._queue: queue.Queue[Message | None] = queue.Queue(maxsize=max_size)
+        self._smtp: smtplib.SMTP | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.host)
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="email-queue", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 10) -> None:
+        """Send whatever is queued, then stop the worker."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def enqueue(self, message: Message) -> None:
+        if self._thread is None:
+            logger.warning("Email queue is not running, dropping %s", message["To"])
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            logger.error("Email queue is full, dropping %s", message["To"])
+            self.dropped += 1
+
+    def join(self) -> None:
+        """Block until every queued message has been handled."""
+        self._queue.join()
+
+    def stats(self) -> EmailQueueStats:
+        avg = self._total_send_latency / self.sent if self.sent else None
+        return EmailQueueStats(
+            queue_depth=self._queue.qsize(),
+            sent=self.sent,
+            failed=self.failed,
+            dropped=self.dropped,
+            last_send_latency_ms=(
+                self.last_send_latency * 1000
+                if self.last_send_latency is not None
+                else None
+            ),
+            avg_send_latency_ms=avg * 1000 if avg is not None else None,
+        )
+
+    def _run(self) -> None:
+        while True:
+            try:
+                message = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                self._disconnect()
+                continue
+
+            batch = [message]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = None in batch
+            self._send_batch([m for m in batch if m is not None])
+            for _ in batch:
+                self._queue.task_done()
+            if stopping:
+                self._disconnect()
+                return
+
+    def _send_batch(self, batch: list[Message]) -> None:
+        for message in batch:
+            start = time.perf_counter()
+            try:
+                self._send(message)
+            except Exception as e:
+                logger.error("Failed to send email to %s: %s", message["To"], e)
+                self.failed += 1
+                self._disconnect()
+                continue
+            self.last_send_latency = time.perf_counter() - start
+            self._total_send_latency += self.last_send_latency
+            self.sent += 1
+
+    def _send(self, message: Message) -> None:
+        try:
+            self._connection().send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped the idle connection, retry once on a new one
+            self._disconnect()
+            self._connection().send_message(message)
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port)
+            if self.use_tls:
+                smtp.starttls()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+            self._smtp = smtp
+        return self._smtp
+
+    def _disconnect(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        finally:
+            self._smtp = None
+
+
+email_queue = EmailQueue(
+    host=settings.SMTP_SERVER,
+    port=settings.SMTP_PORT,
+    username=settings.SMTP_USERNAME,
+    password=settings.SMTP_PASSWORD,
+    use_tls=settings.SMTP_USE_TLS,
+    batch_size=settings.EMAIL_QUEUE_BATCH_SIZE,
+    max_size=settings.EMAIL_QUEUE_MAX_SIZE,
+    idle_timeout=settings.SMTP_IDLE_TIMEOUT_SECONDS,
+)
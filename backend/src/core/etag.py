@@ -0,0 +1,40 @@
+import hashlib
+
+from fastapi import Request, Response
+
+# Responses are per user and must be revalidated before every reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(request: Request, version: object) -> str:
+    """Strong ETag for a GET of `request` while its data is at `version`.
+
+    The path and query string are part of the tag, since they select which
+    page or projection of the data is returned.
+    """
+    key = f"{request.url.path}?{request.url.query}#{version}"
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix is ignored
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in tags
+
+
+def conditional_response(
+    request: Request, response: Response, version: object
+) -> Response | None:
+    """Tag `response` for `version` and return a 304 response if the client
+    already holds that version, otherwise None."""
+    etag = make_etag(request, version)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
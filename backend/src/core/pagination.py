@@ -0,0 +1,154 @@
+import base64
+import json
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from typing import Annotated, Any, Literal, NamedTuple
+
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import ColumnElement, Row, Select, UnaryExpression, func, tuple_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# How list endpoints compute their total: `exact` counts every matching
+# row, `estimate` reads counters or planner statistics, `none` skips it.
+CountMode = Literal["exact", "estimate", "none"]
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class Cursor(NamedTuple):
+    """Position of the last item of a page in a list ordered by (sort key, id).
+
+    Clients get it as an opaque string and pass it back to fetch the next
+    page, which then starts with an index seek instead of an OFFSET scan.
+    """
+
+    # A timestamp, or a number such as a search rank
+    sort_value: datetime | float
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        sort_value = self.sort_value
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        raw = json.dumps([sort_value, str(self.id)])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "Cursor":
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            sort_value, id = json.loads(base64.urlsafe_b64decode(padded))
+            if isinstance(sort_value, str):
+                sort_value = datetime.fromisoformat(sort_value)
+            elif isinstance(sort_value, int | float):
+                sort_value = float(sort_value)
+            else:
+                raise TypeError(sort_value)
+            return cls(sort_value, uuid.UUID(id))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError(cursor) from e
+
+
+def keyset_order(
+    sort_column: Any, id_column: Any, descending: bool = True
+) -> tuple[UnaryExpression, UnaryExpression]:
+    if descending:
+        return sort_column.desc(), id_column.desc()
+    return sort_column.asc(), id_column.asc()
+
+
+def after_cursor(
+    sort_column: Any, id_column: Any, cursor: Cursor, descending: bool = True
+) -> ColumnElement[bool]:
+    """Filter for the rows that come after `cursor` in `keyset_order`."""
+    position = tuple_(sort_column, id_column)
+    last = tuple_(cursor.sort_value, cursor.id)
+    return position < last if descending else position > last
+
+
+def next_cursor(items: Sequence[Any], limit: int, sort_attr: str) -> str | None:
+    """Cursor for the page after `items`, or None if this was the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return Cursor(getattr(last, sort_attr), last.id).encode()
+
+
+def _cursor_dependency(sort_type: type) -> Callable[..., Cursor | None]:
+    """Dependency reading the `cursor` query parameter of a list sorted by
+    values of `sort_type`, so a cursor of another list is rejected."""
+
+    def get_cursor(
+        cursor: Annotated[
+            str | None, Query(description="`next_cursor` of the previous page")
+        ] = None,
+    ) -> Cursor | None:
+        if cursor is None:
+            return None
+        try:
+            decoded = Cursor.decode(cursor)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if not isinstance(decoded.sort_value, sort_type):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return decoded
+
+    return get_cursor
+
+
+get_cursor = _cursor_dependency(datetime)
+get_rank_cursor = _cursor_dependency(float)
+
+CursorDep = Annotated[Cursor | None, Depends(get_cursor)]
+RankCursorDep = Annotated[Cursor | None, Depends(get_rank_cursor)]
+
+
+async def estimate_count(session: AsyncSession, statement: Select) -> int:
+    """Number of rows the planner expects `statement` to return."""
+    connection = await session.connection()
+    compiled = statement.compile(dialect=connection.dialect)
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def fetch_page(
+    session: AsyncSession,
+    statement: Select,
+    filtered: Select,
+    count: CountMode = "exact",
+    estimate: Callable[[], Awaitable[int]] | None = None,
+) -> tuple[list[Row], int | None]:
+    """Run the page `statement` and count the rows of `filtered`, the same
+    query without ordering, cursor or paging.
+
+    An exact count comes back with the page as an uncorrelated subquery
+    column, which Postgres evaluates once, so it needs no second round trip
+    unless the page is empty. `estimate` overrides the planner estimate
+    with a cheaper source, such as a denormalized counter.
+
+    Rows are returned as `Row` objects whatever the shape of `statement`.
+    """
+    count_statement = select(func.count()).select_from(filtered.subquery())
+    if count == "exact":
+        total_count = count_statement.scalar_subquery().label("total_count")
+        result = await session.execute(statement.add_columns(total_count))
+        rows = result.all()
+        if rows:
+            return rows, rows[0].total_count
+        return rows, (await session.exec(count_statement)).one()
+
+    rows = (await session.execute(statement)).all()
+    if count == "estimate":
+        if estimate:
+            return rows, await estimate()
+        return rows, await estimate_count(session, filtered)
+    return rows, None
@@ -0,0 +1,150 @@
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import Engine, text
+from sqlmodel import Field, SQLModel
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets.
+
+    The in-memory backend only limits within one worker process; a backend
+    on shared storage lets several workers enforce a common limit.
+    """
+
+    @abstractmethod
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        """Take one token from the bucket for `key`.
+
+        Returns 0 if a token was available, otherwise the number of seconds
+        until the next token is added.
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Token buckets in a bounded LRU map.
+
+    Each call is O(1). When more than `max_keys` buckets exist, the least
+    recently used one is dropped, which resets that key to a full bucket.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated_at) * refill_rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / refill_rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimitBucket(SQLModel, table=True):
+    """A token bucket of `DatabaseRateLimitBackend`."""
+
+    key: str = Field(primary_key=True)
+    tokens: float
+    # Seconds the last hit had to wait for a token, 0 if it got one
+    retry_after: float
+    updated_at: datetime
+    # When the bucket is full again and the row can be dropped
+    expires_at: datetime = Field(index=True)
+
+
+# A hit refills the bucket for the time since the last one, which also locks
+# its row until the transaction ends, then takes a token if there is one
+_REFILL = text(
+    """
+    INSERT INTO ratelimitbucket AS bucket
+        (key, tokens, retry_after, updated_at, expires_at)
+    VALUES (:key, :capacity, 0, now(), now())
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = least(
+            :capacity,
+            bucket.tokens + :refill_rate
+            * CAST(extract(epoch FROM now() - bucket.updated_at) AS float)
+        ),
+        updated_at = now()
+    """
+)
+_TAKE = text(
+    """
+    UPDATE ratelimitbucket SET
+        tokens = tokens - least(1, floor(tokens)),
+        retry_after = greatest(0, 1 - tokens) / :refill_rate,
+        expires_at = now() + make_interval(
+            secs => (:capacity - tokens + least(1, floor(tokens))) / :refill_rate
+        )
+    WHERE key = :key
+    RETURNING retry_after
+    """
+)
+_PRUNE = text("DELETE FROM ratelimitbucket WHERE expires_at < now()")
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """Token buckets in the `ratelimitbucket` table, shared by all workers.
+
+    Each hit is one short transaction. Every `prune_every` hits, the buckets that have
+    filled up again are deleted, as they would be recreated full.
+    """
+
+    def __init__(self, engine: Engine, prune_every: int = 1000):
+        self.engine = engine
+        self._hits = itertools.count(1)
+        self.prune_every = prune_every
+
+    def consume(self, key: str, capacity: int, refill_rate: float) -> float:
+        params = {"key": key, "capacity": capacity, "refill_rate": refill_rate}
+        with self.engine.begin() as connection:
+            connection.execute(_REFILL, params)
+            retry_after = connection.execute(_TAKE, params).scalar_one()
+            if next(self._hits) % self.prune_every == 0:
+                connection.execute(_PRUNE)
+        return retry_after
+
+    def clear(self) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(text("DELETE FROM ratelimitbucket"))
+
+
+class TokenBucketLimiter:
+    """Allows `per_minute` hits per key, with bursts up to the same amount.
+
+    A `per_minute` of 0 disables the limiter.
+    """
+
+    def __init__(self, name: str, per_minute: int, backend: RateLimitBackend):
+        self.name = name
+        self.per_minute = per_minute
+        self.backend = backend
+
+    def hit(self, key: str) -> float:
+        if self.per_minute <= 0:
+            return 0.0
+        return self.backend.consume(
+            f"{self.name}:{key}",
+            capacity=self.per_minute,
+            refill_rate=self.per_minute / 60,
+        )
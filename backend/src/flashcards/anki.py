@@ -0,0 +1,341 @@
+import asyncio
+import html
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import uuid
+import zipfile
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import suppress
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import ValidationError
+from sqlmodel import col, delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.core.db import async_engine
+
+from .cache import typeahead_cache
+from .exceptions import AnkiDeckError, AnkiDeckTooLargeError
+from .imports import ParsedRow, import_cards, validation_error_detail
+from .models import AnkiDeckImport, Collection
+from .schemas import AnkiImport, CardBase, CardImportRowError, CardImportSummary
+from .services import create_collection
+
+logger = logging.getLogger(__name__)
+
+# Packages from Anki 2.1.50+ may only hold a zstd compressed database in
+# the current schema, with a placeholder in the legacy slots
+LEGACY_COLLECTIONS = ("collection.anki21", "collection.anki2")
+CURRENT_COLLECTION = "collection.anki21b"
+
+FIELD_SEPARATOR = "\x1f"
+
+_CLOZE = re.compile(r"\{\{c\d+::(.*?)(?:::(.*?))?\}\}", re.DOTALL)
+_LINE_BREAK = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]*>")
+_SOUND = re.compile(r"\[sound:[^\]]*\]")
+
+# Notes that have at least one card, in creation order. `id` is the rowid,
+# so SQLite walks the table in order without sorting it.
+NOTES_QUERY = "SELECT flds FROM notes WHERE id IN (SELECT nid FROM cards) ORDER BY id"
+
+
+def field_text(field: str) -> str:
+    """Plain text of an Anki field, which holds HTML and media references."""
+    text = _LINE_BREAK.sub("\n", field)
+    text = _SOUND.sub("", _TAG.sub("", text))
+    return html.unescape(text).strip()
+
+
+def note_card(fields: list[str]) -> CardBase | str:
+    """Map the fields of a note to a card.
+
+    Cloze notes ask for the text with its deletions hidden and answer with
+    them revealed, followed by the extra field. Other notes use their first
+    two fields.
+    """
+    texts = [field_text(field) for field in fields]
+    if _CLOZE.search(texts[0]):
+        front = _CLOZE.sub(lambda m: f"[{m.group(2) or '...'}]", texts[0])
+        back = "\n\n".join(
+            text for text in (_CLOZE.sub(r"\1", texts[0]), *texts[1:2]) if text
+        )
+    elif len(texts) < 2:
+        return "Note has a single field"
+    else:
+        front, back = texts[0], texts[1]
+    if not front:
+        return "Note has an empty front"
+    try:
+        return CardBase(front=front, back=back)
+    except ValidationError as e:
+        return validation_error_detail(e)
+
+
+def collection_member(package: zipfile.ZipFile) -> zipfile.ZipInfo:
+    names = set(package.namelist())
+    if CURRENT_COLLECTION in names:
+        raise AnkiDeckError(
+            "Deck uses the latest Anki package format, export it with "
+            "'Support older Anki versions' enabled"
+        )
+    for name in LEGACY_COLLECTIONS:
+        if name in names:
+            return package.getinfo(name)
+    raise AnkiDeckError("File is not an Anki deck")
+
+
+def check_package(path: str) -> None:
+    """Reject files that are not Anki packages before queueing them."""
+    try:
+        with zipfile.ZipFile(path) as package:
+            info = collection_member(package)
+    except zipfile.BadZipFile:
+        raise AnkiDeckError("File is not an Anki deck")
+    if info.file_size > settings.ANKI_IMPORT_MAX_COLLECTION_BYTES:
+        raise AnkiDeckTooLargeError("Deck is too large")
+
+
+async def save_upload(chunks: AsyncIterable[bytes]) -> str:
+    """Write an upload to a temporary file as it arrives and return its path."""
+    size = 0
+    with tempfile.NamedTemporaryFile(suffix=".apkg", delete=False) as upload:
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > settings.ANKI_IMPORT_MAX_BYTES:
+                    raise AnkiDeckTooLargeError("Deck is too large")
+                upload.write(chunk)
+        except BaseException:
+            os.unlink(upload.name)
+            raise
+    return upload.name
+
+
+class AnkiDeck:
+    """Notes of an Anki collection database, read in chunks."""
+
+    def __init__(self, path: Path):
+        self._connection = sqlite3.connect(
+            f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False
+        )
+        try:
+            self.name = self._deck_name()
+        except sqlite3.DatabaseError:
+            self.close()
+            raise AnkiDeckError("Deck database is unreadable")
+
+    @classmethod
+    def extract(cls, package_path: str, directory: str) -> "AnkiDeck":
+        """Extract the collection database of a package into `directory`."""
+        target = Path(directory) / "collection.db"
+        try:
+            with zipfile.ZipFile(package_path) as package:
+                info = collection_member(package)
+                with package.open(info) as source, target.open("wb") as out:
+                    shutil.copyfileobj(source, out)
+        except zipfile.BadZipFile:
+            raise AnkiDeckError("File is not an Anki deck")
+        return cls(target)
+
+    def _deck_name(self) -> str:
+        # Named after the deck most of the package's cards are in, without
+        # its parent decks
+        row = self._connection.execute(
+            "SELECT did FROM cards GROUP BY did ORDER BY count(*) DESC LIMIT 1"
+        ).fetchone()
+        (decks,) = self._connection.execute("SELECT decks FROM col").fetchone()
+        name = json.loads(decks).get(str(row[0]), {}).get("name") if row else None
+        return name.split("::")[-1] if name else "Anki deck"
+
+    async def rows(self, chunk_size: int) -> AsyncIterator[ParsedRow]:
+        """Yield each note's position in the deck and its card, reading and
+        converting `chunk_size` notes at a time off the event loop."""
+        cursor = self._connection.execute(NOTES_QUERY)
+        position = 0
+
+        def read_chunk() -> list[CardBase | str]:
+            return [
+                note_card(flds.split(FIELD_SEPARATOR))
+                for (flds,) in cursor.fetchmany(chunk_size)
+            ]
+
+        while chunk := await asyncio.to_thread(read_chunk):
+            for row in chunk:
+                position += 1
+                yield position, row
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class AnkiImportJob(AnkiImport):
+    user_id: uuid.UUID
+    path: str
+    name: str | None = None
+
+
+async def save_job(job: AnkiImportJob) -> None:
+    """Write the status of `job` to its row, for polls served by any worker."""
+    values = job.model_dump(include=set(AnkiImport.model_fields) - {"id"})
+    statement = (
+        update(AnkiDeckImport)
+        .where(col(AnkiDeckImport.id) == job.id)
+        .values(**values, updated_at=datetime.now(timezone.utc))
+    )
+    async with AsyncSession(async_engine) as session:
+        await session.exec(statement)
+        await session.commit()
+
+
+async def get_anki_import(
+    session: AsyncSession, import_id: uuid.UUID, user_id: uuid.UUID
+) -> AnkiDeckImport | None:
+    statement = select(AnkiDeckImport).where(
+        AnkiDeckImport.id == import_id, AnkiDeckImport.user_id == user_id
+    )
+    return (await session.exec(statement)).first()
+
+
+async def import_anki_deck(job: AnkiImportJob) -> None:
+    """Import the deck of `job` into a new collection, recording progress on
+    the job after each chunk. The collection is removed again if the import
+    fails."""
+    job.status = "running"
+    await save_job(job)
+    with tempfile.TemporaryDirectory() as directory:
+        deck = await asyncio.to_thread(AnkiDeck.extract, job.path, directory)
+        try:
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                collection = await create_collection(
+                    session, job.user_id, job.name or deck.name
+                )
+                job.collection_id = collection.id
+                try:
+                    rows = deck.rows(settings.CARD_IMPORT_CHUNK_SIZE)
+                    async for event in import_cards(session, collection.id, rows):
+                        if isinstance(event, CardImportRowError):
+                            job.errors.append(event)
+                            continue
+                        if isinstance(event, CardImportSummary):
+                            job.imported = event.imported
+                        job.failed = event.failed
+                        await save_job(job)
+                except BaseException:
+                    job.collection_id = None
+                    await session.rollback()
+                    await session.exec(
+                        delete(Collection).where(Collection.id == collection.id)
+                    )
+                    await session.commit()
+                    typeahead_cache.invalidate_user(job.user_id)
+                    raise
+        finally:
+            deck.close()
+    job.status = "done"
+    await save_job(job)
+
+
+class AnkiImportQueue:
+    """Imports uploaded Anki decks one at a time on a background task, so
+    large decks neither hold a request open nor compete with each other.
+
+    The queue and the uploaded decks belong to this process, which runs the
+    imports it accepted. Their status is kept in the `AnkiDeckImport` table,
+    so it can be polled through any worker, and the status of the last
+    `max_jobs` imports is kept. At most `max_pending` decks wait for the
+    worker. Decks still queued, or being imported, when the queue is stopped
+    are reported as cancelled; if the process dies instead, their imports
+    stay `pending` or `running`.
+    """
+
+    def __init__(self, max_pending: int, max_jobs: int):
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self._queue: asyncio.Queue[AnkiImportJob] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._current: AnkiImportJob | None = None
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run(), name="anki-import")
+
+    async def stop(self) -> None:
+        if self._task is None or self._queue is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        cancelled = [self._current] if self._current else []
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            os.unlink(job.path)
+            cancelled.append(job)
+        for job in cancelled:
+            job.status, job.detail = "failed", "Import was cancelled"
+            await self._save(job)
+
+    async def enqueue(self, job: AnkiImportJob) -> bool:
+        """Record and queue `job`, or return False if the worker is not
+        keeping up."""
+        if self._queue is None or self._queue.full():
+            return False
+        kept = (
+            select(AnkiDeckImport.id)
+            .order_by(col(AnkiDeckImport.created_at).desc())
+            .limit(self.max_jobs)
+        )
+        async with AsyncSession(async_engine) as session:
+            session.add(AnkiDeckImport(id=job.id, user_id=job.user_id))
+            await session.flush()
+            await session.exec(
+                delete(AnkiDeckImport).where(col(AnkiDeckImport.id).not_in(kept))
+            )
+            await session.commit()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            job.status, job.detail = "failed", "Too many imports in progress"
+            await save_job(job)
+            return False
+        return True
+
+    async def _save(self, job: AnkiImportJob) -> None:
+        try:
+            await save_job(job)
+        except Exception:
+            logger.exception("Could not record the status of Anki import %s", job.id)
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = self._current = await self._queue.get()
+            try:
+                await import_anki_deck(job)
+            except AnkiDeckError as e:
+                job.status, job.detail = "failed", str(e)
+            except Exception:
+                logger.exception("Anki import %s failed", job.id)
+                job.status, job.detail = "failed", "Import failed"
+            finally:
+                os.unlink(job.path)
+                self._queue.task_done()
+            self._current = None
+            if job.status == "failed":
+                await self._save(job)
+
+
+anki_import_queue = AnkiImportQueue(
+    max_pending=settings.ANKI_IMPORT_MAX_PENDING,
+    max_jobs=settings.ANKI_IMPORT_MAX_JOBS,
+)
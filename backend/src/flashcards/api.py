@@ -1,24 +1,51 @@
-import asyncio
+import os
 import uuid
+from collections.abc import AsyncIterator
 from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.types import Receive, Scope, Send
 
 from src.ai_models.gemini import GeminiProviderDep
 from src.ai_models.gemini.exceptions import AIGenerationError
-from src.auth.services import CurrentUser, SessionDep
-from src.users.services import check_and_increment_ai_usage_quota
-
-from . import services
-from .exceptions import EmptyCollectionError
+from src.auth.services import CurrentUser, ReadSessionDep, SessionDep
+from src.core.db import async_engine
+from src.core.etag import conditional_response
+from src.core.pagination import CountMode, CursorDep, RankCursorDep, next_cursor
+from src.users.services import check_and_increment_ai_usage_quota, get_user_by_email
+
+from . import anki, dedup, exports, imports, models, services
+from .exceptions import (
+    AnkiDeckError,
+    AnkiDeckTooLargeError,
+    CollectionNotFoundError,
+    DuplicateCardError,
+    EmptyCollectionError,
+)
 from .schemas import (
+    AnkiImport,
     Card,
+    CardBulkMove,
+    CardBulkOperation,
+    CardBulkResponse,
+    CardBulkResult,
+    CardBulkUpdate,
     CardCreate,
+    CardDuplicateList,
+    CardField,
     CardList,
+    CardSearchList,
     CardUpdate,
     Collection,
+    CollectionClone,
     CollectionCreate,
     CollectionList,
+    CollectionNameList,
+    CollectionShareCreate,
+    CollectionSummary,
     CollectionUpdate,
     PracticeCardListResponse,
     PracticeCardResponse,
@@ -26,19 +53,39 @@ from .schemas import (
     PracticeSession,
     PracticeSessionCreate,
     PracticeSessionList,
+    SharedCollectionList,
 )
 
 router = APIRouter()
 
 
 @router.get("/collections/", response_model=CollectionList)
-def read_collections(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_collections(
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    count: CountMode = "exact",
 ) -> Any:
-    collections, count = services.get_collections(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+    version = await services.get_collections_version(session, current_user.id)
+    if not_modified := conditional_response(request, response, version):
+        return not_modified
+    collections, total = await services.get_collections(
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        after=cursor,
+        count=count,
+    )
+    return CollectionList(
+        data=collections,
+        count=total,
+        next_cursor=next_cursor(collections, limit, "updated_at"),
     )
-    return CollectionList(data=collections, count=count)
 
 
 @router.post("/collections/", response_model=Collection)
@@ -47,15 +94,17 @@ async def create_collection(
     current_user: CurrentUser,
     collection_in: CollectionCreate,
     provider: GeminiProviderDep,
+    skip_duplicates: bool = False,
 ) -> Any:
+    """Create a collection, with cards generated from `prompt` when given.
+    With `skip_duplicates`, generated cards that are near-duplicates of
+    earlier ones are left out."""
     name = collection_in.name
     cards = None
 
     if collection_in.prompt:
         try:
-            if not await asyncio.to_thread(
-                lambda: check_and_increment_ai_usage_quota(session, current_user)
-            ):
+            if not await check_and_increment_ai_usage_quota(session, current_user):
                 raise HTTPException(
                     status_code=429, detail="Quota for AI usage is reached."
                 )
@@ -71,69 +120,364 @@ async def create_collection(
         except AIGenerationError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
-    return await asyncio.to_thread(
-        lambda: services.create_collection(
-            session=session, user_id=current_user.id, name=name, cards=cards
+    return await services.create_collection(
+        session=session,
+        user_id=current_user.id,
+        name=name,
+        cards=cards,
+        skip_duplicates=skip_duplicates,
+    )
+
+
+@router.post(
+    "/collections/anki-imports",
+    response_model=AnkiImport,
+    status_code=202,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"}
+                }
+            },
+        }
+    },
+)
+async def import_anki_deck(
+    request: Request, current_user: CurrentUser, name: str | None = None
+) -> Any:
+    """Queue an Anki .apkg deck from the raw request body for import into a
+    new collection, named after the deck unless `name` is given.
+
+    Poll the returned import for its progress.
+    """
+    try:
+        path = await anki.save_upload(request.stream())
+    except AnkiDeckTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    try:
+        anki.check_package(path)
+    except AnkiDeckError as e:
+        os.unlink(path)
+        status_code = 413 if isinstance(e, AnkiDeckTooLargeError) else 400
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+    job = anki.AnkiImportJob(
+        id=uuid.uuid4(), user_id=current_user.id, path=path, name=name
+    )
+    if not await anki.anki_import_queue.enqueue(job):
+        os.unlink(path)
+        raise HTTPException(
+            status_code=503, detail="Too many imports in progress, try again later"
         )
+    return job
+
+
+@router.get("/collections/anki-imports/{import_id}", response_model=AnkiImport)
+async def read_anki_import(
+    session: SessionDep, current_user: CurrentUser, import_id: uuid.UUID
+) -> Any:
+    job = await anki.get_anki_import(session, import_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
+
+
+@router.get("/collections/typeahead", response_model=CollectionNameList)
+async def typeahead_collections(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=services.TYPEAHEAD_MAX_RESULTS),
+) -> Any:
+    """Names of the user's collections containing `q`, those starting with
+    it first, for completing a name as it is typed."""
+    names = await services.match_collection_names(
+        session=session, user_id=current_user.id, term=q, limit=limit
     )
+    return CollectionNameList(data=names)
 
 
 @router.get("/collections/{collection_id}", response_model=Collection)
-def read_collection(
-    session: SessionDep, current_user: CurrentUser, collection_id: uuid.UUID
+async def read_collection(
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    collection_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
 ) -> Any:
-    collection = services.get_collection(
+    """Get a collection with one page of its cards."""
+    collection = await services.get_collection(
         session=session, id=collection_id, user_id=current_user.id
     )
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
-    return collection
+    if not_modified := conditional_response(request, response, collection.version):
+        return not_modified
+    return await services.load_collection_cards(
+        session, collection, skip=skip, limit=limit
+    )
 
 
 @router.put("/collections/{collection_id}", response_model=Collection)
-def update_collection(
+async def update_collection(
     session: SessionDep,
     current_user: CurrentUser,
     collection_id: uuid.UUID,
     collection_in: CollectionUpdate,
 ) -> Any:
-    collection = services.get_collection(
+    """Rename a collection. It is returned with the first page of its cards,
+    like `read_collection` does."""
+    collection = await services.get_collection(
         session=session, id=collection_id, user_id=current_user.id
     )
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
-    return services.update_collection(
+    collection = await services.update_collection(
         session=session, collection=collection, collection_in=collection_in
     )
+    return await services.load_collection_cards(session, collection)
 
 
 @router.delete("/collections/{collection_id}", status_code=204)
-def delete_collection(
+async def delete_collection(
     session: SessionDep, current_user: CurrentUser, collection_id: uuid.UUID
 ) -> None:
-    collection = services.get_collection(
+    collection = await services.get_collection(
         session=session, id=collection_id, user_id=current_user.id
     )
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
-    services.delete_collection(session=session, collection=collection)
+    await services.delete_collection(session=session, collection=collection)
     return
 
 
-@router.get("/collections/{collection_id}/cards/", response_model=CardList)
-def read_cards(
+@router.post("/collections/{collection_id}/clone", response_model=CollectionSummary)
+async def clone_collection(
     session: SessionDep,
     current_user: CurrentUser,
     collection_id: uuid.UUID,
+    clone_in: CollectionClone | None = None,
+) -> Any:
+    """Copy a collection and all its cards. Practice sessions are not
+    copied."""
+    collection = await services.get_collection(
+        session=session, id=collection_id, user_id=current_user.id
+    )
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    clone_in = clone_in or CollectionClone()
+    return await services.clone_collection(
+        session=session,
+        collection=collection,
+        user_id=current_user.id,
+        name=clone_in.name,
+    )
+
+
+@router.post("/collections/{collection_id}/shares", status_code=202)
+async def share_collection(
+    session: SessionDep,
+    current_user: CurrentUser,
+    collection_id: uuid.UUID,
+    share_in: CollectionShareCreate,
+) -> Any:
+    """Offer a copy of a collection to the user with `email`, made once they
+    accept it. The response is the same whether or not they have an
+    account."""
+    collection = await services.get_collection(
+        session=session, id=collection_id, user_id=current_user.id
+    )
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    user = await get_user_by_email(session=session, email=share_in.email)
+    if user and user.is_active and user.id != current_user.id:
+        await services.share_collection(
+            session=session,
+            collection=collection,
+            recipient_id=user.id,
+            name=share_in.name,
+        )
+    return {"message": "Collection offered if the user exists"}
+
+
+@router.get("/collection-shares/", response_model=SharedCollectionList)
+async def read_collection_shares(session: SessionDep, current_user: CurrentUser) -> Any:
+    """Copies of collections other users offered to the current user."""
+    shares = await services.get_collection_shares(session, current_user.id)
+    return SharedCollectionList(data=shares, count=len(shares))
+
+
+@router.post("/collection-shares/{share_id}/accept", response_model=CollectionSummary)
+async def accept_collection_share(
+    session: SessionDep, current_user: CurrentUser, share_id: uuid.UUID
+) -> Any:
+    """Copy an offered collection into the current user's account."""
+    share = await services.get_collection_share(session, share_id, current_user.id)
+    if not share:
+        raise HTTPException(status_code=404, detail="Share not found")
+    return await services.accept_collection_share(session=session, share=share)
+
+
+@router.delete("/collection-shares/{share_id}", status_code=204)
+async def decline_collection_share(
+    session: SessionDep, current_user: CurrentUser, share_id: uuid.UUID
+) -> None:
+    share = await services.get_collection_share(session, share_id, current_user.id)
+    if not share:
+        raise HTTPException(status_code=404, detail="Share not found")
+    await services.decline_collection_share(session=session, share=share)
+
+
+@router.get("/collections/{collection_id}/duplicates", response_model=CardDuplicateList)
+async def read_duplicate_cards(
+    session: SessionDep,
+    current_user: CurrentUser,
+    collection_id: uuid.UUID,
+    threshold: float = Query(dedup.DUPLICATE_THRESHOLD, ge=dedup.MIN_THRESHOLD, le=1),
+) -> Any:
+    """Groups of cards of a collection that are near-duplicates of each
+    other, by estimated similarity of their text, largest groups first."""
+    if not await services.check_collection_access(
+        session, collection_id, current_user.id
+    ):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    clusters = await services.find_duplicate_cards(session, collection_id, threshold)
+    return CardDuplicateList(data=clusters, count=len(clusters))
+
+
+# Lists of cards are narrowed to some of their attributes with `fields`, e.g.
+# `?fields=id&fields=preview`
+FieldsQuery = Query(
+    None, description="Card attributes to return, all but `preview` if not given"
+)
+
+
+def _sparse_list_response(
+    content: dict[str, Any], response: Response | None = None
+) -> Response:
+    """A list whose items have only the requested fields. It is returned
+    as JSON directly, as the response model requires every field, with the
+    headers already set on `response`, such as its ETag."""
+    headers = {}
+    if response is not None:
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name != "content-length"
+        }
+    return JSONResponse(jsonable_encoder(content), headers=headers)
+
+
+@router.get("/collections/{collection_id}/cards/", response_model=CardList)
+async def read_cards(
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    collection_id: uuid.UUID,
+    cursor: CursorDep,
     skip: int = 0,
     limit: int = 100,
+    count: CountMode = "exact",
+    fields: list[CardField] | None = FieldsQuery,
 ) -> Any:
-    if not services.check_collection_access(session, collection_id, current_user.id):
+    version = await services.get_collection_version(
+        session, collection_id, current_user.id
+    )
+    if version is None:
         raise HTTPException(status_code=404, detail="Collection not found")
-    cards, count = services.get_cards(
-        session=session, collection_id=collection_id, skip=skip, limit=limit
+    if not_modified := conditional_response(request, response, version):
+        return not_modified
+    cards, total = await services.get_cards(
+        session=session,
+        collection_id=collection_id,
+        skip=skip,
+        limit=limit,
+        after=cursor,
+        count=count,
+        fields=fields,
+    )
+    cursor_page = next_cursor(cards, limit, "updated_at")
+    if fields is not None:
+        data = [{field: getattr(card, field) for field in fields} for card in cards]
+        return _sparse_list_response(
+            {"data": data, "count": total, "next_cursor": cursor_page}, response
+        )
+    return CardList(data=cards, count=total, next_cursor=cursor_page)
+
+
+@router.get(
+    "/collections/{collection_id}/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in exports.MEDIA_TYPES.values()}
+        }
+    },
+)
+async def export_collection(
+    request: Request,
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    collection_id: uuid.UUID,
+    format: exports.CardExportFormat = "ndjson",
+) -> Any:
+    """Stream the cards of a collection as JSON Lines or CSV, gzip compressed
+    if the client accepts it."""
+    collection = await services.get_collection(session, collection_id, current_user.id)
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+
+    # Read from the same database as the request's session
+    chunks = exports.export_collection(session.bind, collection_id, format)
+    headers = {
+        "Content-Disposition": exports.content_disposition(collection.name, format),
+        "Vary": "Accept-Encoding",
+    }
+    if exports.accepts_gzip(request.headers.get("accept-encoding")):
+        chunks = exports.gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        chunks, media_type=exports.MEDIA_TYPES[format], headers=headers
+    )
+
+
+@router.get("/search", response_model=CardSearchList)
+async def search_cards(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    cursor: RankCursorDep,
+    q: str = Query(
+        description="Words to find; supports quoted phrases, OR and -word",
+        min_length=1,
+        max_length=200,
+    ),
+    collection_id: uuid.UUID | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    count: CountMode = "exact",
+) -> Any:
+    """Search the cards of all the user's collections, or of one, most
+    relevant first."""
+    if collection_id is not None and not await services.check_collection_access(
+        session, collection_id, current_user.id
+    ):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    results, total = await services.search_cards(
+        session=session,
+        user_id=current_user.id,
+        query=q,
+        collection_id=collection_id,
+        limit=limit,
+        after=cursor,
+        count=count,
+    )
+    return CardSearchList(
+        data=results, count=total, next_cursor=next_cursor(results, limit, "rank")
     )
-    return CardList(data=cards, count=count)
 
 
 @router.post("/collections/{collection_id}/cards/", response_model=Card)
@@ -143,134 +487,262 @@ async def create_card(
     collection_id: uuid.UUID,
     card_in: CardCreate,
     provider: GeminiProviderDep,
+    skip_duplicates: bool = False,
 ) -> Any:
-    access_checked = await asyncio.to_thread(
-        lambda: services.check_collection_access(
-            session, collection_id, current_user.id
-        )
-    )
-    if not access_checked:
+    """Add a card to a collection, generated from `prompt` when given. With
+    `skip_duplicates`, a near-duplicate of a card of the collection is
+    refused with 409."""
+    if not await services.check_collection_access(
+        session, collection_id, current_user.id
+    ):
         raise HTTPException(status_code=404, detail="Collection not found")
     if card_in.prompt:
-        if not await asyncio.to_thread(
-            lambda: check_and_increment_ai_usage_quota(session, current_user)
-        ):
+        if not await check_and_increment_ai_usage_quota(session, current_user):
             raise HTTPException(
                 status_code=429, detail="Quota for AI usage is reached."
             )
         card_base = await services.generate_ai_flashcard(card_in.prompt, provider)
         card_in.front = card_base.front
         card_in.back = card_base.back
-    return await asyncio.to_thread(
-        lambda: services.create_card(
-            session=session, collection_id=collection_id, card_in=card_in
+    try:
+        return await services.create_card(
+            session=session,
+            collection_id=collection_id,
+            card_in=card_in,
+            skip_duplicates=skip_duplicates,
+        )
+    except DuplicateCardError as e:
+        raise HTTPException(
+            status_code=409, detail=f"Card is a near-duplicate of card {e.card_id}"
         )
+
+
+class _UploadStreamingResponse(StreamingResponse):
+    """Streams its body while the endpoint is still reading the request body.
+
+    StreamingResponse listens for a client disconnect on the same receive
+    channel, which would swallow the rest of the upload.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+
+async def _import_events(
+    request: Request,
+    collection_id: uuid.UUID,
+    format: imports.CardImportFormat,
+    skip_duplicates: bool,
+) -> AsyncIterator[str]:
+    # Dependencies are closed before a streaming body is sent, so the
+    # import runs in a session of its own
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        rows = imports.parse_cards(request.stream(), format)
+        events = imports.import_cards(session, collection_id, rows, skip_duplicates)
+        async for event in events:
+            yield event.model_dump_json() + "\n"
+
+
+@router.post(
+    "/collections/{collection_id}/cards/import",
+    response_class=_UploadStreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string", "format": "binary"}}
+                for media_type in (
+                    "text/csv",
+                    "text/tab-separated-values",
+                    "application/x-ndjson",
+                )
+            },
+        }
+    },
+)
+async def import_cards(
+    request: Request,
+    session: SessionDep,
+    current_user: CurrentUser,
+    collection_id: uuid.UUID,
+    format: imports.CardImportFormat = "csv",
+    skip_duplicates: bool = False,
+) -> Any:
+    """Import cards from the raw request body as it is uploaded.
+
+    Nothing is written until the whole body has been received, so a slow
+    upload holds no database connection. CSV and TSV files may start with a
+    `front,back` header. The response is
+    JSON Lines of `progress`, `error` and a final `summary` events. With
+    `skip_duplicates`, rows that are near-duplicates of cards of the
+    collection or of earlier rows are counted as `skipped` instead.
+    """
+    if not await services.check_collection_access(
+        session, collection_id, current_user.id
+    ):
+        raise HTTPException(status_code=404, detail="Collection not found")
+    return _UploadStreamingResponse(
+        _import_events(request, collection_id, format, skip_duplicates),
+        media_type="application/x-ndjson",
     )
 
 
-@router.get("/collections/{collection_id}/cards/{card_id}", response_model=Card)
-def read_card(
+@router.post("/collections/{collection_id}/cards/bulk", response_model=CardBulkResponse)
+async def bulk_update_cards(
     session: SessionDep,
     current_user: CurrentUser,
     collection_id: uuid.UUID,
-    card_id: uuid.UUID,
+    operation: CardBulkOperation,
 ) -> Any:
-    if not services.check_collection_access(session, collection_id, current_user.id):
+    """Update, move or delete up to 1000 cards of a collection in one
+    transaction. Cards that are not in the collection are reported as
+    `not_found`."""
+    if not await services.check_collection_access(
+        session, collection_id, current_user.id
+    ):
         raise HTTPException(status_code=404, detail="Collection not found")
-    card = services.get_card_with_collection(
-        session=session, card_id=card_id, user_id=current_user.id
+
+    card_ids = list(dict.fromkeys(operation.card_ids))
+    if isinstance(operation, CardBulkUpdate):
+        status = "updated"
+        done = await services.update_cards(
+            session, collection_id, card_ids, operation.changes
+        )
+    elif isinstance(operation, CardBulkMove):
+        if operation.target_collection_id == collection_id:
+            raise HTTPException(
+                status_code=400, detail="Cards are already in this collection"
+            )
+        if not await services.check_collection_access(
+            session, operation.target_collection_id, current_user.id
+        ):
+            raise HTTPException(status_code=404, detail="Target collection not found")
+        status = "moved"
+        done = await services.move_cards(
+            session, collection_id, operation.target_collection_id, card_ids
+        )
+    else:
+        status = "deleted"
+        done = await services.delete_cards(session, collection_id, card_ids)
+
+    found = set(done)
+    return CardBulkResponse(
+        data=[
+            CardBulkResult(
+                id=card_id, status=status if card_id in found else "not_found"
+            )
+            for card_id in card_ids
+        ]
+    )
+
+
+async def _get_owned_card(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    card_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> models.Card:
+    found, card = await services.get_owned_card(
+        session, collection_id, card_id, user_id
     )
-    if not card or card.collection_id != collection_id:
+    if not found:
+        raise HTTPException(status_code=404, detail="Collection not found")
+    if not card:
         raise HTTPException(status_code=404, detail="Card not found")
     return card
 
 
+@router.get("/collections/{collection_id}/cards/{card_id}", response_model=Card)
+async def read_card(
+    session: ReadSessionDep,
+    current_user: CurrentUser,
+    collection_id: uuid.UUID,
+    card_id: uuid.UUID,
+) -> Any:
+    return await _get_owned_card(session, collection_id, card_id, current_user.id)
+
+
 @router.put("/collections/{collection_id}/cards/{card_id}", response_model=Card)
-def update_card(
+async def update_card(
     session: SessionDep,
     current_user: CurrentUser,
     collection_id: uuid.UUID,
     card_id: uuid.UUID,
     card_in: CardUpdate,
 ) -> Any:
-    if not services.check_collection_access(session, collection_id, current_user.id):
-        raise HTTPException(status_code=404, detail="Collection not found")
-    card = services.get_card_with_collection(
-        session=session, card_id=card_id, user_id=current_user.id
-    )
-    if not card or card.collection_id != collection_id:
-        raise HTTPException(status_code=404, detail="Card not found")
-    return services.update_card(session=session, card=card, card_in=card_in)
+    card = await _get_owned_card(session, collection_id, card_id, current_user.id)
+    return await services.update_card(session=session, card=card, card_in=card_in)
 
 
 @router.delete("/collections/{collection_id}/cards/{card_id}", status_code=204)
-def delete_card(
+async def delete_card(
     session: SessionDep,
     current_user: CurrentUser,
     collection_id: uuid.UUID,
     card_id: uuid.UUID,
 ) -> None:
-    if not services.check_collection_access(session, collection_id, current_user.id):
-        raise HTTPException(status_code=404, detail="Collection not found")
-    card = services.get_card_with_collection(
-        session=session, card_id=card_id, user_id=current_user.id
-    )
-    if not card or card.collection_id != collection_id:
-        raise HTTPException(status_code=404, detail="Card not found")
-    services.delete_card(session=session, card=card)
+    card = await _get_owned_card(session, collection_id, card_id, current_user.id)
+    await services.delete_card(session=session, card=card)
     return
 
 
 @router.post("/practice-sessions", response_model=PracticeSession)
-def start_practice_session(
+async def start_practice_session(
     session: SessionDep,
     current_user: CurrentUser,
     practice_session_in: PracticeSessionCreate,
 ) -> Any:
     """Start a new practice session for a collection"""
-    if not services.check_collection_access(
-        session, practice_session_in.collection_id, current_user.id
-    ):
-        raise HTTPException(status_code=404, detail="Collection not found")
-
     try:
-        return services.get_or_create_practice_session(
+        return await services.get_or_create_practice_session(
             session=session,
             collection_id=practice_session_in.collection_id,
             user_id=current_user.id,
         )
+    except CollectionNotFoundError:
+        raise HTTPException(status_code=404, detail="Collection not found")
     except EmptyCollectionError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/practice-sessions", response_model=PracticeSessionList)
-def list_practice_sessions(
-    session: SessionDep,
+async def list_practice_sessions(
+    session: ReadSessionDep,
     current_user: CurrentUser,
+    cursor: CursorDep,
     skip: int = 0,
     limit: int = 100,
+    count: CountMode = "exact",
 ) -> Any:
     """List all practice sessions for the current user"""
-    practice_sessions, count = services.get_practice_sessions(
+    practice_sessions, total = await services.get_practice_sessions(
         session=session,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
+        after=cursor,
+        count=count,
+    )
+    return PracticeSessionList(
+        data=practice_sessions,
+        count=total,
+        next_cursor=next_cursor(practice_sessions, limit, "created_at"),
     )
-    return PracticeSessionList(data=practice_sessions, count=count)
 
 
 @router.get("/practice-sessions/{practice_session_id}", response_model=PracticeSession)
-def get_practice_session_status(
-    session: SessionDep,
+async def get_practice_session_status(
+    session: ReadSessionDep,
     current_user: CurrentUser,
     practice_session_id: uuid.UUID,
 ) -> Any:
     """Get practice session status and statistics"""
-    practice_session = services.get_practice_session(
+    practice_session = await services.get_practice_session(
         session=session,
         session_id=practice_session_id,
         user_id=current_user.id,
+        with_cards=True,
     )
     if not practice_session:
         raise HTTPException(status_code=404, detail="Practice session not found")
@@ -282,16 +754,23 @@ def get_practice_session_status(
     "/practice-sessions/{practice_session_id}/cards",
     response_model=PracticeCardListResponse,
 )
-def list_practice_cards(
-    session: SessionDep,
+async def list_practice_cards(
+    session: ReadSessionDep,
     current_user: CurrentUser,
     practice_session_id: uuid.UUID,
+    cursor: CursorDep,
     status: Literal["pending", "completed", "all"] | None = None,
     limit: int = 100,
     order: Literal["asc", "desc", "random"] | None = None,
+    count: CountMode = "exact",
+    fields: list[CardField] | None = FieldsQuery,
 ) -> Any:
     """List practice cards for a session, optionally filtering and ordering."""
-    practice_session = services.get_practice_session(
+    if cursor is not None and order == "random":
+        raise HTTPException(
+            status_code=400, detail="Cursor pagination needs a stable order"
+        )
+    practice_session = await services.get_practice_session(
         session=session,
         session_id=practice_session_id,
         user_id=current_user.id,
@@ -299,14 +778,35 @@ def list_practice_cards(
     if not practice_session:
         raise HTTPException(status_code=404, detail="Practice session not found")
 
-    practice_cards, count = services.get_practice_cards(
+    practice_cards, total = await services.get_practice_cards(
         session=session,
         practice_session_id=practice_session_id,
         status=status,
         limit=limit,
         order=order,
+        after=cursor,
+        count=count,
+        fields=fields,
     )
 
+    cursor_page = None
+    if order != "random":
+        sort_attr, _ = services.practice_card_sort_key(status, order)
+        cursor_page = next_cursor(practice_cards, limit, sort_attr)
+
+    if fields is not None:
+        data = [
+            {
+                "card": {field: getattr(pc, f"card_{field}") for field in fields},
+                "is_practiced": pc.is_practiced,
+                "is_correct": pc.is_correct,
+            }
+            for pc in practice_cards
+        ]
+        return _sparse_list_response(
+            {"data": data, "count": total, "next_cursor": cursor_page}
+        )
+
     response_data = [
         PracticeCardResponse(
             card=pc.card,
@@ -315,15 +815,16 @@ def list_practice_cards(
         )
         for pc in practice_cards
     ]
-
-    return PracticeCardListResponse(data=response_data, count=count)
+    return PracticeCardListResponse(
+        data=response_data, count=total, next_cursor=cursor_page
+    )
 
 
 @router.patch(
     "/practice-sessions/{practice_session_id}/cards/{card_id}",
     response_model=PracticeCardResponse,
 )
-def update_practice_card_result(
+async def update_practice_card_result(
     session: SessionDep,
     current_user: CurrentUser,
     practice_session_id: uuid.UUID,
@@ -331,7 +832,7 @@ def update_practice_card_result(
     result_in: PracticeCardResultPatch,
 ) -> Any:
     """Update the result (is_correct) for a practiced card."""
-    practice_session = services.get_practice_session(
+    practice_session = await services.get_practice_session(
         session=session,
         session_id=practice_session_id,
         user_id=current_user.id,
@@ -342,7 +843,7 @@ def update_practice_card_result(
     if practice_session.is_completed:
         raise HTTPException(status_code=400, detail="Practice session is completed")
 
-    practice_card = services.get_practice_card(
+    practice_card = await services.get_practice_card(
         session=session,
         practice_session_id=practice_session_id,
         card_id=card_id,
@@ -350,13 +851,13 @@ def update_practice_card_result(
     if not practice_card:
         raise HTTPException(status_code=404, detail="Practice card not found")
 
-    practice_card = services.record_practice_card_result(
+    practice_card = await services.record_practice_card_result(
         session=session,
         practice_card=practice_card,
         is_correct=result_in.is_correct,
     )
 
-    card = services.get_card_by_id(session=session, card_id=practice_card.card_id)
+    card = await services.get_card_by_id(session=session, card_id=practice_card.card_id)
     if not card:
         raise HTTPException(status_code=500, detail="Associated card not found")
 
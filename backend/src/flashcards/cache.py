@@ -0,0 +1,135 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from src.core.config import settings
+
+from .schemas import CollectionName
+
+
+def typeahead_term(term: str) -> str:
+    return term.strip().lower()
+
+
+def typeahead_sort_key(term: str, match: CollectionName) -> tuple:
+    """Order of typeahead matches: names starting with the term, then by
+    how early the term appears, shorter names first. Mirrors the ORDER BY
+    of `match_collection_names`."""
+    position = match.name.lower().find(term)
+    return (position != 0, position, len(match.name), match.id)
+
+
+def _entry_size(matches: list[CollectionName]) -> int:
+    return max(len(matches), 1)
+
+
+class TypeaheadCache:
+    """In-process LRU cache of the collection names of a user matching a
+    typed term, most of whose lookups come from typing one more letter.
+
+    When all matches of a term are cached, those of any longer term that
+    starts with it are among them, so they are filtered from the entry
+    instead of queried. Entries expire after `ttl` seconds and are dropped
+    per user when the user's collections change. `max_size` bounds the
+    number of names held, counting an empty entry as one.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            tuple[uuid.UUID, str], tuple[list[CollectionName], bool, float]
+        ] = OrderedDict()
+        self._terms_by_user: dict[uuid.UUID, set[str]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def get(self, user_id: uuid.UUID, term: str) -> list[CollectionName] | None:
+        """Cached matches of `term`, best first, or None on a miss. Only the
+        first matches are returned for an entry that is not complete."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            for end in range(len(term), 0, -1):
+                key = (user_id, term[:end])
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                matches, complete, deadline = entry
+                if deadline <= now:
+                    self._discard(key)
+                    continue
+                if end < len(term) and not complete:
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if end == len(term):
+                    return matches
+                return sorted(
+                    (match for match in matches if term in match.name.lower()),
+                    key=lambda match: typeahead_sort_key(term, match),
+                )
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        user_id: uuid.UUID,
+        term: str,
+        matches: list[CollectionName],
+        complete: bool,
+    ) -> None:
+        """Cache the best `matches` of `term`; `complete` if there are no
+        others."""
+        if not self.enabled:
+            return
+        key = (user_id, term)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (matches, complete, time.monotonic() + self.ttl)
+            self._terms_by_user.setdefault(user_id, set()).add(term)
+            self._size += _entry_size(matches)
+            while self._size > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            for term in list(self._terms_by_user.get(user_id, ())):
+                self._discard((user_id, term))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._terms_by_user.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, key: tuple[uuid.UUID, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= _entry_size(entry[0])
+        user_id, term = key
+        user_terms = self._terms_by_user.get(user_id)
+        if user_terms is not None:
+            user_terms.discard(term)
+            if not user_terms:
+                del self._terms_by_user[user_id]
+
+
+typeahead_cache = TypeaheadCache(
+    max_size=settings.TYPEAHEAD_CACHE_MAX_SIZE,
+    ttl=settings.TYPEAHEAD_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,236 @@
+"""Near-duplicate detection of cards with MinHash and locality-sensitive
+hashing.
+
+A card's signature holds, for each of `NUM_PERM` hash functions, the lowest
+hash of the character shingles of its text. Two signatures agree on a
+position with a probability equal to the Jaccard similarity of the two
+shingle sets, so the share of equal positions estimates it.
+
+Signatures are cut into `BANDS` bands of `ROWS` positions and each band is
+hashed to a key. Cards sharing a key are candidates, which are then compared
+on their signatures: with 20 bands of 6 rows, cards that are 80% similar
+share a key with a probability of 99.8%, cards 75% similar with 98%, cards
+30% similar with 1.5% and unrelated cards, around 15% similar, almost never.
+Below `MIN_THRESHOLD` too many similar pairs would be missed, so the
+similarity asked for cannot be lower. Only candidates are
+compared, so finding the duplicates of n cards takes about n·BANDS steps
+instead of n² comparisons.
+"""
+
+import hashlib
+import re
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+BANDS = 20
+ROWS = 6
+NUM_PERM = BANDS * ROWS
+SHINGLE_SIZE = 3
+# Lowest estimated similarity for a card to count as a near-duplicate
+DUPLICATE_THRESHOLD = 0.8
+# Lowest threshold at which the bands still find nearly all similar pairs
+MIN_THRESHOLD = 0.75
+# How many rows of a bucket each row is compared with when looking for
+# groups of duplicates, see `_candidate_pairs`
+BUCKET_WINDOW = 32
+
+_NON_WORD = re.compile(r"[\W_]+")
+_SHIFT = np.uint64(32)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_CODE_BASE = np.uint64(0x100000001B3)
+
+# The hash functions are the high 32 bits of a·x + b mod 2^64, for odd a.
+# Signatures are stored with every card, so a and b are derived from a fixed
+# seed rather than drawn from a random generator whose stream could change
+# between NumPy versions.
+_coefficients = np.frombuffer(
+    hashlib.shake_128(b"flashcards-minhash").digest(NUM_PERM * 16), dtype="<u8"
+).reshape(2, NUM_PERM)
+_A = _coefficients[0] | np.uint64(1)
+_B = _coefficients[1]
+
+
+def _words(text: str) -> str:
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def card_text(front: str, back: str) -> str:
+    """The text a signature is computed from, ignoring case, punctuation
+    and spacing."""
+    return _words(front) + "\n" + _words(back)
+
+
+def _shingle_hashes(texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """32 bit hashes of the shingles of all texts, and where each text's
+    shingles start. Texts shorter than a shingle are padded to one."""
+    padded = [text.ljust(SHINGLE_SIZE, "\0") for text in texts]
+    lengths = np.array([len(text) for text in padded], dtype=np.int64)
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype="<u4")
+    codes = codes.astype(np.uint64)
+
+    # Hash of the shingle starting at every position of the joined texts
+    positions = len(codes) - SHINGLE_SIZE + 1
+    hashes = np.zeros(positions, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        hashes = hashes * _CODE_BASE + codes[offset : offset + positions]
+
+    # Keep those that lie within a single text
+    counts = lengths - SHINGLE_SIZE + 1
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    index = np.arange(counts.sum()) + np.repeat(text_starts - starts, counts)
+    return (hashes[index] * _MIX) >> _SHIFT, starts
+
+
+def signatures(texts: Sequence[str]) -> np.ndarray:
+    """MinHash signatures of `texts`, one row of `NUM_PERM` uint32 each.
+
+    All shingles of the batch are hashed together, one hash function at a
+    time, and reduced to each text's minimum.
+    """
+    result = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    if not texts:
+        return result
+    shingles, starts = _shingle_hashes(texts)
+    for i in range(NUM_PERM):
+        values = (shingles * _A[i] + _B[i]) >> _SHIFT
+        result[:, i] = np.minimum.reduceat(values, starts)
+    return result
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """The LSH bucket of each band of each signature, as int64 so they can
+    be stored as bigint. The band number is hashed in, so keys of different
+    bands never match each other."""
+    rows = signatures.reshape(len(signatures), BANDS, ROWS).astype(np.uint64)
+    keys = np.broadcast_to(np.arange(BANDS, dtype=np.uint64), rows.shape[:2])
+    for row in range(ROWS):
+        keys = (keys ^ rows[:, :, row]) * _MIX
+    return keys.view(np.int64)
+
+
+def fingerprint(cards: Sequence[tuple[str, str]]) -> tuple[np.ndarray, np.ndarray]:
+    """Signatures and band keys of (front, back) pairs."""
+    sigs = signatures([card_text(front, back) for front, back in cards])
+    return sigs, band_keys(sigs)
+
+
+def to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def from_bytes(values: Sequence[bytes]) -> np.ndarray:
+    return np.frombuffer(b"".join(values), dtype="<u4").reshape(-1, NUM_PERM)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of signatures, row by row."""
+    return (a == b).mean(axis=-1)
+
+
+class DuplicateIndex:
+    """An in-memory LSH index, to drop near-duplicates from a stream of
+    cards against the cards seen before them."""
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._signatures: list[np.ndarray] = []
+        self._buckets: dict[int, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, signature: np.ndarray, keys: ArrayLike) -> None:
+        for key in np.asarray(keys).tolist():
+            self._buckets.setdefault(key, []).append(len(self._signatures))
+        self._signatures.append(signature)
+
+    def contains(self, signature: np.ndarray, keys: np.ndarray) -> bool:
+        """Whether a near-duplicate of the signature has been added."""
+        candidates = {i for key in keys.tolist() for i in self._buckets.get(key, ())}
+        if not candidates:
+            return False
+        others = np.stack([self._signatures[i] for i in candidates])
+        return bool((similarity(others, signature) >= self.threshold).any())
+
+    def add_distinct(self, signatures: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Add the signatures that have no near-duplicate yet, in order, and
+        return which were added."""
+        added = np.zeros(len(signatures), dtype=bool)
+        for i, (signature, row_keys) in enumerate(zip(signatures, keys, strict=True)):
+            if not self.contains(signature, row_keys):
+                self.add(signature, row_keys)
+                added[i] = True
+        return added
+
+
+def _candidate_pairs(keys: np.ndarray) -> np.ndarray:
+    """Pairs of rows sharing a bucket, lower row first.
+
+    Every pair of a bucket of up to `BUCKET_WINDOW` + 1 rows is returned.
+    Larger buckets, which mostly hold many copies of one card, are cut short:
+    each row is paired with the next `BUCKET_WINDOW` rows of the bucket, so
+    copies still join one group without k² comparisons.
+    """
+    n = len(keys)
+    # Each pair as one number, lower row first, so pairs found in several
+    # bands are counted once
+    pairs = []
+    for band in range(keys.shape[1]):
+        order = np.argsort(keys[:, band], kind="stable")
+        sorted_keys = keys[order, band]
+        for offset in range(1, min(BUCKET_WINDOW, n - 1) + 1):
+            same = np.flatnonzero(sorted_keys[offset:] == sorted_keys[:-offset])
+            if not len(same):
+                break
+            a, b = order[same], order[same + offset]
+            pairs.append(np.minimum(a, b) * n + np.maximum(a, b))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.unique(np.concatenate(pairs))
+    return np.stack([pairs // n, pairs % n], axis=1)
+
+
+def find_clusters(
+    signatures: np.ndarray,
+    keys: ArrayLike,
+    threshold: float = DUPLICATE_THRESHOLD,
+) -> list[tuple[list[int], float]]:
+    """Group rows that are near-duplicates of each other, directly or
+    through other rows.
+
+    Returns the rows of each group of two or more, in order, with the lowest
+    similarity among the pairs that joined it, largest groups first.
+    """
+    if len(signatures) < 2:
+        return []
+    pairs = _candidate_pairs(np.asarray(keys, dtype=np.int64))
+    scores = similarity(signatures[pairs[:, 0]], signatures[pairs[:, 1]])
+    matched = scores >= threshold
+
+    parent = list(range(len(signatures)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in pairs[matched].tolist():
+        parent[root(a)] = root(b)
+
+    members: dict[int, list[int]] = {}
+    lowest: dict[int, float] = {}
+    for (a, _), score in zip(
+        pairs[matched].tolist(), scores[matched].tolist(), strict=True
+    ):
+        group = root(a)
+        lowest[group] = min(lowest.get(group, 1.0), score)
+    for i in range(len(signatures)):
+        if (group := root(i)) in lowest:
+            members.setdefault(group, []).append(i)
+    clusters = [(rows, lowest[group]) for group, rows in members.items()]
+    clusters.sort(key=lambda cluster: (-len(cluster[0]), cluster[0][0]))
+    return clusters
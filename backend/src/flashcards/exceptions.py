@@ -1,10 +1,49 @@
+import uuid
+
+
 class FlashcardsException(Exception):
     """Base exception for flashcards module"""
 
     pass
 
 
+class CollectionNotFoundError(FlashcardsException):
+    """Raised when the collection does not exist or belongs to another user"""
+
+    pass
+
+
 class EmptyCollectionError(FlashcardsException):
     """Raised when trying to create a practice session for an empty collection"""
 
     pass
+
+
+class DuplicateCardError(FlashcardsException):
+    """Raised when a card is a near-duplicate of one in its collection and
+    near-duplicates are skipped"""
+
+    def __init__(self, card_id: uuid.UUID):
+        super().__init__(f"Near-duplicate of card {card_id}")
+        self.card_id = card_id
+
+
+class CardImportError(FlashcardsException):
+    """Raised when an uploaded card file cannot be read any further"""
+
+    def __init__(self, line: int, detail: str):
+        super().__init__(detail)
+        self.line = line
+        self.detail = detail
+
+
+class AnkiDeckError(FlashcardsException):
+    """Raised when an uploaded file is not a readable Anki deck"""
+
+    pass
+
+
+class AnkiDeckTooLargeError(AnkiDeckError):
+    """Raised when an uploaded Anki deck exceeds the size limits"""
+
+    pass
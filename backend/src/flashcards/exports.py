@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import uuid
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from typing import Literal
+from urllib.parse import quote
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+
+from .services import export_cards
+
+# Both formats are read back by the card import
+CardExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+async def ndjson_chunks(
+    partitions: AsyncIterable[Sequence[Row]],
+) -> AsyncIterator[bytes]:
+    async for rows in partitions:
+        yield "".join(
+            json.dumps({"front": front, "back": back}, ensure_ascii=False) + "\n"
+            for front, back in rows
+        ).encode()
+
+
+async def csv_chunks(
+    partitions: AsyncIterable[Sequence[Row]],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["front", "back"])
+    async for rows in partitions:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+FORMATTERS = {"ndjson": ndjson_chunks, "csv": csv_chunks}
+
+
+async def export_collection(
+    engine: AsyncEngine, collection_id: uuid.UUID, format: CardExportFormat
+) -> AsyncIterator[bytes]:
+    """Encoded chunks of a collection's cards. The export runs in a session
+    of its own, which stays open until the last chunk has been produced."""
+    async with AsyncSession(engine) as session:
+        partitions = export_cards(
+            session, collection_id, settings.CARD_EXPORT_CHUNK_SIZE
+        )
+        async for chunk in FORMATTERS[format](partitions):
+            yield chunk
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() != "gzip":
+            continue
+        params = params.strip()
+        try:
+            return not params or float(params.removeprefix("q=")) > 0
+        except ValueError:
+            return False
+    return False
+
+
+async def gzip_chunks(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Compress a stream on the fly, one gzip member for the whole body."""
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def content_disposition(name: str, format: CardExportFormat) -> str:
+    return (
+        f'attachment; filename="collection.{format}"; '
+        f"filename*=UTF-8''{quote(name)}.{format}"
+    )
@@ -0,0 +1,410 @@
+import asyncio
+import codecs
+import csv
+import pickle
+import tempfile
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime, timezone
+from typing import IO, Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import (
+    BigInteger,
+    LargeBinary,
+    Text,
+    column,
+    false,
+    insert,
+    literal,
+    table,
+    text,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+
+from . import dedup
+from .exceptions import CardImportError
+from .models import Card, PracticeCard, PracticeSession
+from .schemas import (
+    CardBase,
+    CardImportProgress,
+    CardImportRowError,
+    CardImportSummary,
+)
+from .services import (
+    FINGERPRINT_BATCH_SIZE,
+    SET_FINGERPRINTS,
+    bump_collection_version_statement,
+    fingerprint_params,
+    unfingerprinted_cards_statement,
+)
+
+# csv allows quoted fields spanning lines, tsv is one card per line with
+# tab separated fields, ndjson is one {"front": ..., "back": ...} per line
+CardImportFormat = Literal["csv", "tsv", "ndjson"]
+
+CardImportEvent = CardImportProgress | CardImportRowError | CardImportSummary
+
+# A row is its position in the upload (the line number, or the note number
+# of an Anki deck) and either the card or why it was rejected
+ParsedRow = tuple[int, CardBase | str]
+
+# Longest line or CSV record accepted. Valid cards are far shorter, so a
+# longer one is a malformed file that would otherwise be buffered whole.
+MAX_RECORD_LENGTH = 64 * 1024
+
+# Valid rows are staged here, with their signatures, and moved into the
+# collection in one statement
+card_import = table(
+    "card_import",
+    column("front", Text),
+    column("back", Text),
+    column("minhash", LargeBinary),
+    column("lsh_buckets", ARRAY(BigInteger)),
+)
+
+
+async def read_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode an upload as UTF-8 and split it into lines as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_number = 0
+    try:
+        async for chunk in chunks:
+            *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+            for line in lines:
+                line_number += 1
+                yield line.removesuffix("\r")
+            if len(pending) > MAX_RECORD_LENGTH:
+                raise CardImportError(line_number + 1, "Line is too long")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        line_number += e.object[: e.start].count(b"\n") + 1
+        raise CardImportError(line_number, "File is not valid UTF-8")
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+def validation_error_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e["loc"] else e["msg"]
+        for e in error.errors()
+    )
+
+
+def _validate_fields(fields: list[str]) -> CardBase | str:
+    if len(fields) < 2:
+        return "Expected a front and a back column"
+    try:
+        return CardBase(front=fields[0], back=fields[1])
+    except ValidationError as e:
+        return validation_error_detail(e)
+
+
+def _is_header(fields: list[str]) -> bool:
+    return [field.strip().lower() for field in fields[:2]] == ["front", "back"]
+
+
+async def parse_csv(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    """Parse CSV records, which may span lines inside quoted fields.
+
+    A record is complete once it holds an even number of quotes, escaped
+    quotes being doubled, so only one record is buffered at a time.
+    """
+    record: list[str] = []
+    record_length = quotes = start = line_number = 0
+    first = True
+    async for line in lines:
+        line_number += 1
+        if not record:
+            start = line_number
+        record.append(line)
+        record_length += len(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            if record_length > MAX_RECORD_LENGTH:
+                raise CardImportError(start, "Record is too long")
+            continue
+
+        raw = "\n".join(record)
+        record, record_length, quotes = [], 0, 0
+        if not raw.strip():
+            continue
+        fields = next(csv.reader([raw]))
+        if first:
+            first = False
+            if _is_header(fields):
+                continue
+        yield start, _validate_fields(fields)
+    if record:
+        yield start, "Unterminated quoted field"
+
+
+async def parse_tsv(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        fields = line.split("\t")
+        if line_number == 1 and _is_header(fields):
+            continue
+        yield line_number, _validate_fields(fields)
+
+
+async def parse_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, CardBase.model_validate_json(line)
+        except ValidationError as e:
+            yield line_number, validation_error_detail(e)
+
+
+PARSERS = {"csv": parse_csv, "tsv": parse_tsv, "ndjson": parse_ndjson}
+
+
+def parse_cards(
+    chunks: AsyncIterable[bytes], format: CardImportFormat
+) -> AsyncIterator[ParsedRow]:
+    return PARSERS[format](read_lines(chunks))
+
+
+# Signatures are computed and compared with NumPy, which would hold the
+# event loop for a noticeable time on every chunk, so that work runs in a
+# worker thread and only the database round trips stay on the loop.
+
+
+async def _fingerprint_collection(
+    connection: AsyncConnection, collection_id: uuid.UUID
+) -> None:
+    """`fingerprint_cards`, with the signatures computed off the event loop."""
+    statement = unfingerprinted_cards_statement(collection_id)
+    rows = (await connection.execute(statement)).all()
+    for start in range(0, len(rows), FINGERPRINT_BATCH_SIZE):
+        batch = rows[start : start + FINGERPRINT_BATCH_SIZE]
+        params = await asyncio.to_thread(fingerprint_params, batch)
+        await connection.execute(SET_FINGERPRINTS, params)
+
+
+def _duplicate_index(minhashes: list[bytes]) -> dedup.DuplicateIndex:
+    signatures = dedup.from_bytes(minhashes)
+    index = dedup.DuplicateIndex()
+    for signature, keys in zip(signatures, dedup.band_keys(signatures), strict=True):
+        index.add(signature, keys)
+    return index
+
+
+async def _load_duplicate_index(
+    connection: AsyncConnection, collection_id: uuid.UUID
+) -> dedup.DuplicateIndex:
+    """An index of the collection's cards, to check the rows of an import
+    against them and against each other.
+
+    Looking up every row in the bucket index would compare its buckets with
+    those of each card of the collection, so all signatures are read once
+    instead.
+    """
+    statement = select(Card.minhash).where(Card.collection_id == collection_id)
+    minhashes = (await connection.execute(statement)).scalars().all()
+    return await asyncio.to_thread(_duplicate_index, minhashes)
+
+
+def _stage_rows(
+    spool: IO[bytes],
+    cards: list[CardBase],
+    duplicates: dedup.DuplicateIndex | None,
+) -> int:
+    """Fingerprint a chunk of rows and append those kept to the spool,
+    leaving out the near-duplicates of the cards in `duplicates`, which the
+    rows kept are added to. Returns how many were kept."""
+    signatures, keys = dedup.fingerprint([(card.front, card.back) for card in cards])
+    if duplicates is not None:
+        keep = duplicates.add_distinct(signatures, keys).tolist()
+    else:
+        keep = [True] * len(cards)
+    rows = [
+        (card.front, card.back, dedup.to_bytes(signature), card_keys.tolist())
+        for card, signature, card_keys, kept in zip(
+            cards, signatures, keys, keep, strict=True
+        )
+        if kept
+    ]
+    if rows:
+        pickle.dump(rows, spool, protocol=pickle.HIGHEST_PROTOCOL)
+    return len(rows)
+
+
+def _read_staged_rows(spool: IO[bytes]) -> list[tuple[str, str, bytes, list[int]]]:
+    """The next chunk of rows of the spool, or none at its end."""
+    try:
+        return pickle.load(spool)
+    except EOFError:
+        return []
+
+
+async def _copy_staged_rows(driver_connection: Any, spool: IO[bytes]) -> None:
+    """COPY the spooled rows into the staging table, reading the spool in a
+    worker thread as it may have spilled to disk."""
+    spool.seek(0)
+    async with driver_connection.cursor() as cursor:
+        async with cursor.copy(
+            "COPY card_import (front, back, minhash, lsh_buckets) FROM STDIN"
+        ) as copy:
+            while rows := await asyncio.to_thread(_read_staged_rows, spool):
+                for row in rows:
+                    await copy.write_row(row)
+
+
+def _load_staged_cards_statement(collection_id: uuid.UUID):
+    """Move the staged rows into the collection and add the new cards to its
+    ongoing practice sessions, like `_add_card_to_ongoing_sessions` does for
+    a single card, in one statement that returns how many cards it added."""
+    now = datetime.now(timezone.utc)
+    inserted = (
+        insert(Card)
+        .from_select(
+            [
+                "id",
+                "front",
+                "back",
+                "collection_id",
+                "created_at",
+                "updated_at",
+                "minhash",
+                "lsh_buckets",
+            ],
+            select(
+                func.gen_random_uuid(),
+                card_import.c.front,
+                card_import.c.back,
+                literal(collection_id),
+                literal(now),
+                literal(now),
+                card_import.c.minhash,
+                card_import.c.lsh_buckets,
+            ),
+        )
+        .returning(Card.id)
+        .cte("inserted")
+    )
+    grown = (
+        update(PracticeSession)
+        .where(
+            PracticeSession.collection_id == collection_id,
+            PracticeSession.is_completed.is_not(True),
+        )
+        .values(
+            total_cards=PracticeSession.total_cards
+            + select(func.count()).select_from(inserted).scalar_subquery(),
+            updated_at=now,
+        )
+        .returning(PracticeSession.id)
+        .cte("grown")
+    )
+    added = (
+        insert(PracticeCard)
+        .from_select(
+            ["id", "session_id", "card_id", "is_practiced", "created_at", "updated_at"],
+            select(
+                func.gen_random_uuid(),
+                grown.c.id,
+                inserted.c.id,
+                false(),
+                literal(now),
+                literal(now),
+            ).select_from(grown.join(inserted, true())),
+        )
+        .cte("added")
+    )
+    return select(func.count()).select_from(inserted).add_cte(added)
+
+
+async def import_cards(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    rows: AsyncIterable[ParsedRow],
+    skip_duplicates: bool = False,
+) -> AsyncIterator[CardImportEvent]:
+    """Import parsed rows into a collection, yielding a progress event per
+    chunk, an error event per invalid row and a closing summary.
+
+    The upload is read to the end before the import touches the database:
+    valid rows are fingerprinted and spooled in memory, or in a temporary
+    file once they outgrow `CARD_IMPORT_SPOOL_MAX_MEMORY`, so a slow client
+    holds no connection, transaction or lock. The spooled rows are then
+    COPYed into a temporary table and moved into the collection in one
+    statement, so the import is committed as a whole and invalid rows are
+    skipped. If the upload cannot be read to the end, nothing is imported.
+
+    With `skip_duplicates`, near-duplicates of the collection's cards or of
+    earlier rows are left out and counted as skipped. The collection's
+    signatures are read in a short transaction of their own before the
+    upload, so cards added to it while the upload is read are not compared.
+    """
+    duplicates = None
+    if skip_duplicates:
+        connection = await session.connection()
+        await _fingerprint_collection(connection, collection_id)
+        duplicates = await _load_duplicate_index(connection, collection_id)
+        await session.commit()
+
+    staged = failed = skipped = 0
+    chunk: list[CardBase] = []
+    with tempfile.SpooledTemporaryFile(
+        max_size=settings.CARD_IMPORT_SPOOL_MAX_MEMORY
+    ) as spool:
+        try:
+            async for line, row in rows:
+                if isinstance(row, str):
+                    failed += 1
+                    if failed <= settings.CARD_IMPORT_MAX_REPORTED_ERRORS:
+                        yield CardImportRowError(line=line, detail=row)
+                    continue
+                chunk.append(row)
+                if len(chunk) >= settings.CARD_IMPORT_CHUNK_SIZE:
+                    kept = await asyncio.to_thread(
+                        _stage_rows, spool, chunk, duplicates
+                    )
+                    staged += kept
+                    skipped += len(chunk) - kept
+                    chunk = []
+                    yield CardImportProgress(
+                        staged=staged, failed=failed, skipped=skipped
+                    )
+            if chunk:
+                kept = await asyncio.to_thread(_stage_rows, spool, chunk, duplicates)
+                staged += kept
+                skipped += len(chunk) - kept
+        except CardImportError as e:
+            yield CardImportRowError(line=e.line, detail=e.detail)
+            yield CardImportSummary(imported=0, failed=failed)
+            return
+
+        imported = 0
+        if staged:
+            connection = await session.connection()
+            await connection.execute(
+                text(
+                    "CREATE TEMPORARY TABLE card_import (front text NOT NULL, "
+                    "back text NOT NULL, minhash bytea, lsh_buckets bigint[]) "
+                    "ON COMMIT DROP"
+                )
+            )
+            raw_connection = await connection.get_raw_connection()
+            await _copy_staged_rows(raw_connection.driver_connection, spool)
+            imported = (
+                await connection.execute(_load_staged_cards_statement(collection_id))
+            ).scalar_one()
+            await connection.execute(bump_collection_version_statement(collection_id))
+            await session.commit()
+    yield CardImportSummary(imported=imported, failed=failed, skipped=skipped)
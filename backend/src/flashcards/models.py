@@ -1,7 +1,19 @@
 import uuid
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    FetchedValue,
+    Index,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import declared_attr, deferred
 from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
@@ -9,35 +21,106 @@ if TYPE_CHECKING:
 
 
 class Collection(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_collection_user_id_updated_at_id", "user_id", "updated_at", "id"),
+        # Substring lookups of the typeahead, see `match_collection_names`
+        Index(
+            "ix_collection_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     id: uuid.UUID | None = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str = Field(index=True)
-    user_id: uuid.UUID = Field(foreign_key="user.id", index=True, ondelete="CASCADE")
+    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE")
     user: "User" = Relationship(back_populates="collections")
-    cards: list["Card"] = Relationship(back_populates="collection", cascade_delete=True)
+    cards: list["Card"] = Relationship(
+        back_populates="collection", cascade_delete=True, passive_deletes=True
+    )
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Bumped by every change to the collection, its cards or its practice
+    # sessions; conditional GETs derive their ETags from it
+    version: int = Field(default=1)
     practice_sessions: list["PracticeSession"] = Relationship(
-        back_populates="collection", sa_relationship_kwargs={"cascade": "all, delete"}
+        back_populates="collection", cascade_delete=True, passive_deletes=True
     )
 
 
 class Card(SQLModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_card_collection_id_updated_at_id", "collection_id", "updated_at", "id"
+        ),
+        Index("ix_card_lsh_buckets", "lsh_buckets", postgresql_using="gin"),
+        # Generated tsvector of the text for full-text search, see its
+        # migration and `search_cards`. It is part of the table but not
+        # mapped, as even a deferred column would be returned by every
+        # insert and update
+        Column(
+            "search_vector",
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', front), 'A') || "
+                "setweight(to_tsvector('simple', back), 'B')",
+                persisted=True,
+            ),
+        ),
+        Index("ix_card_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id: uuid.UUID | None = Field(default_factory=uuid.uuid4, primary_key=True)
     front: str = Field(max_length=3000)
     back: str = Field(max_length=3000)
-    collection_id: uuid.UUID = Field(foreign_key="collection.id", index=True)
+    collection_id: uuid.UUID = Field(foreign_key="collection.id", ondelete="CASCADE")
     collection: Collection = Relationship(back_populates="cards")
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     practice_cards: list["PracticeCard"] = Relationship(
-        back_populates="card", sa_relationship_kwargs={"cascade": "all, delete"}
+        back_populates="card", cascade_delete=True, passive_deletes=True
+    )
+    # MinHash signature of the text and its LSH band keys, see `dedup`.
+    # Cleared when cards are changed in bulk; such cards are fingerprinted
+    # again when their collection is next checked for duplicates. Both are
+    # deferred, so loading cards does not load the fingerprints with them.
+    minhash: bytes | None = Field(default=None, sa_column=Column(LargeBinary))
+    lsh_buckets: list[int] | None = Field(
+        default=None, sa_column=Column(ARRAY(BigInteger))
+    )
+    # Plain text start of the front, for lists; a generated column, see its
+    # migration, so it is never written but loaded back after inserts
+    preview: str | None = Field(
+        default=None,
+        sa_column=Column(
+            String, server_default=FetchedValue(), server_onupdate=FetchedValue()
+        ),
     )
 
+    @declared_attr
+    def __mapper_args__(cls) -> dict[str, Any]:
+        return {
+            "properties": {
+                "minhash": deferred(cls.__table__.c.minhash),
+                "lsh_buckets": deferred(cls.__table__.c.lsh_buckets),
+            },
+            "exclude_properties": ["search_vector"],
+        }
+
 
 class PracticeSession(SQLModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_practicesession_user_id_created_at_id", "user_id", "created_at", "id"
+        ),
+    )
+
     id: uuid.UUID | None = Field(default_factory=uuid.uuid4, primary_key=True)
-    collection_id: uuid.UUID = Field(foreign_key="collection.id", index=True)
-    user_id: uuid.UUID = Field(foreign_key="user.id", index=True, ondelete="CASCADE")
+    collection_id: uuid.UUID = Field(
+        foreign_key="collection.id", index=True, ondelete="CASCADE"
+    )
+    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE")
     user: "User" = Relationship(back_populates="practice_sessions")
     is_completed: bool = Field(default=False)
     total_cards: int = Field(default=0)
@@ -49,17 +132,65 @@ class PracticeSession(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     collection: Collection = Relationship(back_populates="practice_sessions")
     practice_cards: list["PracticeCard"] = Relationship(
-        back_populates="session", cascade_delete=True
+        back_populates="session", cascade_delete=True, passive_deletes=True
     )
 
 
 class PracticeCard(SQLModel, table=True):
+    __table_args__ = (
+        Index(
+            "ix_practicecard_session_id_created_at_id", "session_id", "created_at", "id"
+        ),
+        Index(
+            "ix_practicecard_session_id_updated_at_id", "session_id", "updated_at", "id"
+        ),
+    )
+
     id: uuid.UUID | None = Field(default_factory=uuid.uuid4, primary_key=True)
-    session_id: uuid.UUID = Field(foreign_key="practicesession.id", index=True)
-    card_id: uuid.UUID = Field(foreign_key="card.id", index=True)
+    session_id: uuid.UUID = Field(foreign_key="practicesession.id", ondelete="CASCADE")
+    card_id: uuid.UUID = Field(foreign_key="card.id", index=True, ondelete="CASCADE")
     is_correct: bool | None = Field(default=None)
     is_practiced: bool = Field(default=False)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     session: PracticeSession = Relationship(back_populates="practice_cards")
     card: Card = Relationship(back_populates="practice_cards")
+
+
+class AnkiDeckImport(SQLModel, table=True):
+    """Status of an Anki deck import. The worker process that received the
+    deck runs it, and writes its progress here so any worker can report it."""
+
+    id: uuid.UUID = Field(primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", index=True, ondelete="CASCADE")
+    status: str = Field(default="pending", max_length=16)
+    collection_id: uuid.UUID | None = Field(
+        default=None, foreign_key="collection.id", ondelete="SET NULL"
+    )
+    imported: int = Field(default=0)
+    failed: int = Field(default=0)
+    # The reported `CardImportRowError`s
+    errors: list[dict[str, Any]] = Field(
+        default_factory=list, sa_column=Column(JSONB, nullable=False)
+    )
+    detail: str | None = Field(default=None)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class CollectionShare(SQLModel, table=True):
+    """A copy of a collection offered to another user. It is only made once
+    they accept the offer, see `accept_collection_share`."""
+
+    __table_args__ = (UniqueConstraint("collection_id", "recipient_id"),)
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    collection_id: uuid.UUID = Field(foreign_key="collection.id", ondelete="CASCADE")
+    recipient_id: uuid.UUID = Field(
+        foreign_key="user.id", index=True, ondelete="CASCADE"
+    )
+    # Name of the copy, the collection's own name when not given
+    name: str | None = Field(default=None)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, EmailStr, Field
 from sqlmodel import SQLModel
 
 
@@ -17,9 +18,18 @@ class CollectionUpdate(SQLModel):
     name: str | None = None
 
 
+class CollectionClone(SQLModel):
+    name: str | None = None
+
+
+class CollectionShareCreate(CollectionClone):
+    # The user offered a copy
+    email: EmailStr = Field(max_length=255)
+
+
 class CardBase(SQLModel):
-    front: str
-    back: str
+    front: str = Field(max_length=3000)
+    back: str = Field(max_length=3000)
 
 
 class CardCreate(CardBase):
@@ -27,8 +37,8 @@ class CardCreate(CardBase):
 
 
 class CardUpdate(CardBase):
-    front: str | None = None
-    back: str | None = None
+    front: str | None = Field(default=None, max_length=3000)
+    back: str | None = Field(default=None, max_length=3000)
 
 
 class Card(CardBase):
@@ -36,19 +46,83 @@ class Card(CardBase):
     collection_id: uuid.UUID
 
 
+# Card attributes a list can be narrowed to with `fields`. `preview` is the
+# start of the front as plain text, and only returned when asked for.
+CardField = Literal["id", "collection_id", "front", "back", "preview"]
+
+
 class Collection(CollectionBase):
     id: uuid.UUID
     user_id: uuid.UUID
     cards: list[Card]
 
 
+class CollectionSummary(CollectionBase):
+    id: uuid.UUID
+    card_count: int
+    updated_at: datetime
+    last_practiced_at: datetime | None
+
+
+class CollectionName(SQLModel):
+    id: uuid.UUID
+    name: str
+
+
+class CollectionNameList(SQLModel):
+    data: list[CollectionName]
+
+
 class CollectionList(SQLModel):
-    data: list[Collection]
+    data: list[CollectionSummary]
+    count: int | None
+    next_cursor: str | None = None
+
+
+class SharedCollection(SQLModel):
+    # Id of the offer
+    id: uuid.UUID
+    # Name the copy will have
+    name: str
+    sender_email: str
+    created_at: datetime
+
+
+class SharedCollectionList(SQLModel):
+    data: list[SharedCollection]
     count: int
 
 
 class CardList(SQLModel):
     data: list[Card]
+    count: int | None
+    next_cursor: str | None = None
+
+
+class CardSearchResult(SQLModel):
+    id: uuid.UUID
+    collection_id: uuid.UUID
+    rank: float
+    # Plain text excerpts, HTML escaped, with the matched words in <mark>
+    front_snippet: str
+    back_snippet: str
+
+
+class CardSearchList(SQLModel):
+    data: list[CardSearchResult]
+    count: int | None
+    next_cursor: str | None = None
+
+
+class CardDuplicateCluster(SQLModel):
+    # Lowest estimated similarity, from 0 to 1, between the cards found to
+    # be near-duplicates of each other
+    similarity: float
+    cards: list[Card]
+
+
+class CardDuplicateList(SQLModel):
+    data: list[CardDuplicateCluster]
     count: int
 
 
@@ -100,7 +174,8 @@ class PracticeSession(PracticeSessionBase):
 
 class PracticeSessionList(SQLModel):
     data: list[PracticeSession]
-    count: int
+    count: int | None
+    next_cursor: str | None = None
 
 
 class PracticeCardResponse(SQLModel):
@@ -125,8 +200,75 @@ class PracticeResultSubmit(SQLModel):
 
 class PracticeCardListResponse(SQLModel):
     data: list[PracticeCardResponse]
-    count: int
+    count: int | None
+    next_cursor: str | None = None
 
 
 class PracticeCardResultPatch(SQLModel):
     is_correct: bool
+
+
+class CardImportProgress(SQLModel):
+    type: Literal["progress"] = "progress"
+    # Valid rows read so far, less skipped ones. They are inserted together
+    # once the upload is read, and the summary reports how many were
+    staged: int
+    failed: int
+    # Near-duplicates left out, when the import skips them
+    skipped: int = 0
+
+
+class CardImportRowError(SQLModel):
+    type: Literal["error"] = "error"
+    line: int
+    detail: str
+
+
+class CardImportSummary(SQLModel):
+    type: Literal["summary"] = "summary"
+    imported: int
+    failed: int
+    skipped: int = 0
+
+
+class AnkiImport(SQLModel):
+    id: uuid.UUID
+    status: Literal["pending", "running", "done", "failed"] = "pending"
+    # Set once the worker has created the collection for the deck
+    collection_id: uuid.UUID | None = None
+    imported: int = 0
+    failed: int = 0
+    errors: list[CardImportRowError] = []
+    detail: str | None = None
+
+
+class CardBulkBase(SQLModel):
+    card_ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+
+class CardBulkUpdate(CardBulkBase):
+    action: Literal["update"]
+    changes: CardUpdate
+
+
+class CardBulkMove(CardBulkBase):
+    action: Literal["move"]
+    target_collection_id: uuid.UUID
+
+
+class CardBulkDelete(CardBulkBase):
+    action: Literal["delete"]
+
+
+CardBulkOperation = Annotated[
+    CardBulkUpdate | CardBulkMove | CardBulkDelete, Field(discriminator="action")
+]
+
+
+class CardBulkResult(SQLModel):
+    id: uuid.UUID
+    status: Literal["updated", "moved", "deleted", "not_found"]
+
+
+class CardBulkResponse(SQLModel):
+    data: list[CardBulkResult]
@@ -1,265 +1,1027 @@
+import asyncio
+import html
 import json
 import random
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, timezone
-from typing import Literal
+from typing import Any, Literal
 
 from google import genai
 from pydantic import ValidationError
-from sqlmodel import Session, func, select
+from sqlalchemy import (
+    Float,
+    Row,
+    String,
+    cast,
+    false,
+    insert,
+    literal,
+    text,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import delete, func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.ai_models.gemini.exceptions import AIGenerationError
+from src.core.pagination import (
+    CountMode,
+    Cursor,
+    after_cursor,
+    fetch_page,
+    keyset_order,
+)
+from src.users.models import User
 
+from . import dedup
 from .ai_config import get_card_config, get_flashcard_config
-from .exceptions import EmptyCollectionError
-from .models import Card, Collection, PracticeCard, PracticeSession
+from .cache import typeahead_cache, typeahead_term
+from .exceptions import (
+    CollectionNotFoundError,
+    DuplicateCardError,
+    EmptyCollectionError,
+)
+from .models import (
+    Card,
+    Collection,
+    CollectionShare,
+    PracticeCard,
+    PracticeSession,
+)
 from .schemas import (
     AIFlashcardCollection,
     CardBase,
     CardCreate,
+    CardDuplicateCluster,
+    CardField,
+    CardSearchResult,
     CardUpdate,
+    CollectionName,
+    CollectionSummary,
     CollectionUpdate,
+    SharedCollection,
 )
 
 
-def get_collections(
-    session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> tuple[list[Collection], int]:
-    count_statement = select(func.count()).where(Collection.user_id == user_id)
-    count = session.exec(count_statement).one()
+async def get_collections(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: Cursor | None = None,
+    count: CountMode = "exact",
+) -> tuple[list[CollectionSummary], int | None]:
+    filtered = select(Collection.id).where(Collection.user_id == user_id)
+    card_count = (
+        select(func.count(Card.id))
+        .where(Card.collection_id == Collection.id)
+        .scalar_subquery()
+    )
+    last_practiced_at = (
+        select(func.max(PracticeSession.updated_at))
+        .where(
+            PracticeSession.collection_id == Collection.id,
+            PracticeSession.cards_practiced > 0,
+        )
+        .scalar_subquery()
+    )
     statement = (
-        select(Collection)
+        select(
+            Collection.id,
+            Collection.name,
+            Collection.updated_at,
+            card_count.label("card_count"),
+            last_practiced_at.label("last_practiced_at"),
+        )
         .where(Collection.user_id == user_id)
-        .order_by(Collection.updated_at.desc())
+        .order_by(*keyset_order(Collection.updated_at, Collection.id))
         .offset(skip)
         .limit(limit)
     )
-    collections = session.exec(statement).all()
-    return collections, count
+    if after is not None:
+        statement = statement.where(
+            after_cursor(Collection.updated_at, Collection.id, after)
+        )
+    rows, total = await fetch_page(session, statement, filtered, count)
+    return [CollectionSummary(**row._mapping) for row in rows], total
+
 
+async def get_collections_version(session: AsyncSession, user_id: uuid.UUID) -> str:
+    """Digest of the id and version of every collection the user owns.
+
+    It changes whenever a collection is created, changed or deleted.
+    """
+    entry = cast(Collection.id, String) + ":" + cast(Collection.version, String)
+    statement = select(
+        func.md5(
+            func.coalesce(
+                func.string_agg(entry, aggregate_order_by(literal(","), Collection.id)),
+                "",
+            )
+        )
+    ).where(Collection.user_id == user_id)
+    return (await session.exec(statement)).one()
+
+
+async def get_collection_version(
+    session: AsyncSession, collection_id: uuid.UUID, user_id: uuid.UUID
+) -> int | None:
+    """Version of the collection, or None if the user has no such collection."""
+    statement = select(Collection.version).where(
+        Collection.id == collection_id, Collection.user_id == user_id
+    )
+    return (await session.exec(statement)).first()
+
+
+def bump_collection_version_statement(collection_id: uuid.UUID):
+    return (
+        update(Collection)
+        .where(Collection.id == collection_id)
+        .values(version=Collection.version + 1)
+    )
 
-def get_collection(
-    session: Session, id: uuid.UUID, user_id: uuid.UUID
+
+async def get_collection(
+    session: AsyncSession, id: uuid.UUID, user_id: uuid.UUID
 ) -> Collection | None:
     statement = select(Collection).where(
         Collection.id == id, Collection.user_id == user_id
     )
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
+
 
+async def get_collection_with_cards(
+    session: AsyncSession,
+    id: uuid.UUID,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+) -> Collection | None:
+    """Get a collection with one page of its cards loaded into `cards`."""
+    collection = await get_collection(session=session, id=id, user_id=user_id)
+    if not collection:
+        return None
+    return await load_collection_cards(session, collection, skip=skip, limit=limit)
 
-def create_collection(
-    session: Session, user_id: uuid.UUID, name: str, cards: list[CardBase] | None = None
+
+async def load_collection_cards(
+    session: AsyncSession, collection: Collection, skip: int = 0, limit: int = 100
 ) -> Collection:
-    collection = Collection(name=name, user_id=user_id)
-    session.add(collection)
-    session.flush()
-
-    if cards:
-        card_objs = [
-            Card(
-                front=card.front,
-                back=card.back,
-                collection_id=collection.id,
-            )
-            for card in cards
+    """Load one page of the collection's cards into `cards`."""
+    statement = (
+        select(Card)
+        .where(Card.collection_id == collection.id)
+        .order_by(Card.updated_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    cards = (await session.exec(statement)).all()
+    set_committed_value(collection, "cards", cards)
+    return collection
+
+
+def _fingerprint(cards: Sequence[Card]) -> list[bool]:
+    """Set the MinHash signature and LSH buckets of new or edited cards and
+    return, for each card, whether it is no near-duplicate of an earlier
+    one."""
+    signatures, keys = dedup.fingerprint([(card.front, card.back) for card in cards])
+    for card, signature, card_keys in zip(cards, signatures, keys, strict=True):
+        card.minhash = dedup.to_bytes(signature)
+        card.lsh_buckets = card_keys.tolist()
+    return dedup.DuplicateIndex().add_distinct(signatures, keys).tolist()
+
+
+def _new_collection(
+    user_id: uuid.UUID,
+    name: str,
+    cards: list[CardBase] | None,
+    skip_duplicates: bool = False,
+) -> Collection:
+    new_cards = [Card(front=card.front, back=card.back) for card in cards or []]
+    distinct = _fingerprint(new_cards)
+    if skip_duplicates:
+        new_cards = [
+            card for card, keep in zip(new_cards, distinct, strict=True) if keep
         ]
-        session.add_all(card_objs)
-    session.commit()
-    session.refresh(collection)
+    # Cards are attached through the relationship, so the collection comes
+    # back from the commit with them loaded and needs no reload
+    return Collection(name=name, user_id=user_id, cards=new_cards)
+
+
+async def create_collection(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    name: str,
+    cards: list[CardBase] | None = None,
+    skip_duplicates: bool = False,
+) -> Collection:
+    # Fingerprinting is CPU-bound, so it runs in a worker thread
+    collection = await asyncio.to_thread(
+        _new_collection, user_id, name, cards, skip_duplicates
+    )
+    session.add(collection)
+    await session.commit()
+    typeahead_cache.invalidate_user(user_id)
     return collection
 
 
-def update_collection(
-    session: Session, collection: Collection, collection_in: CollectionUpdate
+async def update_collection(
+    session: AsyncSession, collection: Collection, collection_in: CollectionUpdate
 ) -> Collection:
     collection_data = collection_in.model_dump(exclude_unset=True)
     for key, value in collection_data.items():
         setattr(collection, key, value)
     collection.updated_at = datetime.now(timezone.utc)
+    collection.version = Collection.version + 1
     session.add(collection)
-    session.commit()
-    session.refresh(collection)
+    await session.commit()
+    typeahead_cache.invalidate_user(collection.user_id)
     return collection
 
 
-def delete_collection(session: Session, collection: Collection) -> None:
-    session.delete(collection)
-    session.commit()
+async def delete_collection(session: AsyncSession, collection: Collection) -> None:
+    user_id = collection.user_id
+    # Cards, practice sessions and practice cards are deleted by the database
+    await session.delete(collection)
+    await session.commit()
+    typeahead_cache.invalidate_user(user_id)
+
+
+async def clone_collection(
+    session: AsyncSession,
+    collection: Collection,
+    user_id: uuid.UUID,
+    name: str | None = None,
+) -> CollectionSummary:
+    """Copy a collection and its cards into the account of `user_id`.
+
+    The cards are copied by the database with one INSERT ... SELECT, keeping
+    their timestamps so they list in the same order, and their signatures.
+    Practice sessions are not copied.
+    """
+    now = datetime.now(timezone.utc)
+    clone = Collection(
+        name=name or collection.name, user_id=user_id, created_at=now, updated_at=now
+    )
+    session.add(clone)
+    await session.flush()
+    copied = (
+        insert(Card)
+        .from_select(
+            [
+                "id",
+                "front",
+                "back",
+                "collection_id",
+                "created_at",
+                "updated_at",
+                "minhash",
+                "lsh_buckets",
+            ],
+            select(
+                func.gen_random_uuid(),
+                Card.front,
+                Card.back,
+                literal(clone.id),
+                Card.created_at,
+                Card.updated_at,
+                Card.minhash,
+                Card.lsh_buckets,
+            ).where(Card.collection_id == collection.id),
+        )
+        .returning(Card.id)
+        .cte("copied")
+    )
+    card_count = (await session.exec(select(func.count()).select_from(copied))).one()
+    summary = CollectionSummary(
+        id=clone.id,
+        name=clone.name,
+        card_count=card_count,
+        updated_at=clone.updated_at,
+        last_practiced_at=None,
+    )
+    await session.commit()
+    typeahead_cache.invalidate_user(user_id)
+    return summary
 
 
-def get_cards(
-    session: Session, collection_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> tuple[list[Card], int]:
-    count_statement = select(func.count()).where(Card.collection_id == collection_id)
-    count = session.exec(count_statement).one()
+async def share_collection(
+    session: AsyncSession,
+    collection: Collection,
+    recipient_id: uuid.UUID,
+    name: str | None = None,
+) -> None:
+    """Offer a copy of a collection to the user `recipient_id`. Offering the
+    same collection again replaces the earlier offer."""
+    values = {"name": name, "created_at": datetime.now(timezone.utc)}
+    statement = pg_insert(CollectionShare).values(
+        id=uuid.uuid4(),
+        collection_id=collection.id,
+        recipient_id=recipient_id,
+        **values,
+    )
+    await session.exec(
+        statement.on_conflict_do_update(
+            index_elements=["collection_id", "recipient_id"], set_=values
+        )
+    )
+    await session.commit()
+
+
+async def get_collection_shares(
+    session: AsyncSession, recipient_id: uuid.UUID
+) -> list[SharedCollection]:
+    """Offers made to a user, newest first."""
     statement = (
-        select(Card)
+        select(
+            CollectionShare.id,
+            func.coalesce(CollectionShare.name, Collection.name).label("name"),
+            User.email.label("sender_email"),
+            CollectionShare.created_at,
+        )
+        .join(Collection, Collection.id == CollectionShare.collection_id)
+        .join(User, User.id == Collection.user_id)
+        .where(CollectionShare.recipient_id == recipient_id)
+        .order_by(CollectionShare.created_at.desc())
+    )
+    rows = await session.exec(statement)
+    return [SharedCollection(**row._mapping) for row in rows]
+
+
+async def get_collection_share(
+    session: AsyncSession, id: uuid.UUID, recipient_id: uuid.UUID
+) -> CollectionShare | None:
+    statement = select(CollectionShare).where(
+        CollectionShare.id == id, CollectionShare.recipient_id == recipient_id
+    )
+    return (await session.exec(statement)).first()
+
+
+async def accept_collection_share(
+    session: AsyncSession, share: CollectionShare
+) -> CollectionSummary:
+    """Copy the offered collection into the recipient's account, and remove
+    the offer in the same transaction."""
+    collection = await session.get_one(Collection, share.collection_id)
+    await session.delete(share)
+    return await clone_collection(
+        session=session,
+        collection=collection,
+        user_id=share.recipient_id,
+        name=share.name,
+    )
+
+
+async def decline_collection_share(
+    session: AsyncSession, share: CollectionShare
+) -> None:
+    await session.delete(share)
+    await session.commit()
+
+
+# Most matches a typeahead lookup returns
+TYPEAHEAD_MAX_RESULTS = 20
+# Matches fetched per typeahead lookup. When a term has fewer, they are all
+# cached and answer every longer term starting with it; otherwise only the
+# first TYPEAHEAD_MAX_RESULTS are.
+TYPEAHEAD_MATCHES = 200
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def match_collection_names(
+    session: AsyncSession, user_id: uuid.UUID, term: str, limit: int = 10
+) -> list[CollectionName]:
+    """Names of the user's collections containing `term`, ignoring case,
+    best first. Served from `typeahead_cache` when it can answer."""
+    term = typeahead_term(term)
+    matches = typeahead_cache.get(user_id, term)
+    if matches is None:
+        # Substring matches are served by the trigram index on the name
+        position = func.strpos(func.lower(Collection.name), term)
+        statement = (
+            select(Collection.id, Collection.name)
+            .where(
+                Collection.user_id == user_id,
+                Collection.name.ilike(f"%{_escape_like(term)}%", escape="\\"),
+            )
+            .order_by(
+                position != 1, position, func.length(Collection.name), Collection.id
+            )
+            .limit(TYPEAHEAD_MATCHES)
+        )
+        rows = await session.exec(statement)
+        matches = [CollectionName(id=id, name=name) for id, name in rows]
+        complete = len(matches) < TYPEAHEAD_MATCHES
+        if not complete:
+            matches = matches[:TYPEAHEAD_MAX_RESULTS]
+        typeahead_cache.put(user_id, term, matches, complete=complete)
+    return matches[:limit]
+
+
+def _sparse_card_columns(fields: Sequence[CardField], prefix: str = "") -> list:
+    return [getattr(Card, field).label(prefix + field) for field in fields]
+
+
+async def get_cards(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: Cursor | None = None,
+    count: CountMode = "exact",
+    fields: Sequence[CardField] | None = None,
+) -> tuple[list[Card] | list[Row], int | None]:
+    """A page of the cards of a collection, most recently updated first.
+
+    With `fields`, only those columns are read and the page holds rows with
+    them, along with `id` and `updated_at` to page on.
+    """
+    filtered = select(Card.id).where(Card.collection_id == collection_id)
+    if fields is None:
+        columns = [Card]
+    else:
+        columns = _sparse_card_columns(
+            list(dict.fromkeys([*fields, "id", "updated_at"]))
+        )
+    statement = (
+        select(*columns)
         .where(Card.collection_id == collection_id)
-        .order_by(Card.updated_at.desc())
+        .order_by(*keyset_order(Card.updated_at, Card.id))
         .offset(skip)
         .limit(limit)
     )
-    cards = session.exec(statement).all()
-    return cards, count
+    if after is not None:
+        statement = statement.where(after_cursor(Card.updated_at, Card.id, after))
+    rows, total = await fetch_page(session, statement, filtered, count)
+    if fields is not None:
+        return rows, total
+    return [row.Card for row in rows], total
+
+
+# Text search configuration of `card.search_vector`, see its migration
+SEARCH_CONFIG = "simple"
+# Private use characters mark the matches in headlines until the text is
+# escaped, as the card content may hold HTML of its own
+_MATCH_START, _MATCH_STOP = "\ue000", "\ue001"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_MATCH_START}, StopSel={_MATCH_STOP}, "
+    "MinWords=10, MaxWords=30, MaxFragments=2"
+)
+
+
+def _snippet(headline: str) -> str:
+    text = " ".join(html.escape(html.unescape(headline)).split())
+    return text.replace(_MATCH_START, "<mark>").replace(_MATCH_STOP, "</mark>")
+
+
+async def search_cards(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    query: str,
+    collection_id: uuid.UUID | None = None,
+    limit: int = 20,
+    after: Cursor | None = None,
+    count: CountMode = "exact",
+) -> tuple[list[CardSearchResult], int | None]:
+    """Cards of the user matching a web search style `query`, most relevant
+    first, optionally in one collection.
+
+    Matches are found through the GIN index on `card.search_vector`.
+    Snippets are only built for the cards of the page.
+    """
+    config = cast(SEARCH_CONFIG, REGCONFIG)
+    ts_query = func.websearch_to_tsquery(config, query)
+    search_vector = Card.__table__.c.search_vector
+    # Double precision, so the rank in a cursor compares equal to the row's
+    rank = cast(func.ts_rank(search_vector, ts_query), Float)
+    filters = [Collection.user_id == user_id, search_vector.op("@@")(ts_query)]
+    if collection_id is not None:
+        filters.append(Card.collection_id == collection_id)
+
+    filtered = select(Card.id).join(Collection).where(*filters)
+    page = (
+        select(Card.id, Card.collection_id, Card.front, Card.back, rank.label("rank"))
+        .join(Collection)
+        .where(*filters)
+        .order_by(*keyset_order(rank, Card.id))
+        .limit(limit)
+    )
+    if after is not None:
+        page = page.where(after_cursor(rank, Card.id, after))
+    page = page.subquery()
+    statement = select(
+        page.c.id,
+        page.c.collection_id,
+        page.c.rank,
+        func.ts_headline(config, page.c.front, ts_query, _HEADLINE_OPTIONS).label(
+            "front_snippet"
+        ),
+        func.ts_headline(config, page.c.back, ts_query, _HEADLINE_OPTIONS).label(
+            "back_snippet"
+        ),
+    ).order_by(*keyset_order(page.c.rank, page.c.id))
+    rows, total = await fetch_page(session, statement, filtered, count)
+    results = [
+        CardSearchResult(
+            id=row.id,
+            collection_id=row.collection_id,
+            rank=row.rank,
+            front_snippet=_snippet(row.front_snippet),
+            back_snippet=_snippet(row.back_snippet),
+        )
+        for row in rows
+    ]
+    return results, total
+
+
+async def export_cards(
+    session: AsyncSession, collection_id: uuid.UUID, chunk_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield the front and back of a collection's cards, oldest change first,
+    in chunks of `chunk_size` rows fetched from a server-side cursor, so
+    memory does not grow with the collection."""
+    statement = (
+        select(Card.front, Card.back)
+        .where(Card.collection_id == collection_id)
+        .order_by(*keyset_order(Card.updated_at, Card.id, descending=False))
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await session.stream(statement)
+    async for partition in result.partitions():
+        yield partition
 
 
-def get_card(session: Session, card_id: uuid.UUID) -> Card | None:
-    return session.get(Card, card_id)
+async def get_card(session: AsyncSession, card_id: uuid.UUID) -> Card | None:
+    return await session.get(Card, card_id)
 
 
-def get_card_with_collection(
-    session: Session, card_id: uuid.UUID, user_id: uuid.UUID
+async def get_card_with_collection(
+    session: AsyncSession, card_id: uuid.UUID, user_id: uuid.UUID
 ) -> Card | None:
     statement = (
         select(Card)
         .join(Collection)
         .where(Card.id == card_id, Collection.user_id == user_id)
     )
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
-def _add_card_to_ongoing_sessions(session: Session, card: Card) -> None:
-    statement = select(PracticeSession).where(
-        PracticeSession.collection_id == card.collection_id,
-        PracticeSession.is_completed.is_not(True),
+async def get_owned_card(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    card_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> tuple[bool, Card | None]:
+    """Check that the user owns the collection and load one of its cards in a
+    single query.
+
+    Returns whether the collection was found, and the card if it belongs to
+    that collection.
+    """
+    statement = (
+        select(Collection.id, Card)
+        .outerjoin(Card, (Card.collection_id == Collection.id) & (Card.id == card_id))
+        .where(Collection.id == collection_id, Collection.user_id == user_id)
     )
-    practice_session = session.exec(statement).first()
+    row = (await session.exec(statement)).first()
+    if row is None:
+        return False, None
+    return True, row.Card
 
-    if practice_session:
-        practice_card = PracticeCard(
-            session_id=practice_session.id,
-            card_id=card.id,
+
+def _grow_ongoing_sessions_statement(card: Card):
+    return (
+        update(PracticeSession)
+        .where(
+            PracticeSession.collection_id == card.collection_id,
+            PracticeSession.is_completed.is_not(True),
         )
-        session.add(practice_card)
-        practice_session.total_cards += 1
-        practice_session.updated_at = datetime.now(timezone.utc)
-        session.add(practice_session)
+        .values(
+            total_cards=PracticeSession.total_cards + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(PracticeSession.id)
+    )
+
 
+async def _add_card_to_ongoing_sessions(session: AsyncSession, card: Card) -> None:
+    result = await session.exec(_grow_ongoing_sessions_statement(card))
+    session_ids = result.scalars().all()
+    session.add_all(
+        PracticeCard(session_id=session_id, card_id=card.id)
+        for session_id in session_ids
+    )
 
-def create_card(
-    session: Session, collection_id: uuid.UUID, card_in: CardCreate
+
+async def _new_card(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    card_in: CardCreate,
+    skip_duplicates: bool,
 ) -> Card:
     card = Card(collection_id=collection_id, **card_in.model_dump())
+    await asyncio.to_thread(_fingerprint, [card])
+    if skip_duplicates:
+        if duplicate_id := await find_near_duplicate(session, collection_id, card):
+            raise DuplicateCardError(duplicate_id)
+    return card
+
+
+async def create_card(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    card_in: CardCreate,
+    skip_duplicates: bool = False,
+) -> Card:
+    """Add a card to a collection. With `skip_duplicates`, a card that is a
+    near-duplicate of one in the collection raises `DuplicateCardError`."""
+    card = await _new_card(session, collection_id, card_in, skip_duplicates)
     session.add(card)
-    session.flush()
+    await session.flush()
 
-    _add_card_to_ongoing_sessions(session, card)
+    await _add_card_to_ongoing_sessions(session, card)
+    await session.exec(bump_collection_version_statement(collection_id))
 
-    session.commit()
-    session.refresh(card)
+    await session.commit()
     return card
 
 
-def update_card(session: Session, card: Card, card_in: CardUpdate) -> Card:
+async def update_card(session: AsyncSession, card: Card, card_in: CardUpdate) -> Card:
     card_data = card_in.model_dump(exclude_unset=True)
     for key, value in card_data.items():
         setattr(card, key, value)
+    if card_data.keys() & {"front", "back"}:
+        await asyncio.to_thread(_fingerprint, [card])
     card.updated_at = datetime.now(timezone.utc)
     session.add(card)
-    session.commit()
-    session.refresh(card)
+    await session.exec(bump_collection_version_statement(card.collection_id))
+    await session.commit()
     return card
 
 
-def _remove_incomplete_practice_sessions(session: Session, card: Card) -> None:
-    statement = (
-        select(PracticeSession)
-        .join(PracticeCard, PracticeCard.session_id == PracticeSession.id)
+async def delete_card(session: AsyncSession, card: Card) -> None:
+    await _remove_incomplete_practice_sessions(session, card.collection_id, [card.id])
+    # Practice cards of the card are deleted by the database
+    await session.delete(card)
+    await session.exec(bump_collection_version_statement(card.collection_id))
+    await session.commit()
+
+
+def _collection_cards(collection_id: uuid.UUID, card_ids: list[uuid.UUID]):
+    return Card.collection_id == collection_id, Card.id.in_(card_ids)
+
+
+async def _remove_incomplete_practice_sessions(
+    session: AsyncSession, collection_id: uuid.UUID, card_ids: list[uuid.UUID]
+) -> None:
+    """Delete the practice sessions that are not completed and include any of
+    the cards, with their practice cards, in one statement."""
+    session_ids = (
+        select(PracticeCard.session_id)
+        .join(Card, Card.id == PracticeCard.card_id)
+        .where(*_collection_cards(collection_id, card_ids))
+    )
+    await session.exec(
+        delete(PracticeSession).where(
+            PracticeSession.id.in_(session_ids),
+            PracticeSession.is_completed.is_not(True),
+        )
+    )
+
+
+def _add_cards_to_ongoing_sessions_statement(
+    collection_id: uuid.UUID, card_ids: list[uuid.UUID]
+):
+    now = datetime.now(timezone.utc)
+    grown = (
+        update(PracticeSession)
         .where(
-            PracticeCard.card_id == card.id,
+            PracticeSession.collection_id == collection_id,
             PracticeSession.is_completed.is_not(True),
         )
-        .distinct()
+        .values(total_cards=PracticeSession.total_cards + len(card_ids), updated_at=now)
+        .returning(PracticeSession.id)
+        .cte("grown")
+    )
+    return insert(PracticeCard).from_select(
+        ["id", "session_id", "card_id", "is_practiced", "created_at", "updated_at"],
+        select(
+            func.gen_random_uuid(),
+            grown.c.id,
+            Card.id,
+            false(),
+            literal(now),
+            literal(now),
+        ).select_from(grown.join(Card, Card.id.in_(card_ids))),
+    )
+
+
+async def update_cards(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    card_ids: list[uuid.UUID],
+    card_in: CardUpdate,
+) -> list[uuid.UUID]:
+    """Apply the same changes to several cards of a collection and return
+    the ids of the cards found.
+
+    Changed text leaves the cards without signatures, which
+    `fingerprint_cards` computes again when they are next needed.
+    """
+    values = card_in.model_dump(exclude_unset=True)
+    if values.keys() & {"front", "back"}:
+        values.update(minhash=None, lsh_buckets=None)
+    statement = (
+        update(Card)
+        .where(*_collection_cards(collection_id, card_ids))
+        .values(**values, updated_at=datetime.now(timezone.utc))
+        .returning(Card.id)
+    )
+    updated = (await session.exec(statement)).scalars().all()
+    if updated:
+        await session.exec(bump_collection_version_statement(collection_id))
+    await session.commit()
+    return list(updated)
+
+
+async def move_cards(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    target_collection_id: uuid.UUID,
+    card_ids: list[uuid.UUID],
+) -> list[uuid.UUID]:
+    """Move several cards to another collection and return the ids of the
+    cards found.
+
+    Incomplete practice sessions of the source collection that contain the
+    cards are removed, as deleting them would, and the cards are added to
+    the ongoing sessions of the target collection, as creating them would.
+    """
+    await _remove_incomplete_practice_sessions(session, collection_id, card_ids)
+    statement = (
+        update(Card)
+        .where(*_collection_cards(collection_id, card_ids))
+        .values(
+            collection_id=target_collection_id, updated_at=datetime.now(timezone.utc)
+        )
+        .returning(Card.id)
+    )
+    moved = list((await session.exec(statement)).scalars().all())
+    if moved:
+        await session.exec(
+            _add_cards_to_ongoing_sessions_statement(target_collection_id, moved)
+        )
+        await session.exec(bump_collection_version_statement(collection_id))
+        await session.exec(bump_collection_version_statement(target_collection_id))
+    await session.commit()
+    return moved
+
+
+async def delete_cards(
+    session: AsyncSession, collection_id: uuid.UUID, card_ids: list[uuid.UUID]
+) -> list[uuid.UUID]:
+    """Delete several cards of a collection, with the same effect on
+    practice sessions as `delete_card`, and return the ids of the cards
+    found."""
+    await _remove_incomplete_practice_sessions(session, collection_id, card_ids)
+    statement = (
+        delete(Card)
+        .where(*_collection_cards(collection_id, card_ids))
+        .returning(Card.id)
     )
-    affected_sessions = session.exec(statement).all()
+    deleted = (await session.exec(statement)).scalars().all()
+    if deleted:
+        await session.exec(bump_collection_version_statement(collection_id))
+    await session.commit()
+    return list(deleted)
+
+
+# Cards are fingerprinted in batches of this many
+FINGERPRINT_BATCH_SIZE = 1000
+
+# Sets the signatures of a batch of cards from parallel arrays, the band keys
+# of all cards being one flat array
+SET_FINGERPRINTS = text(
+    """
+    UPDATE card
+    SET minhash = fingerprint.minhash,
+        lsh_buckets = (CAST(:keys AS bigint[]))
+            [fingerprint.n * :bands - :bands + 1 : fingerprint.n * :bands]
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:minhashes AS bytea[]))
+        WITH ORDINALITY AS fingerprint(id, minhash, n)
+    WHERE card.id = fingerprint.id
+    """
+)
 
-    for practice_session in affected_sessions:
-        session.delete(practice_session)
 
+def unfingerprinted_cards_statement(collection_id: uuid.UUID):
+    return select(Card.id, Card.front, Card.back).where(
+        Card.collection_id == collection_id, Card.minhash.is_(None)
+    )
 
-def delete_card(session: Session, card: Card) -> None:
-    _remove_incomplete_practice_sessions(session, card)
 
-    session.delete(card)
-    session.commit()
+def fingerprint_params(batch: Sequence[Row]) -> dict[str, Any]:
+    """Parameters of `SET_FINGERPRINTS` for a batch of (id, front, back)
+    rows. It does not touch the database, so it can run in a worker
+    thread."""
+    signatures, keys = dedup.fingerprint([(row.front, row.back) for row in batch])
+    return {
+        "ids": [row.id for row in batch],
+        "minhashes": [dedup.to_bytes(signature) for signature in signatures],
+        "keys": keys.ravel().tolist(),
+        "bands": dedup.BANDS,
+    }
+
+
+async def fingerprint_cards(session: AsyncSession, collection_id: uuid.UUID) -> int:
+    """Compute the missing signatures of a collection's cards, left by
+    migrations and bulk updates, and return how many there were."""
+    rows = (await session.exec(unfingerprinted_cards_statement(collection_id))).all()
+    for start in range(0, len(rows), FINGERPRINT_BATCH_SIZE):
+        batch = rows[start : start + FINGERPRINT_BATCH_SIZE]
+        params = await asyncio.to_thread(fingerprint_params, batch)
+        await session.exec(SET_FINGERPRINTS, params=params)
+    return len(rows)
+
+
+async def find_near_duplicate(
+    session: AsyncSession, collection_id: uuid.UUID, card: Card
+) -> uuid.UUID | None:
+    """The id of the card of a collection most similar to a fingerprinted
+    `card`, if it is a near-duplicate.
+
+    Only the cards sharing an LSH bucket with it are compared.
+    """
+    await fingerprint_cards(session, collection_id)
+    statement = select(Card.id, Card.minhash).where(
+        Card.collection_id == collection_id,
+        Card.lsh_buckets.overlap(card.lsh_buckets),
+        Card.id != card.id,
+    )
+    candidates = (await session.exec(statement)).all()
+    if not candidates:
+        return None
+    scores = dedup.similarity(
+        dedup.from_bytes([row.minhash for row in candidates]),
+        dedup.from_bytes([card.minhash]),
+    )
+    best = int(scores.argmax())
+    if scores[best] < dedup.DUPLICATE_THRESHOLD:
+        return None
+    return candidates[best].id
+
+
+def _find_clusters(
+    minhashes: Sequence[bytes], threshold: float
+) -> list[tuple[list[int], float]]:
+    """`dedup.find_clusters` of stored signatures, run in a worker thread."""
+    signatures = dedup.from_bytes(minhashes)
+    # Band keys are quicker to compute again than to read
+    return dedup.find_clusters(signatures, dedup.band_keys(signatures), threshold)
+
+
+async def find_duplicate_cards(
+    session: AsyncSession,
+    collection_id: uuid.UUID,
+    threshold: float = dedup.DUPLICATE_THRESHOLD,
+) -> list[CardDuplicateCluster]:
+    """Groups of near-duplicate cards of a collection, largest first.
+
+    The signatures of all cards are read and grouped at once, in time about
+    linear in the number of cards; only the cards of the groups are loaded.
+    """
+    if await fingerprint_cards(session, collection_id):
+        await session.commit()
+    statement = (
+        select(Card.id, Card.minhash)
+        .where(Card.collection_id == collection_id)
+        .order_by(Card.created_at, Card.id)
+    )
+    rows = (await session.exec(statement)).all()
+    clusters = await asyncio.to_thread(
+        _find_clusters, [row.minhash for row in rows], threshold
+    )
+    card_ids = [rows[i].id for members, _ in clusters for i in members]
+    result = await session.exec(select(Card).where(Card.id.in_(card_ids)))
+    cards = {card.id: card for card in result.all()}
+    return [
+        CardDuplicateCluster(
+            similarity=score, cards=[cards[rows[i].id] for i in members]
+        )
+        for members, score in clusters
+    ]
 
 
-def check_collection_access(
-    session: Session, collection_id: uuid.UUID, user_id: uuid.UUID
+async def check_collection_access(
+    session: AsyncSession, collection_id: uuid.UUID, user_id: uuid.UUID
 ) -> bool:
-    statement = select(Collection).where(
+    statement = select(Collection.id).where(
         Collection.id == collection_id, Collection.user_id == user_id
     )
-    collection = session.exec(statement).first()
-    return collection is not None
-
-
-def get_practice_sessions(
-    session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> tuple[list["PracticeSession"], int]:
-    count_statement = select(func.count()).where(PracticeSession.user_id == user_id)
-    count = session.exec(count_statement).one()
+    return (await session.exec(statement)).first() is not None
+
+
+async def get_practice_sessions(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    after: Cursor | None = None,
+    count: CountMode = "exact",
+) -> tuple[list["PracticeSession"], int | None]:
+    """A page of the user's practice sessions, newest first, with their
+    practice cards loaded."""
+    filtered = select(PracticeSession.id).where(PracticeSession.user_id == user_id)
     statement = (
         select(PracticeSession)
+        .options(selectinload(PracticeSession.practice_cards))
         .where(PracticeSession.user_id == user_id)
-        .order_by(PracticeSession.created_at.desc())
+        .order_by(*keyset_order(PracticeSession.created_at, PracticeSession.id))
         .offset(skip)
         .limit(limit)
     )
-    practice_sessions = session.exec(statement).all()
-    return practice_sessions, count
+    if after is not None:
+        statement = statement.where(
+            after_cursor(PracticeSession.created_at, PracticeSession.id, after)
+        )
+    rows, total = await fetch_page(session, statement, filtered, count)
+    return [row.PracticeSession for row in rows], total
 
 
-def get_practice_session(
-    session: Session, session_id: uuid.UUID, user_id: uuid.UUID
+async def get_practice_session(
+    session: AsyncSession,
+    session_id: uuid.UUID,
+    user_id: uuid.UUID,
+    with_cards: bool = False,
 ) -> PracticeSession | None:
+    """The user's practice session, with its practice cards loaded too if
+    `with_cards`."""
     statement = select(PracticeSession).where(
         PracticeSession.id == session_id, PracticeSession.user_id == user_id
     )
-    return session.exec(statement).first()
+    if with_cards:
+        statement = statement.options(selectinload(PracticeSession.practice_cards))
+    return (await session.exec(statement)).first()
 
 
-def _get_uncompleted_session(
-    session: Session, collection_id: uuid.UUID, user_id: uuid.UUID
+async def _get_uncompleted_session(
+    session: AsyncSession, collection_id: uuid.UUID, user_id: uuid.UUID
 ) -> PracticeSession | None:
-    statement = select(PracticeSession).where(
-        PracticeSession.collection_id == collection_id,
-        PracticeSession.user_id == user_id,
-        PracticeSession.is_completed.is_not(True),
+    statement = (
+        select(PracticeSession)
+        .options(selectinload(PracticeSession.practice_cards))
+        .where(
+            PracticeSession.collection_id == collection_id,
+            PracticeSession.user_id == user_id,
+            PracticeSession.is_completed.is_not(True),
+        )
     )
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
-def _get_collection_cards(session: Session, collection_id: uuid.UUID) -> list[Card]:
-    statement = select(Card).where(Card.collection_id == collection_id)
-    return session.exec(statement).all()
+async def _get_collection_card_ids(
+    session: AsyncSession, collection_id: uuid.UUID, user_id: uuid.UUID
+) -> list[uuid.UUID] | None:
+    """Ids of the collection's cards, or None if the user does not own it."""
+    statement = (
+        select(Collection.id, Card.id)
+        .outerjoin(Card, Card.collection_id == Collection.id)
+        .where(Collection.id == collection_id, Collection.user_id == user_id)
+    )
+    rows = (await session.exec(statement)).all()
+    if not rows:
+        return None
+    return [card_id for _, card_id in rows if card_id is not None]
 
 
-def _create_practice_cards(
-    session: Session, practice_session: PracticeSession, cards: list[Card]
-) -> None:
-    random_cards = random.sample(cards, len(cards))
-    for card in random_cards:
-        practice_card = PracticeCard(
-            session_id=practice_session.id,
-            card_id=card.id,
-        )
-        session.add(practice_card)
+def _create_practice_cards(card_ids: list[uuid.UUID]) -> list[PracticeCard]:
+    random_card_ids = random.sample(card_ids, len(card_ids))
+    return [PracticeCard(card_id=card_id) for card_id in random_card_ids]
 
 
-def get_or_create_practice_session(
-    session: Session, collection_id: uuid.UUID, user_id: uuid.UUID
+async def get_or_create_practice_session(
+    session: AsyncSession, collection_id: uuid.UUID, user_id: uuid.UUID
 ) -> PracticeSession:
-    existing_session = _get_uncompleted_session(session, collection_id, user_id)
+    """The user's ongoing practice session of a collection, or a new one,
+    with its practice cards loaded."""
+    existing_session = await _get_uncompleted_session(session, collection_id, user_id)
     if existing_session:
         if existing_session.cards_practiced == 0:
-            session.delete(existing_session)
-            session.commit()
+            await session.delete(existing_session)
+            await session.commit()
         else:
             return existing_session
 
-    cards = _get_collection_cards(session, collection_id)
-    if not cards:
+    card_ids = await _get_collection_card_ids(session, collection_id, user_id)
+    if card_ids is None:
+        raise CollectionNotFoundError("Collection not found")
+    if not card_ids:
         raise EmptyCollectionError(
             "Cannot create practice session for empty collection"
         )
@@ -267,27 +1029,58 @@ def get_or_create_practice_session(
     practice_session = PracticeSession(
         collection_id=collection_id,
         user_id=user_id,
-        total_cards=len(cards),
+        total_cards=len(card_ids),
+        practice_cards=_create_practice_cards(card_ids),
     )
     session.add(practice_session)
-    session.flush()
+    await session.exec(bump_collection_version_statement(collection_id))
+    await session.commit()
+    return practice_session
 
-    _create_practice_cards(session, practice_session, cards)
 
-    session.commit()
-    session.refresh(practice_session)
-    return practice_session
+def practice_card_sort_key(
+    status: Literal["pending", "completed", "all"] | None = None,
+    order: Literal["asc", "desc"] | None = None,
+) -> tuple[str, bool]:
+    """Name of the PracticeCard column a listing is sorted on, and whether
+    it is sorted descending."""
+    if order is not None:
+        return "created_at", order == "desc"
+    if status == "pending":
+        return "created_at", False
+    return "updated_at", True
 
 
-def get_practice_cards(
-    session: Session,
+async def get_practice_cards(
+    session: AsyncSession,
     practice_session_id: uuid.UUID,
     status: Literal["pending", "completed", "all"] | None = None,
     limit: int | None = None,
     order: Literal["asc", "desc", "random"] | None = None,
-) -> tuple[list[PracticeCard], int]:
-    """Get practice cards for a session, optionally filtering, ordering, and limiting."""
-    base_statement = select(PracticeCard).where(
+    after: Cursor | None = None,
+    count: CountMode = "exact",
+    fields: Sequence[CardField] | None = None,
+) -> tuple[list[PracticeCard] | list[Row], int | None]:
+    """Get practice cards for a session, optionally filtering, ordering, and limiting.
+
+    `after` continues a listing from a cursor; it cannot be combined with
+    random order. Estimated counts come from the session's own counters.
+
+    With `fields`, the page holds rows of the practice card columns and only
+    those card columns, prefixed with `card_`, read in the same query.
+    """
+    if fields is None:
+        base_statement = select(PracticeCard)
+    else:
+        base_statement = select(
+            PracticeCard.id,
+            PracticeCard.is_practiced,
+            PracticeCard.is_correct,
+            PracticeCard.created_at,
+            PracticeCard.updated_at,
+            *_sparse_card_columns(fields, prefix="card_"),
+        ).join(Card, Card.id == PracticeCard.card_id)
+    base_statement = base_statement.where(
         PracticeCard.session_id == practice_session_id
     )
 
@@ -297,36 +1090,54 @@ def get_practice_cards(
         statement = base_statement.where(PracticeCard.is_practiced.is_(True))
     else:
         statement = base_statement
-
-    count_statement = select(func.count()).select_from(statement.subquery())
-    count = session.exec(count_statement).one()
-
-    if order == "asc":
-        statement = statement.order_by(PracticeCard.created_at.asc())
-    elif order == "desc":
-        statement = statement.order_by(PracticeCard.created_at.desc())
-    elif order != "random":
-        if status == "pending":
-            statement = statement.order_by(PracticeCard.created_at)
-        else:
-            statement = statement.order_by(PracticeCard.updated_at.desc())
+    filtered = statement.with_only_columns(PracticeCard.id)
+    if fields is None:
+        # Their cards are loaded with the practice cards, as an async
+        # session cannot load them lazily
+        statement = statement.options(selectinload(PracticeCard.card))
+
+    if order != "random":
+        sort_attr, descending = practice_card_sort_key(status, order)
+        sort_column = getattr(PracticeCard, sort_attr)
+        statement = statement.order_by(
+            *keyset_order(sort_column, PracticeCard.id, descending)
+        )
+        if after is not None:
+            statement = statement.where(
+                after_cursor(sort_column, PracticeCard.id, after, descending)
+            )
 
     if order == "random":
-        practice_cards = session.exec(statement).all()
+        practice_cards = list((await session.exec(statement)).all())
+        total = len(practice_cards) if count != "none" else None
         random.shuffle(practice_cards)
 
         if limit is not None:
             practice_cards = practice_cards[:limit]
-    else:
-        if limit is not None:
-            statement = statement.limit(limit)
-        practice_cards = session.exec(statement).all()
+        return practice_cards, total
 
-    return practice_cards, count
+    async def estimate() -> int:
+        practice_session = await session.get(PracticeSession, practice_session_id)
+        if practice_session is None:
+            return 0
+        if status == "pending":
+            return practice_session.total_cards - practice_session.cards_practiced
+        if status == "completed":
+            return practice_session.cards_practiced
+        return practice_session.total_cards
+
+    if limit is not None:
+        statement = statement.limit(limit)
+    rows, total = await fetch_page(
+        session, statement, filtered, count, estimate=estimate
+    )
+    if fields is not None:
+        return rows, total
+    return [row.PracticeCard for row in rows], total
 
 
-def get_practice_card(
-    session: Session,
+async def get_practice_card(
+    session: AsyncSession,
     practice_session_id: uuid.UUID,
     card_id: uuid.UUID,
 ) -> PracticeCard | None:
@@ -334,11 +1145,11 @@ def get_practice_card(
         PracticeCard.session_id == practice_session_id,
         PracticeCard.card_id == card_id,
     )
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
-def record_practice_card_result(
-    session: Session,
+async def record_practice_card_result(
+    session: AsyncSession,
     practice_card: PracticeCard,
     is_correct: bool,
 ) -> PracticeCard:
@@ -349,7 +1160,7 @@ def record_practice_card_result(
     practice_card.updated_at = datetime.now(timezone.utc)
     session.add(practice_card)
 
-    practice_session = session.get(PracticeSession, practice_card.session_id)
+    practice_session = await session.get(PracticeSession, practice_card.session_id)
     if practice_session:
         if not was_practiced:
             practice_session.cards_practiced += 1
@@ -361,15 +1172,17 @@ def record_practice_card_result(
 
         practice_session.updated_at = datetime.now(timezone.utc)
         session.add(practice_session)
+        await session.exec(
+            bump_collection_version_statement(practice_session.collection_id)
+        )
 
-    session.commit()
-    session.refresh(practice_card)
+    await session.commit()
     return practice_card
 
 
-def get_card_by_id(session: Session, card_id: uuid.UUID) -> Card | None:
+async def get_card_by_id(session: AsyncSession, card_id: uuid.UUID) -> Card | None:
     statement = select(Card).where(Card.id == card_id)
-    return session.exec(statement).first()
+    return (await session.exec(statement)).first()
 
 
 async def generate_ai_collection(provider, prompt: str) -> AIFlashcardCollection:
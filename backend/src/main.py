@@ -1,18 +1,41 @@
-from fastapi import FastAPI
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.routing import APIRoute
 from fastapi_pagination import add_pagination
+from starlette.background import BackgroundTask
 from starlette.middleware.cors import CORSMiddleware
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
+from src.auth.hashing import password_hasher
 from src.core.config import settings
+from src.core.db import replica_router, track_connection_hold
+from src.core.email import email_queue
+from src.flashcards.anki import anki_import_queue
 from src.routers import api_router
 
+logger = logging.getLogger(__name__)
+
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    email_queue.start()
+    anki_import_queue.start()
+    yield
+    await anki_import_queue.stop()
+    email_queue.stop()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
 )
@@ -29,5 +52,47 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Take the client address from X-Forwarded-For on requests from trusted
+# proxies, whatever uvicorn's own --forwarded-allow-ips is set to
+if settings.FORWARDED_ALLOW_IPS:
+    app.add_middleware(
+        ProxyHeadersMiddleware, trusted_hosts=settings.FORWARDED_ALLOW_IPS
+    )
+
+
+@app.middleware("http")
+async def report_connection_hold(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Report how long the request held database connections."""
+    with track_connection_hold() as holds:
+        response = await call_next(request)
+    hold_ms = sum(holds) * 1000
+    response.headers.append("Server-Timing", f"db-hold;dur={hold_ms:.1f}")
+    if hold_ms > settings.DB_SLOW_HOLD_MS:
+        logger.warning(
+            "%s %s held database connections for %.0fms across %d checkouts",
+            request.method,
+            request.url.path,
+            hold_ms,
+            len(holds),
+        )
+    return response
+
+
+@app.middleware("http")
+async def record_writes(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Start the read-your-writes window of a user whose request may have
+    written once its response, streamed or not, has been sent, rather than
+    when the request started."""
+    response = await call_next(request)
+    writer_id = getattr(request.state, "writer_id", None)
+    if writer_id is not None:
+        response.background = BackgroundTask(replica_router.record_write, writer_id)
+    return response
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 add_pagination(app)
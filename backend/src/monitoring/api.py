@@ -0,0 +1,28 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from src.auth.services import get_current_active_superuser
+from src.core.db import PoolStats, async_engine, engine, replica_engines
+from src.core.email import EmailQueueStats, email_queue
+
+router = APIRouter(dependencies=[Depends(get_current_active_superuser)])
+
+
+@router.get("/email", response_model=EmailQueueStats)
+def read_email_queue_stats() -> Any:
+    """Outbound email queue depth and send latency for this worker."""
+    return email_queue.stats()
+
+
+@router.get("/db-pool", response_model=list[PoolStats])
+def read_db_pool_stats() -> Any:
+    """Database connection pool usage for this worker."""
+    return [
+        engine.pool.stats("sync"),
+        async_engine.sync_engine.pool.stats("async"),
+        *(
+            replica.sync_engine.pool.stats(f"replica-{i}")
+            for i, replica in enumerate(replica_engines)
+        ),
+    ]
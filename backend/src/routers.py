@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from src.auth.api import router as auth_router
 from src.flashcards.api import router as flashcards_router
+from src.monitoring.api import router as monitoring_router
 from src.stats.api import router as stats_router
 from src.users.api import router as user_router
 
@@ -11,3 +12,4 @@ api_router.include_router(auth_router, tags=["login"])
 api_router.include_router(user_router, prefix="/users", tags=["users"])
 api_router.include_router(flashcards_router, tags=["flashcards"])
 api_router.include_router(stats_router, tags=["stats"])
+api_router.include_router(monitoring_router, prefix="/monitoring", tags=["monitoring"])
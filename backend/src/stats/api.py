@@ -1,10 +1,11 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
-from src.auth.services import CurrentUser, SessionDep
-from src.flashcards.services import check_collection_access
+from src.auth.services import CurrentUser, ReadSessionDep
+from src.core.etag import conditional_response
+from src.flashcards.services import get_collection_version
 
 from .schemas import CollectionStats
 from .services import get_collection_stats
@@ -13,19 +14,24 @@ router = APIRouter()
 
 
 @router.get("/collections/{collection_id}/stats", response_model=CollectionStats)
-def get_collection_statistics_endpoint(
-    session: SessionDep,
+async def get_collection_statistics_endpoint(
+    request: Request,
+    response: Response,
+    session: ReadSessionDep,
     current_user: CurrentUser,
     collection_id: uuid.UUID,
     limit: int = Query(
         30, description="Maximum number of recent sessions to return", ge=1, le=90
     ),
 ) -> Any:
-    if not check_collection_access(session, collection_id, current_user.id):
+    version = await get_collection_version(session, collection_id, current_user.id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Collection not found")
+    if not_modified := conditional_response(request, response, version):
+        return not_modified
 
     try:
-        statistics = get_collection_stats(
+        statistics = await get_collection_stats(
             session=session,
             collection_id=collection_id,
             limit=limit,
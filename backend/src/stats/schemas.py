@@ -21,6 +21,7 @@ class PracticeSessionStats(SQLModel):
 
 class CardBasicStats(SQLModel):
     id: uuid.UUID
+    # Plain text start of the card front, its `preview`
     front: str
     total_attempts: int
     correct_answers: int
@@ -1,7 +1,8 @@
 import uuid
 
 from sqlalchemy import Float, case, func
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.flashcards.models import Card, Collection, PracticeCard, PracticeSession
 
@@ -13,10 +14,10 @@ from .schemas import (
 )
 
 
-def _get_collection_basic_info(
-    session: Session, collection_id: uuid.UUID
+async def _get_collection_basic_info(
+    session: AsyncSession, collection_id: uuid.UUID
 ) -> CollectionBasicInfo:
-    collection = session.get(Collection, collection_id)
+    collection = await session.get(Collection, collection_id)
     if not collection:
         raise ValueError(
             f"Collection with id {collection_id} not found in _get_collection_basic_info"
@@ -25,12 +26,12 @@ def _get_collection_basic_info(
     total_cards_stmt = select(func.count(Card.id)).where(
         Card.collection_id == collection_id
     )
-    total_cards = session.exec(total_cards_stmt).one()
+    total_cards = (await session.exec(total_cards_stmt)).one()
     total_sessions_stmt = select(func.count(PracticeSession.id)).where(
         PracticeSession.collection_id == collection_id,
         PracticeSession.is_completed,
     )
-    total_sessions = session.exec(total_sessions_stmt).one()
+    total_sessions = (await session.exec(total_sessions_stmt)).one()
 
     return CollectionBasicInfo(
         name=collection_name,
@@ -39,8 +40,8 @@ def _get_collection_basic_info(
     )
 
 
-def _get_recent_sessions(
-    session: Session, collection_id: uuid.UUID, limit: int = 10
+async def _get_recent_sessions(
+    session: AsyncSession, collection_id: uuid.UUID, limit: int = 10
 ) -> list[PracticeSessionStats]:
     """Get recent practice sessions using an optimized query."""
     statement = (
@@ -53,7 +54,7 @@ def _get_recent_sessions(
         .limit(limit)
     )
 
-    sessions = session.exec(statement).all()
+    sessions = (await session.exec(statement)).all()
     return [
         PracticeSessionStats(
             id=s.id,
@@ -67,8 +68,8 @@ def _get_recent_sessions(
     ]
 
 
-def _get_difficult_cards(
-    session: Session,
+async def _get_difficult_cards(
+    session: AsyncSession,
     collection_id: uuid.UUID,
     min_attempts: int = 2,
     limit: int = 5,
@@ -76,7 +77,7 @@ def _get_difficult_cards(
     statement = (
         select(
             Card.id,
-            Card.front,
+            Card.preview,
             func.count(PracticeCard.id).label("total_attempts"),
             func.sum(case((PracticeCard.is_correct, 1), else_=0)).label(
                 "correct_answers"
@@ -90,7 +91,7 @@ def _get_difficult_cards(
             PracticeCard.is_practiced,
             PracticeCard.is_correct.is_not(None),
         )
-        .group_by(Card.id, Card.front)
+        .group_by(Card.id)
         .having(func.count(PracticeCard.id) >= min_attempts)
         .order_by(
             func.sum(case((PracticeCard.is_correct, 1), else_=0)).cast(Float)
@@ -99,29 +100,29 @@ def _get_difficult_cards(
         .limit(limit)
     )
 
-    results = session.exec(statement).all()
+    results = (await session.exec(statement)).all()
     return [
         CardBasicStats(
             id=card_id,
-            front=front[:100],
+            front=preview,
             total_attempts=total_attempts,
             correct_answers=correct_answers,
         )
-        for card_id, front, total_attempts, correct_answers in results
+        for card_id, preview, total_attempts, correct_answers in results
     ]
 
 
-def get_collection_stats(
-    session: Session, collection_id: uuid.UUID, limit: int = 30
+async def get_collection_stats(
+    session: AsyncSession, collection_id: uuid.UUID, limit: int = 30
 ) -> CollectionStats:
     return CollectionStats(
-        collection_info=_get_collection_basic_info(session, collection_id),
-        recent_sessions=_get_recent_sessions(
+        collection_info=await _get_collection_basic_info(session, collection_id),
+        recent_sessions=await _get_recent_sessions(
             session=session,
             collection_id=collection_id,
             limit=limit,
         ),
-        difficult_cards=_get_difficult_cards(
+        difficult_cards=await _get_difficult_cards(
             session=session,
             collection_id=collection_id,
         ),
@@ -2,6 +2,8 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException
 
+from src.auth.exceptions import PasswordHasherBusyError
+from src.auth.hashing import password_hasher
 from src.auth.services import CurrentUser, SessionDep
 from src.core.config import settings
 from src.users.schemas import AIUsageQuota, UserCreate, UserPublic, UserRegister
@@ -12,15 +14,15 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUser) -> Any:
+async def read_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
     """
     Get current user.
     """
-    return current_user
+    return await services.get_user_by_id(session=session, user_id=current_user.id)
 
 
 @router.post("", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+async def register_user(session: SessionDep, user_in: UserRegister) -> Any:
     """
     Create new user without the need to be logged in.
     """
@@ -29,17 +31,25 @@ def register_user(session: SessionDep, user_in: UserRegister) -> Any:
             status_code=403,
             detail="Open user registration is forbidden on this server",
         )
-    user = services.get_user_by_email(session=session, email=user_in.email)
+    user = await services.get_user_by_email(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=409,
             detail="The user with this email already exists in the system",
         )
+    try:
+        hashed_password = await password_hasher.hash(user_in.password)
+    except PasswordHasherBusyError:
+        raise HTTPException(status_code=503, detail="Server busy, try again later")
     user_create = UserCreate.model_validate(user_in)
-    user = services.create_user(session=session, user_create=user_create)
-    return user
+    return await services.create_user(
+        session=session, user_create=user_create, hashed_password=hashed_password
+    )
 
 
 @router.get("/users/me/ai-usage-quota", response_model=AIUsageQuota)
-def get_my_ai_usage_quota(current_user: CurrentUser):
-    return services.get_ai_usage_quota_for_user(current_user)
+async def get_my_ai_usage_quota(session: SessionDep, current_user: CurrentUser):
+    user = await services.get_user_by_id(
+        session=session, user_id=current_user.id, with_ai_usage_quota=True
+    )
+    return services.get_ai_usage_quota_for_user(user)
@@ -16,15 +16,17 @@ class User(UserBase, table=True):
     collections: list["Collection"] = Relationship(
         back_populates="user",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        passive_deletes=True,
     )
     practice_sessions: list["PracticeSession"] = Relationship(
         back_populates="user",
         cascade_delete=True,
-        sa_relationship_kwargs={"lazy": "selectin"},
+        passive_deletes=True,
     )
     ai_usage_quota: "AIUsageQuota" = Relationship(
         back_populates="user",
+        cascade_delete=True,
+        passive_deletes=True,
         sa_relationship_kwargs={"uselist": False, "lazy": "selectin"},
     )
 
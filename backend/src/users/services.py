@@ -2,9 +2,14 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select, update
-
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth.cache import principal_cache
+from src.auth.schemas import Principal
 from src.auth.services import get_password_hash
 from src.core.config import settings
 from src.users.models import AIUsageQuota as AIUsageQuotaModel
@@ -12,17 +17,25 @@ from src.users.models import User
 from src.users.schemas import AIUsageQuota, UserCreate, UserUpdate
 
 
-def create_user(*, session: Session, user_create: UserCreate) -> User:
+async def create_user(
+    *,
+    session: AsyncSession,
+    user_create: UserCreate,
+    hashed_password: str | None = None,
+) -> User:
+    if hashed_password is None:
+        hashed_password = get_password_hash(user_create.password)
     db_obj = User.model_validate(
-        user_create, update={"hashed_password": get_password_hash(user_create.password)}
+        user_create, update={"hashed_password": hashed_password}
     )
     session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
+    await session.commit()
     return db_obj
 
 
-def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
+async def update_user(
+    *, session: AsyncSession, db_user: User, user_in: UserUpdate
+) -> Any:
     user_data = user_in.model_dump(exclude_unset=True)
     extra_data = {}
     if "password" in user_data:
@@ -31,23 +44,45 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
         extra_data["hashed_password"] = hashed_password
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    principal_cache.invalidate_user(db_user.id)
     return db_user
 
 
-def get_user_by_id(*, session: Session, user_id: uuid.UUID) -> User | None:
+async def get_user_by_id(
+    *, session: AsyncSession, user_id: uuid.UUID, with_ai_usage_quota: bool = False
+) -> User | None:
+    """The user, with `ai_usage_quota` loaded too if `with_ai_usage_quota`,
+    as it cannot be loaded lazily from an async session."""
     statement = select(User).where(User.id == user_id)
-    session_user = session.exec(statement).first()
+    if with_ai_usage_quota:
+        statement = statement.options(selectinload(User.ai_usage_quota))
+    session_user = (await session.exec(statement)).first()
     return session_user
 
 
-def get_user_by_email(*, session: Session, email: str) -> User | None:
+async def get_user_by_email(*, session: AsyncSession, email: str) -> User | None:
     statement = select(User).where(User.email == email)
-    session_user = session.exec(statement).first()
+    session_user = (await session.exec(statement)).first()
     return session_user
 
 
+async def set_password_by_email(
+    *, session: AsyncSession, email: str, hashed_password: str
+) -> uuid.UUID | None:
+    """Replace a user's password hash; returns the user's id, or None if no
+    user has this email."""
+    statement = (
+        update(User)
+        .where(User.email == email)
+        .values(hashed_password=hashed_password)
+        .returning(User.id)
+    )
+    user_id = (await session.exec(statement)).scalar_one_or_none()
+    await session.commit()
+    return user_id
+
+
 def get_ai_usage_quota_for_user(user: User) -> AIUsageQuota:
     quota = user.ai_usage_quota
     if not quota:
@@ -68,45 +103,35 @@ def get_ai_usage_quota_for_user(user: User) -> AIUsageQuota:
     )
 
 
-def check_and_increment_ai_usage_quota(session: Session, user: User) -> bool:
+def _increment_ai_usage_quota_statement(user_id: uuid.UUID):
+    """Upsert that counts one AI request against the user's quota.
+
+    A new or expired quota restarts at 1; otherwise the count is incremented
+    while it is below the limit. Returns the row only when the request is
+    allowed, so the whole check is one atomic statement.
+    """
     now = datetime.now(timezone.utc)
     reset_threshold = now - timedelta(days=settings.AI_QUOTA_TIME_RANGE_DAYS)
-
-    if not user.ai_usage_quota:
-        try:
-            quota = AIUsageQuotaModel(
-                user_id=user.id, usage_count=1, last_reset_time=now
-            )
-            session.add(quota)
-            session.commit()
-            return True
-        except IntegrityError:
-            session.rollback()
-
-            session.refresh(user)
-
-    result_reset = session.exec(
-        update(AIUsageQuotaModel)
-        .where(
-            (AIUsageQuotaModel.user_id == user.id)
-            & (AIUsageQuotaModel.last_reset_time <= reset_threshold)
-        )
-        .values(usage_count=1, last_reset_time=now)
+    expired = AIUsageQuotaModel.last_reset_time <= reset_threshold
+    statement = insert(AIUsageQuotaModel).values(
+        id=uuid.uuid4(), user_id=user_id, usage_count=1, last_reset_time=now
     )
-
-    if result_reset.rowcount > 0:
-        session.commit()
-        return True
-
-    result_increment = session.exec(
-        update(AIUsageQuotaModel)
-        .where(
-            (AIUsageQuotaModel.user_id == user.id)
-            & (AIUsageQuotaModel.last_reset_time > reset_threshold)
-            & (AIUsageQuotaModel.usage_count < settings.AI_MAX_USAGE_QUOTA)
-        )
-        .values(usage_count=AIUsageQuotaModel.usage_count + 1)
-    )
-
-    session.commit()
-    return result_increment.rowcount > 0
+    return statement.on_conflict_do_update(
+        index_elements=[AIUsageQuotaModel.user_id],
+        set_={
+            "usage_count": case((expired, 1), else_=AIUsageQuotaModel.usage_count + 1),
+            "last_reset_time": case(
+                (expired, now), else_=AIUsageQuotaModel.last_reset_time
+            ),
+        },
+        where=expired | (AIUsageQuotaModel.usage_count < settings.AI_MAX_USAGE_QUOTA),
+    ).returning(AIUsageQuotaModel.usage_count)
+
+
+async def check_and_increment_ai_usage_quota(
+    session: AsyncSession, user: User | Principal
+) -> bool:
+    result = await session.exec(_increment_ai_usage_quota_statement(user.id))
+    allowed = result.first() is not None
+    await session.commit()
+    return allowed
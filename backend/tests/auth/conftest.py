@@ -0,0 +1,46 @@
+import socket
+from collections.abc import Generator
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Message
+
+from src.core.email import EmailQueue
+
+
+class RecordingHandler(Message):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.port = 0
+
+    def handle_message(self, message):
+        self.messages.append(message)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server() -> Generator[RecordingHandler, None, None]:
+    handler = RecordingHandler()
+    handler.port = _free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=handler.port)
+    controller.start()
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def test_email_queue(
+    smtp_server: RecordingHandler,
+) -> Generator[EmailQueue, None, None]:
+    queue = EmailQueue(
+        host="127.0.0.1", port=smtp_server.port, use_tls=False, batch_size=10
+    )
+    queue.start()
+    yield queue
+    queue.stop()
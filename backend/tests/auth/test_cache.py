@@ -0,0 +1,105 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth.cache import PrincipalCache, principal_cache
+from src.auth.schemas import Principal
+from src.core.config import settings
+from src.core.db import async_engine, engine
+from src.users.schemas import UserUpdate
+from src.users.services import get_user_by_email, update_user
+from tests.utils.utils import count_queries
+
+
+def _principal() -> Principal:
+    return Principal(id=uuid.uuid4(), is_active=True, is_superuser=False)
+
+
+def test_cache_hit_and_miss_counters() -> None:
+    cache = PrincipalCache(max_size=10, ttl=60)
+    principal = _principal()
+
+    assert cache.get("token") is None
+    cache.put("token", principal)
+    assert cache.get("token") == principal
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = PrincipalCache(max_size=2, ttl=60)
+    cache.put("a", _principal())
+    cache.put("b", _principal())
+    cache.get("a")
+    cache.put("c", _principal())
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_respects_token_expiry() -> None:
+    cache = PrincipalCache(max_size=10, ttl=60)
+    cache.put("expired", _principal(), expires_at=time.time() - 1)
+    assert cache.get("expired") is None
+    assert len(cache) == 0
+
+
+def test_cache_invalidate_user() -> None:
+    cache = PrincipalCache(max_size=10, ttl=60)
+    principal = _principal()
+    other = _principal()
+    cache.put("t1", principal)
+    cache.put("t2", principal)
+    cache.put("t3", other)
+
+    cache.invalidate_user(principal.id)
+
+    assert cache.get("t1") is None
+    assert cache.get("t2") is None
+    assert cache.get("t3") == other
+
+
+def test_cache_disabled_with_zero_ttl() -> None:
+    cache = PrincipalCache(max_size=10, ttl=0)
+    cache.put("token", _principal())
+    assert cache.get("token") is None
+    assert cache.misses == 0
+
+
+def test_cached_principal_skips_user_lookup(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/collections/"
+    client.get(url, headers=normal_user_token_headers)
+    hits = principal_cache.hits
+
+    with count_queries(engine, async_engine.sync_engine) as statements:
+        rsp = client.get(url, headers=normal_user_token_headers)
+
+    assert rsp.status_code == 200
+    assert principal_cache.hits == hits + 1
+    assert not any('FROM "user"' in s for s in statements)
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_cached_principal(
+    client: TestClient,
+    async_db: AsyncSession,
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    url = f"{settings.API_V1_STR}/collections/"
+    assert client.get(url, headers=normal_user_token_headers).status_code == 200
+
+    user = await get_user_by_email(session=async_db, email=settings.EMAIL_TEST_USER)
+    await update_user(
+        session=async_db, db_user=user, user_in=UserUpdate(is_active=False)
+    )
+
+    rsp = client.get(url, headers=normal_user_token_headers)
+    assert rsp.status_code == 400
+    assert rsp.json()["detail"] == "Inactive user"
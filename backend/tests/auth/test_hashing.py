@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from src.auth.exceptions import PasswordHasherBusyError
+from src.auth.hashing import PasswordHasher, get_crypt_context, password_hasher
+from src.core.config import settings
+from src.users.models import User
+from tests.utils.utils import random_email, random_lower_string
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_on_thread_pool():
+    hasher = PasswordHasher(workers=0, max_pending=4, rounds=4)
+    hashed = await hasher.hash("secret-password")
+
+    assert await hasher.verify_and_update("secret-password", hashed) == (True, None)
+    assert await hasher.verify_and_update("wrong-password", hashed) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_on_process_pool():
+    hasher = PasswordHasher(workers=1, max_pending=4, rounds=4)
+    try:
+        hashed = await hasher.hash("secret-password")
+        verified, new_hash = await hasher.verify_and_update("secret-password", hashed)
+    finally:
+        hasher.shutdown()
+
+    assert verified is True
+    assert new_hash is None
+
+
+@pytest.mark.asyncio
+async def test_verify_returns_new_hash_when_rounds_change():
+    hashed = get_crypt_context(4).hash("secret-password")
+    hasher = PasswordHasher(workers=0, max_pending=4, rounds=5)
+
+    verified, new_hash = await hasher.verify_and_update("secret-password", hashed)
+
+    assert verified is True
+    assert new_hash is not None
+    assert new_hash.startswith("$2b$05$")
+
+
+@pytest.mark.asyncio
+async def test_hasher_rejects_when_saturated():
+    hasher = PasswordHasher(workers=0, max_pending=0, rounds=4)
+    with pytest.raises(PasswordHasherBusyError):
+        await hasher.hash("secret-password")
+
+
+def test_login_returns_503_when_hasher_saturated(
+    client: TestClient,
+    db: Session,  # noqa: ARG001
+):
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    with patch.object(password_hasher, "max_pending", 0):
+        rsp = client.post(f"{settings.API_V1_STR}/tokens", data=login_data)
+    assert rsp.status_code == 503
+
+
+def test_login_rehashes_password_with_outdated_cost(client: TestClient, db: Session):
+    email = random_email()
+    password = random_lower_string()
+    user = User(email=email, hashed_password=get_crypt_context(4).hash(password))
+    db.add(user)
+    db.commit()
+
+    with patch.object(password_hasher, "rounds", 5):
+        rsp = client.post(
+            f"{settings.API_V1_STR}/tokens",
+            data={"username": email, "password": password},
+        )
+
+    assert rsp.status_code == 200
+    db.refresh(user)
+    assert user.hashed_password.startswith("$2b$05$")
@@ -1,34 +1,101 @@
+import smtplib
+from datetime import timedelta
+from email.message import EmailMessage
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 from sqlmodel import Session
-from src.auth.services import get_password_hash
 
-def test_request_password_reset(client: TestClient, db: Session) -> None:
-    email = "testuser@example.com"
-    password = "testpassword"
-    hashed_password = get_password_hash(password)
+from src.auth.services import create_access_token, verify_password
+from src.core.config import settings
+from src.core.db import async_engine
+from src.core.email import EmailQueue
+from tests.utils.user import create_random_user
+from tests.utils.utils import count_queries, statement_kinds
 
-    # Créer un utilisateur
-    db.exec(
-        "INSERT INTO user (email, hashed_password, is_active) VALUES (:email, :hashed_password, :is_active)",
-        {"email": email, "hashed_password": hashed_password, "is_active": True},
-    )
 
-    # Demander une réinitialisation
-    response = client.post("/api/auth/password-reset", json={"email": email})
+def test_request_password_reset(
+    client: TestClient, db: Session, test_email_queue: EmailQueue, smtp_server
+) -> None:
+    user = create_random_user(db)
+
+    with patch("src.auth.services.email_queue", test_email_queue):
+        response = client.post(
+            f"{settings.API_V1_STR}/password-reset", params={"email": user.email}
+        )
     assert response.status_code == 200
     assert response.json() == {"message": "Password reset email sent"}
 
+    test_email_queue.join()
+    assert len(smtp_server.messages) == 1
+    message = smtp_server.messages[0]
+    assert message["To"] == user.email
+    assert "/reset-password?token=" in message.get_payload()[0].get_payload()
+
+
+def test_request_password_reset_unknown_email(client: TestClient) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/password-reset",
+        params={"email": "unknown@example.com"},
+    )
+    assert response.status_code == 404
+
+
 def test_reset_password(client: TestClient, db: Session) -> None:
-    email = "testuser@example.com"
+    user = create_random_user(db)
     new_password = "newpassword"
+    token = create_access_token(user.email, timedelta(hours=1))
 
-    # Simuler un token
-    token = "mock-token"  # Remplacer par une vraie logique de token si nécessaire
-
-    # Réinitialiser le mot de passe
     response = client.post(
-        "/api/auth/password-reset/confirm",
-        json={"token": token, "new_password": new_password},
+        f"{settings.API_V1_STR}/password-reset/confirm",
+        params={"token": token, "new_password": new_password},
     )
     assert response.status_code == 200
-    assert response.json() == {"message": "Password reset successful"}
\ No newline at end of file
+    assert response.json() == {"message": "Password reset successful"}
+
+    db.refresh(user)
+    assert verify_password(new_password, user.hashed_password)
+
+
+def test_reset_password_statements(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    token = create_access_token(user.email, timedelta(hours=1))
+
+    with count_queries(async_engine) as statements:
+        response = client.post(
+            f"{settings.API_V1_STR}/password-reset/confirm",
+            params={"token": token, "new_password": "newpassword"},
+        )
+
+    assert response.status_code == 200
+    assert statement_kinds(statements) == ["UPDATE"]
+
+
+def test_email_queue_reuses_connection(
+    test_email_queue: EmailQueue, smtp_server
+) -> None:
+    with patch("src.core.email.smtplib.SMTP", wraps=smtplib.SMTP) as smtp:
+        for i in range(5):
+            message = EmailMessage()
+            message["From"] = settings.EMAIL_SENDER
+            message["To"] = f"user{i}@example.com"
+            message.set_content("hello")
+            test_email_queue.enqueue(message)
+        test_email_queue.join()
+
+    assert smtp.call_count == 1
+    assert len(smtp_server.messages) == 5
+    stats = test_email_queue.stats()
+    assert stats.sent == 5
+    assert stats.queue_depth == 0
+    assert stats.avg_send_latency_ms is not None
+
+
+def test_email_queue_drops_when_not_running() -> None:
+    queue = EmailQueue(host=None, port=25)
+    queue.start()
+    message = EmailMessage()
+    message["To"] = "user@example.com"
+    queue.enqueue(message)
+
+    assert queue.stats().dropped == 1
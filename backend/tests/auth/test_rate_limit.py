@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from src.auth.services import login_account_limiter, login_ip_limiter
+from src.core.config import settings
+from src.core.db import engine
+from src.core.rate_limit import (
+    DatabaseRateLimitBackend,
+    InMemoryRateLimitBackend,
+    TokenBucketLimiter,
+)
+from src.main import app
+
+
+def test_token_bucket_allows_burst_then_rejects():
+    limiter = TokenBucketLimiter("test", 3, InMemoryRateLimitBackend(max_keys=10))
+
+    assert [limiter.hit("key") for _ in range(3)] == [0, 0, 0]
+    retry_after = limiter.hit("key")
+    assert 0 < retry_after <= 20
+    assert limiter.hit("other-key") == 0
+
+
+def test_token_bucket_refills_over_time():
+    backend = InMemoryRateLimitBackend(max_keys=10)
+    limiter = TokenBucketLimiter("test", 60, backend)
+
+    with patch("src.core.rate_limit.time.monotonic", return_value=100.0):
+        for _ in range(60):
+            limiter.hit("key")
+        assert limiter.hit("key") > 0
+    with patch("src.core.rate_limit.time.monotonic", return_value=101.0):
+        assert limiter.hit("key") == 0
+
+
+def test_token_bucket_disabled_with_zero_limit():
+    limiter = TokenBucketLimiter("test", 0, InMemoryRateLimitBackend(max_keys=10))
+    assert all(limiter.hit("key") == 0 for _ in range(100))
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    limiter = TokenBucketLimiter("test", 1, backend)
+
+    limiter.hit("a")
+    limiter.hit("b")
+    limiter.hit("a")
+    limiter.hit("c")
+
+    assert len(backend) == 2
+    assert limiter.hit("a") > 0
+    assert limiter.hit("b") == 0
+
+
+def test_database_backend_allows_burst_then_rejects():
+    backend = DatabaseRateLimitBackend(engine, prune_every=2)
+    backend.clear()
+    limiter = TokenBucketLimiter("test", 3, backend)
+
+    assert [limiter.hit("key") for _ in range(3)] == [0, 0, 0]
+    retry_after = limiter.hit("key")
+    assert 0 < retry_after <= 20
+    assert limiter.hit("other-key") == 0
+    backend.clear()
+
+
+def test_database_backend_is_shared_between_instances():
+    backend = DatabaseRateLimitBackend(engine)
+    backend.clear()
+    first = TokenBucketLimiter("test", 2, backend)
+    second = TokenBucketLimiter("test", 2, DatabaseRateLimitBackend(engine))
+
+    assert first.hit("key") == 0
+    assert second.hit("key") == 0
+    assert first.hit("key") > 0
+    backend.clear()
+
+
+def test_login_rejected_before_password_check(client: TestClient):
+    login_data = {"username": "someone@example.com", "password": "incorrect"}
+    with patch.object(login_account_limiter, "per_minute", 2):
+        for _ in range(2):
+            rsp = client.post(f"{settings.API_V1_STR}/tokens", data=login_data)
+            assert rsp.status_code == 400
+
+        with patch("src.auth.services.authenticate") as authenticate:
+            rsp = client.post(f"{settings.API_V1_STR}/tokens", data=login_data)
+            authenticate.assert_not_called()
+
+    assert rsp.status_code == 429
+    assert int(rsp.headers["Retry-After"]) > 0
+
+
+def test_login_limited_per_ip_across_accounts(client: TestClient):
+    with patch.object(login_ip_limiter, "per_minute", 2):
+        statuses = [
+            client.post(
+                f"{settings.API_V1_STR}/tokens",
+                data={"username": f"user{i}@example.com", "password": "incorrect"},
+            ).status_code
+            for i in range(3)
+        ]
+    assert statuses == [400, 400, 429]
+
+
+def test_password_reset_request_limited_per_account(client: TestClient):
+    url = f"{settings.API_V1_STR}/password-reset"
+    params = {"email": "nobody@example.com"}
+    statuses = [
+        client.post(url, params=params).status_code
+        for _ in range(settings.PASSWORD_RESET_ACCOUNT_RATE_LIMIT + 1)
+    ]
+    assert statuses[-1] == 429
+    assert all(status == 404 for status in statuses[:-1])
+
+
+def test_login_limited_per_forwarded_client_ip():
+    client = TestClient(ProxyHeadersMiddleware(app, trusted_hosts="*"))
+    url = f"{settings.API_V1_STR}/tokens"
+
+    def login(i: int, forwarded_for: str) -> int:
+        return client.post(
+            url,
+            data={"username": f"user{i}@example.com", "password": "incorrect"},
+            headers={"X-Forwarded-For": forwarded_for},
+        ).status_code
+
+    with patch.object(login_ip_limiter, "per_minute", 1):
+        assert login(0, "203.0.113.1") == 400
+        assert login(1, "203.0.113.2") == 400
+        assert login(2, "203.0.113.1") == 429
@@ -1,6 +1,7 @@
 from datetime import timedelta
 
-from sqlmodel import Session
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.auth.services import authenticate, create_access_token
 from src.users.schemas import UserCreate
@@ -8,27 +9,32 @@ from src.users.services import create_user
 from tests.utils.utils import random_email, random_lower_string
 
 
-def test_authenticate_user(db: Session) -> None:
+@pytest.mark.asyncio
+async def test_authenticate_user(async_db: AsyncSession) -> None:
     email = random_email()
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password)
-    user = create_user(session=db, user_create=user_in)
-    authenticated_user = authenticate(session=db, email=email, password=password)
+    user = await create_user(session=async_db, user_create=user_in)
+    authenticated_user = await authenticate(
+        session=async_db, email=email, password=password
+    )
     assert authenticated_user
     assert user.email == authenticated_user.email
 
 
-def test_not_authenticate_user(db: Session) -> None:
+@pytest.mark.asyncio
+async def test_not_authenticate_user(async_db: AsyncSession) -> None:
     email = random_email()
     password = random_lower_string()
-    user = authenticate(session=db, email=email, password=password)
+    user = await authenticate(session=async_db, email=email, password=password)
     assert user is None
 
 
-def test_create_access_token(db: Session) -> None:
+@pytest.mark.asyncio
+async def test_create_access_token(async_db: AsyncSession) -> None:
     email = random_email()
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password)
-    user = create_user(session=db, user_create=user_in)
+    user = await create_user(session=async_db, user_create=user_in)
     token = create_access_token(subject=user.id, expires_delta=timedelta(minutes=15))
     assert isinstance(token, str)
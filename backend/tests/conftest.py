@@ -1,12 +1,17 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.auth.cache import principal_cache
+from src.auth.services import rate_limit_backend
 from src.core.config import settings
-from src.core.db import engine, init_db
+from src.core.db import async_engine, engine, init_db
+from src.flashcards.cache import typeahead_cache
 from src.main import app
 from src.users.models import User
 from tests.utils.user import authentication_token_from_email
@@ -29,12 +34,23 @@ def db() -> Generator[Session, None, None]:
         except Exception as e:
             print(f"Error during cleanup: {e}")
             session.rollback()
+        principal_cache.clear()
+        typeahead_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def async_db(
+    db: Session,  # noqa: ARG001
+) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
 
 
 @pytest.fixture
 def client() -> Generator[TestClient, None, None]:
     with TestClient(app) as c:
         yield c
+    rate_limit_backend.clear()
 
 
 @pytest.fixture
@@ -0,0 +1,134 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import exc, text
+from sqlmodel import Session, create_engine
+
+from src.core.config import settings
+from src.core.db import InstrumentedQueuePool, ReplicaRouter, track_connection_hold
+
+
+@pytest.fixture
+def small_engine():
+    engine = create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_track_checkouts(small_engine):
+    with small_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = small_engine.pool.stats()
+        assert stats.checked_out == 1
+        assert stats.size == 1
+
+    stats = small_engine.pool.stats()
+    assert stats.checked_out == 0
+    assert stats.checked_in == 1
+    assert stats.checkouts == 1
+    assert stats.avg_wait_ms is not None
+
+
+def test_pool_stats_count_timeouts(small_engine):
+    with small_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            small_engine.connect()
+
+    stats = small_engine.pool.stats()
+    assert stats.timeouts == 1
+    assert stats.checkouts == 1
+
+
+def test_pool_stats_track_hold_time(small_engine):
+    with track_connection_hold() as holds:
+        with small_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            time.sleep(0.05)
+
+    stats = small_engine.pool.stats()
+    assert len(holds) == 1
+    assert holds[0] >= 0.05
+    assert stats.avg_hold_ms is not None
+    assert stats.avg_hold_ms >= 50
+    assert stats.max_hold_ms == pytest.approx(holds[0] * 1000)
+
+
+def test_unused_session_does_not_check_out(small_engine):
+    with track_connection_hold() as holds:
+        with Session(small_engine):
+            pass
+
+    assert holds == []
+    assert small_engine.pool.stats().checkouts == 0
+
+
+def test_response_reports_connection_hold(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+):
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/", headers=normal_user_token_headers
+    )
+
+    assert rsp.status_code == 200
+    name, duration = rsp.headers["Server-Timing"].split(";")
+    assert name == "db-hold"
+    assert float(duration.removeprefix("dur=")) > 0
+
+
+@pytest.fixture
+def replica_engines():
+    engines = [create_engine(str(settings.SQLALCHEMY_DATABASE_URI)) for _ in range(2)]
+    yield engines
+    for replica in engines:
+        replica.dispose()
+
+
+def test_replica_router_without_replicas_reads_from_primary(small_engine):
+    router = ReplicaRouter(small_engine, [], read_your_writes_window=5)
+    user_id = uuid.uuid4()
+    router.record_write(user_id)
+    assert router.engine_for_read(user_id) is small_engine
+    assert router.engine_for_read() is small_engine
+
+
+def test_replica_router_round_robins_reads(small_engine, replica_engines):
+    router = ReplicaRouter(small_engine, replica_engines, read_your_writes_window=5)
+    picked = [router.engine_for_read(uuid.uuid4()) for _ in range(4)]
+    assert picked == replica_engines * 2
+
+
+def test_replica_router_reads_own_writes_from_primary(small_engine, replica_engines):
+    router = ReplicaRouter(small_engine, replica_engines, read_your_writes_window=5)
+    writer, other = uuid.uuid4(), uuid.uuid4()
+    router.record_write(writer)
+
+    assert router.engine_for_read(writer) is small_engine
+    assert router.engine_for_read(other) in replica_engines
+
+
+def test_replica_router_window_expires(small_engine, replica_engines):
+    router = ReplicaRouter(small_engine, replica_engines, read_your_writes_window=0)
+    user_id = uuid.uuid4()
+    router.record_write(user_id)
+    assert router.engine_for_read(user_id) in replica_engines
+
+
+def test_replica_router_bounds_tracked_writers(small_engine, replica_engines):
+    router = ReplicaRouter(
+        small_engine, replica_engines, read_your_writes_window=5, max_users=2
+    )
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    for user_id in (first, second, third):
+        router.record_write(user_id)
+
+    assert router.engine_for_read(first) in replica_engines
+    assert router.engine_for_read(second) is small_engine
+    assert router.engine_for_read(third) is small_engine
@@ -0,0 +1,45 @@
+import pytest
+from starlette.requests import Request
+
+from src.core.etag import etag_matches, make_etag
+
+
+def make_request(path: str = "/items", query: str = "", **headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [
+                (k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()
+            ],
+        }
+    )
+
+
+def test_make_etag_depends_on_version_and_query():
+    etag = make_etag(make_request(), 1)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert make_etag(make_request(), 1) == etag
+    assert make_etag(make_request(), 2) != etag
+    assert make_etag(make_request(query="limit=1"), 1) != etag
+    assert make_etag(make_request(path="/other"), 1) != etag
+
+
+@pytest.mark.parametrize(
+    "if_none_match,matches",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ("*", True),
+        ('"xyz"', False),
+        ("", False),
+    ],
+)
+def test_etag_matches(if_none_match: str, matches: bool):
+    request = make_request(if_none_match=if_none_match)
+
+    assert etag_matches(request, '"abc"') is matches
@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from src.core.pagination import Cursor, InvalidCursorError, next_cursor
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(datetime(2025, 1, 2, 3, 4, 5, 678901), uuid.uuid4())
+
+    encoded = cursor.encode()
+
+    assert "=" not in encoded
+    assert Cursor.decode(encoded) == cursor
+
+
+def test_rank_cursor_round_trip():
+    cursor = Cursor(0.6079271, uuid.uuid4())
+
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize("value", ["", "not a cursor", "W10", "WyJ4IiwgInkiXQ"])
+def test_cursor_decode_invalid(value: str):
+    with pytest.raises(InvalidCursorError):
+        Cursor.decode(value)
+
+
+def test_next_cursor_only_for_full_pages():
+    item = Cursor(datetime(2025, 1, 1), uuid.uuid4())
+
+    assert next_cursor([item], 2, "sort_value") is None
+    assert next_cursor([], 2, "sort_value") is None
+    assert Cursor.decode(next_cursor([item, item], 2, "sort_value")) == item
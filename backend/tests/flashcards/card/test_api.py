@@ -1,12 +1,18 @@
+import json
 import uuid
 from typing import Any
 from unittest.mock import ANY, AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlmodel import Session, select
 
 from src.core.config import settings
+from src.core.db import async_engine
+from src.flashcards.models import Collection, PracticeSession
 from src.flashcards.schemas import CardCreate, CardUpdate, CollectionCreate
+from src.users.models import User
+from tests.utils.utils import count_queries, count_selects, statement_kinds
 
 
 @pytest.fixture
@@ -142,6 +148,44 @@ def test_different_user_access(
     assert rsp.status_code == 404
 
 
+def test_read_card_query_count_independent_of_history(
+    client: TestClient,
+    db: Session,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],
+):
+    url = (
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}"
+        f"/cards/{test_card['id']}"
+    )
+    with count_queries(async_engine) as statements:
+        rsp = client.get(url, headers=normal_user_token_headers)
+    assert rsp.status_code == 200
+    baseline = count_selects(statements)
+
+    user = db.exec(select(User).where(User.email == settings.EMAIL_TEST_USER)).one()
+    collections = [Collection(name=f"History {i}", user_id=user.id) for i in range(20)]
+    db.add_all(collections)
+    db.flush()
+    db.add_all(
+        PracticeSession(
+            collection_id=collection.id,
+            user_id=user.id,
+            is_completed=True,
+        )
+        for collection in collections
+        for _ in range(10)
+    )
+    db.commit()
+
+    with count_queries(async_engine) as statements:
+        rsp = client.get(url, headers=normal_user_token_headers)
+    assert rsp.status_code == 200
+    assert count_selects(statements) == baseline
+    assert not any("practicesession" in s for s in statements)
+
+
 def test_read_cards(
     client: TestClient,
     normal_user_token_headers: dict[str, str],
@@ -183,6 +227,133 @@ def test_read_cards_with_pagination(
     assert len(content["data"]) <= 3
 
 
+def test_read_cards_with_cursor(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_multiple_cards: list[dict[str, Any]],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/"
+    seen = []
+    params = {"limit": 2}
+    while True:
+        rsp = client.get(url, params=params, headers=normal_user_token_headers)
+        assert rsp.status_code == 200
+        content = rsp.json()
+        assert content["count"] == len(test_multiple_cards)
+        seen.extend(card["id"] for card in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params["cursor"] = content["next_cursor"]
+
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == sorted(card["id"] for card in test_multiple_cards)
+
+
+def test_read_cards_not_modified(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/"
+    etag = client.get(url, headers=normal_user_token_headers).headers["etag"]
+    conditional_headers = {**normal_user_token_headers, "If-None-Match": etag}
+
+    assert client.get(url, headers=conditional_headers).status_code == 304
+
+    client.put(
+        f"{url}{test_card['id']}",
+        json={"front": "Updated front"},
+        headers=normal_user_token_headers,
+    )
+    rsp = client.get(url, headers=conditional_headers)
+    assert rsp.status_code == 200
+    assert rsp.json()["data"][0]["front"] == "Updated front"
+    etag = rsp.headers["etag"]
+
+    client.delete(f"{url}{test_card['id']}", headers=normal_user_token_headers)
+    rsp = client.get(url, headers={**normal_user_token_headers, "If-None-Match": etag})
+    assert rsp.status_code == 200
+    assert rsp.json()["data"] == []
+
+
+def test_read_cards_with_invalid_cursor(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        params={"cursor": "not a cursor"},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 400
+    assert rsp.json()["detail"] == "Invalid cursor"
+
+
+def test_read_cards_with_fields(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_multiple_cards: list[dict[str, Any]],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/"
+    seen = []
+    params: dict[str, Any] = {"limit": 2, "fields": ["id", "preview"]}
+    while True:
+        rsp = client.get(url, params=params, headers=normal_user_token_headers)
+        assert rsp.status_code == 200
+        assert rsp.headers["etag"]
+        content = rsp.json()
+        assert content["count"] == len(test_multiple_cards)
+        assert all(card.keys() == {"id", "preview"} for card in content["data"])
+        seen.extend(content["data"])
+        if content["next_cursor"] is None:
+            break
+        params["cursor"] = content["next_cursor"]
+
+    assert sorted(seen, key=lambda card: card["id"]) == sorted(
+        ({"id": card["id"], "preview": card["front"]} for card in test_multiple_cards),
+        key=lambda card: card["id"],
+    )
+
+
+def test_read_cards_with_fields_not_modified(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],  # noqa: ARG001
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/"
+    params = {"fields": "preview"}
+    etag = client.get(url, params=params, headers=normal_user_token_headers).headers[
+        "etag"
+    ]
+
+    rsp = client.get(
+        url, params=params, headers={**normal_user_token_headers, "If-None-Match": etag}
+    )
+    assert rsp.status_code == 304
+    full = client.get(url, headers=normal_user_token_headers)
+    assert full.headers["etag"] != etag
+
+
+def test_read_cards_with_invalid_fields(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        params={"fields": ["id", "minhash"]},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 422
+
+
 def test_read_cards_with_nonexistent_collection(
     client: TestClient, normal_user_token_headers: dict[str, str]
 ):
@@ -395,7 +566,8 @@ def test_create_card_with_prompt_ai(
         "src.flashcards.services.generate_ai_flashcard", new_callable=AsyncMock
     ) as mock_ai:
         with patch(
-            "src.flashcards.api.check_and_increment_ai_usage_quota"
+            "src.flashcards.api.check_and_increment_ai_usage_quota",
+            new_callable=AsyncMock,
         ) as mock_quota_check:
             mock_quota_check.return_value = True
             mock_ai.return_value = type("Card", (), ai_card)()
@@ -428,3 +600,750 @@ def test_create_card_with_prompt_too_long(
     assert rsp.status_code == 422
     content = rsp.json()
     assert "prompt" in str(content)
+
+
+def test_read_card_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.get(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}"
+            f"/cards/{test_card['id']}",
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    # Ownership and the card come from one query
+    assert statement_kinds(statements) == ["SELECT"]
+
+
+def test_read_card_from_another_collection(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_card: dict[str, Any],
+):
+    other = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Other"},
+        headers=normal_user_token_headers,
+    ).json()
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{other['id']}/cards/{test_card['id']}",
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 404
+    assert rsp.json()["detail"] == "Card not found"
+
+
+def test_create_card_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.post(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+            json={"front": "front", "back": "back"},
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    # The last UPDATE bumps the collection version
+    assert statement_kinds(statements) == ["SELECT", "INSERT", "UPDATE", "UPDATE"]
+
+
+def test_update_card_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.put(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}"
+            f"/cards/{test_card['id']}",
+            json={"front": "new front", "back": "new back"},
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    assert statement_kinds(statements) == ["SELECT", "UPDATE", "UPDATE"]
+
+
+def test_delete_card_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.delete(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}"
+            f"/cards/{test_card['id']}",
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 204
+    # Practice cards go with the card, through the foreign key
+    assert statement_kinds(statements) == ["SELECT", "DELETE", "DELETE", "UPDATE"]
+
+
+def _import_cards(
+    client: TestClient,
+    headers: dict[str, str],
+    collection_id: str,
+    content: bytes,
+    format: str = "csv",
+    skip_duplicates: bool = False,
+) -> list[dict[str, Any]]:
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{collection_id}/cards/import",
+        params={"format": format, "skip_duplicates": skip_duplicates},
+        content=content,
+        headers=headers,
+    )
+    assert rsp.status_code == 200
+    assert rsp.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in rsp.text.splitlines()]
+
+
+def test_import_cards_csv(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    content = (
+        "front,back\n"
+        'Hola,Hello\n"Multi\nline",Back\n'
+        "missing back\n"
+        f"{'x' * 3001},Too long\n"
+    ).encode()
+    with patch.object(settings, "CARD_IMPORT_CHUNK_SIZE", 1):
+        events = _import_cards(
+            client, normal_user_token_headers, test_collection["id"], content
+        )
+
+    assert events == [
+        {"type": "progress", "staged": 1, "failed": 0, "skipped": 0},
+        {"type": "progress", "staged": 2, "failed": 0, "skipped": 0},
+        {"type": "error", "line": 5, "detail": "Expected a front and a back column"},
+        {
+            "type": "error",
+            "line": 6,
+            "detail": "front: String should have at most 3000 characters",
+        },
+        {"type": "summary", "imported": 2, "failed": 2, "skipped": 0},
+    ]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        headers=normal_user_token_headers,
+    )
+    cards = {(card["front"], card["back"]) for card in rsp.json()["data"]}
+    assert cards == {("Hola", "Hello"), ("Multi\nline", "Back")}
+
+
+@pytest.mark.parametrize(
+    "format,content",
+    [
+        ("tsv", b"front\tback\nOne\t1\nTwo\t2\n"),
+        ("ndjson", b'{"front": "One", "back": "1"}\n{"front": "Two", "back": "2"}'),
+    ],
+)
+def test_import_cards_formats(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    format: str,
+    content: bytes,
+):
+    events = _import_cards(
+        client, normal_user_token_headers, test_collection["id"], content, format
+    )
+
+    assert events == [{"type": "summary", "imported": 2, "failed": 0, "skipped": 0}]
+
+
+def test_import_cards_adds_to_ongoing_session(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/practice-sessions",
+        json={"collection_id": test_collection["id"]},
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 200
+    practice_session_id = rsp.json()["id"]
+
+    events = _import_cards(
+        client,
+        normal_user_token_headers,
+        test_collection["id"],
+        b"One,1\nTwo,2\n",
+    )
+    assert events[-1] == {"type": "summary", "imported": 2, "failed": 0, "skipped": 0}
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/practice-sessions/{practice_session_id}",
+        headers=normal_user_token_headers,
+    )
+    assert rsp.json()["total_cards"] == 3
+    rsp = client.get(
+        f"{settings.API_V1_STR}/practice-sessions/{practice_session_id}/cards",
+        headers=normal_user_token_headers,
+    )
+    assert {card["card"]["front"] for card in rsp.json()["data"]} == {
+        test_card["front"],
+        "One",
+        "Two",
+    }
+
+
+def test_import_cards_unreadable_file_imports_nothing(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    events = _import_cards(
+        client,
+        normal_user_token_headers,
+        test_collection["id"],
+        b"One,1\nTwo,\xff\n",
+    )
+
+    assert events == [
+        {"type": "error", "line": 2, "detail": "File is not valid UTF-8"},
+        {"type": "summary", "imported": 0, "failed": 0, "skipped": 0},
+    ]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        headers=normal_user_token_headers,
+    )
+    assert rsp.json()["count"] == 0
+
+
+def test_import_cards_different_user(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/import",
+        content=b"One,1\n",
+        headers=superuser_token_headers,
+    )
+
+    assert rsp.status_code == 404
+    assert rsp.json()["detail"] == "Collection not found"
+
+
+def test_import_cards_skip_duplicates(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        json={"front": "What is the capital of France?", "back": "Paris"},
+        headers=normal_user_token_headers,
+    )
+    content = (
+        b"front,back\n"
+        b"what is the capital of france,PARIS\n"
+        b"What is the capital of Spain?,Madrid\n"
+        b"Largest planet,Jupiter\n"
+        b"What's the capital of Spain?,Madrid.\n"
+    )
+
+    with patch.object(settings, "CARD_IMPORT_CHUNK_SIZE", 2):
+        events = _import_cards(
+            client,
+            normal_user_token_headers,
+            test_collection["id"],
+            content,
+            skip_duplicates=True,
+        )
+
+    assert events == [
+        {"type": "progress", "staged": 1, "failed": 0, "skipped": 1},
+        {"type": "progress", "staged": 2, "failed": 0, "skipped": 2},
+        {"type": "summary", "imported": 2, "failed": 0, "skipped": 2},
+    ]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        headers=normal_user_token_headers,
+    )
+    backs = sorted(card["back"] for card in rsp.json()["data"])
+    assert backs == ["Jupiter", "Madrid", "Paris"]
+
+
+def _create_cards(
+    client: TestClient, headers: dict[str, str], collection_id: str, count: int
+) -> list[str]:
+    ids = []
+    for i in range(count):
+        rsp = client.post(
+            f"{settings.API_V1_STR}/collections/{collection_id}/cards/",
+            json={"front": f"Front {i}", "back": f"Back {i}"},
+            headers=headers,
+        )
+        assert rsp.status_code == 200
+        ids.append(rsp.json()["id"])
+    return ids
+
+
+def test_bulk_update_cards(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    card_ids = _create_cards(
+        client, normal_user_token_headers, test_collection["id"], 3
+    )
+    missing_id = str(uuid.uuid4())
+
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={
+            "action": "update",
+            "card_ids": [*card_ids[:2], missing_id],
+            "changes": {"back": "Updated"},
+        },
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    assert rsp.json()["data"] == [
+        {"id": card_ids[0], "status": "updated"},
+        {"id": card_ids[1], "status": "updated"},
+        {"id": missing_id, "status": "not_found"},
+    ]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        headers=normal_user_token_headers,
+    )
+    assert sorted(card["back"] for card in rsp.json()["data"]) == [
+        "Back 2",
+        "Updated",
+        "Updated",
+    ]
+
+
+def test_bulk_move_cards(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    card_ids = _create_cards(
+        client, normal_user_token_headers, test_collection["id"], 3
+    )
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Target"},
+        headers=normal_user_token_headers,
+    )
+    target_id = rsp.json()["id"]
+
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={
+            "action": "move",
+            "card_ids": card_ids[:2],
+            "target_collection_id": target_id,
+        },
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    assert [result["status"] for result in rsp.json()["data"]] == ["moved", "moved"]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{target_id}/cards/",
+        headers=normal_user_token_headers,
+    )
+    assert {card["id"] for card in rsp.json()["data"]} == set(card_ids[:2])
+
+
+def test_bulk_delete_cards(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    card_ids = _create_cards(
+        client, normal_user_token_headers, test_collection["id"], 3
+    )
+
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={"action": "delete", "card_ids": [card_ids[0], card_ids[0], card_ids[1]]},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    assert rsp.json()["data"] == [
+        {"id": card_ids[0], "status": "deleted"},
+        {"id": card_ids[1], "status": "deleted"},
+    ]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        headers=normal_user_token_headers,
+    )
+    assert [card["id"] for card in rsp.json()["data"]] == [card_ids[2]]
+
+
+def test_bulk_move_cards_to_same_collection(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={
+            "action": "move",
+            "card_ids": [str(uuid.uuid4())],
+            "target_collection_id": test_collection["id"],
+        },
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 400
+    assert rsp.json()["detail"] == "Cards are already in this collection"
+
+
+def test_bulk_move_cards_to_other_users_collection(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Not mine"},
+        headers=superuser_token_headers,
+    )
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={
+            "action": "move",
+            "card_ids": [str(uuid.uuid4())],
+            "target_collection_id": rsp.json()["id"],
+        },
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 404
+    assert rsp.json()["detail"] == "Target collection not found"
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"action": "update", "card_ids": [str(uuid.uuid4())]},
+        {"action": "archive", "card_ids": [str(uuid.uuid4())]},
+        {"action": "delete", "card_ids": []},
+    ],
+)
+def test_bulk_cards_invalid(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    body: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json=body,
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 422
+
+
+def test_bulk_cards_too_many(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={"action": "delete", "card_ids": [str(uuid.uuid4()) for _ in range(1001)]},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 422
+
+
+def test_bulk_cards_different_user(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={"action": "delete", "card_ids": [str(uuid.uuid4())]},
+        headers=superuser_token_headers,
+    )
+
+    assert rsp.status_code == 404
+    assert rsp.json()["detail"] == "Collection not found"
+
+
+def _search(
+    client: TestClient, headers: dict[str, str], **params: Any
+) -> dict[str, Any]:
+    rsp = client.get(f"{settings.API_V1_STR}/search", params=params, headers=headers)
+    assert rsp.status_code == 200
+    return rsp.json()
+
+
+def test_search_cards(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/"
+    cards = [
+        ("Capital of Spain", "Madrid, not Paris"),
+        ("<b>Paris</b> & France", "The capital"),
+        ("Berlin", "Germany"),
+    ]
+    for front, back in cards:
+        client.post(
+            url, json={"front": front, "back": back}, headers=normal_user_token_headers
+        )
+
+    results = _search(client, normal_user_token_headers, q="paris")
+
+    assert results["count"] == 2
+    assert results["next_cursor"] is None
+    first, second = results["data"]
+    assert first["front_snippet"] == "<mark>Paris</mark> &amp; France"
+    assert first["back_snippet"] == "The capital"
+    assert second["back_snippet"] == "Madrid, not <mark>Paris</mark>"
+    assert first["rank"] > second["rank"]
+
+
+def test_search_cards_in_collection(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    other_collection = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Other"},
+        headers=normal_user_token_headers,
+    ).json()
+    superuser_collection = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Not mine"},
+        headers=superuser_token_headers,
+    ).json()
+    for collection, headers in [
+        (test_collection, normal_user_token_headers),
+        (other_collection, normal_user_token_headers),
+        (superuser_collection, superuser_token_headers),
+    ]:
+        client.post(
+            f"{settings.API_V1_STR}/collections/{collection['id']}/cards/",
+            json={"front": "Lisbon", "back": "Portugal"},
+            headers=headers,
+        )
+
+    everywhere = _search(client, normal_user_token_headers, q="lisbon")
+    scoped = _search(
+        client,
+        normal_user_token_headers,
+        q="lisbon",
+        collection_id=test_collection["id"],
+    )
+
+    assert {card["collection_id"] for card in everywhere["data"]} == {
+        test_collection["id"],
+        other_collection["id"],
+    }
+    assert [card["collection_id"] for card in scoped["data"]] == [test_collection["id"]]
+
+
+def test_search_cards_paginates(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    card_ids = _create_cards(
+        client, normal_user_token_headers, test_collection["id"], 5
+    )
+
+    seen = []
+    params: dict[str, Any] = {"q": "front", "limit": 2}
+    while True:
+        page = _search(client, normal_user_token_headers, **params)
+        seen.extend(card["id"] for card in page["data"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    assert sorted(seen) == sorted(card_ids)
+
+
+def test_search_cards_invalid(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_card: dict[str, Any],  # noqa: ARG001
+):
+    url = f"{settings.API_V1_STR}/search"
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+        params={"limit": 1},
+        headers=normal_user_token_headers,
+    )
+    date_cursor = rsp.json()["next_cursor"]
+
+    rsp = client.get(
+        url,
+        params={"q": "front", "cursor": date_cursor},
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 400
+    rsp = client.get(url, params={"q": ""}, headers=normal_user_token_headers)
+    assert rsp.status_code == 422
+    rsp = client.get(
+        url,
+        params={"q": "front", "collection_id": test_collection["id"]},
+        headers=superuser_token_headers,
+    )
+    assert rsp.status_code == 404
+
+
+def test_create_card_skip_duplicates(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/"
+    rsp = client.post(
+        url,
+        json={"front": "What is the capital of France?", "back": "Paris"},
+        headers=normal_user_token_headers,
+    )
+    original_id = rsp.json()["id"]
+    duplicate = {"front": "What's the capital of France?", "back": "Paris."}
+
+    rsp = client.post(
+        url,
+        params={"skip_duplicates": True},
+        json=duplicate,
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 409
+    assert original_id in rsp.json()["detail"]
+
+    rsp = client.post(
+        url,
+        params={"skip_duplicates": True},
+        json={"front": "What is the capital of Spain?", "back": "Madrid"},
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 200
+    rsp = client.post(url, json=duplicate, headers=normal_user_token_headers)
+    assert rsp.status_code == 200
+
+
+def _duplicates(
+    client: TestClient, headers: dict[str, str], collection_id: str, **params: Any
+):
+    return client.get(
+        f"{settings.API_V1_STR}/collections/{collection_id}/duplicates",
+        params=params,
+        headers=headers,
+    )
+
+
+def test_read_duplicate_cards(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    cards = [
+        ("What is the capital of France?", "Paris"),
+        ("Largest planet", "Jupiter"),
+        ("What is the capital of France", "Paris!"),
+        ("Smallest planet", "Mercury"),
+        ("Largest planet?", "Jupiter"),
+        ("Closest star", "The Sun"),
+    ]
+    ids = []
+    for front, back in cards:
+        rsp = client.post(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+            json={"front": front, "back": back},
+            headers=normal_user_token_headers,
+        )
+        ids.append(rsp.json()["id"])
+
+    rsp = _duplicates(client, normal_user_token_headers, test_collection["id"])
+
+    assert rsp.status_code == 200
+    content = rsp.json()
+    assert content["count"] == 2
+    assert [
+        [card["id"] for card in cluster["cards"]] for cluster in content["data"]
+    ] == [
+        [ids[0], ids[2]],
+        [ids[1], ids[4]],
+    ]
+    assert content["data"][0]["cards"][0]["front"] == "What is the capital of France?"
+    assert all(cluster["similarity"] == 1.0 for cluster in content["data"])
+
+
+def test_read_duplicate_cards_after_bulk_update(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    ids = _create_cards(client, normal_user_token_headers, test_collection["id"], 3)
+    # The update leaves the cards without signatures until they are checked
+    client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/bulk",
+        json={
+            "action": "update",
+            "card_ids": ids[:2],
+            "changes": {"front": "Same front", "back": "Same back"},
+        },
+        headers=normal_user_token_headers,
+    )
+
+    rsp = _duplicates(client, normal_user_token_headers, test_collection["id"])
+
+    assert rsp.status_code == 200
+    assert [card["id"] for card in rsp.json()["data"][0]["cards"]] == ids[:2]
+    assert rsp.json()["count"] == 1
+
+
+@pytest.mark.parametrize("threshold", [0.2, 0.5, 1.5, "high"])
+def test_read_duplicate_cards_invalid_threshold(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    threshold: Any,
+):
+    rsp = _duplicates(
+        client, normal_user_token_headers, test_collection["id"], threshold=threshold
+    )
+    assert rsp.status_code == 422
+
+
+def test_read_duplicate_cards_different_user(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = _duplicates(client, superuser_token_headers, test_collection["id"])
+    assert rsp.status_code == 404
@@ -0,0 +1,146 @@
+import threading
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import async_engine
+from src.flashcards import dedup
+from src.flashcards.exceptions import CardImportError
+from src.flashcards.imports import (
+    MAX_RECORD_LENGTH,
+    ParsedRow,
+    import_cards,
+    parse_cards,
+)
+from src.flashcards.models import Card, Collection
+from src.flashcards.schemas import CardBase
+
+
+async def _chunks(content: bytes, size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(content), size):
+        yield content[i : i + size]
+
+
+async def _parse(content: bytes, format: str, size: int = 1) -> list:
+    return [
+        (line, row if isinstance(row, str) else (row.front, row.back))
+        async for line, row in parse_cards(_chunks(content, size), format)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parse_csv_across_chunk_boundaries():
+    content = '\ufefffront,back\r\n"Café, ""au lait""",Coffee\r\n"Two\nlines",2\r\n\r\n'
+    rows = await _parse(content.encode(), "csv")
+
+    assert rows == [
+        (2, ('Café, "au lait"', "Coffee")),
+        (3, ("Two\nlines", "2")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parse_csv_unterminated_quote():
+    rows = await _parse(b'One,1\n"Two,2\n', "csv", size=64)
+
+    assert rows == [(1, ("One", "1")), (2, "Unterminated quoted field")]
+
+
+@pytest.mark.asyncio
+async def test_parse_tsv_keeps_quotes():
+    rows = await _parse(b'Say "hi\tHello\textra\nno tab\n', "tsv", size=3)
+
+    assert rows == [
+        (1, ('Say "hi', "Hello")),
+        (2, "Expected a front and a back column"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parse_ndjson_invalid_rows():
+    content = b'{"front": "One", "back": "1"}\n[1]\n{"front": "Two"}\nnot json\n'
+    rows = await _parse(content, "ndjson", size=7)
+
+    assert rows[0] == (1, ("One", "1"))
+    assert [line for line, _ in rows[1:]] == [2, 3, 4]
+    assert rows[2][1] == "back: Field required"
+
+
+@pytest.mark.asyncio
+async def test_parse_rejects_overlong_line():
+    content = b"One,1\n" + b"x" * (MAX_RECORD_LENGTH + 1)
+
+    with pytest.raises(CardImportError) as e:
+        await _parse(content, "csv", size=4096)
+    assert e.value.line == 2
+
+
+@pytest.mark.asyncio
+async def test_import_cards_fingerprints_off_the_event_loop(
+    async_db: AsyncSession,
+    test_collection: Collection,
+    test_card: Card,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    collection_id, card_id = test_collection.id, test_card.id
+    threads = []
+    fingerprint = dedup.fingerprint
+
+    def record_thread(cards):
+        threads.append(threading.current_thread())
+        return fingerprint(cards)
+
+    monkeypatch.setattr(dedup, "fingerprint", record_thread)
+    content = b"front,back\nOne,1\nTwo,2\n"
+    rows = parse_cards(_chunks(content, 64), "csv")
+
+    events = [
+        event
+        async for event in import_cards(
+            async_db, collection_id, rows, skip_duplicates=True
+        )
+    ]
+
+    assert events[-1].imported == 2
+    assert threads
+    assert threading.main_thread() not in threads
+    count = await async_db.exec(
+        select(func.count()).where(
+            Card.collection_id == collection_id, Card.id != card_id
+        )
+    )
+    assert count.one() == 2
+
+
+@pytest.mark.asyncio
+async def test_import_cards_holds_no_connection_during_upload(
+    async_db: AsyncSession,
+    test_collection: Collection,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    collection_id = test_collection.id
+    monkeypatch.setattr("src.core.config.settings.CARD_IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr("src.core.config.settings.CARD_IMPORT_SPOOL_MAX_MEMORY", 64)
+    checked_out = []
+
+    async def rows() -> AsyncIterator[ParsedRow]:
+        for i in range(5):
+            checked_out.append(async_engine.sync_engine.pool.checkedout())
+            yield i + 1, CardBase(front=f"front {i}", back=f"back {i}")
+
+    events = [
+        event
+        async for event in import_cards(
+            async_db, collection_id, rows(), skip_duplicates=True
+        )
+    ]
+
+    assert checked_out == [0] * 5
+    assert [event.staged for event in events[:-1]] == [2, 4]
+    assert events[-1].imported == 5
+    count = await async_db.exec(
+        select(func.count()).where(Card.collection_id == collection_id)
+    )
+    assert count.one() == 5
@@ -1,23 +1,41 @@
 import uuid
-
-from sqlmodel import Session
-
-from src.flashcards.models import Card, Collection
+from datetime import datetime
+from typing import Any
+
+import pytest
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import async_engine
+from src.core.pagination import Cursor
+from src.flashcards import dedup
+from src.flashcards.exceptions import DuplicateCardError
+from src.flashcards.models import Card, Collection, PracticeCard, PracticeSession
 from src.flashcards.schemas import CardCreate, CardUpdate
 from src.flashcards.services import (
     create_card,
     delete_card,
+    delete_cards,
+    fingerprint_cards,
     get_card,
     get_card_by_id,
     get_card_with_collection,
     get_cards,
+    get_or_create_practice_session,
+    get_owned_card,
+    move_cards,
     update_card,
+    update_cards,
 )
+from tests.utils.utils import count_queries, statement_kinds
 
 
-def test_create_card(db: Session, test_collection: Collection):
+@pytest.mark.asyncio
+async def test_create_card(async_db: AsyncSession, test_collection: Collection):
     card_in = CardCreate(front="front", back="back")
-    card = create_card(session=db, card_in=card_in, collection_id=test_collection.id)
+    card = await create_card(
+        session=async_db, card_in=card_in, collection_id=test_collection.id
+    )
 
     assert card is not None
     assert card.id is not None
@@ -28,8 +46,33 @@ def test_create_card(db: Session, test_collection: Collection):
     assert card.updated_at is not None
 
 
-def test_get_card(db: Session, test_card: Card):
-    db_card = get_card(session=db, card_id=test_card.id)
+@pytest.mark.asyncio
+async def test_create_card_adds_to_ongoing_session(
+    async_db: AsyncSession, test_user: dict[str, Any], test_card: Card
+):
+    practice_session = await get_or_create_practice_session(
+        session=async_db, collection_id=test_card.collection_id, user_id=test_user["id"]
+    )
+    card = await create_card(
+        session=async_db,
+        collection_id=test_card.collection_id,
+        card_in=CardCreate(front="new front", back="new back"),
+    )
+
+    assert card.id is not None
+    assert card.front == "new front"
+    await async_db.refresh(practice_session)
+    assert practice_session.total_cards == 2
+    practice_card = (
+        await async_db.exec(select(PracticeCard).where(PracticeCard.card_id == card.id))
+    ).first()
+    assert practice_card is not None
+    assert practice_card.session_id == practice_session.id
+
+
+@pytest.mark.asyncio
+async def test_get_card(async_db: AsyncSession, test_card: Card):
+    db_card = await get_card(session=async_db, card_id=test_card.id)
 
     assert db_card is not None
     assert db_card.id == test_card.id
@@ -40,39 +83,44 @@ def test_get_card(db: Session, test_card: Card):
     assert db_card.created_at is not None
 
 
-def test_get_card_not_found(db: Session):
-    db_card = get_card(session=db, card_id=uuid.uuid4())
+@pytest.mark.asyncio
+async def test_get_card_not_found(async_db: AsyncSession):
+    db_card = await get_card(session=async_db, card_id=uuid.uuid4())
 
     assert db_card is None
 
 
-def test_get_card_by_id(db: Session, test_card: Card):
-    db_card = get_card_by_id(session=db, card_id=test_card.id)
+@pytest.mark.asyncio
+async def test_get_card_by_id(async_db: AsyncSession, test_card: Card):
+    db_card = await get_card_by_id(session=async_db, card_id=test_card.id)
 
     assert db_card is not None
     assert db_card.id == test_card.id
 
 
-def test_get_card_by_nonexistent_id(db: Session):
+@pytest.mark.asyncio
+async def test_get_card_by_nonexistent_id(async_db: AsyncSession):
     non_existent_card_id = uuid.uuid4()
-    db_card = get_card_by_id(session=db, card_id=non_existent_card_id)
+    db_card = await get_card_by_id(session=async_db, card_id=non_existent_card_id)
 
     assert db_card is None
 
 
-def test_get_card_with_collection(
-    db: Session, test_collection: Collection, test_card: Card
+@pytest.mark.asyncio
+async def test_get_card_with_collection(
+    async_db: AsyncSession, test_collection: Collection, test_card: Card
 ):
-    db_card = get_card_with_collection(
-        session=db, card_id=test_card.id, user_id=test_collection.user_id
+    db_card = await get_card_with_collection(
+        session=async_db, card_id=test_card.id, user_id=test_collection.user_id
     )
 
     assert db_card is not None
 
 
-def test_get_card_with_wrong_collection(db: Session, test_card: Card):
-    db_card = get_card_with_collection(
-        session=db,
+@pytest.mark.asyncio
+async def test_get_card_with_wrong_collection(async_db: AsyncSession, test_card: Card):
+    db_card = await get_card_with_collection(
+        session=async_db,
         card_id=test_card.id,
         user_id=uuid.uuid4(),
     )
@@ -80,12 +128,54 @@ def test_get_card_with_wrong_collection(db: Session, test_card: Card):
     assert db_card is None
 
 
-def test_get_cards(
-    db: Session, test_collection: Collection, test_multiple_cards: list[Card]
+@pytest.mark.asyncio
+async def test_get_owned_card(
+    async_db: AsyncSession, test_collection: Collection, test_card: Card
+):
+    collection_id = test_card.collection_id
+    user_id = test_collection.user_id
+
+    with count_queries(async_engine) as statements:
+        found, card = await get_owned_card(
+            async_db, collection_id, test_card.id, user_id
+        )
+
+    assert found
+    assert card.id == test_card.id
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_owned_card_missing_card(
+    async_db: AsyncSession, test_collection: Collection
+):
+    found, card = await get_owned_card(
+        async_db, test_collection.id, uuid.uuid4(), test_collection.user_id
+    )
+
+    assert found
+    assert card is None
+
+
+@pytest.mark.asyncio
+async def test_get_owned_card_other_users_collection(
+    async_db: AsyncSession, test_card: Card
+):
+    found, card = await get_owned_card(
+        async_db, test_card.collection_id, test_card.id, uuid.uuid4()
+    )
+
+    assert not found
+    assert card is None
+
+
+@pytest.mark.asyncio
+async def test_get_cards(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
 ):
     limit = 3
-    db_cards, count = get_cards(
-        session=db, collection_id=test_collection.id, limit=limit
+    db_cards, count = await get_cards(
+        session=async_db, collection_id=test_collection.id, limit=limit
     )
 
     assert len(db_cards) == limit
@@ -95,27 +185,144 @@ def test_get_cards(
         assert db_cards[i].updated_at >= db_cards[i + 1].updated_at
 
 
-def test_get_cards_skip(
-    db: Session, test_collection: Collection, test_multiple_cards: list[Card]
+@pytest.mark.asyncio
+async def test_get_cards_skip(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
 ):
     limit = 3
     skip = 2
-    db_cards, count = get_cards(
-        session=db, collection_id=test_collection.id, skip=skip, limit=limit
+    db_cards, count = await get_cards(
+        session=async_db, collection_id=test_collection.id, skip=skip, limit=limit
     )
 
     assert len(db_cards) == limit
     assert count == len(test_multiple_cards)
 
 
-def test_get_cards_empty(db: Session, test_collection: Collection):
-    db_cards, count = get_cards(session=db, collection_id=test_collection.id)
+@pytest.mark.asyncio
+async def test_get_cards_after_cursor_with_equal_timestamps(
+    async_db: AsyncSession, test_collection: Collection
+):
+    updated_at = datetime(2025, 1, 1)
+    cards = [
+        Card(
+            front=f"front {i}",
+            back=f"back {i}",
+            collection_id=test_collection.id,
+            updated_at=updated_at,
+        )
+        for i in range(5)
+    ]
+    async_db.add_all(cards)
+    await async_db.commit()
+
+    first_page, _ = await get_cards(
+        session=async_db, collection_id=test_collection.id, limit=3
+    )
+    last = first_page[-1]
+    second_page, _ = await get_cards(
+        session=async_db,
+        collection_id=test_collection.id,
+        limit=3,
+        after=Cursor(last.updated_at, last.id),
+    )
+
+    page_ids = [card.id for card in first_page + second_page]
+    assert page_ids == sorted((card.id for card in cards), reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_get_cards_exact_count_in_page_query(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    collection_id = test_collection.id
+    with count_queries(async_engine) as statements:
+        db_cards, count = await get_cards(
+            session=async_db, collection_id=collection_id, limit=2
+        )
+
+    assert len(db_cards) == 2
+    assert count == len(test_multiple_cards)
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_cards_exact_count_after_cursor(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    first_page, _ = await get_cards(
+        session=async_db, collection_id=test_collection.id, limit=2
+    )
+    last = first_page[-1]
+
+    cursor = Cursor(last.updated_at, last.id)
+    collection_id = test_collection.id
+
+    with count_queries(async_engine) as statements:
+        db_cards, count = await get_cards(
+            session=async_db, collection_id=collection_id, limit=2, after=cursor
+        )
+
+    assert len(db_cards) == 2
+    assert count == len(test_multiple_cards)
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_cards_exact_count_past_last_page(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    db_cards, count = await get_cards(
+        session=async_db,
+        collection_id=test_collection.id,
+        skip=len(test_multiple_cards),
+    )
+
+    assert db_cards == []
+    assert count == len(test_multiple_cards)
+
+
+@pytest.mark.asyncio
+async def test_get_cards_without_count(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    collection_id = test_collection.id
+    with count_queries(async_engine) as statements:
+        db_cards, count = await get_cards(
+            session=async_db, collection_id=collection_id, count="none"
+        )
+
+    assert len(db_cards) == len(test_multiple_cards)
+    assert count is None
+    assert len(statements) == 1
+    assert "count" not in statements[0].lower()
+
+
+@pytest.mark.asyncio
+async def test_get_cards_estimated_count(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    db_cards, count = await get_cards(
+        session=async_db, collection_id=test_collection.id, count="estimate"
+    )
+
+    assert len(db_cards) == len(test_multiple_cards)
+    assert isinstance(count, int)
+    assert count >= 0
+
+
+@pytest.mark.asyncio
+async def test_get_cards_empty(async_db: AsyncSession, test_collection: Collection):
+    db_cards, count = await get_cards(
+        session=async_db, collection_id=test_collection.id
+    )
 
     assert len(db_cards) == 0
     assert count == 0
 
 
-def test_update_card(db: Session, test_card: Card):
+@pytest.mark.asyncio
+async def test_update_card(async_db: AsyncSession, test_card: Card):
     original_updated_at = test_card.updated_at
 
     import time
@@ -123,14 +330,15 @@ def test_update_card(db: Session, test_card: Card):
     time.sleep(0.01)
 
     card_in = CardUpdate(front="Update front", back="Update back")
-    updated_card = update_card(session=db, card=test_card, card_in=card_in)
+    updated_card = await update_card(session=async_db, card=test_card, card_in=card_in)
 
     assert updated_card.front == card_in.front
     assert updated_card.back == card_in.back
     assert updated_card.updated_at > original_updated_at
 
 
-def test_update_card_partial(db: Session, test_card: Card):
+@pytest.mark.asyncio
+async def test_update_card_partial(async_db: AsyncSession, test_card: Card):
     original_updated_at = test_card.updated_at
 
     import time
@@ -138,17 +346,223 @@ def test_update_card_partial(db: Session, test_card: Card):
     time.sleep(0.01)
 
     card_in = CardUpdate(front="Update front")
-    updated_card = update_card(session=db, card=test_card, card_in=card_in)
+    updated_card = await update_card(session=async_db, card=test_card, card_in=card_in)
 
     assert updated_card.front == card_in.front
     assert updated_card.back == test_card.back
     assert updated_card.updated_at > original_updated_at
 
 
-def test_delete_card(db: Session, test_collection: Collection, test_card: Card):
-    delete_card(session=db, card=test_card)
+@pytest.mark.asyncio
+async def test_delete_card(
+    async_db: AsyncSession, test_collection: Collection, test_card: Card
+):
+    await delete_card(session=async_db, card=test_card)
 
-    card = get_card_with_collection(
-        session=db, card_id=test_card.id, user_id=test_collection.user_id
+    card = await get_card_with_collection(
+        session=async_db, card_id=test_card.id, user_id=test_collection.user_id
     )
     assert card is None
+
+
+@pytest.mark.asyncio
+async def test_update_cards(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    card_ids = [card.id for card in test_multiple_cards[:3]]
+    updated = await update_cards(
+        async_db, test_collection.id, [*card_ids, uuid.uuid4()], CardUpdate(back="same")
+    )
+
+    assert sorted(updated) == sorted(card_ids)
+    backs = (
+        await async_db.exec(
+            select(Card.back).where(Card.collection_id == test_collection.id)
+        )
+    ).all()
+    assert sorted(backs) == ["back 3", "back 4", "same", "same", "same"]
+
+
+@pytest.mark.asyncio
+async def test_card_preview(async_db: AsyncSession, test_collection: Collection):
+    front = "<h2>Past tense</h2><p>I <strong>ate</strong>&nbsp;&amp; drank</p>"
+    card = await create_card(
+        async_db, test_collection.id, CardCreate(front=front, back="b")
+    )
+
+    assert card.preview == "Past tense I ate & drank"
+
+    await update_card(async_db, card, CardUpdate(front=f"<p>{'word ' * 50}</p>"))
+    await async_db.refresh(card)
+    assert card.preview == ("word " * 24).rstrip()
+
+    await update_cards(
+        async_db, test_collection.id, [card.id], CardUpdate(front="a &lt; b")
+    )
+    await async_db.refresh(card)
+    assert card.preview == "a < b"
+
+
+@pytest.mark.parametrize("fields", [["id", "preview"], ["front", "id"]])
+@pytest.mark.asyncio
+async def test_get_cards_fields(
+    async_db: AsyncSession,
+    test_collection: Collection,
+    test_multiple_cards: list[Card],  # noqa: ARG001
+    fields: list[str],
+):
+    with count_queries(async_engine) as statements:
+        rows, total = await get_cards(
+            async_db, test_collection.id, limit=2, count="none", fields=fields
+        )
+
+    assert total is None
+    assert len(rows) == 2
+    assert set(rows[0]._fields) == {*fields, "id", "updated_at"}
+    assert "back" not in statements[0].split("FROM")[0]
+
+
+@pytest.mark.asyncio
+async def test_card_signatures_follow_text_changes(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    card = test_multiple_cards[0]
+    assert card.minhash == dedup.to_bytes(dedup.fingerprint([("front 0", "back 0")])[0])
+    assert len(card.lsh_buckets) == dedup.BANDS
+
+    await update_card(async_db, card, CardUpdate(back="changed"))
+    assert card.minhash == dedup.to_bytes(
+        dedup.fingerprint([("front 0", "changed")])[0]
+    )
+
+    card_ids = [card.id for card in test_multiple_cards[1:3]]
+    await update_cards(async_db, test_collection.id, card_ids, CardUpdate(front="same"))
+    unsigned = select(func.count()).where(
+        Card.collection_id == test_collection.id, Card.minhash.is_(None)
+    )
+    assert (await async_db.exec(unsigned)).one() == len(card_ids)
+    assert await fingerprint_cards(async_db, test_collection.id) == len(card_ids)
+    assert await fingerprint_cards(async_db, test_collection.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_cards_load_without_signatures(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    collection_id = test_collection.id
+    card_id = test_multiple_cards[0].id
+    async_db.expunge_all()
+
+    with count_queries(async_engine) as statements:
+        card = await get_card(async_db, card_id)
+        await get_cards(async_db, collection_id)
+    assert all("minhash" not in s and "lsh_buckets" not in s for s in statements)
+
+    with count_queries(async_engine) as statements:
+        await async_db.refresh(card, ["minhash"])
+    assert card.minhash is not None
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_card_skip_duplicates(async_db: AsyncSession, test_card: Card):
+    collection_id = test_card.collection_id
+    card_id = test_card.id
+
+    with pytest.raises(DuplicateCardError) as error:
+        await create_card(
+            async_db, collection_id, CardCreate(front="Front!", back="BACK"), True
+        )
+    assert error.value.card_id == card_id
+
+    card = await create_card(
+        async_db, collection_id, CardCreate(front="other", back="card"), True
+    )
+    assert card.collection_id == collection_id
+
+
+@pytest.mark.asyncio
+async def test_move_cards(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    user_id = test_collection.user_id
+    target = Collection(name="Target", user_id=user_id)
+    async_db.add(target)
+    await async_db.commit()
+    await create_card(async_db, target.id, CardCreate(front="front", back="back"))
+    source_session = await get_or_create_practice_session(
+        async_db, test_collection.id, user_id
+    )
+    source_session_id = source_session.id
+    target_session = await get_or_create_practice_session(async_db, target.id, user_id)
+    card_ids = [card.id for card in test_multiple_cards[:2]]
+
+    moved = await move_cards(async_db, test_collection.id, target.id, card_ids)
+
+    assert sorted(moved) == sorted(card_ids)
+    assert await async_db.get(PracticeSession, source_session_id) is None
+    await async_db.refresh(target_session)
+    assert target_session.total_cards == 3
+    practice_card_ids = (
+        await async_db.exec(
+            select(PracticeCard.card_id).where(
+                PracticeCard.session_id == target_session.id
+            )
+        )
+    ).all()
+    assert set(card_ids) < set(practice_card_ids)
+
+
+@pytest.mark.asyncio
+async def test_delete_cards(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    practice_session = await get_or_create_practice_session(
+        async_db, test_collection.id, test_collection.user_id
+    )
+    practice_session_id = practice_session.id
+    card_ids = [card.id for card in test_multiple_cards[:4]]
+
+    deleted = await delete_cards(async_db, test_collection.id, card_ids)
+
+    assert sorted(deleted) == sorted(card_ids)
+    assert await async_db.get(PracticeSession, practice_session_id) is None
+    remaining = await async_db.exec(
+        select(Card.id).where(Card.collection_id == test_collection.id)
+    )
+    assert remaining.all() == [test_multiple_cards[4].id]
+
+
+@pytest.mark.asyncio
+async def test_delete_cards_of_other_collection(
+    async_db: AsyncSession, test_collection: Collection, test_multiple_cards: list[Card]
+):
+    card_ids = [card.id for card in test_multiple_cards]
+
+    assert await delete_cards(async_db, uuid.uuid4(), card_ids) == []
+    count = (
+        await async_db.exec(
+            select(func.count()).where(Card.collection_id == test_collection.id)
+        )
+    ).one()
+    assert count == 5
+
+
+@pytest.mark.parametrize("cards", [1, 5])
+@pytest.mark.asyncio
+async def test_delete_cards_statements(
+    async_db: AsyncSession,
+    test_collection: Collection,
+    test_multiple_cards: list[Card],
+    cards: int,
+):
+    await get_or_create_practice_session(
+        async_db, test_collection.id, test_collection.user_id
+    )
+    collection_id = test_collection.id
+    card_ids = [card.id for card in test_multiple_cards[:cards]]
+
+    with count_queries(async_engine) as statements:
+        await delete_cards(async_db, collection_id, card_ids)
+
+    assert statement_kinds(statements) == ["DELETE", "DELETE", "UPDATE"]
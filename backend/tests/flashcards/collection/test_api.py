@@ -1,13 +1,29 @@
+import asyncio
+import csv
+import io
+import json
 import uuid
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
 from src.ai_models.gemini.exceptions import AIGenerationError
 from src.core.config import settings
-from src.flashcards.schemas import Card, Collection, CollectionCreate, CollectionUpdate
+from src.core.db import ReplicaRouter, async_engine
+from src.flashcards import services
+from src.flashcards.schemas import (
+    AIFlashcard,
+    AIFlashcardCollection,
+    Card,
+    Collection,
+    CollectionCreate,
+    CollectionUpdate,
+)
+from tests.utils.utils import count_queries, statement_kinds
 
 
 @pytest.fixture
@@ -84,7 +100,8 @@ def test_create_collection_with_prompt(
         "src.flashcards.services.generate_ai_collection", new_callable=AsyncMock
     ) as mock_ai_generate:
         with patch(
-            "src.flashcards.api.check_and_increment_ai_usage_quota"
+            "src.flashcards.api.check_and_increment_ai_usage_quota",
+            new_callable=AsyncMock,
         ) as mock_quota_check:
             mock_ai_generate.return_value = mock_collection
             mock_quota_check.return_value = True
@@ -108,6 +125,41 @@ def test_create_collection_with_prompt(
             mock_ai_generate.assert_called_once()
 
 
+def test_create_collection_with_prompt_skips_duplicates(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+):
+    generated = AIFlashcardCollection(
+        name="Capitals",
+        cards=[
+            AIFlashcard(front="What is the capital of France?", back="Paris"),
+            AIFlashcard(front="What is the capital of Spain?", back="Madrid"),
+            AIFlashcard(front="What's the capital of France?", back="Paris."),
+        ],
+    )
+
+    with (
+        patch(
+            "src.flashcards.services.generate_ai_collection",
+            new_callable=AsyncMock,
+            return_value=generated,
+        ),
+        patch(
+            "src.flashcards.api.check_and_increment_ai_usage_quota",
+            new_callable=AsyncMock,
+            return_value=True,
+        ),
+    ):
+        rsp = client.post(
+            f"{settings.API_V1_STR}/collections/",
+            params={"skip_duplicates": True},
+            json={"name": "Capitals", "prompt": "European capitals"},
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    assert [card["back"] for card in rsp.json()["cards"]] == ["Paris", "Madrid"]
+
+
 def test_create_collection_with_ai_generation_error(
     client: TestClient, normal_user_token_headers: dict[str, str]
 ):
@@ -119,7 +171,8 @@ def test_create_collection_with_ai_generation_error(
         "src.flashcards.services.generate_ai_collection", new_callable=AsyncMock
     ) as mock_ai_generate:
         with patch(
-            "src.flashcards.api.check_and_increment_ai_usage_quota"
+            "src.flashcards.api.check_and_increment_ai_usage_quota",
+            new_callable=AsyncMock,
         ) as mock_quota_check:
             err_msg = "AI service is unavailable"
             mock_ai_generate.side_effect = AIGenerationError(err_msg)
@@ -232,6 +285,30 @@ def test_read_collections_with_pagination(
     assert len(content["data"]) <= 2
 
 
+def test_read_collections_with_cursor(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_multiple_collections: list[dict[str, Any]],
+):
+    seen = []
+    params: dict[str, Any] = {"limit": 2}
+    while True:
+        rsp = client.get(
+            f"{settings.API_V1_STR}/collections/",
+            params=params,
+            headers=normal_user_token_headers,
+        )
+        assert rsp.status_code == 200
+        content = rsp.json()
+        seen.extend(collection["id"] for collection in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params["cursor"] = content["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == content["count"]
+    assert {collection["id"] for collection in test_multiple_collections} <= set(seen)
+
+
 def test_update_collection_success(
     client: TestClient,
     normal_user_token_headers: dict[str, str],
@@ -394,3 +471,602 @@ def test_deleted_collection_not_in_list(
     assert delete_collection["id"] not in [
         collection["id"] for collection in list_after["data"]
     ]
+
+
+@pytest.fixture
+def replica_router(monkeypatch: pytest.MonkeyPatch):
+    """Route reads to a second engine so tests can tell which one served them.
+    It pools no connections, as they would belong to the test client's loop."""
+    replica = create_async_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI), poolclass=NullPool
+    )
+    router = ReplicaRouter(async_engine, [replica], read_your_writes_window=60)
+    monkeypatch.setattr("src.auth.services.replica_router", router)
+    monkeypatch.setattr("src.main.replica_router", router)
+    return router
+
+
+def test_read_collections_uses_replica(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    replica_router: ReplicaRouter,
+):
+    url = f"{settings.API_V1_STR}/collections/"
+    # Caches the principal, which is always looked up on the primary
+    client.get(url, headers=normal_user_token_headers)
+
+    with (
+        count_queries(replica_router.primary) as primary,
+        count_queries(*replica_router.replicas) as replica,
+    ):
+        rsp = client.get(url, headers=normal_user_token_headers)
+
+    assert rsp.status_code == 200
+    assert replica
+    assert not primary
+
+
+def test_read_collections_after_write_uses_primary(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    replica_router: ReplicaRouter,
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Fresh"},
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 200
+
+    with count_queries(*replica_router.replicas) as replica:
+        rsp = client.get(
+            f"{settings.API_V1_STR}/collections/", headers=normal_user_token_headers
+        )
+
+    assert rsp.status_code == 200
+    assert "Fresh" in [c["name"] for c in rsp.json()["data"]]
+    assert not replica
+
+
+def test_read_after_slow_write_uses_primary(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    replica_router: ReplicaRouter,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    replica_router.read_your_writes_window = 0.5
+    create_collection = services.create_collection
+
+    async def slow_create_collection(*args: Any, **kwargs: Any) -> Any:
+        await asyncio.sleep(0.6)
+        return await create_collection(*args, **kwargs)
+
+    monkeypatch.setattr(services, "create_collection", slow_create_collection)
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Slow"},
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 200
+
+    with count_queries(*replica_router.replicas) as replica:
+        rsp = client.get(
+            f"{settings.API_V1_STR}/collections/", headers=normal_user_token_headers
+        )
+
+    assert rsp.status_code == 200
+    assert not replica
+
+
+def test_create_collection_statements(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+):
+    url = f"{settings.API_V1_STR}/collections/"
+    client.get(url, headers=normal_user_token_headers)
+
+    with count_queries(async_engine) as statements:
+        rsp = client.post(
+            url, json={"name": "Statements"}, headers=normal_user_token_headers
+        )
+
+    assert rsp.status_code == 200
+    assert statement_kinds(statements) == ["INSERT"]
+
+
+def test_update_collection_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.put(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}",
+            json={"name": "Renamed"},
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    assert statement_kinds(statements) == ["SELECT", "UPDATE", "SELECT"]
+
+
+def test_delete_collection_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.delete(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}",
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 204
+    assert statement_kinds(statements) == ["SELECT", "DELETE"]
+
+
+def test_read_collections_summary(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/"
+    for i in range(3):
+        client.post(
+            url,
+            json={"front": f"front {i}", "back": f"back {i}"},
+            headers=normal_user_token_headers,
+        )
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/", headers=normal_user_token_headers
+    )
+
+    assert rsp.status_code == 200
+    [summary] = [c for c in rsp.json()["data"] if c["id"] == test_collection["id"]]
+    assert summary["card_count"] == 3
+    assert summary["last_practiced_at"] is None
+    assert "cards" not in summary
+
+
+def test_read_collections_query_count_independent_of_size(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_multiple_collections: list[dict[str, Any]],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.get(
+            f"{settings.API_V1_STR}/collections/", headers=normal_user_token_headers
+        )
+
+    assert rsp.status_code == 200
+    assert len(rsp.json()["data"]) >= len(test_multiple_collections)
+    # The ETag digest, then the page with its total count
+    assert statement_kinds(statements) == ["SELECT", "SELECT"]
+
+
+def test_read_collections_not_modified(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    url = f"{settings.API_V1_STR}/collections/"
+    rsp = client.get(url, headers=normal_user_token_headers)
+    etag = rsp.headers["etag"]
+    assert rsp.headers["cache-control"] == "private, no-cache"
+
+    with count_queries(async_engine) as statements:
+        rsp = client.get(
+            url, headers={**normal_user_token_headers, "If-None-Match": etag}
+        )
+
+    assert rsp.status_code == 304
+    assert rsp.content == b""
+    assert rsp.headers["etag"] == etag
+    assert statement_kinds(statements) == ["SELECT"]
+
+    client.put(
+        f"{url}{test_collection['id']}",
+        json={"name": "Renamed"},
+        headers=normal_user_token_headers,
+    )
+    rsp = client.get(url, headers={**normal_user_token_headers, "If-None-Match": etag})
+    assert rsp.status_code == 200
+    assert rsp.headers["etag"] != etag
+
+    etag = rsp.headers["etag"]
+    client.delete(f"{url}{test_collection['id']}", headers=normal_user_token_headers)
+    rsp = client.get(url, headers={**normal_user_token_headers, "If-None-Match": etag})
+    assert rsp.status_code == 200
+
+
+def test_read_collection_not_modified(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}"
+    etag = client.get(url, headers=normal_user_token_headers).headers["etag"]
+    conditional_headers = {**normal_user_token_headers, "If-None-Match": etag}
+
+    with count_queries(async_engine) as statements:
+        rsp = client.get(url, headers=conditional_headers)
+    assert rsp.status_code == 304
+    assert statement_kinds(statements) == ["SELECT"]
+
+    rsp = client.get(url, params={"limit": 1}, headers=conditional_headers)
+    assert rsp.status_code == 200
+
+    client.post(
+        f"{url}/cards/",
+        json={"front": "front", "back": "back"},
+        headers=normal_user_token_headers,
+    )
+    rsp = client.get(url, headers=conditional_headers)
+    assert rsp.status_code == 200
+    assert len(rsp.json()["cards"]) == 1
+
+
+@pytest.mark.parametrize("count", ["estimate", "none"])
+def test_read_collections_count_modes(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_multiple_collections: list[dict[str, Any]],
+    count: str,
+):
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/",
+        params={"count": count},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    content = rsp.json()
+    assert len(content["data"]) >= len(test_multiple_collections)
+    if count == "none":
+        assert content["count"] is None
+    else:
+        assert isinstance(content["count"], int)
+
+
+def test_read_collection_paginates_cards(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    url = f"{settings.API_V1_STR}/collections/{test_collection['id']}"
+    for i in range(5):
+        client.post(
+            f"{url}/cards/",
+            json={"front": f"front {i}", "back": f"back {i}"},
+            headers=normal_user_token_headers,
+        )
+
+    rsp = client.get(url, params={"limit": 2}, headers=normal_user_token_headers)
+    assert rsp.status_code == 200
+    first_page = [card["id"] for card in rsp.json()["cards"]]
+    assert len(first_page) == 2
+
+    rsp = client.get(
+        url, params={"skip": 2, "limit": 10}, headers=normal_user_token_headers
+    )
+    assert rsp.status_code == 200
+    rest = [card["id"] for card in rsp.json()["cards"]]
+    assert len(rest) == 3
+    assert not set(first_page) & set(rest)
+
+
+@pytest.fixture
+def test_export_cards(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+) -> list[tuple[str, str]]:
+    cards = [("Hola", "Hello"), ('Say "hi"', "Line one\nline two"), ("Café", "a,b")]
+    for front, back in cards:
+        rsp = client.post(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}/cards/",
+            json={"front": front, "back": back},
+            headers=normal_user_token_headers,
+        )
+        assert rsp.status_code == 200
+    return cards
+
+
+def test_export_collection_ndjson(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_export_cards: list[tuple[str, str]],
+):
+    with patch.object(settings, "CARD_EXPORT_CHUNK_SIZE", 2):
+        rsp = client.get(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}/export",
+            headers={**normal_user_token_headers, "Accept-Encoding": "identity"},
+        )
+
+    assert rsp.status_code == 200
+    assert rsp.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in rsp.headers
+    assert rsp.headers["content-disposition"].endswith(
+        "filename*=UTF-8''Test%20Collection.ndjson"
+    )
+    rows = [json.loads(line) for line in rsp.text.splitlines()]
+    assert [(row["front"], row["back"]) for row in rows] == test_export_cards
+
+
+def test_export_collection_csv_gzip(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_export_cards: list[tuple[str, str]],
+):
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/export",
+        params={"format": "csv"},
+        headers={**normal_user_token_headers, "Accept-Encoding": "gzip"},
+    )
+
+    assert rsp.status_code == 200
+    assert rsp.headers["content-encoding"] == "gzip"
+    assert rsp.headers["vary"] == "Accept-Encoding"
+    rows = list(csv.reader(io.StringIO(rsp.text)))
+    assert rows == [["front", "back"], *map(list, test_export_cards)]
+
+
+def test_export_collection_round_trips_through_import(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_export_cards: list[tuple[str, str]],  # noqa: ARG001
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Copy"},
+        headers=normal_user_token_headers,
+    )
+    copy_id = rsp.json()["id"]
+    export = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/export",
+        params={"format": "csv"},
+        headers=normal_user_token_headers,
+    )
+    client.post(
+        f"{settings.API_V1_STR}/collections/{copy_id}/cards/import",
+        content=export.content,
+        headers=normal_user_token_headers,
+    )
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{copy_id}/export",
+        params={"format": "csv"},
+        headers=normal_user_token_headers,
+    )
+    assert sorted(csv.reader(io.StringIO(rsp.text))) == sorted(
+        csv.reader(io.StringIO(export.text))
+    )
+
+
+def test_export_collection_of_other_user(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/export",
+        headers=superuser_token_headers,
+    )
+
+    assert rsp.status_code == 404
+
+
+def test_clone_collection(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_export_cards: list[tuple[str, str]],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/clone",
+        json={"name": "Copy"},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    clone = rsp.json()
+    assert clone["id"] != test_collection["id"]
+    assert clone["name"] == "Copy"
+    assert clone["card_count"] == len(test_export_cards)
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{clone['id']}/export",
+        headers=normal_user_token_headers,
+    )
+    rows = [json.loads(line) for line in rsp.text.splitlines()]
+    assert [(row["front"], row["back"]) for row in rows] == test_export_cards
+
+
+def test_clone_collection_without_body(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/clone",
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    assert rsp.json()["name"] == test_collection["name"]
+    assert rsp.json()["card_count"] == 0
+
+
+def test_clone_collection_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_export_cards: list[tuple[str, str]],  # noqa: ARG001
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.post(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}/clone",
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    assert statement_kinds(statements) == ["SELECT", "INSERT", "WITH"]
+
+
+def test_share_collection_accepted(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+    test_export_cards: list[tuple[str, str]],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/shares",
+        json={"email": settings.FIRST_SUPERUSER, "name": "Shared"},
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 202
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collection-shares/", headers=superuser_token_headers
+    )
+    assert rsp.status_code == 200
+    assert rsp.json()["count"] == 1
+    share = rsp.json()["data"][0]
+    assert share["name"] == "Shared"
+    assert share["sender_email"] == settings.EMAIL_TEST_USER
+
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collection-shares/{share['id']}/accept",
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 404
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collection-shares/{share['id']}/accept",
+        headers=superuser_token_headers,
+    )
+    assert rsp.status_code == 200
+    clone_id = rsp.json()["id"]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{clone_id}",
+        headers=superuser_token_headers,
+    )
+    assert rsp.status_code == 200
+    assert rsp.json()["name"] == "Shared"
+    assert len(rsp.json()["cards"]) == len(test_export_cards)
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collection-shares/", headers=superuser_token_headers
+    )
+    assert rsp.json()["count"] == 0
+
+
+def test_share_collection_declined(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/shares",
+        json={"email": settings.FIRST_SUPERUSER},
+        headers=normal_user_token_headers,
+    )
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collection-shares/", headers=superuser_token_headers
+    )
+    share = rsp.json()["data"][0]
+    assert share["name"] == test_collection["name"]
+
+    rsp = client.delete(
+        f"{settings.API_V1_STR}/collection-shares/{share['id']}",
+        headers=superuser_token_headers,
+    )
+    assert rsp.status_code == 204
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collection-shares/{share['id']}/accept",
+        headers=superuser_token_headers,
+    )
+    assert rsp.status_code == 404
+
+
+def test_share_collection_hides_whether_user_exists(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    responses = [
+        client.post(
+            f"{settings.API_V1_STR}/collections/{test_collection['id']}/shares",
+            json={"email": email},
+            headers=normal_user_token_headers,
+        )
+        for email in (settings.FIRST_SUPERUSER, "nobody@example.com")
+    ]
+
+    assert [rsp.status_code for rsp in responses] == [202, 202]
+    assert responses[0].json() == responses[1].json()
+
+
+def test_clone_collection_of_other_user(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/{test_collection['id']}/clone",
+        headers=superuser_token_headers,
+    )
+
+    assert rsp.status_code == 404
+    assert rsp.json()["detail"] == "Collection not found"
+
+
+def test_typeahead_collections(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+):
+    for name, headers in [
+        ("Basic Spanish", normal_user_token_headers),
+        ("Spanish verbs", normal_user_token_headers),
+        ("Spanish", normal_user_token_headers),
+        ("German", normal_user_token_headers),
+        ("Spanish food", superuser_token_headers),
+    ]:
+        client.post(
+            f"{settings.API_V1_STR}/collections/", json={"name": name}, headers=headers
+        )
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/typeahead",
+        params={"q": "SPAN"},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    assert [name["name"] for name in rsp.json()["data"]] == [
+        "Spanish",
+        "Spanish verbs",
+        "Basic Spanish",
+    ]
+
+
+def test_typeahead_collections_escapes_wildcards(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+):
+    for name in ("100% French", "1000 words", "snake_case"):
+        client.post(
+            f"{settings.API_V1_STR}/collections/",
+            json={"name": name},
+            headers=normal_user_token_headers,
+        )
+
+    for term, expected in [("0%", ["100% French"]), ("e_c", ["snake_case"])]:
+        rsp = client.get(
+            f"{settings.API_V1_STR}/collections/typeahead",
+            params={"q": term},
+            headers=normal_user_token_headers,
+        )
+        assert [name["name"] for name in rsp.json()["data"]] == expected
@@ -1,23 +1,34 @@
 import uuid
 from typing import Any
 
-from sqlmodel import Session
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.flashcards.models import Collection
-from src.flashcards.schemas import CollectionUpdate
+from src.flashcards.schemas import CardCreate, CollectionUpdate
 from src.flashcards.services import (
+    accept_collection_share,
     check_collection_access,
+    clone_collection,
     create_collection,
     delete_collection,
+    export_cards,
     get_collection,
+    get_collection_share,
+    get_collection_shares,
+    get_collection_with_cards,
     get_collections,
+    get_or_create_practice_session,
+    record_practice_card_result,
+    share_collection,
     update_collection,
 )
 
 
-def test_create_collection(db: Session, test_user: dict[str, Any]):
-    collection = create_collection(
-        session=db, user_id=test_user["id"], name="Test Collection"
+@pytest.mark.asyncio
+async def test_create_collection(async_db: AsyncSession, test_user: dict[str, Any]):
+    collection = await create_collection(
+        session=async_db, user_id=test_user["id"], name="Test Collection"
     )
     assert collection.id is not None
     assert collection.name == "Test Collection"
@@ -26,11 +37,29 @@ def test_create_collection(db: Session, test_user: dict[str, Any]):
     assert collection.updated_at is not None
 
 
-def test_get_collection(
-    db: Session, test_user: dict[str, Any], test_collection: Collection
+@pytest.mark.asyncio
+async def test_create_collection_with_cards(
+    async_db: AsyncSession, test_user: dict[str, Any]
 ):
-    db_collection = get_collection(
-        session=db, id=test_collection.id, user_id=test_user["id"]
+    cards = [CardCreate(front=f"front {i}", back=f"back {i}") for i in range(3)]
+    collection = await create_collection(
+        session=async_db, user_id=test_user["id"], name="Cards", cards=cards
+    )
+    assert collection.id is not None
+    assert collection.user_id == test_user["id"]
+    assert sorted(card.front for card in collection.cards) == [
+        "front 0",
+        "front 1",
+        "front 2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_collection(
+    async_db: AsyncSession, test_user: dict[str, Any], test_collection: Collection
+):
+    db_collection = await get_collection(
+        session=async_db, id=test_collection.id, user_id=test_user["id"]
     )
     assert db_collection is not None
     assert db_collection.id == test_collection.id
@@ -38,24 +67,35 @@ def test_get_collection(
     assert db_collection.user_id == test_user["id"]
 
 
-def test_get_collection_not_found(db: Session, test_user: dict[str, Any]):
-    db_collection = get_collection(session=db, id=uuid.uuid4(), user_id=test_user["id"])
+@pytest.mark.asyncio
+async def test_get_collection_not_found(
+    async_db: AsyncSession, test_user: dict[str, Any]
+):
+    db_collection = await get_collection(
+        session=async_db, id=uuid.uuid4(), user_id=test_user["id"]
+    )
     assert db_collection is None
 
 
-def test_get_collection_with_wrong_user(db: Session, test_other_user: dict[str, Any]):
-    db_collection = get_collection(
-        session=db, id=uuid.uuid4(), user_id=test_other_user["id"]
+@pytest.mark.asyncio
+async def test_get_collection_with_wrong_user(
+    async_db: AsyncSession, test_other_user: dict[str, Any]
+):
+    db_collection = await get_collection(
+        session=async_db, id=uuid.uuid4(), user_id=test_other_user["id"]
     )
     assert db_collection is None
 
 
-def test_get_collections(
-    db: Session, test_user: dict[str, Any], test_multiple_collections: list[Collection]
+@pytest.mark.asyncio
+async def test_get_collections(
+    async_db: AsyncSession,
+    test_user: dict[str, Any],
+    test_multiple_collections: list[Collection],
 ):
     limit = 2
-    db_collections, count = get_collections(
-        session=db, user_id=test_user["id"], limit=limit
+    db_collections, count = await get_collections(
+        session=async_db, user_id=test_user["id"], limit=limit
     )
 
     assert len(db_collections) == limit
@@ -66,28 +106,78 @@ def test_get_collections(
         assert db_collections[i].updated_at >= db_collections[i + 1].updated_at
 
 
-def test_get_collection_skip(
-    db: Session, test_user: dict[str, Any], test_multiple_collections: list[Collection]
+@pytest.mark.asyncio
+async def test_get_collections_summary(
+    async_db: AsyncSession,
+    test_user: dict[str, Any],
+    test_collection_with_multiple_cards: Collection,
+):
+    practice_session = await get_or_create_practice_session(
+        session=async_db,
+        collection_id=test_collection_with_multiple_cards.id,
+        user_id=test_user["id"],
+    )
+    [summary], _ = await get_collections(session=async_db, user_id=test_user["id"])
+    assert summary.id == test_collection_with_multiple_cards.id
+    assert summary.card_count == 5
+    assert summary.last_practiced_at is None
+
+    await record_practice_card_result(
+        session=async_db,
+        practice_card=practice_session.practice_cards[0],
+        is_correct=True,
+    )
+    [summary], _ = await get_collections(session=async_db, user_id=test_user["id"])
+    assert summary.last_practiced_at is not None
+
+
+@pytest.mark.asyncio
+async def test_get_collection_with_cards_paginates(
+    async_db: AsyncSession,
+    test_user: dict[str, Any],
+    test_collection_with_multiple_cards: Collection,
+):
+    collection = await get_collection_with_cards(
+        session=async_db,
+        id=test_collection_with_multiple_cards.id,
+        user_id=test_user["id"],
+        skip=1,
+        limit=3,
+    )
+
+    assert collection is not None
+    assert len(collection.cards) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_collection_skip(
+    async_db: AsyncSession,
+    test_user: dict[str, Any],
+    test_multiple_collections: list[Collection],
 ):
     skip = 2
     limit = 2
 
-    db_collections, count = get_collections(
-        session=db, user_id=test_user["id"], skip=skip, limit=limit
+    db_collections, count = await get_collections(
+        session=async_db, user_id=test_user["id"], skip=skip, limit=limit
     )
 
     assert len(db_collections) == limit
     assert count == len(test_multiple_collections)
 
 
-def test_get_collection_empty(db: Session, test_user: dict[str, Any]):
-    db_collections, count = get_collections(session=db, user_id=test_user["id"])
+@pytest.mark.asyncio
+async def test_get_collection_empty(async_db: AsyncSession, test_user: dict[str, Any]):
+    db_collections, count = await get_collections(
+        session=async_db, user_id=test_user["id"]
+    )
 
     assert len(db_collections) == 0
     assert count == 0
 
 
-def test_update_collection(db: Session, test_collection: Collection):
+@pytest.mark.asyncio
+async def test_update_collection(async_db: AsyncSession, test_collection: Collection):
     original_updated_at = test_collection.updated_at
 
     import time
@@ -95,8 +185,8 @@ def test_update_collection(db: Session, test_collection: Collection):
     time.sleep(0.01)
 
     collection_in = CollectionUpdate(name="Updated Collection")
-    collection_update = update_collection(
-        session=db, collection=test_collection, collection_in=collection_in
+    collection_update = await update_collection(
+        session=async_db, collection=test_collection, collection_in=collection_in
     )
 
     assert collection_update is not None
@@ -104,42 +194,120 @@ def test_update_collection(db: Session, test_collection: Collection):
     assert collection_update.updated_at > original_updated_at
 
 
-def test_delete_collection(
-    db: Session, test_user: dict[str, Any], test_collection: Collection
+@pytest.mark.asyncio
+async def test_delete_collection(
+    async_db: AsyncSession, test_user: dict[str, Any], test_collection: Collection
 ):
-    delete_collection(session=db, collection=test_collection)
+    await delete_collection(session=async_db, collection=test_collection)
 
-    db_collection = get_collection(
-        session=db, id=test_collection.id, user_id=test_user["id"]
+    db_collection = await get_collection(
+        session=async_db, id=test_collection.id, user_id=test_user["id"]
     )
 
     assert db_collection is None
 
 
-def test_check_collection_access(db: Session, test_collection: Collection):
-    can_access = check_collection_access(
-        session=db, collection_id=test_collection.id, user_id=test_collection.user_id
+@pytest.mark.asyncio
+async def test_check_collection_access(
+    async_db: AsyncSession, test_collection: Collection
+):
+    can_access = await check_collection_access(
+        session=async_db,
+        collection_id=test_collection.id,
+        user_id=test_collection.user_id,
     )
 
     assert can_access is True
 
 
-def test_check_collection_access_with_nonexistent_collection(
-    db: Session, test_user: dict[str, Any]
+@pytest.mark.asyncio
+async def test_check_collection_access_with_nonexistent_collection(
+    async_db: AsyncSession, test_user: dict[str, Any]
 ):
     non_existent_collection_id = uuid.uuid4()
-    can_access = check_collection_access(
-        session=db, collection_id=non_existent_collection_id, user_id=test_user["id"]
+    can_access = await check_collection_access(
+        session=async_db,
+        collection_id=non_existent_collection_id,
+        user_id=test_user["id"],
     )
 
     assert can_access is False
 
 
-def test_check_collection_access_with_other_user(
-    db: Session, test_collection: Collection, test_other_user: dict[str, Any]
+@pytest.mark.asyncio
+async def test_check_collection_access_with_other_user(
+    async_db: AsyncSession, test_collection: Collection, test_other_user: dict[str, Any]
 ):
-    can_access = check_collection_access(
-        session=db, collection_id=test_collection.id, user_id=test_other_user["id"]
+    can_access = await check_collection_access(
+        session=async_db,
+        collection_id=test_collection.id,
+        user_id=test_other_user["id"],
     )
 
     assert can_access is False
+
+
+@pytest.mark.asyncio
+async def test_clone_collection(
+    async_db: AsyncSession,
+    test_collection_with_multiple_cards: Collection,
+    test_other_user: dict[str, Any],
+):
+    source = test_collection_with_multiple_cards
+    source_cards = {(card.front, card.back) for card in source.cards}
+
+    clone = await clone_collection(
+        async_db, source, test_other_user["id"], name="Shared"
+    )
+
+    assert clone.id != source.id
+    assert clone.name == "Shared"
+    assert clone.card_count == 5
+    cloned = await get_collection_with_cards(async_db, clone.id, test_other_user["id"])
+    assert cloned is not None
+    assert {(card.front, card.back) for card in cloned.cards} == source_cards
+    assert {card.id for card in cloned.cards}.isdisjoint(
+        card.id for card in source.cards
+    )
+    await async_db.refresh(source, ["cards"])
+    assert len(source.cards) == 5
+
+
+@pytest.mark.asyncio
+async def test_share_collection_copies_on_accept(
+    async_db: AsyncSession,
+    test_collection_with_multiple_cards: Collection,
+    test_other_user: dict[str, Any],
+):
+    source = test_collection_with_multiple_cards
+    recipient_id = test_other_user["id"]
+
+    await share_collection(async_db, source, recipient_id)
+    await share_collection(async_db, source, recipient_id, name="Shared")
+
+    shares = await get_collection_shares(async_db, recipient_id)
+    assert [share.name for share in shares] == ["Shared"]
+    share = await get_collection_share(async_db, shares[0].id, recipient_id)
+    assert share is not None
+    clone = await accept_collection_share(async_db, share)
+
+    assert clone.name == "Shared"
+    assert clone.card_count == 5
+    assert await get_collection_shares(async_db, recipient_id) == []
+
+
+@pytest.mark.asyncio
+async def test_export_cards_in_chunks(
+    async_db: AsyncSession, test_collection_with_multiple_cards: Collection
+):
+    partitions = [
+        rows
+        async for rows in export_cards(
+            async_db, test_collection_with_multiple_cards.id, chunk_size=2
+        )
+    ]
+
+    assert [len(rows) for rows in partitions] == [2, 2, 1]
+    assert {tuple(row) for rows in partitions for row in rows} == {
+        (f"front {i}", f"back {i}") for i in range(5)
+    }
@@ -1,7 +1,7 @@
 from typing import Any
 
-import pytest
-from sqlmodel import Session
+import pytest_asyncio
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.flashcards.models import Card, Collection
 from src.flashcards.schemas import CardCreate
@@ -11,60 +11,62 @@ from src.users.services import create_user
 from tests.utils.utils import random_email, random_lower_string
 
 
-@pytest.fixture
-def test_user(db: Session) -> dict[str, Any]:
+@pytest_asyncio.fixture
+async def test_user(async_db: AsyncSession) -> dict[str, Any]:
     email = random_email()
     password = random_lower_string()
     full_name = random_lower_string()
 
     user_in = UserCreate(email=email, password=password, full_name=full_name)
-    user = create_user(session=db, user_create=user_in)
+    user = await create_user(session=async_db, user_create=user_in)
 
     return {"id": user.id, "email": user.email}
 
 
-@pytest.fixture
-def test_other_user(db: Session) -> dict[str, Any]:
+@pytest_asyncio.fixture
+async def test_other_user(async_db: AsyncSession) -> dict[str, Any]:
     email = random_email()
     password = random_lower_string()
     full_name = random_lower_string()
 
     user_in = UserCreate(email=email, password=password, full_name=full_name)
-    user = create_user(session=db, user_create=user_in)
+    user = await create_user(session=async_db, user_create=user_in)
 
     return {"id": user.id, "email": user.email}
 
 
-@pytest.fixture
-def test_collection(db: Session, test_user: dict[str, Any]) -> Collection:
-    collection = create_collection(
-        session=db, user_id=test_user["id"], name="Test Collection"
+@pytest_asyncio.fixture
+async def test_collection(
+    async_db: AsyncSession, test_user: dict[str, Any]
+) -> Collection:
+    collection = await create_collection(
+        session=async_db, user_id=test_user["id"], name="Test Collection"
     )
     return collection
 
 
-@pytest.fixture
-def test_collection_with_multiple_cards(
-    db: Session, test_user: dict[str, Any]
+@pytest_asyncio.fixture
+async def test_collection_with_multiple_cards(
+    async_db: AsyncSession, test_user: dict[str, Any]
 ) -> Collection:
     cards = [CardCreate(front=f"front {i}", back=f"back {i}") for i in range(5)]
-    collection = create_collection(
-        session=db, user_id=test_user["id"], name="Test Collection", cards=cards
+    collection = await create_collection(
+        session=async_db, user_id=test_user["id"], name="Test Collection", cards=cards
     )
     return collection
 
 
-@pytest.fixture
-def test_multiple_collections(
-    db: Session, test_user: dict[str, Any]
+@pytest_asyncio.fixture
+async def test_multiple_collections(
+    async_db: AsyncSession, test_user: dict[str, Any]
 ) -> list[Collection]:
     collections = []
     for i in range(5):
         cards = [
             CardCreate(front=f"front {i}-{j}", back=f"back {i}-{j}") for j in range(1)
         ]
-        collection = create_collection(
-            session=db,
+        collection = await create_collection(
+            session=async_db,
             user_id=test_user["id"],
             name=f"Test Collection {i}",
             cards=cards,
@@ -73,20 +75,24 @@ def test_multiple_collections(
     return collections
 
 
-@pytest.fixture
-def test_card(db: Session, test_collection: Collection) -> Card:
+@pytest_asyncio.fixture
+async def test_card(async_db: AsyncSession, test_collection: Collection) -> Card:
     card_in = CardCreate(front="front", back="back")
-    card = create_card(session=db, card_in=card_in, collection_id=test_collection.id)
+    card = await create_card(
+        session=async_db, card_in=card_in, collection_id=test_collection.id
+    )
     return card
 
 
-@pytest.fixture
-def test_multiple_cards(db: Session, test_collection: Collection) -> list[Card]:
+@pytest_asyncio.fixture
+async def test_multiple_cards(
+    async_db: AsyncSession, test_collection: Collection
+) -> list[Card]:
     cards = []
     for i in range(5):
         card_in = CardCreate(front=f"front {i}", back=f"back {i}")
-        card = create_card(
-            session=db, card_in=card_in, collection_id=test_collection.id
+        card = await create_card(
+            session=async_db, card_in=card_in, collection_id=test_collection.id
         )
         cards.append(card)
 
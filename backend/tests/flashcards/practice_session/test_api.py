@@ -7,6 +7,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.core.config import settings
+from src.core.db import async_engine
 from src.flashcards.schemas import (
     CardCreate,
     CollectionCreate,
@@ -14,6 +15,7 @@ from src.flashcards.schemas import (
     PracticeCardResultPatch,
     PracticeSession,
 )
+from tests.utils.utils import count_queries, statement_kinds
 
 
 @pytest.fixture
@@ -242,6 +244,29 @@ def test_list_practice_session_with_pagination(
     assert content["count"] == multiple_practice_sessions["count"]
 
 
+def test_list_practice_sessions_with_cursor(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    multiple_practice_sessions: dict[str, Any],
+):
+    seen = []
+    params: dict[str, Any] = {"limit": 2}
+    while True:
+        rsp = client.get(
+            f"{settings.API_V1_STR}/practice-sessions",
+            params=params,
+            headers=normal_user_token_headers,
+        )
+        assert rsp.status_code == 200
+        content = rsp.json()
+        seen.extend(session["id"] for session in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params["cursor"] = content["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == multiple_practice_sessions["count"]
+
+
 def test_get_practice_session_status(
     client: TestClient,
     normal_user_token_headers: dict[str, str],
@@ -309,6 +334,126 @@ def test_list_practice_cards(
     assert card["is_correct"] is None
 
 
+@pytest.mark.parametrize("order", [None, "desc", "random"])
+def test_list_practice_cards_with_fields(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_practice_session: dict[str, Any],
+    order: str | None,
+):
+    url = f"{settings.API_V1_STR}/practice-sessions/{test_practice_session['id']}/cards"
+    full = client.get(url, headers=normal_user_token_headers).json()["data"]
+    previews = {pc["card"]["id"]: pc["card"]["front"] for pc in full}
+    params: dict[str, Any] = {"fields": ["id", "preview"]}
+    if order:
+        params["order"] = order
+
+    rsp = client.get(url, params=params, headers=normal_user_token_headers)
+
+    assert rsp.status_code == 200
+    data = rsp.json()["data"]
+    assert {pc["card"]["id"]: pc["card"]["preview"] for pc in data} == previews
+    assert all(
+        pc.keys() == {"card", "is_practiced", "is_correct"}
+        and pc["card"].keys() == {"id", "preview"}
+        for pc in data
+    )
+
+
+@pytest.mark.parametrize("order", [None, "asc", "desc"])
+def test_list_practice_cards_with_cursor(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_practice_session: dict[str, Any],
+    order: str | None,
+):
+    url = f"{settings.API_V1_STR}/practice-sessions/{test_practice_session['id']}/cards"
+    params: dict[str, Any] = {"limit": 2}
+    if order:
+        params["order"] = order
+    seen = []
+    while True:
+        rsp = client.get(url, params=params, headers=normal_user_token_headers)
+        assert rsp.status_code == 200
+        content = rsp.json()
+        seen.extend(pc["card"]["id"] for pc in content["data"])
+        if content["next_cursor"] is None:
+            break
+        params["cursor"] = content["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == test_practice_session["total_cards"]
+
+
+def test_list_practice_cards_random_order_with_cursor(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_practice_session: dict[str, Any],
+):
+    session_id = test_practice_session["id"]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/practice-sessions/{session_id}/cards",
+        params={"limit": 1},
+        headers=normal_user_token_headers,
+    )
+    cursor = rsp.json()["next_cursor"]
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/practice-sessions/{session_id}/cards",
+        params={"order": "random", "cursor": cursor},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "status,expected", [(None, 3), ("all", 3), ("pending", 2), ("completed", 1)]
+)
+def test_list_practice_cards_estimated_count(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_practice_session: dict[str, Any],
+    status: str | None,
+    expected: int,
+):
+    session_id = test_practice_session["id"]
+    url = f"{settings.API_V1_STR}/practice-sessions/{session_id}/cards"
+    card_id = client.get(url, headers=normal_user_token_headers).json()["data"][0][
+        "card"
+    ]["id"]
+    client.patch(
+        f"{url}/{card_id}", json={"is_correct": True}, headers=normal_user_token_headers
+    )
+    params = {"count": "estimate"}
+    if status:
+        params["status"] = status
+
+    with count_queries(async_engine) as statements:
+        rsp = client.get(url, params=params, headers=normal_user_token_headers)
+
+    assert rsp.status_code == 200
+    assert rsp.json()["count"] == expected
+    assert not any("count(" in s.lower() for s in statements)
+
+
+def test_list_practice_cards_without_count(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_practice_session: dict[str, Any],
+):
+    session_id = test_practice_session["id"]
+    rsp = client.get(
+        f"{settings.API_V1_STR}/practice-sessions/{session_id}/cards",
+        params={"count": "none", "order": "random"},
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 200
+    content = rsp.json()
+    assert content["count"] is None
+    assert len(content["data"]) == 3
+
+
 def test_list_practice_cards_with_nonexistent_session(
     client: TestClient,
     normal_user_token_headers: dict[str, str],
@@ -507,3 +652,52 @@ def test_update_practice_card_with_completed_session(
 
         assert "detail" in content
         assert "completed" in content["detail"]
+
+
+def test_start_practice_session_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_collection: dict[str, Any],
+):
+    with count_queries(async_engine) as statements:
+        rsp = client.post(
+            f"{settings.API_V1_STR}/practice-sessions",
+            json={"collection_id": test_collection["id"]},
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    assert len(rsp.json()["practice_cards"]) == 3
+    assert statement_kinds(statements) == [
+        "SELECT",
+        "SELECT",
+        "INSERT",
+        "INSERT",
+        "UPDATE",
+    ]
+
+
+def test_update_practice_card_result_statements(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    test_practice_session: dict[str, Any],
+):
+    session_id = test_practice_session["id"]
+    card_id = test_practice_session["practice_cards"][0]["card_id"]
+
+    with count_queries(async_engine) as statements:
+        rsp = client.patch(
+            f"{settings.API_V1_STR}/practice-sessions/{session_id}/cards/{card_id}",
+            json={"is_correct": True},
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 200
+    assert statement_kinds(statements) == [
+        "SELECT",
+        "SELECT",
+        "UPDATE",
+        "UPDATE",
+        "UPDATE",
+        "SELECT",
+    ]
@@ -5,7 +5,8 @@ from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from sqlmodel import Session
+import pytest_asyncio
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.ai_models.gemini.exceptions import AIGenerationError
 from src.ai_models.gemini.provider import GeminiProvider
@@ -15,7 +16,7 @@ from src.flashcards.schemas import (
     AIFlashcardCollection,
 )
 from src.flashcards.services import (
-    _get_collection_cards,
+    _get_collection_card_ids,
     generate_ai_collection,
     get_or_create_practice_session,
     get_practice_card,
@@ -31,28 +32,28 @@ def mock_get_provider() -> Generator[GeminiProvider, None, None]:
     yield mock_provider
 
 
-@pytest.fixture
-def test_practice_session(
-    db: Session,
+@pytest_asyncio.fixture
+async def test_practice_session(
+    async_db: AsyncSession,
     test_collection_with_multiple_cards: Collection,
 ) -> PracticeSession:
-    session = get_or_create_practice_session(
-        session=db,
+    session = await get_or_create_practice_session(
+        session=async_db,
         collection_id=test_collection_with_multiple_cards.id,
         user_id=test_collection_with_multiple_cards.user_id,
     )
     return session
 
 
-@pytest.fixture
-def test_multiple_practice_sessions(
-    db: Session,
+@pytest_asyncio.fixture
+async def test_multiple_practice_sessions(
+    async_db: AsyncSession,
     test_multiple_collections: list[Collection],
 ) -> list[PracticeSession]:
     sessions = []
     for i in range(3):
-        session = get_or_create_practice_session(
-            session=db,
+        session = await get_or_create_practice_session(
+            session=async_db,
             collection_id=test_multiple_collections[i].id,
             user_id=test_multiple_collections[i].user_id,
         )
@@ -61,13 +62,14 @@ def test_multiple_practice_sessions(
     return sessions
 
 
-def test_get_or_create_practice_sessions(
-    db: Session,
+@pytest.mark.asyncio
+async def test_get_or_create_practice_sessions(
+    async_db: AsyncSession,
     test_collection_with_multiple_cards: Collection,
     test_user: dict[str, Any],
 ):
-    session = get_or_create_practice_session(
-        session=db,
+    session = await get_or_create_practice_session(
+        session=async_db,
         collection_id=test_collection_with_multiple_cards.id,
         user_id=test_collection_with_multiple_cards.user_id,
     )
@@ -83,13 +85,14 @@ def test_get_or_create_practice_sessions(
     assert session.updated_at is not None
 
 
-def test_get_practice_session(
-    db: Session,
+@pytest.mark.asyncio
+async def test_get_practice_session(
+    async_db: AsyncSession,
     test_practice_session: PracticeSession,
     test_user: dict[str, Any],
 ):
-    session = get_practice_session(
-        session=db,
+    session = await get_practice_session(
+        session=async_db,
         session_id=test_practice_session.id,
         user_id=test_practice_session.user_id,
     )
@@ -105,14 +108,15 @@ def test_get_practice_session(
     assert session.updated_at is not None
 
 
-def test_get_practice_sessions(
-    db: Session,
+@pytest.mark.asyncio
+async def test_get_practice_sessions(
+    async_db: AsyncSession,
     test_multiple_practice_sessions: list[PracticeSession],
     test_user: dict[str, Any],
 ):
     limit = 2
-    db_sessions, count = get_practice_sessions(
-        session=db, user_id=test_user["id"], limit=limit
+    db_sessions, count = await get_practice_sessions(
+        session=async_db, user_id=test_user["id"], limit=limit
     )
 
     assert count == len(test_multiple_practice_sessions)
@@ -122,39 +126,76 @@ def test_get_practice_sessions(
         assert db_sessions[i].updated_at >= db_sessions[i + 1].updated_at
 
 
-def test_get_practice_sessions_with_skip(
-    db: Session,
+@pytest.mark.asyncio
+async def test_get_practice_sessions_with_skip(
+    async_db: AsyncSession,
     test_multiple_practice_sessions: list[PracticeSession],
     test_user: dict[str, Any],
 ):
     skip = 2
     limit = 2
-    db_sessions, count = get_practice_sessions(
-        session=db, user_id=test_user["id"], skip=skip, limit=limit
+    db_sessions, count = await get_practice_sessions(
+        session=async_db, user_id=test_user["id"], skip=skip, limit=limit
     )
 
     assert count == len(test_multiple_practice_sessions)
     assert 1 == len(db_sessions)  # Due to the total sessions is 3
 
 
-def test_get_collection_cards(
-    db: Session,
+@pytest.mark.asyncio
+async def test_get_collection_card_ids(
+    async_db: AsyncSession,
     test_collection_with_multiple_cards: Collection,
 ):
-    cards = _get_collection_cards(
-        session=db, collection_id=test_collection_with_multiple_cards.id
+    card_ids = await _get_collection_card_ids(
+        session=async_db,
+        collection_id=test_collection_with_multiple_cards.id,
+        user_id=test_collection_with_multiple_cards.user_id,
+    )
+
+    assert sorted(card_ids) == sorted(
+        card.id for card in test_collection_with_multiple_cards.cards
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_collection_card_ids_for_other_user(
+    async_db: AsyncSession, test_collection_with_multiple_cards: Collection
+):
+    card_ids = await _get_collection_card_ids(
+        session=async_db,
+        collection_id=test_collection_with_multiple_cards.id,
+        user_id=uuid.uuid4(),
+    )
+
+    assert card_ids is None
+
+
+@pytest.mark.asyncio
+async def test_get_collection_card_ids_empty_collection(
+    async_db: AsyncSession, test_collection: Collection
+):
+    card_ids = await _get_collection_card_ids(
+        session=async_db,
+        collection_id=test_collection.id,
+        user_id=test_collection.user_id,
     )
 
-    assert len(cards) == len(test_collection_with_multiple_cards.cards)
+    assert card_ids == []
 
 
-def test_get_practice_card(db: Session, test_collection: Collection, test_card: Card):
-    session = get_or_create_practice_session(
-        session=db, collection_id=test_collection.id, user_id=test_collection.user_id
+@pytest.mark.asyncio
+async def test_get_practice_card(
+    async_db: AsyncSession, test_collection: Collection, test_card: Card
+):
+    session = await get_or_create_practice_session(
+        session=async_db,
+        collection_id=test_collection.id,
+        user_id=test_collection.user_id,
     )
 
-    card = get_practice_card(
-        session=db,
+    card = await get_practice_card(
+        session=async_db,
         practice_session_id=session.id,
         card_id=test_card.id,
     )
@@ -165,12 +206,13 @@ def test_get_practice_card(db: Session, test_collection: Collection, test_card:
     assert card.is_practiced is False
 
 
-def test_get_nonexistent_practice_card(
-    db: Session, test_practice_session: PracticeSession
+@pytest.mark.asyncio
+async def test_get_nonexistent_practice_card(
+    async_db: AsyncSession, test_practice_session: PracticeSession
 ):
     non_existent_card_id = uuid.uuid4()
-    card = get_practice_card(
-        session=db,
+    card = await get_practice_card(
+        session=async_db,
         practice_session_id=test_practice_session.id,
         card_id=non_existent_card_id,
     )
@@ -178,10 +220,13 @@ def test_get_nonexistent_practice_card(
     assert card is None
 
 
-def test_get_practice_cards(db: Session, test_practice_session: PracticeSession):
+@pytest.mark.asyncio
+async def test_get_practice_cards(
+    async_db: AsyncSession, test_practice_session: PracticeSession
+):
     limit = 3
-    cards, count = get_practice_cards(
-        session=db, practice_session_id=test_practice_session.id, limit=limit
+    cards, count = await get_practice_cards(
+        session=async_db, practice_session_id=test_practice_session.id, limit=limit
     )
 
     assert limit == len(cards)
@@ -191,19 +236,26 @@ def test_get_practice_cards(db: Session, test_practice_session: PracticeSession)
         assert card.is_correct is None
 
 
-def test_get_practice_cards_with_status(
-    db: Session, test_practice_session: PracticeSession
+@pytest.mark.asyncio
+async def test_get_practice_cards_with_status(
+    async_db: AsyncSession, test_practice_session: PracticeSession
 ):
-    cards, count = get_practice_cards(
-        session=db, practice_session_id=test_practice_session.id
+    cards, count = await get_practice_cards(
+        session=async_db, practice_session_id=test_practice_session.id
     )
 
-    record_practice_card_result(session=db, practice_card=cards[0], is_correct=True)
-    record_practice_card_result(session=db, practice_card=cards[1], is_correct=True)
+    await record_practice_card_result(
+        session=async_db, practice_card=cards[0], is_correct=True
+    )
+    await record_practice_card_result(
+        session=async_db, practice_card=cards[1], is_correct=True
+    )
 
     complete_count = 2
-    cards, count = get_practice_cards(
-        session=db, practice_session_id=test_practice_session.id, status="completed"
+    cards, count = await get_practice_cards(
+        session=async_db,
+        practice_session_id=test_practice_session.id,
+        status="completed",
     )
 
     assert count == complete_count
@@ -212,8 +264,8 @@ def test_get_practice_cards_with_status(
         assert card.is_practiced is True
         assert card.is_correct is True
 
-    cards, count = get_practice_cards(
-        session=db, practice_session_id=test_practice_session.id, status="pending"
+    cards, count = await get_practice_cards(
+        session=async_db, practice_session_id=test_practice_session.id, status="pending"
     )
 
     assert len(cards) == len(test_practice_session.practice_cards) - complete_count
@@ -222,11 +274,12 @@ def test_get_practice_cards_with_status(
         assert card.is_correct is None
 
 
-def test_get_practice_card_with_asc_order(
-    db: Session, test_practice_session: PracticeSession
+@pytest.mark.asyncio
+async def test_get_practice_card_with_asc_order(
+    async_db: AsyncSession, test_practice_session: PracticeSession
 ):
-    cards, _ = get_practice_cards(
-        session=db, practice_session_id=test_practice_session.id, order="asc"
+    cards, _ = await get_practice_cards(
+        session=async_db, practice_session_id=test_practice_session.id, order="asc"
     )
 
     # Verify the order
@@ -234,11 +287,12 @@ def test_get_practice_card_with_asc_order(
         assert cards[i].updated_at <= cards[i + 1].updated_at
 
 
-def test_get_practice_card_with_desc_order(
-    db: Session, test_practice_session: PracticeSession
+@pytest.mark.asyncio
+async def test_get_practice_card_with_desc_order(
+    async_db: AsyncSession, test_practice_session: PracticeSession
 ):
-    cards, _ = get_practice_cards(
-        session=db, practice_session_id=test_practice_session.id, order="desc"
+    cards, _ = await get_practice_cards(
+        session=async_db, practice_session_id=test_practice_session.id, order="desc"
     )
 
     # Verify the order
@@ -246,8 +300,9 @@ def test_get_practice_card_with_desc_order(
         assert cards[i].updated_at >= cards[i + 1].updated_at
 
 
-def test_record_practice_card_result(
-    db: Session, test_practice_session: PracticeSession
+@pytest.mark.asyncio
+async def test_record_practice_card_result(
+    async_db: AsyncSession, test_practice_session: PracticeSession
 ):
     before_card = test_practice_session.practice_cards[0]
     original_updated_at = before_card.updated_at
@@ -256,12 +311,12 @@ def test_record_practice_card_result(
 
     time.sleep(0.01)
 
-    after_card = record_practice_card_result(
-        session=db, practice_card=before_card, is_correct=True
+    after_card = await record_practice_card_result(
+        session=async_db, practice_card=before_card, is_correct=True
     )
 
-    session = get_practice_session(
-        session=db,
+    session = await get_practice_session(
+        session=async_db,
         session_id=test_practice_session.id,
         user_id=test_practice_session.user_id,
     )
@@ -275,10 +330,12 @@ def test_record_practice_card_result(
     assert after_card.is_practiced is True
 
     for card in test_practice_session.practice_cards[0:]:
-        record_practice_card_result(session=db, practice_card=card, is_correct=True)
+        await record_practice_card_result(
+            session=async_db, practice_card=card, is_correct=True
+        )
 
-    session = get_practice_session(
-        session=db,
+    session = await get_practice_session(
+        session=async_db,
         session_id=test_practice_session.id,
         user_id=test_practice_session.user_id,
     )
@@ -0,0 +1,257 @@
+import asyncio
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from src.core.config import settings
+from src.flashcards import anki
+from src.flashcards.anki import AnkiDeck, AnkiImportJob, AnkiImportQueue, note_card
+from src.flashcards.models import AnkiDeckImport
+from src.flashcards.schemas import CardBase
+from tests.utils.anki import make_apkg
+
+NOTES = [
+    ["<b>Hola</b>", "Hello<br>Hi"],
+    ["{{c1::Paris}} is the capital of {{c2::France::country}}", "<i>Europe</i>"],
+    ["Only front"],
+    ["x" * 3001, "Too long"],
+    ["Caf&eacute;[sound:cafe.mp3]", "Coffee"],
+]
+
+
+def _import_deck(
+    client: TestClient, headers: dict[str, str], content: bytes, **params: str
+) -> dict[str, Any]:
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/anki-imports",
+        params=params,
+        content=content,
+        headers=headers,
+    )
+    assert rsp.status_code == 202
+    url = f"{settings.API_V1_STR}/collections/anki-imports/{rsp.json()['id']}"
+    deadline = time.monotonic() + 10
+    while rsp.json()["status"] in ("pending", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+        rsp = client.get(url, headers=headers)
+        assert rsp.status_code == 200
+    return rsp.json()
+
+
+@pytest.mark.parametrize(
+    "fields,expected",
+    [
+        (
+            ["<div>Hola</div>", "Hello<br />Hi"],
+            CardBase(front="Hola", back="Hello\nHi"),
+        ),
+        (
+            ["{{c1::Paris}} is in {{c2::France::country}}", "Extra"],
+            CardBase(front="[...] is in [country]", back="Paris is in France\n\nExtra"),
+        ),
+        (["Only front"], "Note has a single field"),
+        (["<img src='a.png'>", "Back"], "Note has an empty front"),
+        (["Front", "y" * 3001], "back: String should have at most 3000 characters"),
+    ],
+)
+def test_note_card(fields: list[str], expected: CardBase | str):
+    assert note_card(fields) == expected
+
+
+@pytest.mark.asyncio
+async def test_read_deck(tmp_path: Path):
+    package = make_apkg(
+        tmp_path / "deck.apkg", NOTES, deck_name="Languages::Spanish", cards_per_note=2
+    )
+    deck = AnkiDeck.extract(str(package), str(tmp_path))
+    try:
+        rows = [row async for row in deck.rows(chunk_size=2)]
+    finally:
+        deck.close()
+
+    assert deck.name == "Spanish"
+    assert [position for position, _ in rows] == [1, 2, 3, 4, 5]
+    assert rows[0][1] == CardBase(front="Hola", back="Hello\nHi")
+    assert rows[2][1] == "Note has a single field"
+    assert rows[4][1] == CardBase(front="Café", back="Coffee")
+
+
+def test_import_anki_deck(
+    client: TestClient, normal_user_token_headers: dict[str, str], tmp_path: Path
+):
+    package = make_apkg(tmp_path / "deck.apkg", NOTES, deck_name="Spanish")
+    job = _import_deck(client, normal_user_token_headers, package.read_bytes())
+
+    assert job["status"] == "done"
+    assert job["imported"] == 3
+    assert job["failed"] == 2
+    assert [error["line"] for error in job["errors"]] == [3, 4]
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{job['collection_id']}",
+        headers=normal_user_token_headers,
+    )
+    assert rsp.status_code == 200
+    assert rsp.json()["name"] == "Spanish"
+    assert {card["front"] for card in rsp.json()["cards"]} == {
+        "Hola",
+        "[...] is the capital of [country]",
+        "Café",
+    }
+
+
+def test_import_anki_deck_with_name(
+    client: TestClient, normal_user_token_headers: dict[str, str], tmp_path: Path
+):
+    package = make_apkg(tmp_path / "deck.apkg", NOTES[:1])
+    job = _import_deck(
+        client, normal_user_token_headers, package.read_bytes(), name="Mine"
+    )
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/{job['collection_id']}",
+        headers=normal_user_token_headers,
+    )
+    assert rsp.json()["name"] == "Mine"
+
+
+def test_import_anki_deck_unreadable_database(
+    client: TestClient, normal_user_token_headers: dict[str, str], tmp_path: Path
+):
+    package = tmp_path / "deck.apkg"
+    with zipfile.ZipFile(package, "w") as apkg:
+        apkg.writestr("collection.anki2", b"not a database")
+
+    job = _import_deck(client, normal_user_token_headers, package.read_bytes())
+
+    assert job["status"] == "failed"
+    assert job["detail"] == "Deck database is unreadable"
+    assert job["collection_id"] is None
+
+
+@pytest.mark.parametrize(
+    "member,detail",
+    [
+        ("collection.anki21b", "Deck uses the latest Anki package format"),
+        ("notes.txt", "File is not an Anki deck"),
+    ],
+)
+def test_import_anki_deck_rejects_other_packages(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    tmp_path: Path,
+    member: str,
+    detail: str,
+):
+    package = make_apkg(tmp_path / "deck.apkg", NOTES, member=member)
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/anki-imports",
+        content=package.read_bytes(),
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 400
+    assert rsp.json()["detail"].startswith(detail)
+
+
+def test_import_anki_deck_not_a_zip(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+):
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/anki-imports",
+        content=b"front,back\n",
+        headers=normal_user_token_headers,
+    )
+
+    assert rsp.status_code == 400
+    assert rsp.json()["detail"] == "File is not an Anki deck"
+
+
+def test_import_anki_deck_too_large(
+    client: TestClient, normal_user_token_headers: dict[str, str], tmp_path: Path
+):
+    package = make_apkg(tmp_path / "deck.apkg", NOTES)
+    with patch.object(settings, "ANKI_IMPORT_MAX_BYTES", 100):
+        rsp = client.post(
+            f"{settings.API_V1_STR}/collections/anki-imports",
+            content=package.read_bytes(),
+            headers=normal_user_token_headers,
+        )
+
+    assert rsp.status_code == 413
+
+
+def test_read_anki_import_of_other_user(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    superuser_token_headers: dict[str, str],
+    tmp_path: Path,
+):
+    package = make_apkg(tmp_path / "deck.apkg", NOTES[:1])
+    job = _import_deck(client, normal_user_token_headers, package.read_bytes())
+
+    rsp = client.get(
+        f"{settings.API_V1_STR}/collections/anki-imports/{job['id']}",
+        headers=superuser_token_headers,
+    )
+    assert rsp.status_code == 404
+
+
+def test_anki_import_status_is_stored(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    db: Session,
+    tmp_path: Path,
+):
+    package = make_apkg(tmp_path / "deck.apkg", NOTES)
+    job = _import_deck(client, normal_user_token_headers, package.read_bytes())
+
+    row = db.get(AnkiDeckImport, uuid.UUID(job["id"]))
+    assert row.status == "done"
+    assert row.imported == 3
+    assert [error["line"] for error in row.errors] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_anki_import_queue_stop_cancels_jobs(
+    db: Session,
+    test_user: dict[str, Any],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    started = asyncio.Event()
+
+    async def blocked_import(job: AnkiImportJob) -> None:  # noqa: ARG001
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(anki, "import_anki_deck", blocked_import)
+    queue = AnkiImportQueue(max_pending=2, max_jobs=10)
+    queue.start()
+    jobs = []
+    for i in range(2):
+        path = tmp_path / f"deck{i}.apkg"
+        path.write_bytes(b"")
+        job = AnkiImportJob(id=uuid.uuid4(), user_id=test_user["id"], path=str(path))
+        assert await queue.enqueue(job)
+        jobs.append(job)
+    await started.wait()
+
+    await queue.stop()
+
+    rows = db.exec(
+        select(AnkiDeckImport).where(AnkiDeckImport.user_id == test_user["id"])
+    ).all()
+    assert {row.id for row in rows} == {job.id for job in jobs}
+    assert {(row.status, row.detail) for row in rows} == {
+        ("failed", "Import was cancelled")
+    }
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,138 @@
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+from src.core.db import async_engine
+from src.flashcards.cache import TypeaheadCache, typeahead_cache
+from src.flashcards.schemas import CollectionName
+from tests.utils.utils import count_queries
+
+
+def _names(*names: str) -> list[CollectionName]:
+    return [CollectionName(id=uuid.uuid4(), name=name) for name in names]
+
+
+def test_cache_exact_term() -> None:
+    cache = TypeaheadCache(max_size=10, ttl=60)
+    user_id = uuid.uuid4()
+    matches = _names("Spanish", "Basic Spanish")
+
+    assert cache.get(user_id, "span") is None
+    cache.put(user_id, "span", matches, complete=False)
+    assert cache.get(user_id, "span") == matches
+    assert cache.get(uuid.uuid4(), "span") is None
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_cache_filters_complete_prefix() -> None:
+    cache = TypeaheadCache(max_size=10, ttl=60)
+    user_id = uuid.uuid4()
+    spanish, verbs, basic = _names("Spanish", "Spanish verbs", "Basic Spanish")
+    cache.put(user_id, "s", [spanish, verbs, basic], complete=True)
+
+    assert cache.get(user_id, "sh v") == [verbs]
+    assert cache.get(user_id, "spanish") == [spanish, verbs, basic]
+    assert cache.get(user_id, "span ") == []
+
+
+def test_cache_skips_incomplete_prefix() -> None:
+    cache = TypeaheadCache(max_size=10, ttl=60)
+    user_id = uuid.uuid4()
+    cache.put(user_id, "s", _names("Spanish"), complete=False)
+
+    assert cache.get(user_id, "sp") is None
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = TypeaheadCache(max_size=3, ttl=60)
+    user_id = uuid.uuid4()
+    cache.put(user_id, "a", [], complete=False)
+    cache.put(user_id, "b", [], complete=False)
+    cache.get(user_id, "a")
+    cache.put(user_id, "c", _names("c1", "c2"), complete=False)
+
+    assert len(cache) == 2
+    assert cache.get(user_id, "b") is None
+    assert cache.get(user_id, "a") == []
+
+
+def test_cache_expires_entries() -> None:
+    cache = TypeaheadCache(max_size=10, ttl=60)
+    user_id = uuid.uuid4()
+    cache.put(user_id, "a", [], complete=True)
+
+    with patch("src.flashcards.cache.time.monotonic", return_value=10**9):
+        assert cache.get(user_id, "ab") is None
+    assert len(cache) == 0
+
+
+def test_cache_invalidate_user() -> None:
+    cache = TypeaheadCache(max_size=10, ttl=60)
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+    cache.put(user_id, "a", [], complete=True)
+    cache.put(user_id, "b", [], complete=True)
+    cache.put(other_id, "a", [], complete=True)
+
+    cache.invalidate_user(user_id)
+
+    assert cache.get(user_id, "a") is None
+    assert cache.get(user_id, "b") is None
+    assert cache.get(other_id, "a") == []
+
+
+def test_disabled_cache() -> None:
+    cache = TypeaheadCache(max_size=0, ttl=60)
+    user_id = uuid.uuid4()
+    cache.put(user_id, "a", [], complete=True)
+
+    assert cache.get(user_id, "a") is None
+    assert len(cache) == 0
+
+
+def test_typeahead_served_from_cache(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/collections/typeahead"
+    client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Spanish"},
+        headers=normal_user_token_headers,
+    )
+    client.get(url, params={"q": "s"}, headers=normal_user_token_headers)
+
+    with count_queries(async_engine) as statements:
+        rsp = client.get(url, params={"q": "spa"}, headers=normal_user_token_headers)
+
+    assert [name["name"] for name in rsp.json()["data"]] == ["Spanish"]
+    assert not [s for s in statements if "FROM collection" in s]
+    assert len(typeahead_cache) == 1
+
+
+def test_typeahead_cache_invalidated_by_collection_changes(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/collections/typeahead"
+
+    def names() -> list[str]:
+        rsp = client.get(url, params={"q": "fr"}, headers=normal_user_token_headers)
+        return [name["name"] for name in rsp.json()["data"]]
+
+    assert names() == []
+    rsp = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "French"},
+        headers=normal_user_token_headers,
+    )
+    collection_url = f"{settings.API_V1_STR}/collections/{rsp.json()['id']}"
+    assert names() == ["French"]
+
+    client.put(
+        collection_url, json={"name": "Frisian"}, headers=normal_user_token_headers
+    )
+    assert names() == ["Frisian"]
+
+    client.delete(collection_url, headers=normal_user_token_headers)
+    assert names() == []
@@ -1,12 +1,17 @@
 import uuid
 
 import pytest
+from sqlalchemy import delete, func, insert, literal
 from sqlmodel import Session, select
 
+from src.core.db import engine
 from src.flashcards.models import Card, Collection, PracticeCard, PracticeSession
-from src.users.models import User
+from src.users.models import AIUsageQuota, User
 from src.users.schemas import UserCreate
-from src.users.services import create_user
+from tests.utils.user import create_user
+from tests.utils.utils import count_queries, statement_kinds
+
+LARGE_COLLECTION_CARDS = 2000
 
 
 @pytest.fixture
@@ -15,7 +20,7 @@ def test_user(db: Session):
     email = f"test_cascade_{uuid.uuid4()}@example.com"
     password = "testpassword123"
     user_in = UserCreate(email=email, password=password)
-    user = create_user(session=db, user_create=user_in)
+    user = create_user(db, user_in)
     return user
 
 
@@ -174,3 +179,120 @@ def test_collection_cascade_delete_practice_sessions(
         assert verify_entity_deleted(db, PracticeCard, practice_card_id)
     for card_id in card_ids:
         assert verify_entity_deleted(db, Card, card_id)
+
+
+@pytest.fixture
+def large_collection(db: Session, test_user):
+    """A collection of many cards, all in an ongoing practice session."""
+    collection = Collection(name="Large Collection", user_id=test_user.id)
+    practice_session = PracticeSession(
+        user_id=test_user.id,
+        collection=collection,
+        total_cards=LARGE_COLLECTION_CARDS,
+    )
+    db.add(practice_session)
+    db.commit()
+    user_id, collection_id, session_id = (
+        test_user.id,
+        collection.id,
+        practice_session.id,
+    )
+    db.exec(
+        insert(Card),
+        params=[
+            {"front": f"Front {i}", "back": f"Back {i}", "collection_id": collection_id}
+            for i in range(LARGE_COLLECTION_CARDS)
+        ],
+    )
+    db.exec(
+        insert(PracticeCard).from_select(
+            ["id", "session_id", "card_id"],
+            select(func.gen_random_uuid(), literal(session_id), Card.id).where(
+                Card.collection_id == collection_id
+            ),
+        )
+    )
+    db.commit()
+    db.expunge_all()
+    return user_id, collection_id, session_id
+
+
+def _count(db: Session, entity_class, *where) -> int:
+    return db.exec(select(func.count()).select_from(entity_class).where(*where)).one()
+
+
+def test_collection_delete_of_large_graph_is_one_statement(
+    db: Session, large_collection
+):
+    _, collection_id, session_id = large_collection
+    collection = db.get(Collection, collection_id)
+
+    with count_queries(engine) as statements:
+        db.delete(collection)
+        db.flush()
+
+    # Nothing below the collection is loaded into the session
+    assert statement_kinds(statements) == ["DELETE"]
+    assert not [o for o in db.identity_map.values() if not isinstance(o, Collection)]
+    db.commit()
+    assert _count(db, Card, Card.collection_id == collection_id) == 0
+    assert _count(db, PracticeSession, PracticeSession.id == session_id) == 0
+    assert _count(db, PracticeCard, PracticeCard.session_id == session_id) == 0
+
+
+def test_user_delete_of_large_graph(db: Session, large_collection):
+    user_id, collection_id, session_id = large_collection
+    user = db.get(User, user_id)
+
+    with count_queries(engine) as statements:
+        db.delete(user)
+        db.flush()
+
+    assert statement_kinds(statements) == ["DELETE"]
+    db.commit()
+    assert _count(db, Collection, Collection.id == collection_id) == 0
+    assert _count(db, Card, Card.collection_id == collection_id) == 0
+    assert _count(db, PracticeCard, PracticeCard.session_id == session_id) == 0
+
+
+def test_user_cascade_delete_ai_usage_quota(db: Session, test_user):
+    quota = AIUsageQuota(user_id=test_user.id)
+    db.add(quota)
+    db.commit()
+    user_id, quota_id = test_user.id, quota.id
+    db.expunge_all()
+
+    db.delete(db.get(User, user_id))
+    db.commit()
+
+    assert verify_entity_deleted(db, AIUsageQuota, quota_id)
+
+
+def test_bulk_delete_cascades_in_database(db: Session, large_collection):
+    """Deletes that bypass the ORM cascade as well."""
+    _, collection_id, session_id = large_collection
+
+    db.exec(delete(Collection).where(Collection.id == collection_id))
+    db.commit()
+
+    assert _count(db, Card, Card.collection_id == collection_id) == 0
+    assert _count(db, PracticeSession, PracticeSession.id == session_id) == 0
+    assert _count(db, PracticeCard, PracticeCard.session_id == session_id) == 0
+
+
+def test_card_delete_cascades_practice_cards(
+    db: Session, test_practice_session, test_practice_cards, test_cards
+):
+    session_id = test_practice_session.id
+    practice_card_id = test_practice_cards[0].id
+    card_id = test_cards[0].id
+    db.expunge_all()
+
+    with count_queries(engine) as statements:
+        db.delete(db.get(Card, card_id))
+        db.flush()
+
+    assert statement_kinds(statements) == ["SELECT", "DELETE"]
+    db.commit()
+    assert verify_entity_deleted(db, PracticeCard, practice_card_id)
+    assert not verify_entity_deleted(db, PracticeSession, session_id)
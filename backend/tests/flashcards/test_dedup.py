@@ -0,0 +1,147 @@
+import numpy as np
+
+from src.flashcards import dedup
+
+CAPITAL = ("What is the capital of France?", "Paris")
+
+
+def test_signatures_ignore_case_punctuation_and_spacing() -> None:
+    signatures, keys = dedup.fingerprint(
+        [CAPITAL, ("what is the  capital of france", "PARIS.")]
+    )
+
+    assert signatures.shape == (2, dedup.NUM_PERM)
+    assert keys.shape == (2, dedup.BANDS)
+    assert (signatures[0] == signatures[1]).all()
+    assert (keys[0] == keys[1]).all()
+
+
+def _jaccard(a: tuple[str, str], b: tuple[str, str]) -> float:
+    shingles = []
+    for card in (a, b):
+        text = dedup.card_text(*card)
+        shingles.append(
+            {
+                text[i : i + dedup.SHINGLE_SIZE]
+                for i in range(len(text) - dedup.SHINGLE_SIZE + 1)
+            }
+        )
+    return len(shingles[0] & shingles[1]) / len(shingles[0] | shingles[1])
+
+
+def test_similarity_estimates_jaccard() -> None:
+    cell = ("The mitochondria is the powerhouse of the cell", "Produces ATP")
+    others = [
+        ("The mitochondrion is the powerhouse of the cell", "It produces ATP"),
+        ("What is the capital of Spain?", "Madrid"),
+        ("Capital of Germany", "Berlin"),
+    ]
+    signatures, _ = dedup.fingerprint([cell, *others])
+
+    scores = dedup.similarity(signatures[1:], signatures[0])
+    for other, score in zip(others, scores, strict=True):
+        assert abs(score - _jaccard(cell, other)) < 0.1
+
+
+def test_signatures_of_a_batch_match_single_ones() -> None:
+    cards = [CAPITAL, ("a", ""), ("", ""), ("Capital of Germany", "Berlin")]
+    batch = dedup.signatures([dedup.card_text(*card) for card in cards])
+
+    for card, signature in zip(cards, batch, strict=True):
+        assert (dedup.signatures([dedup.card_text(*card)])[0] == signature).all()
+
+
+def test_signatures_are_stable() -> None:
+    # Signatures are stored, so they must not change between releases
+    signature, _ = dedup.fingerprint([CAPITAL])
+
+    assert signature[0, :4].tolist() == [54430414, 300851536, 85802675, 10231617]
+
+
+def test_to_bytes_round_trip() -> None:
+    signatures, _ = dedup.fingerprint([CAPITAL, ("Capital of Germany", "Berlin")])
+
+    restored = dedup.from_bytes([dedup.to_bytes(row) for row in signatures])
+    assert (restored == signatures).all()
+
+
+def test_duplicate_index_add_distinct() -> None:
+    index = dedup.DuplicateIndex()
+    signatures, keys = dedup.fingerprint(
+        [CAPITAL, ("Capital of Germany", "Berlin"), ("capital of France?", "Paris")]
+    )
+
+    assert index.add_distinct(signatures[:2], keys[:2]).tolist() == [True, True]
+    assert index.add_distinct(signatures[2:], keys[2:]).tolist() == [True]
+    assert index.add_distinct(signatures, keys).tolist() == [False, False, False]
+    assert len(index) == 3
+
+
+def test_find_clusters() -> None:
+    cards = [
+        CAPITAL,
+        ("Capital of Germany", "Berlin"),
+        ("What is the capital of France", "Paris!"),
+        ("Largest planet", "Jupiter"),
+        ("capital of germany", "berlin"),
+        ("What's the capital of France?", "Paris"),
+    ]
+    signatures, keys = dedup.fingerprint(cards)
+
+    clusters = dedup.find_clusters(signatures, keys)
+
+    assert [members for members, _ in clusters] == [[0, 2, 5], [1, 4]]
+    assert all(dedup.DUPLICATE_THRESHOLD <= score <= 1 for _, score in clusters)
+    assert dedup.find_clusters(signatures, keys, threshold=1.0) == [
+        ([0, 2], 1.0),
+        ([1, 4], 1.0),
+    ]
+
+
+def test_find_clusters_compares_all_rows_of_a_bucket() -> None:
+    signatures = np.arange(3 * dedup.NUM_PERM, dtype=np.uint32).reshape(3, -1)
+    signatures[2] = signatures[1]
+    # One shared bucket, every other band distinct
+    keys = np.arange(3 * dedup.BANDS, dtype=np.int64).reshape(3, -1)
+    keys[:, 0] = 7
+
+    assert dedup.find_clusters(signatures, keys) == [([1, 2], 1.0)]
+
+
+def test_find_clusters_at_lowest_threshold() -> None:
+    cards = [
+        (
+            "The mitochondria is the powerhouse of the cell",
+            "It produces most of the chemical energy needed by the cell",
+        ),
+        (
+            "The mitochondria is the powerhouse of the cell",
+            "It produces most of the chemical en",
+        ),
+        (
+            "Photosynthesis converts light energy into chemical energy",
+            "It takes place in the chloroplasts of plant cells",
+        ),
+        ("Photosynthesis converts light energy into chemical energy", "It takes place"),
+        (
+            "The French Revolution began in the year 1789",
+            "It ended the absolute monarchy in France",
+        ),
+        ("The French Revolution began in the year 1789", "It ended the"),
+    ]
+    signatures, keys = dedup.fingerprint(cards)
+
+    clusters = dedup.find_clusters(signatures, keys, threshold=dedup.MIN_THRESHOLD)
+
+    assert [members for members, _ in clusters] == [[0, 1], [2, 3], [4, 5]]
+    assert all(score < dedup.DUPLICATE_THRESHOLD for _, score in clusters)
+
+
+def test_find_clusters_of_many_copies() -> None:
+    signatures, keys = dedup.fingerprint([CAPITAL] * 500)
+
+    clusters = dedup.find_clusters(signatures, keys)
+
+    assert clusters == [(list(range(500)), 1.0)]
+    assert dedup.find_clusters(signatures[:1], keys[:1]) == []
+    assert dedup.find_clusters(np.empty((0, dedup.NUM_PERM)), []) == []
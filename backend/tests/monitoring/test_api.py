@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+
+from src.core.config import settings
+
+
+def test_read_email_queue_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    rsp = client.get(
+        f"{settings.API_V1_STR}/monitoring/email", headers=superuser_token_headers
+    )
+    assert rsp.status_code == 200
+    content = rsp.json()
+    assert content["queue_depth"] == 0
+    assert "avg_send_latency_ms" in content
+
+
+def test_read_email_queue_stats_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    rsp = client.get(
+        f"{settings.API_V1_STR}/monitoring/email", headers=normal_user_token_headers
+    )
+    assert rsp.status_code == 403
+
+
+def test_read_db_pool_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    rsp = client.get(
+        f"{settings.API_V1_STR}/monitoring/db-pool", headers=superuser_token_headers
+    )
+    assert rsp.status_code == 200
+    pools = {pool["engine"]: pool for pool in rsp.json()}
+    assert set(pools) == {"sync", "async"}
+    assert pools["async"]["size"] == settings.DB_POOL_SIZE
+    assert pools["async"]["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert pools["sync"]["size"] == settings.DB_SYNC_POOL_SIZE
+    assert pools["sync"]["max_overflow"] == settings.DB_SYNC_MAX_OVERFLOW
+    assert pools["async"]["checkouts"] >= 1
+    assert pools["async"]["timeouts"] == 0
@@ -109,7 +109,7 @@ def test_get_collection_statistics_with_value_error(
     client: TestClient, db: Session, collection_with_sessions
 ):
     with (
-        patch("src.stats.api.check_collection_access") as mock_access,
+        patch("src.stats.api.get_collection_version") as mock_version,
         patch("src.stats.api.get_collection_stats") as mock_stats,
     ):
         user = create_random_user(db)
@@ -117,7 +117,7 @@ def test_get_collection_statistics_with_value_error(
             client=client, email=user.email, db=db
         )
         collection = collection_with_sessions(user.id, num_cards=5, num_sessions=10)
-        mock_access.return_value = True
+        mock_version.return_value = 1
         mock_stats.side_effect = ValueError("Error testing")
 
         response = client.get(
@@ -135,7 +135,7 @@ def test_get_collection_statistics_with_exception(
     client: TestClient, db: Session, collection_with_sessions
 ):
     with (
-        patch("src.stats.api.check_collection_access") as mock_access,
+        patch("src.stats.api.get_collection_version") as mock_version,
         patch("src.stats.api.get_collection_stats") as mock_stats,
     ):
         user = create_random_user(db)
@@ -143,7 +143,7 @@ def test_get_collection_statistics_with_exception(
             client=client, email=user.email, db=db
         )
         collection = collection_with_sessions(user.id, num_cards=5, num_sessions=10)
-        mock_access.return_value = True
+        mock_version.return_value = 1
         mock_stats.side_effect = Exception("Exception testing")
 
         response = client.get(
@@ -155,3 +155,38 @@ def test_get_collection_statistics_with_exception(
         content = response.json()
         assert "detail" in content
         assert "Error retrieving collection statistics" in content["detail"]
+
+
+def test_stats_not_modified_until_practice(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+):
+    collection = client.post(
+        f"{settings.API_V1_STR}/collections/",
+        json={"name": "Stats Collection"},
+        headers=normal_user_token_headers,
+    ).json()
+    client.post(
+        f"{settings.API_V1_STR}/collections/{collection['id']}/cards/",
+        json={"front": "front", "back": "back"},
+        headers=normal_user_token_headers,
+    )
+    practice_session = client.post(
+        f"{settings.API_V1_STR}/practice-sessions",
+        json={"collection_id": collection["id"]},
+        headers=normal_user_token_headers,
+    ).json()
+    url = f"{settings.API_V1_STR}/collections/{collection['id']}/stats"
+    etag = client.get(url, headers=normal_user_token_headers).headers["etag"]
+    conditional_headers = {**normal_user_token_headers, "If-None-Match": etag}
+
+    assert client.get(url, headers=conditional_headers).status_code == 304
+
+    card_id = practice_session["practice_cards"][0]["card_id"]
+    client.patch(
+        f"{settings.API_V1_STR}/practice-sessions/{practice_session['id']}/cards/{card_id}",
+        json={"is_correct": False},
+        headers=normal_user_token_headers,
+    )
+    rsp = client.get(url, headers=conditional_headers)
+    assert rsp.status_code == 200
+    assert rsp.json()["recent_sessions"][0]["cards_practiced"] == 1
@@ -1,10 +1,11 @@
 import uuid
 from datetime import datetime
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.flashcards.models import Collection
 from src.stats.schemas import (
@@ -20,8 +21,8 @@ from src.stats.services import (
     get_collection_stats,
 )
 from src.users.schemas import UserCreate
-from src.users.services import create_user
 from tests.stats.utils import create_cards, create_practice_cards, create_sessions
+from tests.utils.user import create_user
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -32,7 +33,7 @@ def test_user(db: Session) -> dict[str, Any]:
     full_name = random_lower_string()
 
     user_in = UserCreate(email=email, password=password, full_name=full_name)
-    user = create_user(session=db, user_create=user_in)
+    user = create_user(db, user_in)
 
     return {"id": user.id, "email": user.email}
 
@@ -53,11 +54,12 @@ def collection_with_sessions(db, test_user: dict[str, Any]):
     return collection_out
 
 
-def test_get_collection_basic_info_success(
-    db: Session, collection_with_sessions: Collection
+@pytest.mark.asyncio
+async def test_get_collection_basic_info_success(
+    async_db: AsyncSession, collection_with_sessions: Collection
 ):
-    info = _get_collection_basic_info(
-        session=db, collection_id=collection_with_sessions.id
+    info = await _get_collection_basic_info(
+        session=async_db, collection_id=collection_with_sessions.id
     )
 
     assert info is not None
@@ -68,27 +70,36 @@ def test_get_collection_basic_info_success(
     )
 
 
-def test_get_collection_basic_info_with_nonexistent_collection(db: Session):
+@pytest.mark.asyncio
+async def test_get_collection_basic_info_with_nonexistent_collection(
+    async_db: AsyncSession,
+):
     non_existent_collection_id = uuid.uuid4()
     with pytest.raises(ValueError) as exc_info:
-        _get_collection_basic_info(session=db, collection_id=non_existent_collection_id)
+        await _get_collection_basic_info(
+            session=async_db, collection_id=non_existent_collection_id
+        )
 
     assert f"Collection with id {non_existent_collection_id} not found" in str(
         exc_info.value
     )
 
 
-def test_get_recent_sessions(db: Session, collection_with_sessions: Collection):
-    sessions = _get_recent_sessions(
-        session=db, collection_id=collection_with_sessions.id
+@pytest.mark.asyncio
+async def test_get_recent_sessions(
+    async_db: AsyncSession, collection_with_sessions: Collection
+):
+    sessions = await _get_recent_sessions(
+        session=async_db, collection_id=collection_with_sessions.id
     )
 
     assert isinstance(sessions, list)
     assert len(sessions) == len(collection_with_sessions.practice_sessions)
 
 
-def test_get_difficult_cards():
-    mock_session = MagicMock(spec=Session)
+@pytest.mark.asyncio
+async def test_get_difficult_cards():
+    mock_session = MagicMock(spec=AsyncSession)
     mock_collection_id = uuid.uuid4()
 
     mock_difficult_cards = [
@@ -97,10 +108,10 @@ def test_get_difficult_cards():
         (uuid.uuid4(), "Difficult Card 3", 5, 1),
     ]
 
-    mock_exec = mock_session.exec.return_value
-    mock_exec.all.return_value = mock_difficult_cards
+    mock_session.exec.return_value = MagicMock()
+    mock_session.exec.return_value.all.return_value = mock_difficult_cards
 
-    result = _get_difficult_cards(
+    result = await _get_difficult_cards(
         session=mock_session, collection_id=mock_collection_id
     )
 
@@ -114,14 +125,21 @@ def test_get_difficult_cards():
         assert card_stat.correct_answers == mock_difficult_cards[i][3]
 
 
-def test_get_collection_stats():
-    mock_session = MagicMock(spec=Session)
+@pytest.mark.asyncio
+async def test_get_collection_stats():
+    mock_session = MagicMock(spec=AsyncSession)
     mock_collection_id = uuid.uuid4()
 
     with (
-        patch("src.stats.services._get_collection_basic_info") as mock_get_info,
-        patch("src.stats.services._get_recent_sessions") as mock_get_sessions,
-        patch("src.stats.services._get_difficult_cards") as mock_get_cards,
+        patch(
+            "src.stats.services._get_collection_basic_info", new_callable=AsyncMock
+        ) as mock_get_info,
+        patch(
+            "src.stats.services._get_recent_sessions", new_callable=AsyncMock
+        ) as mock_get_sessions,
+        patch(
+            "src.stats.services._get_difficult_cards", new_callable=AsyncMock
+        ) as mock_get_cards,
     ):
         mock_get_info.return_value = CollectionBasicInfo(
             name="Pytest collection", total_cards=15, total_practice_sessions=7
@@ -159,17 +177,17 @@ def test_get_collection_stats():
             ),
         ]
 
-        result = get_collection_stats(mock_session, mock_collection_id)
+        result = await get_collection_stats(mock_session, mock_collection_id)
 
         assert isinstance(result, CollectionStats)
         assert result.collection_info == mock_get_info.return_value
         assert result.recent_sessions == mock_get_sessions.return_value
         assert result.difficult_cards == mock_get_cards.return_value
 
-        mock_get_info.assert_called_once_with(mock_session, mock_collection_id)
-        mock_get_sessions.assert_called_once_with(
+        mock_get_info.assert_awaited_once_with(mock_session, mock_collection_id)
+        mock_get_sessions.assert_awaited_once_with(
             session=mock_session, collection_id=mock_collection_id, limit=30
         )
-        mock_get_cards.assert_called_once_with(
+        mock_get_cards.assert_awaited_once_with(
             session=mock_session, collection_id=mock_collection_id
         )
@@ -1,20 +1,19 @@
-from typing import Any
-
-import pytest
-from sqlmodel import Session
+import pytest_asyncio
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.users.models import User
 from src.users.schemas import UserCreate
 from src.users.services import create_user
 from tests.utils.utils import random_email, random_lower_string
 
 
-@pytest.fixture
-def test_user(db: Session) -> dict[str, Any]:
+@pytest_asyncio.fixture
+async def test_user(async_db: AsyncSession) -> User:
     email = random_email()
     password = random_lower_string()
     full_name = random_lower_string()
 
     user_in = UserCreate(email=email, password=password, full_name=full_name)
-    user = create_user(session=db, user_create=user_in)
+    user = await create_user(session=async_db, user_create=user_in)
 
     return user
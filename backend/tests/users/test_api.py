@@ -5,12 +5,18 @@ from sqlmodel import Session, select
 
 from src.auth.services import verify_password
 from src.core.config import settings
-from src.users import services
+from src.core.db import async_engine
 from src.users.models import User
 from src.users.schemas import (
     UserCreate,
 )
-from tests.utils.utils import random_email, random_lower_string
+from tests.utils.user import create_user
+from tests.utils.utils import (
+    count_queries,
+    random_email,
+    random_lower_string,
+    statement_kinds,
+)
 
 
 def test_get_users_superuser_me(
@@ -39,7 +45,7 @@ def test_get_existing_user_current_user(client: TestClient, db: Session) -> None
     username = random_email()
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
-    services.create_user(session=db, user_create=user_in)
+    create_user(db, user_in)
 
     login_data = {
         "username": username,
@@ -53,7 +59,7 @@ def test_get_existing_user_current_user(client: TestClient, db: Session) -> None
     r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
     assert 200 <= r.status_code < 300
     api_user = r.json()
-    existing_user = services.get_user_by_email(session=db, email=username)
+    existing_user = db.exec(select(User).where(User.email == username)).first()
     assert existing_user
     assert existing_user.email == api_user["email"]
 
@@ -107,3 +113,15 @@ def test_register_user_already_exists_error(client: TestClient) -> None:
             r.json()["detail"]
             == "The user with this email already exists in the system"
         )
+
+
+def test_register_user_statements(client: TestClient) -> None:
+    data = {"email": random_email(), "password": random_lower_string()}
+    with (
+        patch("src.core.config.settings.USERS_OPEN_REGISTRATION", True),
+        count_queries(async_engine) as statements,
+    ):
+        r = client.post(f"{settings.API_V1_STR}/users", json=data)
+
+    assert r.status_code == 200
+    assert statement_kinds(statements) == ["SELECT", "INSERT"]
@@ -0,0 +1,84 @@
+import json
+import sqlite3
+import tempfile
+import zipfile
+from collections.abc import Iterable
+from pathlib import Path
+
+# The tables of a schema 11 Anki collection, as exported by "Support older
+# Anki versions"
+SCHEMA = """
+CREATE TABLE col (
+    id integer PRIMARY KEY, crt integer NOT NULL, mod integer NOT NULL,
+    scm integer NOT NULL, ver integer NOT NULL, dty integer NOT NULL,
+    usn integer NOT NULL, ls integer NOT NULL, conf text NOT NULL,
+    models text NOT NULL, decks text NOT NULL, dconf text NOT NULL,
+    tags text NOT NULL
+);
+CREATE TABLE notes (
+    id integer PRIMARY KEY, guid text NOT NULL, mid integer NOT NULL,
+    mod integer NOT NULL, usn integer NOT NULL, tags text NOT NULL,
+    flds text NOT NULL, sfld integer NOT NULL, csum integer NOT NULL,
+    flags integer NOT NULL, data text NOT NULL
+);
+CREATE TABLE cards (
+    id integer PRIMARY KEY, nid integer NOT NULL, did integer NOT NULL,
+    ord integer NOT NULL, mod integer NOT NULL, usn integer NOT NULL,
+    type integer NOT NULL, queue integer NOT NULL, due integer NOT NULL,
+    ivl integer NOT NULL, factor integer NOT NULL, reps integer NOT NULL,
+    lapses integer NOT NULL, left integer NOT NULL, odue integer NOT NULL,
+    odid integer NOT NULL, flags integer NOT NULL, data text NOT NULL
+);
+"""
+
+DECK_ID = 1_600_000_000_000
+
+
+def make_apkg(
+    path: Path,
+    notes: Iterable[list[str]],
+    deck_name: str = "Default",
+    cards_per_note: int = 1,
+    member: str = "collection.anki2",
+) -> Path:
+    """Write an .apkg package holding `notes`, each a list of field values,
+    with `cards_per_note` cards each in a deck called `deck_name`."""
+    decks = {
+        "1": {"id": 1, "name": "Default"},
+        str(DECK_ID): {"id": DECK_ID, "name": deck_name},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "collection.db"
+        connection = sqlite3.connect(database)
+        connection.executescript(SCHEMA)
+        connection.execute(
+            "INSERT INTO col VALUES (1, 0, 0, 0, 11, 0, 0, 0, '{}', '{}', ?, "
+            "'{}', '{}')",
+            (json.dumps(decks),),
+        )
+        note_ids = []
+
+        def note_rows():
+            for i, fields in enumerate(notes, start=1):
+                note_ids.append(i)
+                yield (i, f"guid{i}", 1, 0, 0, "", "\x1f".join(fields), 0, 0, 0, "")
+
+        connection.executemany(
+            "INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", note_rows()
+        )
+        connection.executemany(
+            "INSERT INTO cards VALUES (?, ?, ?, ?, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, "
+            "0, 0, 0, '')",
+            (
+                (note_id * cards_per_note + ord, note_id, DECK_ID, ord)
+                for note_id in note_ids
+                for ord in range(cards_per_note)
+            ),
+        )
+        connection.commit()
+        connection.close()
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+            package.write(database, member)
+            package.writestr("media", "{}")
+    return path
@@ -1,10 +1,10 @@
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
+from src.auth.services import get_password_hash
 from src.core.config import settings
-from src.users import services
 from src.users.models import User
-from src.users.schemas import UserCreate, UserUpdate
+from src.users.schemas import UserCreate
 from tests.utils.utils import random_email, random_lower_string
 
 
@@ -20,12 +20,23 @@ def user_authentication_headers(
     return headers
 
 
+def create_user(db: Session, user_create: UserCreate) -> User:
+    """Add a user through the sync test session, for fixtures and tests that
+    do not exercise the async `src.users.services.create_user`."""
+    user = User.model_validate(
+        user_create,
+        update={"hashed_password": get_password_hash(user_create.password)},
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
 def create_random_user(db: Session) -> User:
     email = random_email()
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password)
-    user = services.create_user(session=db, user_create=user_in)
-    return user
+    return create_user(db, user_in)
 
 
 def authentication_token_from_email(
@@ -37,14 +48,13 @@ def authentication_token_from_email(
     If the user doesn't exist it is created first.
     """
     password = random_lower_string()
-    user = services.get_user_by_email(session=db, email=email)
+    user = db.exec(select(User).where(User.email == email)).first()
     if not user:
         user_in_create = UserCreate(email=email, password=password)
-        user = services.create_user(session=db, user_create=user_in_create)
+        user = create_user(db, user_in_create)
     else:
-        user_in_update = UserUpdate(password=password)
-        if not user.id:
-            raise Exception("User id not set")
-        user = services.update_user(session=db, db_user=user, user_in=user_in_update)
+        user.hashed_password = get_password_hash(password)
+        db.add(user)
+        db.commit()
 
     return user_authentication_headers(client=client, email=email, password=password)
@@ -1,7 +1,11 @@
 import random
 import string
+from collections.abc import Generator
+from contextlib import contextmanager
 
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from src.core.config import settings
 
@@ -24,3 +28,33 @@ def get_superuser_token_headers(client: TestClient) -> dict[str, str]:
     a_token = tokens["access_token"]
     headers = {"Authorization": f"Bearer {a_token}"}
     return headers
+
+
+@contextmanager
+def count_queries(*engines: Engine | AsyncEngine) -> Generator[list[str], None, None]:
+    """Collect the SQL statements executed on `engines` inside the block."""
+    statements: list[str] = []
+    engines = tuple(
+        engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        for engine in engines
+    )
+
+    def _record(conn, cursor, statement, parameters, context, executemany):  # noqa: ARG001
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _record)
+
+
+def count_selects(statements: list[str]) -> int:
+    return sum(1 for s in statements if s.lstrip().upper().startswith("SELECT"))
+
+
+def statement_kinds(statements: list[str]) -> list[str]:
+    """The leading keyword of each statement, e.g. ["SELECT", "UPDATE"]."""
+    return [s.lstrip().split(None, 1)[0].upper() for s in statements]
@@ -4,30 +4,55 @@ import type { CancelablePromise } from './core/CancelablePromise'
 import { OpenAPI } from './core/OpenAPI'
 import { request as __request } from './core/request'
 import type {
+  FlashcardsAcceptCollectionShareData,
+  FlashcardsAcceptCollectionShareResponse,
+  FlashcardsBulkUpdateCardsData,
+  FlashcardsBulkUpdateCardsResponse,
+  FlashcardsCloneCollectionData,
+  FlashcardsCloneCollectionResponse,
   FlashcardsCreateCardData,
   FlashcardsCreateCardResponse,
   FlashcardsCreateCollectionData,
   FlashcardsCreateCollectionResponse,
+  FlashcardsDeclineCollectionShareData,
+  FlashcardsDeclineCollectionShareResponse,
   FlashcardsDeleteCardData,
   FlashcardsDeleteCardResponse,
   FlashcardsDeleteCollectionData,
   FlashcardsDeleteCollectionResponse,
+  FlashcardsExportCollectionData,
+  FlashcardsExportCollectionResponse,
   FlashcardsGetPracticeSessionStatusData,
   FlashcardsGetPracticeSessionStatusResponse,
+  FlashcardsImportAnkiDeckData,
+  FlashcardsImportAnkiDeckResponse,
+  FlashcardsImportCardsData,
+  FlashcardsImportCardsResponse,
   FlashcardsListPracticeCardsData,
   FlashcardsListPracticeCardsResponse,
   FlashcardsListPracticeSessionsData,
   FlashcardsListPracticeSessionsResponse,
+  FlashcardsReadAnkiImportData,
+  FlashcardsReadAnkiImportResponse,
   FlashcardsReadCardData,
   FlashcardsReadCardResponse,
   FlashcardsReadCardsData,
   FlashcardsReadCardsResponse,
   FlashcardsReadCollectionData,
   FlashcardsReadCollectionResponse,
+  FlashcardsReadCollectionSharesResponse,
   FlashcardsReadCollectionsData,
   FlashcardsReadCollectionsResponse,
+  FlashcardsReadDuplicateCardsData,
+  FlashcardsReadDuplicateCardsResponse,
+  FlashcardsSearchCardsData,
+  FlashcardsSearchCardsResponse,
+  FlashcardsShareCollectionData,
+  FlashcardsShareCollectionResponse,
   FlashcardsStartPracticeSessionData,
   FlashcardsStartPracticeSessionResponse,
+  FlashcardsTypeaheadCollectionsData,
+  FlashcardsTypeaheadCollectionsResponse,
   FlashcardsUpdateCardData,
   FlashcardsUpdateCardResponse,
   FlashcardsUpdateCollectionData,
@@ -50,6 +75,8 @@ export class FlashcardsService {
    * @param data The data for the request.
    * @param data.skip
    * @param data.limit
+   * @param data.count
+   * @param data.cursor `next_cursor` of the previous page
    * @returns CollectionList Successful Response
    * @throws ApiError
    */
@@ -62,6 +89,8 @@ export class FlashcardsService {
       query: {
         skip: data.skip,
         limit: data.limit,
+        count: data.count,
+        cursor: data.cursor,
       },
       errors: {
         422: 'Validation Error',
@@ -71,8 +100,12 @@ export class FlashcardsService {
 
   /**
    * Create Collection
+   * Create a collection, with cards generated from `prompt` when given.
+   * With `skip_duplicates`, generated cards that are near-duplicates of
+   * earlier ones are left out.
    * @param data The data for the request.
    * @param data.requestBody
+   * @param data.skipDuplicates
    * @returns Collection Successful Response
    * @throws ApiError
    */
@@ -82,6 +115,9 @@ export class FlashcardsService {
     return __request(OpenAPI, {
       method: 'POST',
       url: '/api/v1/collections/',
+      query: {
+        skip_duplicates: data.skipDuplicates,
+      },
       body: data.requestBody,
       mediaType: 'application/json',
       errors: {
@@ -90,6 +126,83 @@ export class FlashcardsService {
     })
   }
 
+  /**
+   * Import Anki Deck
+   * Queue an Anki .apkg deck from the raw request body for import into a
+   * new collection, named after the deck unless `name` is given.
+   *
+   * Poll the returned import for its progress.
+   * @param data The data for the request.
+   * @param data.requestBody
+   * @param data.name
+   * @returns AnkiImport Successful Response
+   * @throws ApiError
+   */
+  public static importAnkiDeck(
+    data: FlashcardsImportAnkiDeckData,
+  ): CancelablePromise<FlashcardsImportAnkiDeckResponse> {
+    return __request(OpenAPI, {
+      method: 'POST',
+      url: '/api/v1/collections/anki-imports',
+      query: {
+        name: data.name,
+      },
+      body: data.requestBody,
+      mediaType: 'application/octet-stream',
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Read Anki Import
+   * @param data The data for the request.
+   * @param data.importId
+   * @returns AnkiImport Successful Response
+   * @throws ApiError
+   */
+  public static readAnkiImport(
+    data: FlashcardsReadAnkiImportData,
+  ): CancelablePromise<FlashcardsReadAnkiImportResponse> {
+    return __request(OpenAPI, {
+      method: 'GET',
+      url: '/api/v1/collections/anki-imports/{import_id}',
+      path: {
+        import_id: data.importId,
+      },
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Typeahead Collections
+   * Names of the user's collections containing `q`, those starting with
+   * it first, for completing a name as it is typed.
+   * @param data The data for the request.
+   * @param data.q
+   * @param data.limit
+   * @returns CollectionNameList Successful Response
+   * @throws ApiError
+   */
+  public static typeaheadCollections(
+    data: FlashcardsTypeaheadCollectionsData,
+  ): CancelablePromise<FlashcardsTypeaheadCollectionsResponse> {
+    return __request(OpenAPI, {
+      method: 'GET',
+      url: '/api/v1/collections/typeahead',
+      query: {
+        q: data.q,
+        limit: data.limit,
+      },
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
   /**
    * Read Collection
    * @param data The data for the request.
@@ -106,6 +219,10 @@ export class FlashcardsService {
       path: {
         collection_id: data.collectionId,
       },
+      query: {
+        skip: data.skip,
+        limit: data.limit,
+      },
       errors: {
         422: 'Validation Error',
       },
@@ -159,12 +276,156 @@ export class FlashcardsService {
     })
   }
 
+  /**
+   * Clone Collection
+   * Copy a collection and all its cards. Practice sessions are not
+   * copied.
+   * @param data The data for the request.
+   * @param data.collectionId
+   * @param data.requestBody
+   * @returns CollectionSummary Successful Response
+   * @throws ApiError
+   */
+  public static cloneCollection(
+    data: FlashcardsCloneCollectionData,
+  ): CancelablePromise<FlashcardsCloneCollectionResponse> {
+    return __request(OpenAPI, {
+      method: 'POST',
+      url: '/api/v1/collections/{collection_id}/clone',
+      path: {
+        collection_id: data.collectionId,
+      },
+      body: data.requestBody,
+      mediaType: 'application/json',
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Share Collection
+   * Offer a copy of a collection to the user with `email`, made once they
+   * accept it. The response is the same whether or not they have an
+   * account.
+   * @param data The data for the request.
+   * @param data.collectionId
+   * @param data.requestBody
+   * @returns unknown Successful Response
+   * @throws ApiError
+   */
+  public static shareCollection(
+    data: FlashcardsShareCollectionData,
+  ): CancelablePromise<FlashcardsShareCollectionResponse> {
+    return __request(OpenAPI, {
+      method: 'POST',
+      url: '/api/v1/collections/{collection_id}/shares',
+      path: {
+        collection_id: data.collectionId,
+      },
+      body: data.requestBody,
+      mediaType: 'application/json',
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Read Collection Shares
+   * Copies of collections other users offered to the current user.
+   * @returns SharedCollectionList Successful Response
+   * @throws ApiError
+   */
+  public static readCollectionShares(): CancelablePromise<FlashcardsReadCollectionSharesResponse> {
+    return __request(OpenAPI, {
+      method: 'GET',
+      url: '/api/v1/collection-shares/',
+    })
+  }
+
+  /**
+   * Accept Collection Share
+   * Copy an offered collection into the current user's account.
+   * @param data The data for the request.
+   * @param data.shareId
+   * @returns CollectionSummary Successful Response
+   * @throws ApiError
+   */
+  public static acceptCollectionShare(
+    data: FlashcardsAcceptCollectionShareData,
+  ): CancelablePromise<FlashcardsAcceptCollectionShareResponse> {
+    return __request(OpenAPI, {
+      method: 'POST',
+      url: '/api/v1/collection-shares/{share_id}/accept',
+      path: {
+        share_id: data.shareId,
+      },
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Decline Collection Share
+   * @param data The data for the request.
+   * @param data.shareId
+   * @returns void Successful Response
+   * @throws ApiError
+   */
+  public static declineCollectionShare(
+    data: FlashcardsDeclineCollectionShareData,
+  ): CancelablePromise<FlashcardsDeclineCollectionShareResponse> {
+    return __request(OpenAPI, {
+      method: 'DELETE',
+      url: '/api/v1/collection-shares/{share_id}',
+      path: {
+        share_id: data.shareId,
+      },
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Read Duplicate Cards
+   * Groups of cards of a collection that are near-duplicates of each
+   * other, by estimated similarity of their text, largest groups first.
+   * @param data The data for the request.
+   * @param data.collectionId
+   * @param data.threshold
+   * @returns CardDuplicateList Successful Response
+   * @throws ApiError
+   */
+  public static readDuplicateCards(
+    data: FlashcardsReadDuplicateCardsData,
+  ): CancelablePromise<FlashcardsReadDuplicateCardsResponse> {
+    return __request(OpenAPI, {
+      method: 'GET',
+      url: '/api/v1/collections/{collection_id}/duplicates',
+      path: {
+        collection_id: data.collectionId,
+      },
+      query: {
+        threshold: data.threshold,
+      },
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
   /**
    * Read Cards
    * @param data The data for the request.
    * @param data.collectionId
    * @param data.skip
    * @param data.limit
+   * @param data.count
+   * @param data.cursor `next_cursor` of the previous page
+   * @param data.fields Card attributes to return, all but `preview` if not given
    * @returns CardList Successful Response
    * @throws ApiError
    */
@@ -180,6 +441,70 @@ export class FlashcardsService {
       query: {
         skip: data.skip,
         limit: data.limit,
+        count: data.count,
+        cursor: data.cursor,
+        fields: data.fields,
+      },
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Export Collection
+   * Stream the cards of a collection as JSON Lines or CSV, gzip compressed
+   * if the client accepts it.
+   * @param data The data for the request.
+   * @param data.collectionId
+   * @param data.format
+   * @returns unknown Successful Response
+   * @throws ApiError
+   */
+  public static exportCollection(
+    data: FlashcardsExportCollectionData,
+  ): CancelablePromise<FlashcardsExportCollectionResponse> {
+    return __request(OpenAPI, {
+      method: 'GET',
+      url: '/api/v1/collections/{collection_id}/export',
+      path: {
+        collection_id: data.collectionId,
+      },
+      query: {
+        format: data.format,
+        skip_duplicates: data.skipDuplicates,
+      },
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Search Cards
+   * Search the cards of all the user's collections, or of one, most
+   * relevant first.
+   * @param data The data for the request.
+   * @param data.q Words to find; supports quoted phrases, OR and -word
+   * @param data.cursor `next_cursor` of the previous page
+   * @param data.collectionId
+   * @param data.limit
+   * @param data.count
+   * @returns CardSearchList Successful Response
+   * @throws ApiError
+   */
+  public static searchCards(
+    data: FlashcardsSearchCardsData,
+  ): CancelablePromise<FlashcardsSearchCardsResponse> {
+    return __request(OpenAPI, {
+      method: 'GET',
+      url: '/api/v1/search',
+      query: {
+        q: data.q,
+        cursor: data.cursor,
+        collection_id: data.collectionId,
+        limit: data.limit,
+        count: data.count,
       },
       errors: {
         422: 'Validation Error',
@@ -189,9 +514,13 @@ export class FlashcardsService {
 
   /**
    * Create Card
+   * Add a card to a collection, generated from `prompt` when given. With
+   * `skip_duplicates`, a near-duplicate of a card of the collection is
+   * refused with 409.
    * @param data The data for the request.
    * @param data.collectionId
    * @param data.requestBody
+   * @param data.skipDuplicates
    * @returns Card Successful Response
    * @throws ApiError
    */
@@ -204,6 +533,73 @@ export class FlashcardsService {
       path: {
         collection_id: data.collectionId,
       },
+      query: {
+        skip_duplicates: data.skipDuplicates,
+      },
+      body: data.requestBody,
+      mediaType: 'application/json',
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Import Cards
+   * Import cards from the raw request body as it is uploaded.
+   *
+   * CSV and TSV files may start with a `front,back` header. The response is
+   * JSON Lines of `progress`, `error` and a final `summary` events. With
+   * `skip_duplicates`, rows that are near-duplicates of cards of the
+   * collection or of earlier rows are counted as `skipped` instead.
+   * @param data The data for the request.
+   * @param data.collectionId
+   * @param data.requestBody
+   * @param data.format
+   * @param data.skipDuplicates
+   * @returns unknown Successful Response
+   * @throws ApiError
+   */
+  public static importCards(
+    data: FlashcardsImportCardsData,
+  ): CancelablePromise<FlashcardsImportCardsResponse> {
+    return __request(OpenAPI, {
+      method: 'POST',
+      url: '/api/v1/collections/{collection_id}/cards/import',
+      path: {
+        collection_id: data.collectionId,
+      },
+      query: {
+        format: data.format,
+      },
+      body: data.requestBody,
+      mediaType: 'text/csv',
+      errors: {
+        422: 'Validation Error',
+      },
+    })
+  }
+
+  /**
+   * Bulk Update Cards
+   * Update, move or delete up to 1000 cards of a collection in one
+   * transaction. Cards that are not in the collection are reported as
+   * `not_found`.
+   * @param data The data for the request.
+   * @param data.collectionId
+   * @param data.requestBody
+   * @returns CardBulkResponse Successful Response
+   * @throws ApiError
+   */
+  public static bulkUpdateCards(
+    data: FlashcardsBulkUpdateCardsData,
+  ): CancelablePromise<FlashcardsBulkUpdateCardsResponse> {
+    return __request(OpenAPI, {
+      method: 'POST',
+      url: '/api/v1/collections/{collection_id}/cards/bulk',
+      path: {
+        collection_id: data.collectionId,
+      },
       body: data.requestBody,
       mediaType: 'application/json',
       errors: {
@@ -315,6 +711,8 @@ export class FlashcardsService {
    * @param data The data for the request.
    * @param data.skip
    * @param data.limit
+   * @param data.count
+   * @param data.cursor `next_cursor` of the previous page
    * @returns PracticeSessionList Successful Response
    * @throws ApiError
    */
@@ -327,6 +725,8 @@ export class FlashcardsService {
       query: {
         skip: data.skip,
         limit: data.limit,
+        count: data.count,
+        cursor: data.cursor,
       },
       errors: {
         422: 'Validation Error',
@@ -365,6 +765,9 @@ export class FlashcardsService {
    * @param data.status
    * @param data.limit
    * @param data.order
+   * @param data.count
+   * @param data.cursor `next_cursor` of the previous page
+   * @param data.fields Card attributes to return, all but `preview` if not given
    * @returns PracticeCardListResponse Successful Response
    * @throws ApiError
    */
@@ -381,6 +784,9 @@ export class FlashcardsService {
         status: data.status,
         limit: data.limit,
         order: data.order,
+        count: data.count,
+        cursor: data.cursor,
+        fields: data.fields,
       },
       errors: {
         422: 'Validation Error',
@@ -6,6 +6,16 @@ export type AIUsageQuota = {
   reset_date: string
 }
 
+export type AnkiImport = {
+  id: string
+  status?: 'pending' | 'running' | 'done' | 'failed'
+  collection_id?: string | null
+  imported?: number
+  failed?: number
+  errors?: Array<CardImportRowError>
+  detail?: string | null
+}
+
 export type Body_login_login_access_token = {
   grant_type?: string | null
   username: string
@@ -29,15 +39,72 @@ export type CardBasicStats = {
   correct_answers: number
 }
 
+export type CardBulkDelete = {
+  card_ids: Array<string>
+  action: 'delete'
+}
+
+export type CardBulkMove = {
+  card_ids: Array<string>
+  action: 'move'
+  target_collection_id: string
+}
+
+export type CardBulkResponse = {
+  data: Array<CardBulkResult>
+}
+
+export type CardBulkResult = {
+  id: string
+  status: 'updated' | 'moved' | 'deleted' | 'not_found'
+}
+
+export type CardBulkUpdate = {
+  card_ids: Array<string>
+  action: 'update'
+  changes: CardUpdate
+}
+
 export type CardCreate = {
   front: string
   back: string
   prompt?: string | null
 }
 
+export type CardDuplicateCluster = {
+  similarity: number
+  cards: Array<Card>
+}
+
+export type CardDuplicateList = {
+  data: Array<CardDuplicateCluster>
+  count: number
+}
+
+export type CardImportRowError = {
+  type?: 'error'
+  line: number
+  detail: string
+}
+
 export type CardList = {
   data: Array<Card>
-  count: number
+  count: number | null
+  next_cursor?: string | null
+}
+
+export type CardSearchList = {
+  data: Array<CardSearchResult>
+  count: number | null
+  next_cursor?: string | null
+}
+
+export type CardSearchResult = {
+  id: string
+  collection_id: string
+  rank: number
+  front_snippet: string
+  back_snippet: string
 }
 
 export type CardUpdate = {
@@ -58,14 +125,19 @@ export type CollectionBasicInfo = {
   total_practice_sessions: number
 }
 
+export type CollectionClone = {
+  name?: string | null
+}
+
 export type CollectionCreate = {
   name: string
   prompt?: string | null
 }
 
 export type CollectionList = {
-  data: Array<Collection>
-  count: number
+  data: Array<CollectionSummary>
+  count: number | null
+  next_cursor?: string | null
 }
 
 export type CollectionStats = {
@@ -74,6 +146,28 @@ export type CollectionStats = {
   difficult_cards: Array<CardBasicStats>
 }
 
+export type CollectionName = {
+  id: string
+  name: string
+}
+
+export type CollectionNameList = {
+  data: Array<CollectionName>
+}
+
+export type CollectionShareCreate = {
+  name?: string | null
+  email: string
+}
+
+export type CollectionSummary = {
+  name: string
+  id: string
+  card_count: number
+  updated_at: string
+  last_practiced_at: string | null
+}
+
 export type CollectionUpdate = {
   name?: string | null
 }
@@ -94,7 +188,8 @@ export type PracticeCard = {
 
 export type PracticeCardListResponse = {
   data: Array<PracticeCardResponse>
-  count: number
+  count: number | null
+  next_cursor?: string | null
 }
 
 export type PracticeCardResponse = {
@@ -126,7 +221,8 @@ export type PracticeSessionCreate = {
 
 export type PracticeSessionList = {
   data: Array<PracticeSession>
-  count: number
+  count: number | null
+  next_cursor?: string | null
 }
 
 export type PracticeSessionStats = {
@@ -138,6 +234,18 @@ export type PracticeSessionStats = {
   is_completed: boolean
 }
 
+export type SharedCollection = {
+  id: string
+  name: string
+  sender_email: string
+  created_at: string
+}
+
+export type SharedCollectionList = {
+  data: Array<SharedCollection>
+  count: number
+}
+
 export type Token = {
   access_token: string
   token_type?: string
@@ -162,6 +270,11 @@ export type ValidationError = {
 }
 
 export type FlashcardsReadCollectionsData = {
+  count?: 'exact' | 'estimate' | 'none'
+  /**
+   * `next_cursor` of the previous page
+   */
+  cursor?: string | null
   limit?: number
   skip?: number
 }
@@ -170,12 +283,35 @@ export type FlashcardsReadCollectionsResponse = CollectionList
 
 export type FlashcardsCreateCollectionData = {
   requestBody: CollectionCreate
+  skipDuplicates?: boolean
 }
 
 export type FlashcardsCreateCollectionResponse = Collection
 
+export type FlashcardsImportAnkiDeckData = {
+  name?: string | null
+  requestBody: Blob | File
+}
+
+export type FlashcardsImportAnkiDeckResponse = AnkiImport
+
+export type FlashcardsReadAnkiImportData = {
+  importId: string
+}
+
+export type FlashcardsReadAnkiImportResponse = AnkiImport
+
+export type FlashcardsTypeaheadCollectionsData = {
+  limit?: number
+  q: string
+}
+
+export type FlashcardsTypeaheadCollectionsResponse = CollectionNameList
+
 export type FlashcardsReadCollectionData = {
   collectionId: string
+  limit?: number
+  skip?: number
 }
 
 export type FlashcardsReadCollectionResponse = Collection
@@ -193,21 +329,105 @@ export type FlashcardsDeleteCollectionData = {
 
 export type FlashcardsDeleteCollectionResponse = void
 
+export type FlashcardsCloneCollectionData = {
+  collectionId: string
+  requestBody?: CollectionClone | null
+}
+
+export type FlashcardsCloneCollectionResponse = CollectionSummary
+
+export type FlashcardsShareCollectionData = {
+  collectionId: string
+  requestBody: CollectionShareCreate
+}
+
+export type FlashcardsShareCollectionResponse = unknown
+
+export type FlashcardsReadCollectionSharesResponse = SharedCollectionList
+
+export type FlashcardsAcceptCollectionShareData = {
+  shareId: string
+}
+
+export type FlashcardsAcceptCollectionShareResponse = CollectionSummary
+
+export type FlashcardsDeclineCollectionShareData = {
+  shareId: string
+}
+
+export type FlashcardsDeclineCollectionShareResponse = void
+
+export type FlashcardsReadDuplicateCardsData = {
+  collectionId: string
+  threshold?: number
+}
+
+export type FlashcardsReadDuplicateCardsResponse = CardDuplicateList
+
 export type FlashcardsReadCardsData = {
   collectionId: string
+  count?: 'exact' | 'estimate' | 'none'
+  /**
+   * `next_cursor` of the previous page
+   */
+  cursor?: string | null
+  /**
+   * Card attributes to return, all but `preview` if not given
+   */
+  fields?: Array<'id' | 'collection_id' | 'front' | 'back' | 'preview'> | null
   limit?: number
   skip?: number
 }
 
 export type FlashcardsReadCardsResponse = CardList
 
+export type FlashcardsExportCollectionData = {
+  collectionId: string
+  format?: 'ndjson' | 'csv'
+}
+
+export type FlashcardsExportCollectionResponse = unknown
+
+export type FlashcardsSearchCardsData = {
+  collectionId?: string | null
+  count?: 'exact' | 'estimate' | 'none'
+  /**
+   * `next_cursor` of the previous page
+   */
+  cursor?: string | null
+  limit?: number
+  /**
+   * Words to find; supports quoted phrases, OR and -word
+   */
+  q: string
+}
+
+export type FlashcardsSearchCardsResponse = CardSearchList
+
 export type FlashcardsCreateCardData = {
   collectionId: string
   requestBody: CardCreate
+  skipDuplicates?: boolean
 }
 
 export type FlashcardsCreateCardResponse = Card
 
+export type FlashcardsImportCardsData = {
+  collectionId: string
+  format?: 'csv' | 'tsv' | 'ndjson'
+  requestBody: Blob | File
+  skipDuplicates?: boolean
+}
+
+export type FlashcardsImportCardsResponse = unknown
+
+export type FlashcardsBulkUpdateCardsData = {
+  collectionId: string
+  requestBody: CardBulkUpdate | CardBulkMove | CardBulkDelete
+}
+
+export type FlashcardsBulkUpdateCardsResponse = CardBulkResponse
+
 export type FlashcardsReadCardData = {
   cardId: string
   collectionId: string
@@ -237,6 +457,11 @@ export type FlashcardsStartPracticeSessionData = {
 export type FlashcardsStartPracticeSessionResponse = PracticeSession
 
 export type FlashcardsListPracticeSessionsData = {
+  count?: 'exact' | 'estimate' | 'none'
+  /**
+   * `next_cursor` of the previous page
+   */
+  cursor?: string | null
   limit?: number
   skip?: number
 }
@@ -250,6 +475,15 @@ export type FlashcardsGetPracticeSessionStatusData = {
 export type FlashcardsGetPracticeSessionStatusResponse = PracticeSession
 
 export type FlashcardsListPracticeCardsData = {
+  count?: 'exact' | 'estimate' | 'none'
+  /**
+   * `next_cursor` of the previous page
+   */
+  cursor?: string | null
+  /**
+   * Card attributes to return, all but `preview` if not given
+   */
+  fields?: Array<'id' | 'collection_id' | 'front' | 'back' | 'preview'> | null
   limit?: number
   order?: 'asc' | 'desc' | 'random' | null
   practiceSessionId: string
@@ -1,4 +1,4 @@
-import type { Collection } from '@/client/types.gen'
+import type { CollectionSummary } from '@/client/types.gen'
 import { Box, HStack, Text } from '@chakra-ui/react'
 import { Link } from '@tanstack/react-router'
 import { useState } from 'react'
@@ -7,7 +7,7 @@ import { DefaultInput } from '../commonUI/Input'
 import CollectionKebabMenu from './CollectionKebabMenu'
 
 interface CollectionListItemProps {
-  collection: Collection
+  collection: CollectionSummary
   onDelete: (id: string) => void
   onRename: (id: string, newName: string) => void
 }
@@ -71,8 +71,8 @@ function CollectionListItem({ collection, onDelete, onRename }: CollectionListIt
           )}
         </Box>
         <Text textStyle="xs" color="fg.muted" marginTop=".5rem">
-          {collection.cards.length > 0
-            ? `${t('general.words.totalCards')}: ${collection.cards.length}`
+          {collection.card_count > 0
+            ? `${t('general.words.totalCards')}: ${collection.card_count}`
             : t('general.words.noCardsAdded')}
         </Text>
       </Box>
@@ -1,5 +1,5 @@
 import Logo from '@/assets/Logo.svg'
-import type { Collection } from '@/client/types.gen'
+import type { CollectionSummary } from '@/client/types.gen'
 import { useColorMode } from '@/components/ui/color-mode'
 import {
   DrawerBackdrop,
@@ -23,7 +23,7 @@ import LanguageSelector from './LanguageSelector'
 function CollectionListItem({
   collection,
   onNavigate,
-}: { collection: Collection; onNavigate: () => void }) {
+}: { collection: CollectionSummary; onNavigate: () => void }) {
   return (
     <List.Item
       key={collection.id}
@@ -65,7 +65,7 @@ function Drawer({ isOpen, setIsOpen }: { isOpen: boolean; setIsOpen: (open: bool
     placeholderData: (prevData) => prevData,
   })
 
-  const collections: Collection[] = data || []
+  const collections: CollectionSummary[] = data || []
 
   const handleNavigate = () => setIsOpen(false)
 
@@ -92,7 +92,7 @@ function Drawer({ isOpen, setIsOpen }: { isOpen: boolean; setIsOpen: (open: bool
               </VStack>
             ) : (
               <List.Root>
-                {collections.map((collection: Collection) => (
+                {collections.map((collection: CollectionSummary) => (
                   <CollectionListItem
                     key={collection.id}
                     collection={collection}
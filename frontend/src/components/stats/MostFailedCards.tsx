@@ -3,10 +3,6 @@ import { useTranslation } from 'react-i18next'
 
 import type { CardBasicStats } from '@/client'
 
-const stripHtml = (html: string): string => {
-  return html.replace(/<[^>]*>/g, '')
-}
-
 interface FailedCardData {
   id: string
   title: string
@@ -31,7 +27,7 @@ const MostFailedCards = ({ cards, title }: MostFailedCardsProps) => {
           : 0
       return {
         id: card.id.toString(),
-        title: stripHtml(card.front),
+        title: card.front,
         failRate,
         totalAttempts: card.total_attempts,
         correctAnswers: card.correct_answers,
@@ -1,9 +1,15 @@
 import { FlashcardsService } from '@/client'
-import type { Collection, CollectionCreate, CollectionList, CollectionUpdate } from '@/client'
+import type {
+  Collection,
+  CollectionCreate,
+  CollectionList,
+  CollectionSummary,
+  CollectionUpdate,
+} from '@/client'
 import type { CollectionRepository } from './CollectionRepository'
 
 export class ApiCollectionRepository implements CollectionRepository {
-  async getAll(): Promise<Collection[]> {
+  async getAll(): Promise<CollectionSummary[]> {
     const result: CollectionList = await FlashcardsService.readCollections()
     return result.data
   }
@@ -1,7 +1,12 @@
-import type { Collection, CollectionCreate, CollectionUpdate } from '@/client'
+import type {
+  Collection,
+  CollectionCreate,
+  CollectionSummary,
+  CollectionUpdate,
+} from '@/client'
 
 export interface CollectionRepository {
-  getAll(): Promise<Collection[]>
+  getAll(): Promise<CollectionSummary[]>
   getById(id: string): Promise<Collection | null>
   create(data: CollectionCreate): Promise<Collection>
   update(id: string, data: CollectionUpdate): Promise<Collection>
@@ -1,4 +1,10 @@
-import type { Card, Collection, CollectionCreate, CollectionUpdate } from '@/client'
+import type {
+  Card,
+  Collection,
+  CollectionCreate,
+  CollectionSummary,
+  CollectionUpdate,
+} from '@/client'
 import * as cards from '@/data/localDB/cards'
 import * as collections from '@/data/localDB/collections'
 import type { LocalCard, LocalCollection } from '@/db/flashcardsDB'
@@ -22,19 +28,26 @@ async function toCollection(local: LocalCollection, localCards: LocalCard[]): Pr
   }
 }
 
+function toCollectionSummary(local: LocalCollection, cardCount: number): CollectionSummary {
+  return {
+    id: local.id,
+    name: local.name,
+    card_count: cardCount,
+    updated_at: new Date(local.updatedAt).toISOString(),
+    last_practiced_at: null,
+  }
+}
+
 export class LocalCollectionRepository implements CollectionRepository {
-  async getAll(): Promise<Collection[]> {
+  async getAll(): Promise<CollectionSummary[]> {
     const locals = await collections.getLocalCollections()
     const collectionIds = locals.map((col) => col.id)
     const allCards = await cards.getLocalCardsForCollections(collectionIds)
-    const cardsByCollection: Record<string, LocalCard[]> = {}
+    const cardCounts: Record<string, number> = {}
     for (const card of allCards) {
-      if (!cardsByCollection[card.collectionId]) cardsByCollection[card.collectionId] = []
-      cardsByCollection[card.collectionId].push(card)
+      cardCounts[card.collectionId] = (cardCounts[card.collectionId] || 0) + 1
     }
-    return Promise.all(
-      locals.map((local) => toCollection(local, cardsByCollection[local.id] || [])),
-    )
+    return locals.map((local) => toCollectionSummary(local, cardCounts[local.id] || 0))
   }
 
   async getById(id: string): Promise<Collection | null> {
@@ -1,4 +1,4 @@
-import type { Collection } from '@/client/types.gen'
+import type { CollectionSummary } from '@/client/types.gen'
 import CollectionDialog from '@/components/collections/CollectionDialog'
 import CollectionListItem from '@/components/collections/CollectionListItem'
 import AiPromptDialog from '@/components/commonUI/AiPromptDialog'
@@ -33,13 +33,13 @@ function Collections() {
   const [isAiDialogOpen, setIsAiDialogOpen] = useState(false)
   const [isAddDialogOpen, setIsAddDialogOpen] = useState(false)
 
-  const { data, error, isLoading } = useQuery<Collection[]>({
+  const { data, error, isLoading } = useQuery<CollectionSummary[]>({
     queryKey: ['collections'],
     queryFn: getCollections,
     placeholderData: (prevData) => prevData,
   })
 
-  const collectionList: Collection[] = data || []
+  const collectionList: CollectionSummary[] = data || []
 
   const addCollection = async (name: string) => {
     if (!name) return
@@ -120,7 +120,7 @@ function Collections() {
               message={t('routes.layout.index.createFirstCollection')}
             />
           ) : (
-            collectionList.map((collection: Collection) => (
+            collectionList.map((collection: CollectionSummary) => (
               <CollectionListItem
                 key={collection.id}
                 collection={collection}
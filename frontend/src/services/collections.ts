@@ -1,10 +1,15 @@
-import type { Collection, CollectionCreate, CollectionUpdate } from '@/client'
+import type {
+  Collection,
+  CollectionCreate,
+  CollectionSummary,
+  CollectionUpdate,
+} from '@/client'
 import { getCollectionRepository } from '@/repositories/collection/CollectionRepositoryFactory'
 import { isGuest } from '@/utils/authUtils'
 
 const repo = () => getCollectionRepository(isGuest())
 
-export const getCollections = async (): Promise<Collection[]> => {
+export const getCollections = async (): Promise<CollectionSummary[]> => {
   return repo().getAll()
 }
 